@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AppAdminEventosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app_admin_eventos'
+
+    def ready(self):
+        import app_admin_eventos.signals
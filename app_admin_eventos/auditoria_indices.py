@@ -0,0 +1,100 @@
+import json
+import re
+
+from django.db import connection
+
+from app_asistentes.models import AsistenteEvento
+from app_evaluadores.models import EvaluadorEvento
+from app_participantes.models import ParticipanteEvento
+from app_participantes.utils import obtener_participantes_por_codigo_proyecto
+from app_usuarios.models import Usuario
+from principal_eventos.catalogo import eventos_catalogo
+
+from .busqueda import _coincidencias
+from .ciclo_vida import transiciones
+from .models import Evento
+
+
+def consultas_frecuentes():
+    """
+    (nombre, queryset) de las consultas más frecuentes de la aplicación, con
+    la misma forma que usan las vistas. Los valores son de ejemplo: EXPLAIN
+    solo necesita la forma de la consulta.
+    """
+    evento_id = Evento.objects.values_list('id', flat=True).first() or 1
+    return [
+        ('catalogo', eventos_catalogo()[:13]),
+        ('ciclo_vida_finalizados', transiciones()['finalizados']),
+        ('busqueda', _coincidencias('feria')),
+        ('participantes_por_estado', ParticipanteEvento.objects.filter(par_eve_evento_fk=evento_id, par_eve_estado='Aprobado')),
+        ('miembros_proyecto', ParticipanteEvento.objects.filter(par_eve_evento_fk=evento_id, par_eve_proyecto_principal=1)),
+        ('participantes_por_codigo', obtener_participantes_por_codigo_proyecto('ABC12345', evento_id)),
+        ('asistentes_por_estado', AsistenteEvento.objects.filter(asi_eve_evento_fk=evento_id, asi_eve_estado='Aprobado')),
+        ('evaluadores_por_estado', EvaluadorEvento.objects.filter(eva_eve_evento_fk=evento_id, eva_eve_estado='Aprobado')),
+        ('usuario_por_email', Usuario.objects.filter(email='correo@ejemplo.com')),
+    ]
+
+
+# Valores de select_type de MySQL, incluidos los de dos palabras que en el
+# texto del plan corren las columnas siguientes
+SELECT_TYPES_MYSQL = (
+    'SIMPLE', 'PRIMARY', 'UNION RESULT', 'DEPENDENT UNION', 'UNCACHEABLE UNION', 'UNION',
+    'DEPENDENT SUBQUERY', 'UNCACHEABLE SUBQUERY', 'SUBQUERY', 'DEPENDENT DERIVED', 'DERIVED', 'MATERIALIZED',
+)
+FILA_MYSQL = re.compile(
+    r'^\d+\s+(?:%s)\s+(?P<tabla>\S+)\s+\S+\s+(?P<tipo>\S+)' % '|'.join(map(re.escape, SELECT_TYPES_MYSQL))
+)
+
+
+def _escaneos_json(nodo):
+    """Tablas con access_type ALL en cualquier nivel de un plan JSON de MySQL."""
+    tablas = []
+    if isinstance(nodo, dict):
+        if nodo.get('access_type') == 'ALL' and 'table_name' in nodo:
+            tablas.append(nodo['table_name'])
+        for valor in nodo.values():
+            tablas.extend(_escaneos_json(valor))
+    elif isinstance(nodo, list):
+        for valor in nodo:
+            tablas.extend(_escaneos_json(valor))
+    return tablas
+
+
+def escaneos_completos(plan, motor=None):
+    """
+    Tablas que el plan de EXPLAIN recorre completas, según el motor:
+      - PostgreSQL: 'Seq Scan on tabla'
+      - MySQL: access_type = ALL en el plan JSON (o type = ALL en el de texto)
+      - SQLite: 'SCAN tabla' (SEARCH es una búsqueda por índice)
+    """
+    motor = motor or connection.vendor
+    if motor == 'mysql' and plan.lstrip().startswith('{'):
+        return _escaneos_json(json.loads(plan))
+
+    tablas = []
+    for linea in plan.splitlines():
+        if motor == 'postgresql':
+            encontrado = re.search(r'Seq Scan on (\w+)', linea)
+            if encontrado:
+                tablas.append(encontrado.group(1))
+        elif motor == 'mysql':
+            # id select_type table partitions type possible_keys key ...
+            encontrado = FILA_MYSQL.match(linea)
+            if encontrado and encontrado.group('tipo') == 'ALL':
+                tablas.append(encontrado.group('tabla'))
+        elif motor == 'sqlite':
+            # 'SCAN tabla USING INDEX' también recorre todo el índice; 'SEARCH' no
+            encontrado = re.search(r'\bSCAN (\w+)', linea)
+            if encontrado and encontrado.group(1) != 'CONSTANT':
+                tablas.append(encontrado.group(1))
+    return tablas
+
+
+def auditar():
+    """[(nombre, plan, tablas recorridas completas)] de las consultas frecuentes."""
+    resultado = []
+    for nombre, consulta in consultas_frecuentes():
+        # En MySQL el plan JSON trae access_type por tabla, sin depender de columnas
+        plan = consulta.explain(format='json') if connection.vendor == 'mysql' else consulta.explain()
+        resultado.append((nombre, plan, escaneos_completos(plan)))
+    return resultado
@@ -0,0 +1,174 @@
+import re
+import unicodedata
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, IntegerField, Max, Q, Sum, When
+
+from .models import Evento, TerminoBusqueda
+
+
+# Peso de una palabra según el campo del evento donde aparece; si aparece en
+# varios campos se suman.
+PESOS = {
+    'nombre': 8,
+    'categoria': 4,
+    'area': 4,
+    'ciudad': 2,
+    'lugar': 2,
+    'descripcion': 1,
+}
+
+LARGO_TERMINO = TerminoBusqueda._meta.get_field('ter_termino').max_length
+LARGO_CIUDAD = Evento._meta.get_field('eve_ciudad_normalizada').max_length
+
+# Palabras demasiado comunes para aportar a la búsqueda
+PALABRAS_VACIAS = {
+    'al', 'con', 'de', 'del', 'el', 'en', 'es', 'la', 'las', 'lo', 'los', 'para',
+    'por', 'que', 'se', 'su', 'sus', 'un', 'una', 'uno', 'y', 'o', 'a',
+}
+
+
+def normalizar(texto):
+    """Minúsculas y sin tildes: 'Bogotá' y 'BOGOTA' quedan como 'bogota'."""
+    descompuesto = unicodedata.normalize('NFKD', texto or '')
+    return ''.join(c for c in descompuesto if not unicodedata.combining(c)).lower()
+
+
+def normalizar_ciudad(ciudad):
+    """Forma con la que se guarda y se filtra eve_ciudad_normalizada."""
+    return ' '.join(normalizar(ciudad).split())[:LARGO_CIUDAD]
+
+
+def normalizar_ciudades():
+    """
+    Llena eve_ciudad_normalizada de los eventos cargados sin pasar por
+    Evento.save() (bulk_create, SQL directo): un UPDATE por ciudad distinta.
+    """
+    ciudades = Evento.objects.order_by().values_list('eve_ciudad', flat=True).distinct()
+    return sum(
+        Evento.objects.filter(eve_ciudad=ciudad).exclude(eve_ciudad_normalizada=normalizar_ciudad(ciudad))
+        .update(eve_ciudad_normalizada=normalizar_ciudad(ciudad))
+        for ciudad in list(ciudades)
+    )
+
+
+def terminos(texto):
+    """Palabras normalizadas del texto, sin repetir y sin palabras vacías."""
+    vistos = []
+    for palabra in re.findall(r'\w+', normalizar(texto)):
+        palabra = palabra[:LARGO_TERMINO]
+        if len(palabra) > 1 and palabra not in PALABRAS_VACIAS and palabra not in vistos:
+            vistos.append(palabra)
+    return vistos
+
+
+def terminos_evento(evento, categorias):
+    """{termino: peso} de un evento; `categorias` son sus Categoria con el área cargada."""
+    campos = [
+        ('nombre', evento.eve_nombre),
+        ('descripcion', evento.eve_descripcion),
+        ('ciudad', evento.eve_ciudad),
+        ('lugar', evento.eve_lugar),
+    ]
+    for categoria in categorias:
+        campos.append(('categoria', categoria.cat_nombre))
+        campos.append(('area', categoria.cat_area_fk.are_nombre))
+
+    pesos = {}
+    for campo, texto in campos:
+        for termino in terminos(texto):
+            pesos[termino] = pesos.get(termino, 0) + PESOS[campo]
+    return pesos
+
+
+def indexar_eventos(ids):
+    """
+    Reconstruye las filas del índice de los eventos indicados: dos lecturas
+    (eventos y categorías), un DELETE y un bulk_create, sin importar cuántos sean.
+    """
+    ids = list(ids)
+    if not ids:
+        return 0
+    eventos = Evento.objects.filter(id__in=ids).only(
+        'id', 'eve_nombre', 'eve_descripcion', 'eve_ciudad', 'eve_lugar'
+    ).prefetch_related('categorias__cat_area_fk')
+
+    filas = [
+        TerminoBusqueda(ter_termino=termino, ter_evento_fk_id=evento.id, ter_peso=peso)
+        for evento in eventos
+        for termino, peso in terminos_evento(evento, evento.categorias.all()).items()
+    ]
+    with transaction.atomic():
+        TerminoBusqueda.objects.filter(ter_evento_fk_id__in=ids).delete()
+        TerminoBusqueda.objects.bulk_create(filas, batch_size=1000)
+    return len(filas)
+
+
+def reindexar_todo(lote=500):
+    """Reconstruye el índice completo por lotes de eventos. Retorna cuántos se indexaron."""
+    total = 0
+    ultimo = 0
+    while True:
+        ids = list(Evento.objects.filter(id__gt=ultimo).order_by('id').values_list('id', flat=True)[:lote])
+        if not ids:
+            return total
+        indexar_eventos(ids)
+        total += len(ids)
+        ultimo = ids[-1]
+
+
+def _coincidencias(texto):
+    """
+    Eventos que contienen todas las palabras del texto (cada una como prefijo,
+    así 'bogo' encuentra 'Bogotá'), agrupados con su relevancia. None si el
+    texto no tiene palabras buscables.
+    """
+    palabras = terminos(texto)
+    if not palabras:
+        return None
+
+    # Los filtros por prefijo usan el índice de ter_termino (LIKE 'x%')
+    condicion = Q()
+    for palabra in palabras:
+        condicion |= Q(ter_termino__startswith=palabra)
+
+    # Una columna por palabra buscada: 1 si alguna fila del evento la contiene
+    presentes = {
+        f'p{i}': Max(Case(When(ter_termino__startswith=palabra, then=1), default=0, output_field=IntegerField()))
+        for i, palabra in enumerate(palabras)
+    }
+    return (
+        TerminoBusqueda.objects.filter(condicion)
+        .values('ter_evento_fk')
+        .annotate(relevancia=Sum('ter_peso'), **presentes)
+        .filter(**{nombre: 1 for nombre in presentes})
+    )
+
+
+def buscar_eventos(texto, limite=None, eventos=None):
+    """
+    IDs de los eventos que coinciden con el texto, del más relevante al menos
+    relevante (empates por id descendente). Una consulta agrupada sobre el índice.
+    `eventos` (queryset de Evento) restringe la búsqueda a esos eventos dentro
+    de la misma consulta, antes del límite: así los filtros del buscador
+    (estado, ciudad, costo...) no descartan resultados ya recortados.
+    """
+    coincidencias = _coincidencias(texto)
+    if coincidencias is None:
+        return []
+    if eventos is not None:
+        coincidencias = coincidencias.filter(ter_evento_fk__in=eventos.values('id'))
+    limite = limite or settings.BUSQUEDA_LIMITE
+    return list(
+        coincidencias.order_by('-relevancia', '-ter_evento_fk')
+        .values_list('ter_evento_fk', flat=True)[:limite]
+    )
+
+
+def condicion_busqueda(texto):
+    """Q para filtrar un queryset de Evento por el texto, sin ordenar por relevancia."""
+    coincidencias = _coincidencias(texto)
+    if coincidencias is None:
+        return Q()
+    return Q(id__in=coincidencias.values('ter_evento_fk'))
@@ -0,0 +1,328 @@
+import logging
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.mail import EmailMessage
+from django.db.models import Q
+from django.utils import formats, timezone
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from app_asistentes.models import AsistenteEvento
+from app_evaluadores.models import EvaluadorEvento
+from app_participantes.models import ParticipanteEvento
+
+from .models import CertificadoGenerado, LoteCertificados
+from .pdf_worker import cargar_plantilla, certificado_a_pdf
+
+logger = logging.getLogger(__name__)
+
+
+# tipo -> (modelo relación, campo evento, campo persona)
+TIPOS_CERTIFICADO = {
+    LoteCertificados.Tipos.PARTICIPANTES: (ParticipanteEvento, 'par_eve_evento_fk', 'par_eve_participante_fk'),
+    LoteCertificados.Tipos.EVALUADORES: (EvaluadorEvento, 'eva_eve_evento_fk', 'eva_eve_evaluador_fk'),
+    LoteCertificados.Tipos.ASISTENTES: (AsistenteEvento, 'asi_eve_evento_fk', 'asi_eve_asistente_fk'),
+}
+
+# Cada cuántos certificados se guarda el avance del lote
+INTERVALO_PROGRESO = 10
+
+
+def numero_procesos():
+    procesos = getattr(settings, 'CERTIFICADOS_PROCESOS', 0)
+    return procesos if procesos > 0 else (os.cpu_count() or 1)
+
+
+############ PLANTILLA COMPILADA (reportlab) ############
+# Replica certificado_participante/evaluador/asistente.html. Todo lo que no
+# cambia entre personas (títulos, texto del evento, firmas) se calcula una vez
+# por evento y tipo; por persona solo se dibuja el nombre.
+
+FUENTE = 'Times-Roman'
+FUENTE_NEGRITA = 'Times-Bold'
+FUENTE_NOMBRE = 'Times-Italic'
+MARGEN = 60
+
+
+def _textos_certificado(tipo, nombre_evento, lugar, fecha):
+    """
+    Retorna (título del documento, subtítulo, párrafos) con los mismos textos
+    de las plantillas HTML. Cada párrafo es una lista de (texto, negrita).
+    """
+    if tipo == LoteCertificados.Tipos.EVALUADORES:
+        return "Certificado de Evaluador", "DE RECONOCIMIENTO", [
+            [("En agradecimiento a su valiosa labor como ", False), ("Evaluador", True)],
+            [("durante el evento ", False), (nombre_evento, True), (f", realizado en {lugar} el {fecha}.", False)],
+        ]
+    if tipo == LoteCertificados.Tipos.ASISTENTES:
+        return "Certificado de Asistencia", "DE ASISTENCIA", [
+            [("Por haber asistido al evento ", False), (nombre_evento, True)],
+            [(f"llevado a cabo en {lugar} el día {fecha}.", False)],
+        ]
+    return "Certificado de Participación", "DE PARTICIPACIÓN", [
+        [("Por su valiosa participación en el evento ", False), (nombre_evento, True)],
+        [(f"realizado en {lugar} el día {fecha}.", False)],
+    ]
+
+
+def _envolver(segmentos, tamano, ancho_maximo):
+    """
+    Parte un párrafo con tramos en negrita en líneas que caben en el ancho dado.
+    Retorna una lista de líneas, cada una como [(texto, fuente), ...].
+    """
+    lineas, linea, ancho = [], [], 0
+    for texto, negrita in segmentos:
+        fuente = FUENTE_NEGRITA if negrita else FUENTE
+        for token in re.findall(r'\S+|\s+', texto):
+            ancho_token = stringWidth(token, fuente, tamano)
+            if token.isspace():
+                if linea:
+                    linea.append((token, fuente))
+                    ancho += ancho_token
+                continue
+            if linea and ancho + ancho_token > ancho_maximo:
+                lineas.append(linea)
+                linea, ancho = [], 0
+            linea.append((token, fuente))
+            ancho += ancho_token
+    if linea:
+        lineas.append(linea)
+
+    resultado = []
+    for linea in lineas:
+        while linea and linea[-1][0].isspace():
+            linea.pop()
+        tramos = []
+        for token, fuente in linea:
+            if tramos and tramos[-1][1] == fuente:
+                tramos[-1] = (tramos[-1][0] + token, fuente)
+            else:
+                tramos.append((token, fuente))
+        resultado.append(tramos)
+    return resultado
+
+
+def _texto_centrado(ancho_pagina, y, tramos, tamano):
+    total = sum(stringWidth(texto, fuente, tamano) for texto, fuente in tramos)
+    x = (ancho_pagina - total) / 2
+    operaciones = []
+    for texto, fuente in tramos:
+        operaciones.append(('texto', fuente, tamano, x, y, texto))
+        x += stringWidth(texto, fuente, tamano)
+    return operaciones
+
+
+@lru_cache(maxsize=128)
+def _compilar(tipo, nombre_evento, lugar, fecha):
+    ancho, alto = A4
+    ancho_util = ancho - 2 * MARGEN
+    titulo, subtitulo, parrafos = _textos_certificado(tipo, nombre_evento, lugar, fecha)
+
+    capa = []
+    y = alto - 110
+    capa += _texto_centrado(ancho, y, [("CERTIFICADO", FUENTE_NEGRITA)], 31.5)
+    y -= 32
+    capa += _texto_centrado(ancho, y, [(subtitulo, FUENTE_NEGRITA)], 16.5)
+    y -= 60
+    capa += _texto_centrado(ancho, y, [("Se otorga el presente certificado a:", FUENTE)], 12)
+    y -= 50
+    y_nombre = y
+
+    y -= 60
+    for parrafo in parrafos:
+        for tramos in _envolver(parrafo, 13.5, ancho_util):
+            capa += _texto_centrado(ancho, y, tramos, 13.5)
+            y -= 18
+
+    # Firmas
+    y -= 90
+    for centro, etiqueta in ((ancho / 2 - 130, "Firma Organizador"), (ancho / 2 + 130, "Firma Director")):
+        capa.append(('linea', centro - 75, y, centro + 75, y))
+        ancho_etiqueta = stringWidth(etiqueta, FUENTE, 11)
+        capa.append(('texto', FUENTE, 11, centro - ancho_etiqueta / 2, y - 14, etiqueta))
+
+    return {
+        'ancho': ancho,
+        'alto': alto,
+        'titulo': titulo,
+        'capa_fija': tuple(capa),
+        'nombre': (FUENTE_NOMBRE, 28.5, y_nombre, ancho_util),
+    }
+
+
+def compilar_plantilla(evento, tipo):
+    """
+    Plantilla del certificado de un evento. Se guarda en caché por los datos
+    que aparecen impresos, así una edición del evento genera una nueva.
+    """
+    fecha = formats.date_format(evento.eve_fecha_fin) if evento.eve_fecha_fin else ''
+    return _compilar(tipo, evento.eve_nombre, evento.eve_lugar, fecha)
+
+
+def personas_del_evento(evento_id, tipo, personas_ids=None):
+    """
+    Retorna las personas inscritas en el evento para el tipo dado, en una sola consulta.
+    """
+    modelo, campo_evento, campo_persona = TIPOS_CERTIFICADO[tipo]
+    filtros = {f'{campo_evento}_id': evento_id}
+    if personas_ids is not None:
+        filtros[f'{campo_persona}__in'] = personas_ids
+
+    relaciones = modelo.objects.filter(**filtros).select_related(f'{campo_persona}__usuario')
+    return [getattr(rel, campo_persona) for rel in relaciones]
+
+
+def nombre_archivo(tipo, persona):
+    return f"certificado_{tipo}_{str(persona).replace(' ', '_')}.pdf"
+
+
+def enviar_certificado(certificado):
+    """
+    Envía por correo el PDF guardado, sin volver a renderizarlo.
+    """
+    certificado.cer_archivo.open('rb')
+    try:
+        contenido = certificado.cer_archivo.read()
+    finally:
+        certificado.cer_archivo.close()
+
+    evento = certificado.cer_evento_fk
+    email = EmailMessage(
+        subject="🎓 Tu Certificado",
+        body=(
+            f"Hola {certificado.cer_primer_nombre or certificado.cer_nombre},\n\n"
+            f"Adjunto encontrarás tu certificado correspondiente al evento '{evento.eve_nombre}'.\n\n"
+            "¡Gracias por participar!"
+        ),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[certificado.cer_correo],
+    )
+    email.attach(os.path.basename(certificado.cer_archivo.name), contenido, "application/pdf")
+    email.send(fail_silently=False)
+
+    certificado.cer_enviado_en = timezone.now()
+    certificado.save(update_fields=['cer_enviado_en'])
+
+
+def _guardar_certificado(lote, persona, pdf):
+    certificado, _ = CertificadoGenerado.objects.get_or_create(
+        cer_evento_fk=lote.lot_evento_fk,
+        cer_tipo=lote.lot_tipo,
+        cer_persona_id=persona.pk,
+        defaults={
+            'cer_nombre': str(persona), 'cer_primer_nombre': persona.usuario.first_name, 'cer_correo': persona.usuario.email,
+        },
+    )
+    if certificado.cer_archivo:
+        certificado.cer_archivo.delete(save=False)
+
+    certificado.cer_lote_fk = lote
+    # str(persona) va en el PDF y en el archivo; el saludo del correo usa el primer nombre
+    certificado.cer_nombre = str(persona)
+    certificado.cer_primer_nombre = persona.usuario.first_name
+    certificado.cer_correo = persona.usuario.email
+    certificado.cer_archivo.save(nombre_archivo(lote.lot_tipo, persona), ContentFile(pdf), save=False)
+    certificado.save()
+    return certificado
+
+
+def _renderizar(plantilla, nombres, procesos):
+    """
+    Genera los PDF en orden. Con más de un proceso reparte el trabajo en un
+    pool 'spawn' (los hijos no heredan las conexiones a la base de datos) y
+    cada hijo recibe la plantilla compilada una sola vez al iniciar.
+    """
+    if procesos <= 1 or len(nombres) <= 1:
+        cargar_plantilla(plantilla)
+        yield from map(certificado_a_pdf, nombres)
+        return
+
+    procesos = min(procesos, len(nombres))
+    chunksize = max(1, len(nombres) // (procesos * 4))
+    with ProcessPoolExecutor(
+        max_workers=procesos,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=cargar_plantilla,
+        initargs=(plantilla,),
+    ) as pool:
+        yield from pool.map(certificado_a_pdf, nombres, chunksize=chunksize)
+
+
+def generar_lote(lote, procesos=None):
+    """
+    Renderiza, guarda y (opcionalmente) envía los certificados de un lote,
+    actualizando el progreso a medida que avanza.
+    """
+    procesos = procesos or numero_procesos()
+    evento = lote.lot_evento_fk
+
+    personas = personas_del_evento(evento.pk, lote.lot_tipo, lote.lot_personas)
+    lote.lot_estado = LoteCertificados.Estados.PROCESANDO
+    lote.lot_total = len(personas)
+    lote.lot_generados = lote.lot_errores = 0
+    lote.lot_iniciado_en = timezone.now()
+    lote.save(update_fields=['lot_estado', 'lot_total', 'lot_generados', 'lot_errores', 'lot_iniciado_en'])
+
+    plantilla = compilar_plantilla(evento, lote.lot_tipo)
+    nombres = [str(persona) for persona in personas]
+
+    try:
+        for i, (persona, (pdf, error)) in enumerate(zip(personas, _renderizar(plantilla, nombres, procesos)), start=1):
+            if error:
+                lote.lot_errores += 1
+                lote.lot_ultimo_error = f"{persona}: {error}"
+                logger.error("Error generando certificado de %s: %s", persona, error)
+            else:
+                certificado = _guardar_certificado(lote, persona, pdf)
+                lote.lot_generados += 1
+                if lote.lot_enviar_correo:
+                    try:
+                        enviar_certificado(certificado)
+                    except Exception as e:
+                        lote.lot_ultimo_error = f"{persona}: {e}"
+                        logger.error("Error al enviar certificado a %s: %s", certificado.cer_correo, e)
+
+            if i % INTERVALO_PROGRESO == 0:
+                lote.save(update_fields=['lot_generados', 'lot_errores', 'lot_ultimo_error'])
+    except Exception as e:
+        lote.lot_estado = LoteCertificados.Estados.FALLIDO
+        lote.lot_ultimo_error = str(e)
+        logger.exception("Lote de certificados %s falló", lote.pk)
+    else:
+        lote.lot_estado = LoteCertificados.Estados.COMPLETADO
+
+    lote.lot_finalizado_en = timezone.now()
+    lote.save()
+    return lote
+
+
+def procesar_lotes_pendientes(procesos=None):
+    """
+    Procesa los lotes pendientes, uno a la vez. La actualización condicional
+    evita que dos workers tomen el mismo lote. lot_iniciado_en funciona como
+    tiempo de bloqueo: un lote que sigue 'Procesando' pasados
+    CERTIFICADOS_BLOQUEO segundos quedó de un worker que murió a mitad, y se
+    vuelve a generar completo.
+    """
+    procesados = []
+    limite = timezone.now() - timedelta(seconds=getattr(settings, 'CERTIFICADOS_BLOQUEO', 3600))
+    elegibles = Q(lot_estado=LoteCertificados.Estados.PENDIENTE) | Q(
+        Q(lot_iniciado_en__lt=limite) | Q(lot_iniciado_en__isnull=True),
+        lot_estado=LoteCertificados.Estados.PROCESANDO,
+    )
+    for lote_id in LoteCertificados.objects.filter(elegibles).order_by('lot_creado_en').values_list('id', flat=True):
+        tomado = LoteCertificados.objects.filter(elegibles, pk=lote_id).update(
+            lot_estado=LoteCertificados.Estados.PROCESANDO, lot_iniciado_en=timezone.now(),
+        )
+        if not tomado:
+            continue
+        lote = LoteCertificados.objects.select_related('lot_evento_fk').get(pk=lote_id)
+        procesados.append(generar_lote(lote, procesos))
+    return procesados
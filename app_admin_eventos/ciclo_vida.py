@@ -0,0 +1,102 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from app_asistentes.models import AsistenteEvento
+from app_evaluadores.models import EvaluadorEvento, PosicionRanking
+from app_participantes.models import ParticipanteEvento
+from principal_eventos.cache_vistas import invalidar_eventos
+
+from .models import Evento
+
+
+logger = logging.getLogger(__name__)
+
+
+def transiciones(hoy=None):
+    """
+    Consultas de cada paso del ciclo de vida, en el orden en que se aplican:
+      - Publicado -> Finalizado: el evento terminó (eve_fecha_fin <= hoy)
+      - Finalizado -> Cerrado: pasaron EVENTOS_DIAS_CIERRE días desde el fin
+      - Cerrado -> eliminado: pasaron EVENTOS_DIAS_ELIMINACION días desde el fin
+    """
+    hoy = hoy or timezone.localdate()
+    cierre = hoy - timedelta(days=settings.EVENTOS_DIAS_CIERRE)
+    eliminacion = hoy - timedelta(days=settings.EVENTOS_DIAS_ELIMINACION)
+    return {
+        'finalizados': Evento.objects.filter(eve_estado=Evento.Estados.PUBLICADO, eve_fecha_fin__lte=hoy),
+        'cerrados': Evento.objects.filter(eve_estado=Evento.Estados.FINALIZADO, eve_fecha_fin__lt=cierre),
+        'eliminados': Evento.objects.filter(eve_estado=Evento.Estados.CERRADO, eve_fecha_fin__lt=eliminacion),
+    }
+
+
+def eliminar_eventos(ids):
+    """
+    Elimina los eventos `ids` con todo lo que depende de ellos. Retorna
+    cuántos eventos se borraron.
+
+    Las tres tablas de inscripción tienen receptores de post_delete (índice
+    de inscripciones, ranking), así que el delete() en cascada del evento
+    cargaría cada inscripción en memoria y la borraría por lotes de ids:
+    miles de filas y cientos de DELETE por evento grande. Esos receptores
+    no hacen nada cuando el origen es el evento, de modo que aquí se borran
+    antes con un DELETE directo por tabla (_raw_delete, el mismo que usa
+    Django para las cascadas sin señales). El resto (índices, ingresos,
+    criterios y calificaciones...) cae en cascada con el evento.
+    """
+    ids = list(ids)
+    if not ids:
+        return 0
+    participantes = ParticipanteEvento.objects.filter(par_eve_evento_fk_id__in=ids)
+    with transaction.atomic():
+        for inscripciones in (
+            PosicionRanking.objects.filter(pos_evento_fk_id__in=ids),
+            # Los miembros de un grupo apuntan a la inscripción del líder: van primero
+            participantes.filter(par_eve_proyecto_principal__isnull=False),
+            participantes,
+            AsistenteEvento.objects.filter(asi_eve_evento_fk_id__in=ids),
+            EvaluadorEvento.objects.filter(eva_eve_evento_fk_id__in=ids),
+        ):
+            inscripciones._raw_delete(inscripciones.db)
+        _, borrados = Evento.objects.filter(id__in=ids).delete()
+    return borrados.get(Evento._meta.label, 0)
+
+
+def avanzar_ciclo_vida(hoy=None, simular=False):
+    """
+    Aplica las transiciones de estado de todos los eventos con una sentencia
+    por paso (UPDATE/DELETE en bloque, sin recorrer filas). Es idempotente:
+    una segunda ejecución el mismo día no cambia nada. Un evento muy antiguo
+    puede recorrer varios pasos en la misma ejecución.
+
+    Retorna {'finalizados': n, 'cerrados': n, 'eliminados': n}. Con
+    `simular` solo cuenta lo que cambiaría cada paso desde el estado actual.
+    """
+    resultado = {}
+    with transaction.atomic():
+        pasos = transiciones(hoy)
+        for paso, nuevo_estado in (('finalizados', Evento.Estados.FINALIZADO), ('cerrados', Evento.Estados.CERRADO)):
+            eventos = pasos[paso]
+            if simular:
+                resultado[paso] = eventos.count()
+                continue
+            ids = list(eventos.values_list('id', flat=True))
+            resultado[paso] = Evento.objects.filter(id__in=ids).update(eve_estado=nuevo_estado)
+            if ids:
+                # update() no dispara señales: la caché de páginas se invalida aquí
+                invalidar_eventos(ids)
+                logger.info("Ciclo de vida: %s eventos pasan a %s: %s", len(ids), nuevo_estado, ids)
+
+        eventos = pasos['eliminados']
+        if simular:
+            resultado['eliminados'] = eventos.count()
+        else:
+            ids = list(eventos.values_list('id', flat=True))
+            resultado['eliminados'] = eliminar_eventos(ids)
+            if ids:
+                logger.info("Ciclo de vida: %s eventos eliminados: %s", len(ids), ids)
+
+    return resultado
@@ -0,0 +1,211 @@
+import logging
+import mimetypes
+from datetime import timedelta
+from email.mime.base import MIMEBase
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import AdjuntoCorreo, CorreoPendiente
+
+logger = logging.getLogger(__name__)
+
+
+def _config(nombre, defecto):
+    return getattr(settings, nombre, defecto)
+
+
+############ ENCOLAR CORREOS ############
+
+def _adjuntos_de(mensaje):
+    """
+    Normaliza los adjuntos de un EmailMessage a tuplas (nombre, bytes, mime).
+    """
+    adjuntos = []
+    for adjunto in mensaje.attachments:
+        if isinstance(adjunto, MIMEBase):
+            nombre = adjunto.get_filename() or 'adjunto'
+            contenido = adjunto.get_payload(decode=True) or b''
+            mime = adjunto.get_content_type()
+        else:
+            nombre, contenido, mime = adjunto
+            if isinstance(contenido, str):
+                contenido = contenido.encode('utf-8')
+            mime = mime or mimetypes.guess_type(nombre)[0] or 'application/octet-stream'
+        adjuntos.append((nombre, contenido, mime))
+    return adjuntos
+
+
+def encolar_correo(mensaje):
+    """
+    Guarda un EmailMessage en la cola de salida y retorna el CorreoPendiente creado.
+    """
+    with transaction.atomic():
+        correo = CorreoPendiente.objects.create(
+            cor_asunto=mensaje.subject[:255],
+            cor_cuerpo=mensaje.body,
+            cor_remitente=mensaje.from_email or settings.DEFAULT_FROM_EMAIL,
+            cor_destinatarios=list(mensaje.to),
+            cor_cc=list(mensaje.cc),
+            cor_bcc=list(mensaje.bcc),
+            cor_responder_a=list(mensaje.reply_to),
+            cor_tipo_contenido=mensaje.content_subtype,
+            cor_alternativas=[list(alt) for alt in getattr(mensaje, 'alternatives', [])],
+            cor_cabeceras=dict(mensaje.extra_headers),
+        )
+        AdjuntoCorreo.objects.bulk_create([
+            AdjuntoCorreo(
+                adj_correo_fk=correo,
+                adj_nombre=nombre,
+                adj_contenido=contenido,
+                adj_tipo_mime=mime,
+            )
+            for nombre, contenido, mime in _adjuntos_de(mensaje)
+        ])
+    return correo
+
+
+class ColaCorreosBackend(BaseEmailBackend):
+    """
+    Backend de correo que no envía: encola cada mensaje en CorreoPendiente.
+    Así `send_mail` y `EmailMessage.send()` regresan sin esperar al servidor SMTP/Brevo.
+    """
+
+    def send_messages(self, email_messages):
+        encolados = 0
+        for mensaje in email_messages:
+            if not mensaje.recipients():
+                continue
+            try:
+                encolar_correo(mensaje)
+                encolados += 1
+            except Exception:
+                if not self.fail_silently:
+                    raise
+                logger.exception("No se pudo encolar el correo '%s'", mensaje.subject)
+        return encolados
+
+
+############ PROCESAR LA COLA ############
+
+def calcular_espera(intentos):
+    """
+    Backoff exponencial: espera_base * 2^(intentos-1), limitado por espera_maxima.
+    """
+    base = _config('COLA_CORREOS_ESPERA_BASE', 60)
+    maxima = _config('COLA_CORREOS_ESPERA_MAXIMA', 3600)
+    return timedelta(seconds=min(base * (2 ** max(intentos - 1, 0)), maxima))
+
+
+def _reclamar_lote(tamano):
+    """
+    Toma un lote de correos listos para enviar y los marca como 'Enviando'.
+    El campo cor_proximo_intento funciona como tiempo de bloqueo: si el worker
+    muere a mitad del envío, el correo vuelve a ser elegible al vencer.
+    """
+    ahora = timezone.now()
+    bloqueo = timedelta(seconds=_config('COLA_CORREOS_BLOQUEO', 600))
+
+    with transaction.atomic():
+        candidatos = CorreoPendiente.objects.select_for_update(
+            skip_locked=connection.features.has_select_for_update_skip_locked
+        ).filter(
+            cor_estado__in=[CorreoPendiente.Estados.PENDIENTE, CorreoPendiente.Estados.ENVIANDO],
+            cor_proximo_intento__lte=ahora,
+        ).order_by('cor_proximo_intento', 'id')
+
+        ids = list(candidatos.values_list('id', flat=True)[:tamano])
+        if ids:
+            CorreoPendiente.objects.filter(id__in=ids).update(
+                cor_estado=CorreoPendiente.Estados.ENVIANDO,
+                cor_proximo_intento=ahora + bloqueo,
+            )
+
+    return list(
+        CorreoPendiente.objects.filter(id__in=ids)
+        .prefetch_related('adjuntos')
+        .order_by('cor_creado_en', 'id')
+    )
+
+
+def construir_mensaje(correo, conexion=None):
+    mensaje = EmailMultiAlternatives(
+        subject=correo.cor_asunto,
+        body=correo.cor_cuerpo,
+        from_email=correo.cor_remitente,
+        to=correo.cor_destinatarios,
+        cc=correo.cor_cc,
+        bcc=correo.cor_bcc,
+        reply_to=correo.cor_responder_a,
+        headers=correo.cor_cabeceras,
+        connection=conexion,
+    )
+    mensaje.content_subtype = correo.cor_tipo_contenido
+    for contenido, mime in correo.cor_alternativas:
+        mensaje.attach_alternative(contenido, mime)
+    for adjunto in correo.adjuntos.all():
+        mensaje.attach(adjunto.adj_nombre, bytes(adjunto.adj_contenido), adjunto.adj_tipo_mime)
+    return mensaje
+
+
+def procesar_cola(tamano_lote=None):
+    """
+    Envía un lote de la cola reutilizando una sola conexión al backend real.
+    Retorna un diccionario con el conteo de enviados, reintentos y fallidos.
+    """
+    tamano_lote = tamano_lote or _config('COLA_CORREOS_LOTE', 50)
+    max_intentos = _config('COLA_CORREOS_MAX_INTENTOS', 5)
+    resultado = {'enviados': 0, 'reintentos': 0, 'fallidos': 0}
+
+    correos = _reclamar_lote(tamano_lote)
+    if not correos:
+        return resultado
+
+    conexion = get_connection(
+        _config('COLA_CORREOS_BACKEND', 'django.core.mail.backends.smtp.EmailBackend'),
+        fail_silently=False,
+    )
+    try:
+        conexion.open()
+    except Exception as e:
+        logger.error("No se pudo abrir la conexión de correo: %s", e)
+
+    enviados = []
+    try:
+        for correo in correos:
+            correo.cor_intentos += 1
+            try:
+                construir_mensaje(correo, conexion).send(fail_silently=False)
+            except Exception as e:
+                correo.cor_ultimo_error = str(e)[:2000]
+                if correo.cor_intentos >= max_intentos:
+                    correo.cor_estado = CorreoPendiente.Estados.FALLIDO
+                    resultado['fallidos'] += 1
+                    logger.error("Correo %s descartado tras %s intentos: %s", correo.pk, correo.cor_intentos, e)
+                else:
+                    correo.cor_estado = CorreoPendiente.Estados.PENDIENTE
+                    correo.cor_proximo_intento = timezone.now() + calcular_espera(correo.cor_intentos)
+                    resultado['reintentos'] += 1
+            else:
+                correo.cor_estado = CorreoPendiente.Estados.ENVIADO
+                correo.cor_enviado_en = timezone.now()
+                correo.cor_ultimo_error = ''
+                # Enviado no se vuelve a construir: el contenido (contraseñas
+                # generadas, certificados...) no se conserva en la base de datos
+                correo.cor_cuerpo = ''
+                correo.cor_alternativas = []
+                enviados.append(correo.pk)
+                resultado['enviados'] += 1
+
+            correo.save(update_fields=[
+                'cor_estado', 'cor_intentos', 'cor_proximo_intento',
+                'cor_ultimo_error', 'cor_enviado_en', 'cor_cuerpo', 'cor_alternativas',
+            ])
+    finally:
+        conexion.close()
+        AdjuntoCorreo.objects.filter(adj_correo_fk_id__in=enviados).delete()
+
+    return resultado
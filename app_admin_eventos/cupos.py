@@ -0,0 +1,116 @@
+from django.db.models import Count, F, Value
+from django.db.models.functions import Greatest
+
+from app_asistentes.models import AsistenteEvento
+from principal_eventos.cache_vistas import invalidar_detalle_eventos, invalidar_eventos
+
+from .models import EstadoInscripcion, Evento
+
+
+# Cupos de asistentes. eve_capacidad es la capacidad configurada y
+# eve_cupos_reservados cuenta las inscripciones que ocupan cupo. Ambos
+# cambios son un UPDATE condicional sobre la fila del evento: la base de
+# datos evalúa la condición y suma en la misma sentencia, así que dos
+# inscripciones simultáneas no pueden tomar el último cupo a la vez
+# (no hay lectura previa en Python que pueda quedar desactualizada).
+#
+# Cada reserva invalida solo la página de detalle del evento; el catálogo,
+# compartido por todos los eventos, solo cuando el evento se llena o se
+# vuelve a abrir. Así un pico de inscripciones no vacía la caché del catálogo.
+
+ESTADOS_CON_CUPO = (EstadoInscripcion.PREINSCRITO, EstadoInscripcion.PENDIENTE, EstadoInscripcion.APROBADO)
+
+
+def _invalidar_paginas(evento_id, cambia_disponibilidad):
+    # update() no dispara señales: la caché de páginas se invalida aquí
+    if cambia_disponibilidad:
+        invalidar_eventos([evento_id])
+    else:
+        invalidar_detalle_eventos([evento_id])
+
+
+def _cupos(evento_id):
+    return Evento.objects.filter(pk=evento_id).values_list('eve_capacidad', 'eve_cupos_reservados').first() or (0, 0)
+
+
+def reservar_cupo(evento_id):
+    """Toma un cupo del evento. Retorna False si ya no quedan (0 filas actualizadas)."""
+    reservado = Evento.objects.filter(
+        pk=evento_id, eve_cupos_reservados__lt=F('eve_capacidad'),
+    ).update(eve_cupos_reservados=F('eve_cupos_reservados') + 1)
+    if reservado:
+        capacidad, reservados = _cupos(evento_id)
+        _invalidar_paginas(evento_id, cambia_disponibilidad=reservados >= capacidad)
+    return bool(reservado)
+
+
+def liberar_cupos(evento_id, cantidad=1):
+    """Devuelve `cantidad` cupos al evento, sin bajar de cero reservados."""
+    if cantidad <= 0:
+        return
+    Evento.objects.filter(pk=evento_id, eve_cupos_reservados__gt=0).update(
+        eve_cupos_reservados=Greatest(F('eve_cupos_reservados') - cantidad, Value(0)),
+    )
+    capacidad, reservados = _cupos(evento_id)
+    # Estaba lleno antes de liberar: vuelve a tener cupos
+    _invalidar_paginas(evento_id, cambia_disponibilidad=reservados < capacidad <= reservados + cantidad)
+
+
+def cambiar_estado_cupo(evento_id, estado_anterior, estado_nuevo):
+    """
+    Reserva o libera según el cambio de estado de una inscripción: solo pasar
+    de un estado sin cupo (nueva, Rechazado, Cancelado) a uno con cupo toma
+    uno, y solo el cambio contrario lo devuelve. Aprobar una inscripción
+    Pendiente no reserva otra vez. Retorna False si hacía falta un cupo y no hay.
+    """
+    antes = estado_anterior in ESTADOS_CON_CUPO
+    despues = estado_nuevo in ESTADOS_CON_CUPO
+    if despues and not antes:
+        return reservar_cupo(evento_id)
+    if antes and not despues:
+        liberar_cupos(evento_id)
+    return True
+
+
+def cambiar_estado_asistente(inscripcion, estado_nuevo):
+    """
+    Pasa la AsistenteEvento `inscripcion` de su estado leído a `estado_nuevo`
+    con un UPDATE condicional sobre ese estado, y mueve el cupo solo si esta
+    petición hizo el cambio: dos aprobaciones, rechazos o cancelaciones
+    simultáneas (o un doble envío) no reservan ni liberan dos veces.
+
+    Retorna True si se aplicó, False si hacía falta un cupo y no hay, y None
+    si otra petición cambió el estado primero (no se toca nada).
+    """
+    anterior = inscripcion.asi_eve_estado
+    evento_id = inscripcion.asi_eve_evento_fk_id
+    toma_cupo = estado_nuevo in ESTADOS_CON_CUPO and anterior not in ESTADOS_CON_CUPO
+    devuelve_cupo = anterior in ESTADOS_CON_CUPO and estado_nuevo not in ESTADOS_CON_CUPO
+
+    # El cupo se toma antes: si no hay, la inscripción no cambia
+    if toma_cupo and not reservar_cupo(evento_id):
+        return False
+    cambiada = AsistenteEvento.objects.filter(pk=inscripcion.pk, asi_eve_estado=anterior).update(
+        asi_eve_estado=estado_nuevo,
+    )
+    if not cambiada:
+        if toma_cupo:
+            liberar_cupos(evento_id)
+        return None
+    if devuelve_cupo:
+        liberar_cupos(evento_id)
+    inscripcion.asi_eve_estado = estado_nuevo
+    return True
+
+
+def liberar_cupos_inscripciones(inscripciones):
+    """
+    Libera los cupos de un queryset de AsistenteEvento antes de borrarlo:
+    un UPDATE por evento con el número de inscripciones que ocupaban cupo.
+    """
+    por_evento = (
+        inscripciones.filter(asi_eve_estado__in=ESTADOS_CON_CUPO)
+        .values('asi_eve_evento_fk').annotate(cantidad=Count('id')).order_by()
+    )
+    for fila in por_evento:
+        liberar_cupos(fila['asi_eve_evento_fk'], fila['cantidad'])
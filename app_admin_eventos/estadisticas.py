@@ -0,0 +1,62 @@
+from django.db.models import Count, Q
+
+from app_asistentes.models import AsistenteEvento
+from app_evaluadores.models import EvaluadorEvento
+from app_participantes.models import ParticipanteEvento
+
+
+def _conteo_por_estado(modelo, campo_evento, campo_estado, evento, **extras):
+    """
+    Cuenta total, aprobados y rechazados de una tabla de inscripción con una
+    sola consulta (agregación condicional). Los demás estados son pendientes.
+    """
+    conteos = modelo.objects.filter(**{campo_evento: evento}).aggregate(
+        total=Count('id'),
+        aprobados=Count('id', filter=Q(**{campo_estado: 'Aprobado'})),
+        rechazados=Count('id', filter=Q(**{campo_estado: 'Rechazado'})),
+        **extras,
+    )
+    conteos['pendientes'] = conteos['total'] - conteos['aprobados'] - conteos['rechazados']
+    return conteos
+
+
+def estadisticas_participantes(evento):
+    """
+    Conteos de participantes por estado y de proyectos individuales/grupales.
+    """
+    participantes = _conteo_por_estado(
+        ParticipanteEvento, 'par_eve_evento_fk', 'par_eve_estado', evento,
+        proyectos_individuales=Count('id', filter=Q(par_eve_es_grupo=False)),
+        proyectos_grupales=Count('id', filter=Q(par_eve_es_grupo=True, par_eve_proyecto_principal__isnull=True)),
+    )
+    participantes['total_proyectos'] = participantes['proyectos_individuales'] + participantes['proyectos_grupales']
+    return participantes
+
+
+def estadisticas_evento(evento):
+    """
+    Estadísticas de inscripción de un evento: una consulta por cada tabla
+    (participantes, asistentes y evaluadores) sin importar cuántos estados se cuenten.
+    """
+    participantes = estadisticas_participantes(evento)
+    asistentes = _conteo_por_estado(AsistenteEvento, 'asi_eve_evento_fk', 'asi_eve_estado', evento)
+    evaluadores = _conteo_por_estado(EvaluadorEvento, 'eva_eve_evento_fk', 'eva_eve_estado', evento)
+
+    # eve_capacidad es la capacidad configurada y eve_cupos_reservados lo que
+    # tomaron las inscripciones de asistentes (ver app_admin_eventos.cupos).
+    cupos_totales = evento.eve_capacidad
+    cupos_ocupados = evento.eve_cupos_reservados
+    cupos_disponibles = evento.cupos_disponibles
+    porcentaje_ocupacion = round(cupos_ocupados / cupos_totales * 100, 1) if cupos_totales > 0 else 0
+
+    return {
+        'cupos': {
+            'totales': cupos_totales,
+            'ocupados': cupos_ocupados,
+            'disponibles': cupos_disponibles,
+            'porcentaje_ocupacion': porcentaje_ocupacion,
+        },
+        'participantes': participantes,
+        'asistentes': asistentes,
+        'evaluadores': evaluadores,
+    }
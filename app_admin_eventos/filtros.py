@@ -0,0 +1,46 @@
+from django.db.models import Exists, OuterRef, Q
+
+from .busqueda import condicion_busqueda, normalizar_ciudad
+from .models import Evento, EventoCategoria
+
+
+def estado_canonico(estados, valor):
+    """
+    Valor de las opciones `estados` que coincide con `valor` sin importar
+    mayúsculas ('publicado' -> 'Publicado'). Así los filtros comparan con
+    igualdad exacta, que sí usa los índices. Si no coincide, retorna `valor`.
+    """
+    for opcion in estados.values:
+        if opcion.lower() == valor.strip().lower():
+            return opcion
+    return valor
+
+
+# Parámetro GET de los buscadores de eventos -> condición sobre Evento
+FILTROS = {
+    # Búsqueda de texto libre sobre el índice invertido (nombre, descripción, lugar, categorías...)
+    'nombre': condicion_busqueda,
+    # Prefijo sobre la columna normalizada (índice): 'bogota' y 'BOGOTÁ' encuentran 'Bogotá D.C.'
+    'ciudad': lambda valor: Q(eve_ciudad_normalizada__startswith=normalizar_ciudad(valor)),
+    'costo': lambda valor: Q(eve_tienecosto__iexact=valor),
+    'estado': lambda valor: Q(eve_estado=estado_canonico(Evento.Estados, valor)),
+    # Exists en lugar de JOIN + distinct(): un evento con varias categorías no se repite
+    'area': lambda valor: valor.isdigit() and Q(Exists(EventoCategoria.objects.filter(
+        eve_cat_evento_fk=OuterRef('pk'), eve_cat_categoria_fk__cat_area_fk_id=valor
+    ))),
+    'categoria': lambda valor: valor.isdigit() and Q(Exists(EventoCategoria.objects.filter(
+        eve_cat_evento_fk=OuterRef('pk'), eve_cat_categoria_fk_id=valor
+    ))),
+}
+
+
+def condicion_filtros(parametros):
+    """Combina los filtros presentes en `parametros` (request.GET o un dict)."""
+    condicion = Q()
+    for nombre, filtro in FILTROS.items():
+        valor = str(parametros.get(nombre) or '').strip()
+        filtro = filtro(valor) if valor else None
+        # Un ID de área o categoría no numérico se ignora en lugar de fallar
+        if filtro:
+            condicion &= filtro
+    return condicion
@@ -1,6 +1,7 @@
 from django.utils import timezone
 from django import forms
 from .models import Evento, Categoria, Area
+from . import referencias
 from app_usuarios.models import Usuario
 
 
@@ -76,6 +77,13 @@ class EventoForm(forms.ModelForm):
         
 
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Opciones desde el registro de referencia: pintar el formulario no consulta las tablas
+        vacio = [('', self.fields['area'].empty_label)] if self.fields['area'].empty_label is not None else []
+        self.fields['area'].choices = vacio + [(area.pk, str(area)) for area in referencias.areas()]
+        self.fields['categorias'].choices = [(categoria.pk, str(categoria)) for categoria in referencias.categorias()]
+
     def clean(self):
         cleaned_data = super().clean()
         fecha_inicio = cleaned_data.get('eve_fecha_inicio')
@@ -91,6 +99,13 @@ class EventoForm(forms.ModelForm):
         if fecha_inicio and fecha_fin and fecha_fin < fecha_inicio:
             self.add_error('eve_fecha_fin', 'La fecha de finalización no puede ser anterior a la fecha de inicio.')
 
+        capacidad = cleaned_data.get('eve_capacidad')
+        if capacidad is not None and self.instance.pk:
+            # Lectura fresca: las reservas no pasan por esta instancia
+            reservados = Evento.objects.filter(pk=self.instance.pk).values_list('eve_cupos_reservados', flat=True).first() or 0
+            if capacidad < reservados:
+                self.add_error('eve_capacidad', f'La capacidad no puede ser menor que los {reservados} cupos ya reservados.')
+
         return cleaned_data
 
 
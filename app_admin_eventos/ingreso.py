@@ -0,0 +1,273 @@
+import base64
+import hashlib
+import hmac
+import json
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+from django.utils.dateparse import parse_datetime
+
+from app_asistentes.models import AsistenteEvento
+from app_evaluadores.models import EvaluadorEvento
+from app_participantes.models import ParticipanteEvento
+
+from .models import RegistroIngreso
+
+
+# Token del QR: <tipo><id inscripción>.<id evento>.<firma>, con los IDs en
+# base 36 y la firma como HMAC-SHA256 (SECRET_KEY) truncado a 96 bits.
+# Ejemplo: "A2s.k.q0Tn1cJ6Rw8Z7yXb". Se verifica sin tocar la base de datos
+# y cabe en un QR versión 2.
+SAL = 'app_admin_eventos.ingreso'
+LARGO_FIRMA = 16
+
+Tipos = RegistroIngreso.Tipos
+
+# tipo -> (modelo, campo evento, campo estado, prefijo del usuario)
+INSCRIPCIONES = {
+    Tipos.ASISTENTE: (AsistenteEvento, 'asi_eve_evento_fk', 'asi_eve_estado', 'asi_eve_asistente_fk__usuario'),
+    Tipos.PARTICIPANTE: (ParticipanteEvento, 'par_eve_evento_fk', 'par_eve_estado', 'par_eve_participante_fk__usuario'),
+    Tipos.EVALUADOR: (EvaluadorEvento, 'eva_eve_evento_fk', 'eva_eve_estado', 'eva_eve_evaluador_fk__usuario'),
+}
+TIPO_POR_MODELO = {modelo: tipo for tipo, (modelo, *_) in INSCRIPCIONES.items()}
+
+
+def _base36(numero):
+    digitos = '0123456789abcdefghijklmnopqrstuvwxyz'
+    texto = ''
+    while True:
+        numero, resto = divmod(numero, 36)
+        texto = digitos[resto] + texto
+        if not numero:
+            return texto
+
+
+def _firma(cuerpo):
+    digest = salted_hmac(SAL, cuerpo, algorithm='sha256').digest()
+    return base64.urlsafe_b64encode(digest).decode('ascii')[:LARGO_FIRMA]
+
+
+def token_ingreso(inscripcion):
+    """
+    Token firmado para el QR de una inscripción (AsistenteEvento,
+    ParticipanteEvento o EvaluadorEvento) ya guardada.
+    """
+    tipo = TIPO_POR_MODELO[type(inscripcion)]
+    _, campo_evento, _, _ = INSCRIPCIONES[tipo]
+    evento_id = getattr(inscripcion, f'{campo_evento}_id')
+    cuerpo = f"{tipo}{_base36(inscripcion.pk)}.{_base36(evento_id)}"
+    return f"{cuerpo}.{_firma(cuerpo)}"
+
+
+def leer_token(token):
+    """
+    Verifica la firma y retorna (tipo, inscripcion_id, evento_id), o None si
+    el token está mal formado o fue alterado. No consulta la base de datos.
+    """
+    try:
+        cuerpo, firma = token.strip().rsplit('.', 1)
+        inscripcion, evento = cuerpo.split('.')
+        tipo = Tipos(inscripcion[0])
+        inscripcion_id, evento_id = int(inscripcion[1:], 36), int(evento, 36)
+    except (AttributeError, ValueError, IndexError):
+        return None
+    if not hmac.compare_digest(firma.encode(), _firma(cuerpo).encode()):
+        return None
+    return tipo, inscripcion_id, evento_id
+
+
+def _aprobadas(evento_id, tipo, ids=None):
+    """
+    Inscripciones aprobadas de un tipo en el evento, en una consulta.
+    Retorna {inscripcion_id: (nombre, clave)}.
+    """
+    modelo, campo_evento, campo_estado, usuario = INSCRIPCIONES[tipo]
+    filas = modelo.objects.filter(**{campo_evento: evento_id, campo_estado: 'Aprobado'})
+    if ids is not None:
+        filas = filas.filter(pk__in=ids)
+    campo_clave = campo_estado.replace('_estado', '_clave')
+    return {
+        pk: (f"{nombre} {apellido}".strip(), clave or '')
+        for pk, nombre, apellido, clave in filas.values_list(
+            'pk', f'{usuario}__first_name', f'{usuario}__last_name', campo_clave
+        )
+    }
+
+
+def registrar_ingreso(evento_id, token, dispositivo=''):
+    """
+    Valida un token escaneado en la puerta y registra el ingreso.
+    Retorna un diccionario con `resultado`:
+      - 'ingreso': primer escaneo, ingreso registrado
+      - 'repetido': la inscripción ya había ingresado (se informa la hora)
+      - 'invalido': firma incorrecta o token ilegible
+      - 'otro_evento': QR válido pero de otro evento
+      - 'no_aprobado': la inscripción no existe o no está aprobada
+    """
+    datos = leer_token(token)
+    if datos is None:
+        return {'resultado': 'invalido'}
+
+    tipo, inscripcion_id, evento_token = datos
+    if evento_token != evento_id:
+        return {'resultado': 'otro_evento'}
+
+    inscripcion = _aprobadas(evento_id, tipo, [inscripcion_id]).get(inscripcion_id)
+    if inscripcion is None:
+        return {'resultado': 'no_aprobado'}
+
+    nombre = inscripcion[0]
+    respuesta = {'tipo': Tipos(tipo).label, 'nombre': nombre}
+    try:
+        with transaction.atomic():
+            registro = RegistroIngreso.objects.create(
+                ing_evento_fk_id=evento_id,
+                ing_tipo=tipo,
+                ing_inscripcion_id=inscripcion_id,
+                ing_nombre=nombre,
+                ing_dispositivo=dispositivo[:64],
+            )
+        return {'resultado': 'ingreso', 'hora': registro.ing_fecha_hora, **respuesta}
+    except IntegrityError:
+        # Segundo escaneo: la restricción única ya tiene el ingreso
+        hora = RegistroIngreso.objects.filter(
+            ing_evento_fk_id=evento_id, ing_tipo=tipo, ing_inscripcion_id=inscripcion_id
+        ).values_list('ing_fecha_hora', flat=True).first()
+        return {'resultado': 'repetido', 'hora': hora, **respuesta}
+
+
+############ MODO SIN CONEXIÓN ############
+
+# La estación de la puerta descarga una foto firmada de las inscripciones
+# aprobadas, valida los QR localmente mientras no hay red y luego sube los
+# ingresos acumulados en lotes a sincronizar_ingresos().
+
+CAMPOS_SNAPSHOT = ['token', 'clave', 'nombre', 'tipo']
+
+# Registros aceptados por petición de sincronización (un día de 5.000 asistentes cabe en una)
+LOTE_MAXIMO = 5000
+
+
+def clave_estacion(evento_id):
+    """
+    Llave HMAC con la que la estación verifica la foto del evento. Se entrega
+    solo al administrador autenticado que abre la página de control.
+    """
+    return salted_hmac(f'{SAL}.estacion', str(evento_id), algorithm='sha256').hexdigest()
+
+
+def huella_clave(clave):
+    """Huella corta de una clave de acceso; la foto nunca lleva la clave en claro."""
+    return hashlib.sha256(clave.strip().encode('utf-8')).hexdigest()[:12]
+
+
+def _json_canonico(datos):
+    return json.dumps(datos, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+
+
+def snapshot_evento(evento_id):
+    """
+    Foto versionada y firmada de las llaves de acceso válidas del evento:
+    una fila [token, huella de la clave, nombre, tipo] por inscripción
+    aprobada. `version` es una huella del contenido, así la estación solo
+    descarga de nuevo cuando algo cambió. Tres consultas en total.
+    """
+    inscripciones = []
+    for tipo, (modelo, *_) in INSCRIPCIONES.items():
+        for pk, (nombre, clave) in sorted(_aprobadas(evento_id, tipo).items()):
+            inscripcion = modelo(pk=pk, **{f'{INSCRIPCIONES[tipo][1]}_id': evento_id})
+            inscripciones.append([token_ingreso(inscripcion), huella_clave(clave) if clave else '', nombre, tipo])
+
+    cuerpo = {
+        'evento': evento_id,
+        'campos': CAMPOS_SNAPSHOT,
+        'inscripciones': inscripciones,
+    }
+    cuerpo['version'] = hashlib.sha256(_json_canonico(cuerpo).encode('utf-8')).hexdigest()[:16]
+    cuerpo['firma'] = hmac.new(
+        clave_estacion(evento_id).encode(), _json_canonico(cuerpo).encode('utf-8'), hashlib.sha256
+    ).hexdigest()
+    return cuerpo
+
+
+def _hora_escaneo(texto, ahora):
+    hora = parse_datetime(texto or '') if isinstance(texto, str) else None
+    if hora is None:
+        return ahora
+    if timezone.is_naive(hora):
+        hora = timezone.make_aware(hora)
+    # Un reloj adelantado en la estación no puede registrar ingresos futuros
+    return min(hora, ahora)
+
+
+def sincronizar_ingresos(evento_id, registros, dispositivo=''):
+    """
+    Ingresa en bloque los escaneos acumulados por una estación sin conexión.
+    `registros` es una lista de {'token': ..., 'hora': ISO 8601}. Es
+    idempotente: reenviar el mismo lote no duplica ingresos y, si un QR se
+    escaneó varias veces, se conserva la hora más temprana del lote.
+
+    Usa una consulta por tipo de inscripción, una para los ingresos ya
+    existentes y un bulk_create, sin importar el tamaño del lote.
+    """
+    ahora = timezone.now()
+    rechazados = []
+    escaneos = {}
+    for registro in registros:
+        token = registro.get('token', '') if isinstance(registro, dict) else ''
+        datos = leer_token(token)
+        if datos is None:
+            rechazados.append({'token': token, 'motivo': 'invalido'})
+            continue
+        tipo, inscripcion_id, evento_token = datos
+        if evento_token != evento_id:
+            rechazados.append({'token': token, 'motivo': 'otro_evento'})
+            continue
+        hora = _hora_escaneo(registro.get('hora'), ahora)
+        clave = (tipo, inscripcion_id)
+        if clave not in escaneos or hora < escaneos[clave][0]:
+            escaneos[clave] = (hora, token)
+
+    por_tipo = {}
+    for tipo, inscripcion_id in escaneos:
+        por_tipo.setdefault(tipo, []).append(inscripcion_id)
+
+    aprobadas = {}
+    for tipo, ids in por_tipo.items():
+        for pk, (nombre, _) in _aprobadas(evento_id, tipo, ids).items():
+            aprobadas[(tipo, pk)] = nombre
+
+    existentes = set()
+    if escaneos:
+        condicion = Q()
+        for tipo, ids in por_tipo.items():
+            condicion |= Q(ing_tipo=tipo, ing_inscripcion_id__in=ids)
+        existentes = set(
+            RegistroIngreso.objects.filter(condicion, ing_evento_fk_id=evento_id)
+            .values_list('ing_tipo', 'ing_inscripcion_id')
+        )
+
+    nuevos = []
+    for clave, (hora, token) in escaneos.items():
+        if clave not in aprobadas:
+            rechazados.append({'token': token, 'motivo': 'no_aprobado'})
+        elif clave not in existentes:
+            nuevos.append(RegistroIngreso(
+                ing_evento_fk_id=evento_id,
+                ing_tipo=clave[0],
+                ing_inscripcion_id=clave[1],
+                ing_nombre=aprobadas[clave],
+                ing_dispositivo=dispositivo[:64],
+                ing_fecha_hora=hora,
+            ))
+
+    # ignore_conflicts cubre a otra estación que sincronice el mismo QR a la vez
+    RegistroIngreso.objects.bulk_create(nuevos, batch_size=1000, ignore_conflicts=True)
+    return {
+        'recibidos': len(registros),
+        'registrados': len(nuevos),
+        'repetidos': len(escaneos) - len(nuevos) - sum(1 for r in rechazados if r['motivo'] == 'no_aprobado'),
+        'rechazados': rechazados,
+    }
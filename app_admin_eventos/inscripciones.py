@@ -0,0 +1,79 @@
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+
+from .models import InscripcionEvento, RegistroIngreso
+
+
+# Regla de roles cruzados: un usuario tiene a lo sumo una inscripción por
+# evento (como asistente, participante o evaluador). InscripcionEvento
+# indexa las tres tablas de inscripción por (evento, usuario) con una
+# restricción única, así que la pregunta "¿qué rol tiene ya?" es una sola
+# consulta por índice, para un usuario o para un grupo completo de cédulas,
+# y dos registros simultáneos no pueden colarse entre la revisión y el INSERT.
+
+Tipos = RegistroIngreso.Tipos
+
+
+def mensaje_rol(tipo):
+    return f"Este usuario ya está inscrito como {Tipos(tipo).label} en este evento."
+
+
+def roles_en_evento(evento_id, usuario_ids):
+    """{usuario_id: tipo} de los usuarios que ya tienen inscripción en el evento. Una consulta."""
+    return dict(
+        InscripcionEvento.objects.filter(ins_evento_fk_id=evento_id, ins_usuario_fk_id__in=list(usuario_ids))
+        .values_list('ins_usuario_fk_id', 'ins_tipo')
+    )
+
+
+def roles_por_cedula(evento_id, cedulas):
+    """{cédula: tipo} para revisar un grupo completo antes de crear nada. Una consulta."""
+    cedulas = [str(cedula).strip() for cedula in cedulas]
+    return dict(
+        InscripcionEvento.objects.filter(ins_evento_fk_id=evento_id, ins_usuario_fk__cedula__in=cedulas)
+        .values_list('ins_usuario_fk__cedula', 'ins_tipo')
+    )
+
+
+def validar_inscripcion(evento_id, usuario_id, tipo, campo=None, nueva=True):
+    """
+    ValidationError (en `campo`, si se da) si el usuario ya está inscrito en
+    el evento con otro rol, o con el mismo si la inscripción es `nueva`.
+    """
+    actual = roles_en_evento(evento_id, [usuario_id]).get(usuario_id)
+    if actual is None or (actual == tipo and not nueva):
+        return
+    mensaje = mensaje_rol(actual)
+    raise ValidationError({campo: mensaje} if campo else mensaje)
+
+
+def registrar_inscripciones(evento_id, tipo, inscripciones):
+    """
+    Indexa inscripciones nuevas del evento: `inscripciones` son pares
+    (usuario_id, id de la inscripción). Un solo INSERT; si algún usuario ya
+    tenía rol en el evento no se indexa ninguno y se lanza ValidationError.
+    Se llama dentro de la transacción que crea las inscripciones, para que
+    el error también las deshaga.
+    """
+    inscripciones = list(inscripciones)
+    filas = [
+        InscripcionEvento(ins_evento_fk_id=evento_id, ins_usuario_fk_id=usuario_id, ins_tipo=tipo, ins_inscripcion_id=inscripcion_id)
+        for usuario_id, inscripcion_id in inscripciones
+    ]
+    try:
+        with transaction.atomic():
+            InscripcionEvento.objects.bulk_create(filas)
+    except IntegrityError:
+        roles = roles_en_evento(evento_id, [usuario_id for usuario_id, _ in inscripciones])
+        if roles:
+            raise ValidationError(mensaje_rol(next(iter(roles.values()))))
+        # El mismo usuario dos veces en el lote
+        raise ValidationError(mensaje_rol(tipo))
+
+
+def registrar_inscripcion(evento_id, usuario_id, tipo, inscripcion_id):
+    registrar_inscripciones(evento_id, tipo, [(usuario_id, inscripcion_id)])
+
+
+def retirar_inscripciones(tipo, inscripcion_ids):
+    InscripcionEvento.objects.filter(ins_tipo=tipo, ins_inscripcion_id__in=list(inscripcion_ids)).delete()
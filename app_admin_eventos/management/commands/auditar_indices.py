@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from app_admin_eventos.auditoria_indices import auditar
+
+
+class Command(BaseCommand):
+    help = "Ejecuta EXPLAIN sobre las consultas más frecuentes y señala las que recorren tablas completas."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--planes', action='store_true', help="Muestra el plan completo de cada consulta.")
+        parser.add_argument('--estricto', action='store_true', help="Termina con error si alguna consulta recorre una tabla completa.")
+
+    def handle(self, *args, **options):
+        con_escaneo = []
+        for nombre, plan, tablas in auditar():
+            if tablas:
+                con_escaneo.append(nombre)
+                self.stdout.write(self.style.WARNING(f"⚠️ {nombre}: recorre completa(s) {', '.join(tablas)}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"✅ {nombre}: usa índices"))
+            if options['planes']:
+                self.stdout.write(f"{plan}\n")
+
+        # En tablas pequeñas el motor puede preferir recorrerlas aunque exista el índice
+        if con_escaneo and options['estricto']:
+            raise CommandError(f"Consultas que recorren tablas completas: {', '.join(con_escaneo)}")
@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from app_admin_eventos.ciclo_vida import avanzar_ciclo_vida
+
+
+class Command(BaseCommand):
+    help = (
+        "Aplica el ciclo de vida de los eventos en bloque: Publicado -> Finalizado -> Cerrado -> eliminado. "
+        "Pensado para ejecutarse una vez al día (cron) o como worker con --continuo."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--simular', action='store_true',
+            help="Solo muestra cuántos eventos cambiarían, sin modificar nada.",
+        )
+        parser.add_argument(
+            '--continuo', action='store_true',
+            help="Mantiene el worker corriendo y repite cada --intervalo segundos.",
+        )
+        parser.add_argument(
+            '--intervalo', type=float, default=3600,
+            help="Segundos entre ejecuciones en modo continuo.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            while True:
+                resultado = avanzar_ciclo_vida(simular=options['simular'])
+                prefijo = "🔎 Simulación" if options['simular'] else "✅ Ciclo de vida aplicado"
+                self.stdout.write(self.style.SUCCESS(
+                    f"{prefijo}: {resultado['finalizados']} finalizados, "
+                    f"{resultado['cerrados']} cerrados, {resultado['eliminados']} eliminados."
+                ))
+                if not options['continuo']:
+                    break
+                time.sleep(options['intervalo'])
+        except KeyboardInterrupt:
+            self.stdout.write("⏹️ Worker detenido.")
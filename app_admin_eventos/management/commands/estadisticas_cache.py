@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from principal_eventos.cache_vistas import estadisticas, reiniciar_estadisticas
+
+
+class Command(BaseCommand):
+    help = "Muestra los aciertos y fallos de la caché de páginas públicas de eventos."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reiniciar', action='store_true', help="Pone los contadores en cero después de mostrarlos.")
+
+    def handle(self, *args, **options):
+        for vista, contadores in estadisticas().items():
+            total = contadores['aciertos'] + contadores['fallos']
+            porcentaje = contadores['aciertos'] * 100 / total if total else 0
+            self.stdout.write(
+                f"{vista}: {contadores['aciertos']} aciertos, {contadores['fallos']} fallos ({porcentaje:.1f}% aciertos)"
+            )
+        if options['reiniciar']:
+            reiniciar_estadisticas()
+            self.stdout.write(self.style.SUCCESS("✅ Contadores de caché reiniciados."))
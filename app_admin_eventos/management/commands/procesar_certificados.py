@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from app_admin_eventos.certificados import numero_procesos, procesar_lotes_pendientes
+
+
+class Command(BaseCommand):
+    help = "Genera los lotes de certificados pendientes repartiendo el renderizado en varios procesos."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--procesos', type=int, default=0,
+            help="Procesos para renderizar PDF (por defecto CERTIFICADOS_PROCESOS o núcleos disponibles).",
+        )
+        parser.add_argument(
+            '--continuo', action='store_true',
+            help="Mantiene el worker corriendo y revisa los lotes cada --intervalo segundos.",
+        )
+        parser.add_argument(
+            '--intervalo', type=float, default=5,
+            help="Segundos de espera entre revisiones en modo continuo.",
+        )
+
+    def handle(self, *args, **options):
+        procesos = options['procesos'] or numero_procesos()
+
+        try:
+            while True:
+                for lote in procesar_lotes_pendientes(procesos):
+                    self.stdout.write(
+                        f"🎓 Lote {lote.pk} ({lote.lot_tipo}) {lote.lot_estado}: "
+                        f"{lote.lot_generados}/{lote.lot_total} generados, {lote.lot_errores} errores"
+                    )
+                if not options['continuo']:
+                    break
+                time.sleep(options['intervalo'])
+        except KeyboardInterrupt:
+            self.stdout.write("⏹️ Worker detenido.")
+
+        self.stdout.write(self.style.SUCCESS("✅ Lotes de certificados procesados."))
@@ -0,0 +1,55 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from app_admin_eventos.correos import procesar_cola
+
+
+class Command(BaseCommand):
+    help = "Envía los correos pendientes de la cola por lotes, con reintentos y backoff exponencial."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lote', type=int, default=getattr(settings, 'COLA_CORREOS_LOTE', 50),
+            help="Cantidad máxima de correos a enviar por lote.",
+        )
+        parser.add_argument(
+            '--continuo', action='store_true',
+            help="Mantiene el worker corriendo y revisa la cola cada --intervalo segundos.",
+        )
+        parser.add_argument(
+            '--intervalo', type=float, default=5,
+            help="Segundos de espera entre revisiones cuando la cola está vacía (modo continuo).",
+        )
+
+    def handle(self, *args, **options):
+        lote = options['lote']
+        total = {'enviados': 0, 'reintentos': 0, 'fallidos': 0}
+
+        try:
+            while True:
+                resultado = procesar_cola(lote)
+                for clave, valor in resultado.items():
+                    total[clave] += valor
+
+                procesados = sum(resultado.values())
+                if procesados:
+                    self.stdout.write(
+                        f"📨 Lote: {resultado['enviados']} enviados, "
+                        f"{resultado['reintentos']} para reintento, {resultado['fallidos']} fallidos"
+                    )
+
+                # Si el lote vino lleno probablemente quedan más correos listos.
+                if procesados >= lote:
+                    continue
+                if not options['continuo']:
+                    break
+                time.sleep(options['intervalo'])
+        except KeyboardInterrupt:
+            self.stdout.write("⏹️ Worker detenido.")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Cola procesada: {total['enviados']} enviados, "
+            f"{total['reintentos']} para reintento, {total['fallidos']} fallidos."
+        ))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from app_admin_eventos.busqueda import normalizar_ciudades, reindexar_todo
+
+
+class Command(BaseCommand):
+    help = "Reconstruye el índice de búsqueda de eventos (solo hace falta tras cargas masivas sin señales)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=500, help="Eventos indexados por lote.")
+
+    def handle(self, *args, **options):
+        normalizar_ciudades()
+        total = reindexar_todo(options['lote'])
+        self.stdout.write(self.style.SUCCESS(f"✅ Índice de búsqueda reconstruido para {total} eventos."))
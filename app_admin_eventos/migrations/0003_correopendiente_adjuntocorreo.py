@@ -0,0 +1,103 @@
+# Generated by Django 5.2.3 on 2026-10-17 23:01
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_admin_eventos", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CorreoPendiente",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("cor_asunto", models.CharField(max_length=255)),
+                ("cor_cuerpo", models.TextField()),
+                ("cor_remitente", models.CharField(max_length=255)),
+                ("cor_destinatarios", models.JSONField(default=list)),
+                ("cor_cc", models.JSONField(blank=True, default=list)),
+                ("cor_bcc", models.JSONField(blank=True, default=list)),
+                ("cor_responder_a", models.JSONField(blank=True, default=list)),
+                (
+                    "cor_tipo_contenido",
+                    models.CharField(default="plain", max_length=20),
+                ),
+                ("cor_alternativas", models.JSONField(blank=True, default=list)),
+                ("cor_cabeceras", models.JSONField(blank=True, default=dict)),
+                (
+                    "cor_estado",
+                    models.CharField(
+                        choices=[
+                            ("Pendiente", "Pendiente"),
+                            ("Enviando", "Enviando"),
+                            ("Enviado", "Enviado"),
+                            ("Fallido", "Fallido"),
+                        ],
+                        default="Pendiente",
+                        max_length=20,
+                    ),
+                ),
+                ("cor_intentos", models.PositiveIntegerField(default=0)),
+                (
+                    "cor_proximo_intento",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("cor_ultimo_error", models.TextField(blank=True, default="")),
+                ("cor_creado_en", models.DateTimeField(auto_now_add=True)),
+                ("cor_enviado_en", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "Correo pendiente",
+                "verbose_name_plural": "Cola de correos",
+                "indexes": [
+                    models.Index(
+                        fields=["cor_estado", "cor_proximo_intento"],
+                        name="correo_estado_proximo_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="AdjuntoCorreo",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("adj_nombre", models.CharField(max_length=255)),
+                ("adj_contenido", models.BinaryField()),
+                (
+                    "adj_tipo_mime",
+                    models.CharField(
+                        default="application/octet-stream", max_length=100
+                    ),
+                ),
+                (
+                    "adj_correo_fk",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="adjuntos",
+                        to="app_admin_eventos.correopendiente",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,133 @@
+# Generated by Django 5.2.3 on 2026-10-17 23:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_admin_eventos", "0003_correopendiente_adjuntocorreo"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LoteCertificados",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "lot_tipo",
+                    models.CharField(
+                        choices=[
+                            ("participantes", "Participantes"),
+                            ("evaluadores", "Evaluadores"),
+                            ("asistentes", "Asistentes"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("lot_personas", models.JSONField(default=list)),
+                ("lot_enviar_correo", models.BooleanField(default=True)),
+                (
+                    "lot_estado",
+                    models.CharField(
+                        choices=[
+                            ("Pendiente", "Pendiente"),
+                            ("Procesando", "Procesando"),
+                            ("Completado", "Completado"),
+                            ("Fallido", "Fallido"),
+                        ],
+                        default="Pendiente",
+                        max_length=20,
+                    ),
+                ),
+                ("lot_total", models.PositiveIntegerField(default=0)),
+                ("lot_generados", models.PositiveIntegerField(default=0)),
+                ("lot_errores", models.PositiveIntegerField(default=0)),
+                ("lot_ultimo_error", models.TextField(blank=True, default="")),
+                ("lot_creado_en", models.DateTimeField(auto_now_add=True)),
+                ("lot_iniciado_en", models.DateTimeField(blank=True, null=True)),
+                ("lot_finalizado_en", models.DateTimeField(blank=True, null=True)),
+                (
+                    "lot_evento_fk",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="lotes_certificados",
+                        to="app_admin_eventos.evento",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Lote de certificados",
+                "verbose_name_plural": "Lotes de certificados",
+                "ordering": ["-lot_creado_en"],
+            },
+        ),
+        migrations.CreateModel(
+            name="CertificadoGenerado",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "cer_tipo",
+                    models.CharField(
+                        choices=[
+                            ("participantes", "Participantes"),
+                            ("evaluadores", "Evaluadores"),
+                            ("asistentes", "Asistentes"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("cer_persona_id", models.PositiveIntegerField()),
+                ("cer_nombre", models.CharField(max_length=255)),
+                ("cer_correo", models.EmailField(max_length=254)),
+                ("cer_archivo", models.FileField(upload_to="upload/certificados")),
+                ("cer_generado_en", models.DateTimeField(auto_now=True)),
+                ("cer_enviado_en", models.DateTimeField(blank=True, null=True)),
+                (
+                    "cer_evento_fk",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="certificados",
+                        to="app_admin_eventos.evento",
+                    ),
+                ),
+                (
+                    "cer_lote_fk",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="certificados",
+                        to="app_admin_eventos.lotecertificados",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Certificado generado",
+                "verbose_name_plural": "Certificados generados",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("cer_evento_fk", "cer_tipo", "cer_persona_id"),
+                        name="certificado_unico_por_persona",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 5.2.3 on 2026-10-17 23:20
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_admin_eventos", "0004_lotecertificados_certificadogenerado"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RegistroIngreso",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "ing_tipo",
+                    models.CharField(
+                        choices=[
+                            ("A", "Asistente"),
+                            ("P", "Participante"),
+                            ("E", "Evaluador"),
+                        ],
+                        max_length=1,
+                    ),
+                ),
+                ("ing_inscripcion_id", models.PositiveIntegerField()),
+                (
+                    "ing_nombre",
+                    models.CharField(blank=True, default="", max_length=255),
+                ),
+                (
+                    "ing_dispositivo",
+                    models.CharField(blank=True, default="", max_length=64),
+                ),
+                (
+                    "ing_fecha_hora",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "ing_evento_fk",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ingresos",
+                        to="app_admin_eventos.evento",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Registro de ingreso",
+                "verbose_name_plural": "Registros de ingreso",
+                "indexes": [
+                    models.Index(
+                        fields=["ing_evento_fk", "ing_fecha_hora"],
+                        name="ingreso_evento_fecha_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("ing_evento_fk", "ing_tipo", "ing_inscripcion_id"),
+                        name="ingreso_unico_por_inscripcion",
+                    )
+                ],
+            },
+        ),
+    ]
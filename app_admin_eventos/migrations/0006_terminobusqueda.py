@@ -0,0 +1,115 @@
+# Generated by Django 5.2.3 on 2026-10-17 23:35
+
+import re
+import unicodedata
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Copia de la indexación de app_admin_eventos.busqueda al momento de esta
+# migración: la migración no debe depender del código ni de los modelos vivos.
+PESOS = {
+    "nombre": 8,
+    "categoria": 4,
+    "area": 4,
+    "ciudad": 2,
+    "lugar": 2,
+    "descripcion": 1,
+}
+
+LARGO_TERMINO = 40
+
+PALABRAS_VACIAS = {
+    "al", "con", "de", "del", "el", "en", "es", "la", "las", "lo", "los", "para",
+    "por", "que", "se", "su", "sus", "un", "una", "uno", "y", "o", "a",
+}
+
+
+def normalizar(texto):
+    descompuesto = unicodedata.normalize("NFKD", texto or "")
+    return "".join(c for c in descompuesto if not unicodedata.combining(c)).lower()
+
+
+def terminos(texto):
+    vistos = []
+    for palabra in re.findall(r"\w+", normalizar(texto)):
+        palabra = palabra[:LARGO_TERMINO]
+        if len(palabra) > 1 and palabra not in PALABRAS_VACIAS and palabra not in vistos:
+            vistos.append(palabra)
+    return vistos
+
+
+def terminos_evento(evento):
+    campos = [
+        ("nombre", evento.eve_nombre),
+        ("descripcion", evento.eve_descripcion),
+        ("ciudad", evento.eve_ciudad),
+        ("lugar", evento.eve_lugar),
+    ]
+    for categoria in evento.categorias.all():
+        campos.append(("categoria", categoria.cat_nombre))
+        campos.append(("area", categoria.cat_area_fk.are_nombre))
+
+    pesos = {}
+    for campo, texto in campos:
+        for termino in terminos(texto):
+            pesos[termino] = pesos.get(termino, 0) + PESOS[campo]
+    return pesos
+
+
+def indexar_eventos_existentes(apps, schema_editor):
+    Evento = apps.get_model("app_admin_eventos", "Evento")
+    TerminoBusqueda = apps.get_model("app_admin_eventos", "TerminoBusqueda")
+
+    filas = []
+    for evento in Evento.objects.prefetch_related("categorias__cat_area_fk").iterator(chunk_size=500):
+        for termino, peso in terminos_evento(evento).items():
+            filas.append(
+                TerminoBusqueda(ter_termino=termino, ter_evento_fk_id=evento.pk, ter_peso=peso)
+            )
+    TerminoBusqueda.objects.bulk_create(filas, batch_size=1000)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_admin_eventos", "0005_registroingreso"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TerminoBusqueda",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("ter_termino", models.CharField(db_index=True, max_length=40)),
+                ("ter_peso", models.PositiveSmallIntegerField(default=1)),
+                (
+                    "ter_evento_fk",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="terminos_busqueda",
+                        to="app_admin_eventos.evento",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Término de búsqueda",
+                "verbose_name_plural": "Términos de búsqueda",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("ter_termino", "ter_evento_fk"),
+                        name="termino_unico_por_evento",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(indexar_eventos_existentes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.3 on 2026-10-17 23:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_admin_eventos", "0006_terminobusqueda"),
+        ("app_usuarios", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="evento",
+            index=models.Index(
+                fields=["eve_estado", "-eve_fecha_inicio", "-id"],
+                name="evento_estado_inicio_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="evento",
+            index=models.Index(
+                fields=["eve_estado", "eve_fecha_fin"], name="evento_estado_fin_idx"
+            ),
+        ),
+    ]
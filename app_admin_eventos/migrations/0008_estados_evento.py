@@ -0,0 +1,46 @@
+# Generated by Django 5.2.3 on 2026-10-17 23:50
+
+from django.db import migrations, models
+from django.db.models import Q
+from django.db.models.functions import Trim
+
+
+ESTADOS = ['Editando', 'Publicado', 'Finalizado', 'Cerrado', 'Cancelado']
+
+# Valores libres que se usaron antes de tener opciones fijas
+SINONIMOS = {'activo': 'Publicado', 'borrador': 'Editando', 'archivado': 'Cerrado'}
+
+
+def normalizar_estados(apps, schema_editor):
+    Evento = apps.get_model('app_admin_eventos', 'Evento')
+    # Sentencias en bloque: espacios sobrantes, mayúsculas distintas y sinónimos
+    Evento.objects.filter(Q(eve_estado__startswith=' ') | Q(eve_estado__endswith=' ')).update(eve_estado=Trim('eve_estado'))
+    for valor in ESTADOS:
+        Evento.objects.filter(eve_estado__iexact=valor).exclude(eve_estado=valor).update(eve_estado=valor)
+    for sinonimo, valor in SINONIMOS.items():
+        Evento.objects.filter(eve_estado__iexact=sinonimo).update(eve_estado=valor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_admin_eventos", "0007_indices_evento"),
+    ]
+
+    operations = [
+        migrations.RunPython(normalizar_estados, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="evento",
+            name="eve_estado",
+            field=models.CharField(
+                choices=[
+                    ("Editando", "Editando"),
+                    ("Publicado", "Publicado"),
+                    ("Finalizado", "Finalizado"),
+                    ("Cerrado", "Cerrado"),
+                    ("Cancelado", "Cancelado"),
+                ],
+                max_length=45,
+            ),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.3 on 2026-10-17 23:56
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+ESTADOS_CON_CUPO = ['Preinscrito', 'Pendiente', 'Aprobado']
+
+
+def separar_reservas(apps, schema_editor):
+    # Hasta ahora eve_capacidad guardaba los cupos que quedaban: pasa a ser la
+    # capacidad configurada (cupos libres + reservados) y las reservas se
+    # cuentan aparte a partir de las inscripciones que ocupan cupo.
+    Evento = apps.get_model('app_admin_eventos', 'Evento')
+    eventos = Evento.objects.annotate(
+        reservados=Count('asistenteevento', filter=Q(asistenteevento__asi_eve_estado__in=ESTADOS_CON_CUPO)),
+    ).filter(reservados__gt=0)
+    for evento in eventos.iterator():
+        Evento.objects.filter(pk=evento.pk).update(
+            eve_capacidad=max(evento.eve_capacidad, 0) + evento.reservados,
+            eve_cupos_reservados=evento.reservados,
+        )
+
+
+def juntar_reservas(apps, schema_editor):
+    Evento = apps.get_model('app_admin_eventos', 'Evento')
+    for evento in Evento.objects.filter(eve_cupos_reservados__gt=0).iterator():
+        Evento.objects.filter(pk=evento.pk).update(
+            eve_capacidad=max(evento.eve_capacidad - evento.eve_cupos_reservados, 0),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_admin_eventos", "0008_estados_evento"),
+        ("app_asistentes", "0004_estados_asistenteevento"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="evento",
+            name="eve_cupos_reservados",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(separar_reservas, juntar_reservas),
+    ]
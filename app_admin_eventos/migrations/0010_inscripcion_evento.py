@@ -0,0 +1,103 @@
+# Generated by Django 5.2.3 on 2026-10-18 00:18
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, Value
+
+
+# (app, modelo, tipo, campo evento, usuario a través del perfil)
+INSCRIPCIONES = [
+    ("app_participantes", "ParticipanteEvento", "P", "par_eve_evento_fk", "par_eve_participante_fk__usuario"),
+    ("app_evaluadores", "EvaluadorEvento", "E", "eva_eve_evento_fk", "eva_eve_evaluador_fk__usuario"),
+    ("app_asistentes", "AsistenteEvento", "A", "asi_eve_evento_fk", "asi_eve_asistente_fk__usuario"),
+]
+
+
+def indexar_inscripciones_existentes(apps, schema_editor):
+    InscripcionEvento = apps.get_model("app_admin_eventos", "InscripcionEvento")
+
+    # Las tres tablas en una sola consulta (UNION ALL)
+    consultas = [
+        apps.get_model(app, modelo).objects.annotate(
+            evento=F(campo_evento), usuario=F(campo_usuario), tipo=Value(tipo), inscripcion=F("pk"),
+        ).values_list("evento", "usuario", "tipo", "inscripcion").order_by()
+        for app, modelo, tipo, campo_evento, campo_usuario in INSCRIPCIONES
+    ]
+    filas = [
+        InscripcionEvento(ins_evento_fk_id=evento, ins_usuario_fk_id=usuario, ins_tipo=tipo, ins_inscripcion_id=inscripcion)
+        for evento, usuario, tipo, inscripcion in consultas[0].union(*consultas[1:], all=True)
+    ]
+    # Si ya había usuarios con dos roles en un evento se indexa el primero
+    InscripcionEvento.objects.bulk_create(filas, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_admin_eventos", "0009_cupos_reservados"),
+        ("app_asistentes", "0004_estados_asistenteevento"),
+        ("app_evaluadores", "0005_estados_evaluadorevento"),
+        ("app_participantes", "0004_estados_participanteevento"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InscripcionEvento",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "ins_tipo",
+                    models.CharField(
+                        choices=[
+                            ("A", "Asistente"),
+                            ("P", "Participante"),
+                            ("E", "Evaluador"),
+                        ],
+                        max_length=1,
+                    ),
+                ),
+                ("ins_inscripcion_id", models.PositiveIntegerField()),
+                (
+                    "ins_evento_fk",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="inscripciones",
+                        to="app_admin_eventos.evento",
+                    ),
+                ),
+                (
+                    "ins_usuario_fk",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="inscripciones_evento",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Inscripción a evento",
+                "verbose_name_plural": "Inscripciones a eventos",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("ins_evento_fk", "ins_usuario_fk"),
+                        name="inscripcion_un_rol_por_evento",
+                    ),
+                    models.UniqueConstraint(
+                        fields=("ins_tipo", "ins_inscripcion_id"),
+                        name="inscripcion_indice_unico",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(indexar_inscripciones_existentes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.3 on 2026-10-18 09:40
+
+import unicodedata
+
+from django.db import migrations, models
+
+
+LARGO_CIUDAD = 45
+
+
+def normalizar_ciudad(ciudad):
+    """Igual que busqueda.normalizar_ciudad al momento de esta migración."""
+    descompuesto = unicodedata.normalize("NFKD", ciudad or "")
+    sin_tildes = "".join(c for c in descompuesto if not unicodedata.combining(c)).lower()
+    return " ".join(sin_tildes.split())[:LARGO_CIUDAD]
+
+
+def normalizar_ciudades_existentes(apps, schema_editor):
+    Evento = apps.get_model("app_admin_eventos", "Evento")
+    # Un UPDATE por ciudad distinta, no por evento
+    ciudades = Evento.objects.order_by().values_list("eve_ciudad", flat=True).distinct()
+    for ciudad in list(ciudades):
+        Evento.objects.filter(eve_ciudad=ciudad).update(eve_ciudad_normalizada=normalizar_ciudad(ciudad))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_admin_eventos", "0010_inscripcion_evento"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="evento",
+            name="eve_ciudad_normalizada",
+            field=models.CharField(default="", editable=False, max_length=45),
+        ),
+        migrations.RunPython(normalizar_ciudades_existentes, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="evento",
+            index=models.Index(
+                fields=["eve_ciudad_normalizada"], name="evento_ciudad_norm_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:10
+
+from django.db import migrations
+
+
+def vaciar_correos_enviados(apps, schema_editor):
+    CorreoPendiente = apps.get_model("app_admin_eventos", "CorreoPendiente")
+    AdjuntoCorreo = apps.get_model("app_admin_eventos", "AdjuntoCorreo")
+
+    # Los ya enviados no conservan cuerpo ni adjuntos (contraseñas generadas, certificados)
+    enviados = CorreoPendiente.objects.filter(cor_estado="Enviado")
+    AdjuntoCorreo.objects.filter(adj_correo_fk__in=enviados).delete()
+    enviados.update(cor_cuerpo="", cor_alternativas=[])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_admin_eventos", "0011_evento_ciudad_normalizada"),
+    ]
+
+    operations = [
+        migrations.RunPython(vaciar_correos_enviados, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.3 on 2026-10-18 16:40
+
+from django.db import migrations, models
+
+
+# tipo de certificado -> (app, modelo de la persona)
+PERSONAS = {
+    "participantes": ("app_usuarios", "Participante"),
+    "evaluadores": ("app_usuarios", "Evaluador"),
+    "asistentes": ("app_usuarios", "Asistente"),
+}
+
+
+def llenar_primer_nombre(apps, schema_editor):
+    CertificadoGenerado = apps.get_model("app_admin_eventos", "CertificadoGenerado")
+
+    for tipo, modelo in PERSONAS.items():
+        nombres = dict(
+            apps.get_model(*modelo).objects.filter(
+                pk__in=CertificadoGenerado.objects.filter(cer_tipo=tipo).values("cer_persona_id")
+            ).values_list("pk", "usuario__first_name")
+        )
+        certificados = list(CertificadoGenerado.objects.filter(cer_tipo=tipo, cer_persona_id__in=nombres))
+        for certificado in certificados:
+            certificado.cer_primer_nombre = nombres[certificado.cer_persona_id] or ""
+        CertificadoGenerado.objects.bulk_update(certificados, ["cer_primer_nombre"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_admin_eventos", "0012_vaciar_correos_enviados"),
+        ("app_usuarios", "0003_identificadores_normalizados"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="certificadogenerado",
+            name="cer_primer_nombre",
+            field=models.CharField(blank=True, default="", max_length=150),
+        ),
+        migrations.RunPython(llenar_primer_nombre, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 
 class Area(models.Model):
@@ -16,18 +17,39 @@ class Categoria(models.Model):
     def __str__(self):
         return self.cat_nombre
 
+class EstadoInscripcion(models.TextChoices):
+    """Estado de la inscripción de un participante, asistente o evaluador a un evento."""
+    PREINSCRITO = 'Preinscrito', 'Preinscrito'
+    PENDIENTE = 'Pendiente', 'Pendiente'
+    APROBADO = 'Aprobado', 'Aprobado'
+    RECHAZADO = 'Rechazado', 'Rechazado'
+    CANCELADO = 'Cancelado', 'Cancelado'
+
+
 class Evento(models.Model):
+    class Estados(models.TextChoices):
+        EDITANDO = 'Editando', 'Editando'
+        PUBLICADO = 'Publicado', 'Publicado'
+        FINALIZADO = 'Finalizado', 'Finalizado'
+        CERRADO = 'Cerrado', 'Cerrado'
+        CANCELADO = 'Cancelado', 'Cancelado'
+
     eve_nombre = models.CharField(max_length=100)
     eve_descripcion = models.CharField(max_length=520)
     eve_ciudad = models.CharField(max_length=45)
+    # eve_ciudad en minúsculas y sin tildes: el filtro por ciudad compara por
+    # prefijo sobre ella (índice) y 'bogota' encuentra 'Bogotá'
+    eve_ciudad_normalizada = models.CharField(max_length=45, default='', editable=False)
     eve_lugar = models.CharField(max_length=100)
     eve_fecha_inicio = models.DateField()
     eve_fecha_fin = models.DateField()
-    eve_estado = models.CharField(max_length=45)
+    eve_estado = models.CharField(max_length=45, choices=Estados.choices)
     eve_imagen = models.ImageField(upload_to='upload/eventos/imagen', verbose_name="Imagen/Logo del Evento")
     eve_administrador_fk = models.ForeignKey('app_usuarios.AdministradorEvento', on_delete=models.CASCADE)
     eve_tienecosto = models.CharField(max_length=45)
     eve_capacidad = models.IntegerField()
+    # Cupos tomados por inscripciones de asistentes; solo lo cambia app_admin_eventos.cupos
+    eve_cupos_reservados = models.PositiveIntegerField(default=0)
     eve_programacion = models.FileField(upload_to='upload/eventos/programacion', verbose_name="Archivo de Programación")
     eve_informacion_tecnica = models.FileField(upload_to='upload/eventos/informacion_tecnica', null=True, blank=True, verbose_name="Información Técnica Opcional")
     preinscripcion_habilitada_asistentes = models.BooleanField(default=False)
@@ -35,9 +57,40 @@ class Evento(models.Model):
     preinscripcion_habilitada_evaluadores = models.BooleanField(default=False)
     categorias = models.ManyToManyField(Categoria, through='EventoCategoria')
 
+    class Meta:
+        indexes = [
+            # Catálogo público: estado + orden (eve_fecha_inicio, id) descendente de la paginación por llave
+            models.Index(fields=['eve_estado', '-eve_fecha_inicio', '-id'], name='evento_estado_inicio_idx'),
+            # Ciclo de vida: estado + eve_fecha_fin
+            models.Index(fields=['eve_estado', 'eve_fecha_fin'], name='evento_estado_fin_idx'),
+            # Filtro por ciudad de los buscadores
+            models.Index(fields=['eve_ciudad_normalizada'], name='evento_ciudad_norm_idx'),
+        ]
+
     def __str__(self):
         return self.eve_nombre
 
+    def save(self, *args, **kwargs):
+        from .busqueda import normalizar_ciudad
+
+        self.eve_ciudad_normalizada = normalizar_ciudad(self.eve_ciudad)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'eve_ciudad' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'eve_ciudad_normalizada'}
+        # eve_cupos_reservados solo cambia con los UPDATE condicionales de
+        # app_admin_eventos.cupos: guardar una instancia leída antes de una
+        # reserva (editar el evento, el admin) no debe pisar el contador.
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                campo.name for campo in self._meta.concrete_fields
+                if not campo.primary_key and campo.name != 'eve_cupos_reservados'
+            ]
+        super().save(*args, **kwargs)
+
+    @property
+    def cupos_disponibles(self):
+        return max(self.eve_capacidad - self.eve_cupos_reservados, 0)
+
 class EventoCategoria(models.Model):
     eve_cat_evento_fk = models.ForeignKey(Evento, on_delete=models.CASCADE)
     eve_cat_categoria_fk = models.ForeignKey(Categoria, on_delete=models.CASCADE)
@@ -60,3 +113,204 @@ class MemoriaEvento(models.Model):
     def __str__(self):
         return f"{self.nombre} ({self.evento.eve_nombre})"
     
+
+
+class CorreoPendiente(models.Model):
+    """
+    Correo en cola de salida. Las vistas solo encolan; el comando
+    `procesar_cola_correos` los envía por lotes con reintentos.
+    """
+    class Estados(models.TextChoices):
+        PENDIENTE = 'Pendiente', 'Pendiente'
+        ENVIANDO = 'Enviando', 'Enviando'
+        ENVIADO = 'Enviado', 'Enviado'
+        FALLIDO = 'Fallido', 'Fallido'
+
+    cor_asunto = models.CharField(max_length=255)
+    cor_cuerpo = models.TextField()
+    cor_remitente = models.CharField(max_length=255)
+    cor_destinatarios = models.JSONField(default=list)
+    cor_cc = models.JSONField(default=list, blank=True)
+    cor_bcc = models.JSONField(default=list, blank=True)
+    cor_responder_a = models.JSONField(default=list, blank=True)
+    cor_tipo_contenido = models.CharField(max_length=20, default='plain')
+    cor_alternativas = models.JSONField(default=list, blank=True)
+    cor_cabeceras = models.JSONField(default=dict, blank=True)
+    cor_estado = models.CharField(max_length=20, choices=Estados.choices, default=Estados.PENDIENTE)
+    cor_intentos = models.PositiveIntegerField(default=0)
+    cor_proximo_intento = models.DateTimeField(default=timezone.now)
+    cor_ultimo_error = models.TextField(blank=True, default='')
+    cor_creado_en = models.DateTimeField(auto_now_add=True)
+    cor_enviado_en = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['cor_estado', 'cor_proximo_intento'], name='correo_estado_proximo_idx'),
+        ]
+        verbose_name = "Correo pendiente"
+        verbose_name_plural = "Cola de correos"
+
+    def __str__(self):
+        return f"{self.cor_asunto} -> {', '.join(self.cor_destinatarios)} ({self.cor_estado})"
+
+
+class AdjuntoCorreo(models.Model):
+    adj_correo_fk = models.ForeignKey(CorreoPendiente, on_delete=models.CASCADE, related_name='adjuntos')
+    adj_nombre = models.CharField(max_length=255)
+    adj_contenido = models.BinaryField()
+    adj_tipo_mime = models.CharField(max_length=100, default='application/octet-stream')
+
+    def __str__(self):
+        return self.adj_nombre
+
+
+class LoteCertificados(models.Model):
+    """
+    Trabajo de generación masiva de certificados. La vista solo lo crea;
+    el comando `procesar_certificados` renderiza los PDF en paralelo.
+    """
+    class Estados(models.TextChoices):
+        PENDIENTE = 'Pendiente', 'Pendiente'
+        PROCESANDO = 'Procesando', 'Procesando'
+        COMPLETADO = 'Completado', 'Completado'
+        FALLIDO = 'Fallido', 'Fallido'
+
+    class Tipos(models.TextChoices):
+        PARTICIPANTES = 'participantes', 'Participantes'
+        EVALUADORES = 'evaluadores', 'Evaluadores'
+        ASISTENTES = 'asistentes', 'Asistentes'
+
+    lot_evento_fk = models.ForeignKey(Evento, on_delete=models.CASCADE, related_name='lotes_certificados')
+    lot_tipo = models.CharField(max_length=20, choices=Tipos.choices)
+    lot_personas = models.JSONField(default=list)
+    lot_enviar_correo = models.BooleanField(default=True)
+    lot_estado = models.CharField(max_length=20, choices=Estados.choices, default=Estados.PENDIENTE)
+    lot_total = models.PositiveIntegerField(default=0)
+    lot_generados = models.PositiveIntegerField(default=0)
+    lot_errores = models.PositiveIntegerField(default=0)
+    lot_ultimo_error = models.TextField(blank=True, default='')
+    lot_creado_en = models.DateTimeField(auto_now_add=True)
+    lot_iniciado_en = models.DateTimeField(null=True, blank=True)
+    lot_finalizado_en = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-lot_creado_en']
+        verbose_name = "Lote de certificados"
+        verbose_name_plural = "Lotes de certificados"
+
+    @property
+    def porcentaje(self):
+        if not self.lot_total:
+            return 100 if self.lot_estado == self.Estados.COMPLETADO else 0
+        return int((self.lot_generados + self.lot_errores) * 100 / self.lot_total)
+
+    def __str__(self):
+        return f"{self.get_lot_tipo_display()} - {self.lot_evento_fk.eve_nombre} ({self.lot_estado})"
+
+
+class CertificadoGenerado(models.Model):
+    """
+    PDF ya renderizado de una persona en un evento; se reutiliza para reenviarlo.
+    """
+    cer_evento_fk = models.ForeignKey(Evento, on_delete=models.CASCADE, related_name='certificados')
+    cer_lote_fk = models.ForeignKey(LoteCertificados, on_delete=models.SET_NULL, null=True, blank=True, related_name='certificados')
+    cer_tipo = models.CharField(max_length=20, choices=LoteCertificados.Tipos.choices)
+    cer_persona_id = models.PositiveIntegerField()
+    cer_nombre = models.CharField(max_length=255)
+    cer_primer_nombre = models.CharField(max_length=150, blank=True, default='')
+    cer_correo = models.EmailField()
+    cer_archivo = models.FileField(upload_to='upload/certificados')
+    cer_generado_en = models.DateTimeField(auto_now=True)
+    cer_enviado_en = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['cer_evento_fk', 'cer_tipo', 'cer_persona_id'],
+                name='certificado_unico_por_persona',
+            ),
+        ]
+        verbose_name = "Certificado generado"
+        verbose_name_plural = "Certificados generados"
+
+    def __str__(self):
+        return f"{self.cer_nombre} - {self.cer_evento_fk.eve_nombre}"
+
+
+class RegistroIngreso(models.Model):
+    """
+    Ingreso a un evento registrado al escanear el QR firmado de una inscripción.
+    La restricción única hace que escanear dos veces el mismo QR no duplique filas.
+    """
+    class Tipos(models.TextChoices):
+        ASISTENTE = 'A', 'Asistente'
+        PARTICIPANTE = 'P', 'Participante'
+        EVALUADOR = 'E', 'Evaluador'
+
+    ing_evento_fk = models.ForeignKey(Evento, on_delete=models.CASCADE, related_name='ingresos')
+    ing_tipo = models.CharField(max_length=1, choices=Tipos.choices)
+    ing_inscripcion_id = models.PositiveIntegerField()
+    ing_nombre = models.CharField(max_length=255, blank=True, default='')
+    ing_dispositivo = models.CharField(max_length=64, blank=True, default='')
+    ing_fecha_hora = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['ing_evento_fk', 'ing_tipo', 'ing_inscripcion_id'],
+                name='ingreso_unico_por_inscripcion',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['ing_evento_fk', 'ing_fecha_hora'], name='ingreso_evento_fecha_idx'),
+        ]
+        verbose_name = "Registro de ingreso"
+        verbose_name_plural = "Registros de ingreso"
+
+    def __str__(self):
+        return f"{self.ing_nombre} ({self.get_ing_tipo_display()}) - {self.ing_fecha_hora:%Y-%m-%d %H:%M}"
+
+
+class TerminoBusqueda(models.Model):
+    """
+    Índice invertido de la búsqueda de eventos: una fila por palabra
+    normalizada (minúsculas, sin tildes) de cada evento, con un peso según
+    los campos donde aparece. Lo mantienen las señales de la app.
+    """
+    ter_termino = models.CharField(max_length=40, db_index=True)
+    ter_evento_fk = models.ForeignKey(Evento, on_delete=models.CASCADE, related_name='terminos_busqueda')
+    ter_peso = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['ter_termino', 'ter_evento_fk'], name='termino_unico_por_evento'),
+        ]
+        verbose_name = "Término de búsqueda"
+        verbose_name_plural = "Términos de búsqueda"
+
+    def __str__(self):
+        return f"{self.ter_termino} -> {self.ter_evento_fk_id} ({self.ter_peso})"
+
+
+class InscripcionEvento(models.Model):
+    """
+    Índice de todas las inscripciones de un evento, sin importar el rol: una
+    fila por usuario y evento. La restricción única es la regla de que nadie
+    sea a la vez asistente, participante o evaluador del mismo evento; la
+    mantienen app_admin_eventos.inscripciones y las señales de la app.
+    """
+    ins_evento_fk = models.ForeignKey(Evento, on_delete=models.CASCADE, related_name='inscripciones')
+    ins_usuario_fk = models.ForeignKey('app_usuarios.Usuario', on_delete=models.CASCADE, related_name='inscripciones_evento')
+    ins_tipo = models.CharField(max_length=1, choices=RegistroIngreso.Tipos.choices)
+    ins_inscripcion_id = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['ins_evento_fk', 'ins_usuario_fk'], name='inscripcion_un_rol_por_evento'),
+            models.UniqueConstraint(fields=['ins_tipo', 'ins_inscripcion_id'], name='inscripcion_indice_unico'),
+        ]
+        verbose_name = "Inscripción a evento"
+        verbose_name_plural = "Inscripciones a eventos"
+
+    def __str__(self):
+        return f"{self.ins_usuario_fk_id} ({self.get_ins_tipo_display()}) - {self.ins_evento_fk_id}"
@@ -0,0 +1,70 @@
+"""
+Motor de certificados en PDF que corre dentro de los procesos del pool.
+
+Este módulo no importa Django a propósito: los procesos hijos se crean con
+'spawn' y solo reciben datos simples. La plantilla de cada evento llega ya
+compilada (posiciones, fuentes y textos fijos calculados una vez) y aquí solo
+se dibuja encima el nombre de cada persona.
+"""
+from io import BytesIO
+
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+
+# Plantilla activa del proceso; se carga una sola vez con cargar_plantilla()
+_plantilla = None
+
+
+def cargar_plantilla(plantilla):
+    """
+    Inicializador del pool: deja la plantilla compilada en memoria del proceso
+    para no volver a enviarla (ni a recalcularla) con cada certificado.
+    """
+    global _plantilla
+    _plantilla = plantilla
+
+
+def _dibujar_capa_fija(lienzo, plantilla):
+    for operacion in plantilla['capa_fija']:
+        if operacion[0] == 'texto':
+            _, fuente, tamano, x, y, texto = operacion
+            lienzo.setFont(fuente, tamano)
+            lienzo.drawString(x, y, texto)
+        elif operacion[0] == 'linea':
+            _, x1, y1, x2, y2 = operacion
+            lienzo.line(x1, y1, x2, y2)
+
+
+def _dibujar_nombre(lienzo, plantilla, nombre):
+    fuente, tamano, y, ancho_maximo = plantilla['nombre']
+    # Los nombres muy largos se reducen hasta caber en el ancho útil
+    ancho = stringWidth(nombre, fuente, tamano)
+    if ancho > ancho_maximo:
+        tamano = tamano * ancho_maximo / ancho
+        ancho = ancho_maximo
+    lienzo.setFont(fuente, tamano)
+    lienzo.drawString((plantilla['ancho'] - ancho) / 2, y, nombre)
+
+
+def certificado_a_pdf(nombre, plantilla=None):
+    """
+    Genera el PDF de una persona. Retorna (pdf, error) para que un fallo
+    individual no tumbe el lote completo.
+    """
+    plantilla = plantilla or _plantilla
+    try:
+        buffer = BytesIO()
+        lienzo = canvas.Canvas(
+            buffer,
+            pagesize=(plantilla['ancho'], plantilla['alto']),
+            pageCompression=1,
+            invariant=1,
+        )
+        lienzo.setTitle(plantilla['titulo'])
+        _dibujar_capa_fija(lienzo, plantilla)
+        _dibujar_nombre(lienzo, plantilla, nombre)
+        lienzo.showPage()
+        lienzo.save()
+        return buffer.getvalue(), None
+    except Exception as e:
+        return None, str(e)
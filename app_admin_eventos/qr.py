@@ -0,0 +1,110 @@
+import hashlib
+from collections import OrderedDict
+from io import BytesIO
+
+import qrcode
+from django.core.files.base import ContentFile
+
+
+# Parámetros de renderizado. Corrección M (~15%) resiste impresiones y
+# pantallas rayadas sin inflar la cantidad de módulos como H; con módulos
+# de 8 px y borde de 2 la imagen sigue siendo legible y pesa menos que la
+# configuración por defecto de qrcode.make (10 px, borde 4).
+CORRECCION = qrcode.constants.ERROR_CORRECT_M
+TAMANO_MODULO = 8
+BORDE = 2
+
+# Cambiar cualquier parámetro de renderizado debe cambiar la huella
+VERSION_RENDER = f"M{TAMANO_MODULO}b{BORDE}"
+
+MAXIMO_EN_MEMORIA = 256
+_cache = OrderedDict()
+
+
+def huella_qr(payload):
+    return hashlib.sha256(f"{VERSION_RENDER}|{payload}".encode('utf-8')).hexdigest()[:32]
+
+
+def renderizar_qr(payload):
+    """
+    PNG del payload. Los resultados recientes se guardan en memoria por huella.
+    """
+    huella = huella_qr(payload)
+    if huella in _cache:
+        _cache.move_to_end(huella)
+        return _cache[huella]
+
+    qr = qrcode.QRCode(error_correction=CORRECCION, box_size=TAMANO_MODULO, border=BORDE)
+    qr.add_data(payload)
+    qr.make(fit=True)
+    buffer = BytesIO()
+    qr.make_image().save(buffer, format='PNG')
+    return _recordar(huella, buffer.getvalue())
+
+
+def _recordar(huella, contenido):
+    _cache[huella] = contenido
+    if len(_cache) > MAXIMO_EN_MEMORIA:
+        _cache.popitem(last=False)
+    return contenido
+
+
+def _ruta(instancia, campo, huella):
+    field = instancia._meta.get_field(campo)
+    return field, f"qr_{huella}.png", field.generate_filename(instancia, f"qr_{huella}.png")
+
+
+def _contenido_existente(field, ruta, huella):
+    """PNG ya almacenado: se lee de memoria o del storage, sin volver a codificar."""
+    if huella in _cache:
+        return _cache[huella]
+    with field.storage.open(ruta, 'rb') as archivo:
+        return _recordar(huella, archivo.read())
+
+
+def asignar_qr(instancia, campo, payload):
+    """
+    Asigna el QR del payload al campo de imagen `campo` de la instancia y
+    retorna los bytes del PNG (para adjuntarlo en el correo).
+
+    Los archivos se nombran por huella del contenido: si ya existe en el
+    storage solo se apunta a él; si no, queda un ContentFile que se sube al
+    guardar la instancia.
+    """
+    huella = huella_qr(payload)
+    field, nombre, ruta = _ruta(instancia, campo, huella)
+
+    if field.storage.exists(ruta):
+        setattr(instancia, campo, ruta)
+        return _contenido_existente(field, ruta, huella)
+
+    contenido = renderizar_qr(payload)
+    setattr(instancia, campo, ContentFile(contenido, name=nombre))
+    return contenido
+
+
+def asignar_qrs(instancias, campo, payloads):
+    """
+    Versión en lote de asignar_qr para aprobar muchos inscritos a la vez.
+    `payloads` es una lista paralela a `instancias`. Sube directamente los
+    archivos que falten (una sola vez por huella) y deja en cada instancia el
+    nombre final, listo para un bulk_update del campo.
+    Retorna la lista de PNG en el mismo orden.
+    """
+    subidos = {}
+    contenidos = []
+    for instancia, payload in zip(instancias, payloads):
+        huella = huella_qr(payload)
+        field, nombre, ruta = _ruta(instancia, campo, huella)
+
+        if huella not in subidos:
+            if field.storage.exists(ruta):
+                subidos[huella] = (ruta, _contenido_existente(field, ruta, huella))
+            else:
+                contenido = renderizar_qr(payload)
+                subidos[huella] = (field.storage.save(ruta, ContentFile(contenido)), contenido)
+
+        ruta, contenido = subidos[huella]
+        setattr(instancia, campo, ruta)
+        contenidos.append(contenido)
+    return contenidos
@@ -0,0 +1,100 @@
+import time
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Area, Categoria
+
+
+# Registro de datos de referencia (áreas y categorías): cambian pocas veces
+# al mes y casi todas las páginas con filtros los pintan. Cada proceso guarda
+# su copia y solo consulta en la caché compartida el número de versión; las
+# señales de la app suben la versión cuando se edita un área o una categoría.
+# Los objetos son compartidos entre peticiones: son de solo lectura.
+
+LLAVE_VERSION = 'referencias:version'
+
+_local = SimpleNamespace(version=None, cargado=0.0, datos=None)
+
+
+def _version_inicial():
+    # Si la caché pierde la versión, la nueva arranca desde el reloj y no
+    # coincide con ninguna que otro proceso tenga guardada
+    return time.time_ns() // 1000
+
+
+def _version():
+    version = cache.get(LLAVE_VERSION)
+    if version is None:
+        cache.add(LLAVE_VERSION, _version_inicial(), None)
+        version = cache.get(LLAVE_VERSION)
+    return version
+
+
+def _cargar():
+    areas = list(Area.objects.order_by('id'))
+    por_area = {area.id: area for area in areas}
+    categorias = list(Categoria.objects.order_by('id'))
+    for categoria in categorias:
+        # Sin consulta extra por cat_area_fk al pintar el área de cada categoría
+        categoria.cat_area_fk = por_area[categoria.cat_area_fk_id]
+    return {
+        'areas': tuple(areas),
+        'categorias': tuple(categorias),
+        'areas_por_id': por_area,
+        'categorias_por_id': {categoria.id: categoria for categoria in categorias},
+    }
+
+
+def _datos():
+    version = _version()
+    vigente = time.monotonic() - _local.cargado < settings.REFERENCIAS_SEGUNDOS
+    if _local.datos is not None and _local.version == version and vigente:
+        return _local.datos
+
+    llave = f'referencias:datos:{version}'
+    datos = cache.get(llave)
+    if datos is None:
+        datos = _cargar()
+        cache.set(llave, datos, settings.REFERENCIAS_SEGUNDOS)
+    _local.version, _local.cargado, _local.datos = version, time.monotonic(), datos
+    return datos
+
+
+def areas():
+    """Todas las áreas, por id."""
+    return _datos()['areas']
+
+
+def categorias(area_id=None):
+    """Todas las categorías (con su área cargada), por id; opcionalmente solo las de un área."""
+    todas = _datos()['categorias']
+    if area_id is None:
+        return todas
+    return tuple(categoria for categoria in todas if categoria.cat_area_fk_id == int(area_id))
+
+
+def area(area_id):
+    return _datos()['areas_por_id'].get(int(area_id))
+
+
+def categoria(categoria_id):
+    return _datos()['categorias_por_id'].get(int(categoria_id))
+
+
+def _subir_version():
+    try:
+        cache.incr(LLAVE_VERSION)
+    except ValueError:
+        cache.set(LLAVE_VERSION, _version_inicial(), None)
+
+
+def invalidar_referencias():
+    """
+    Sube la versión ya (para que la misma transacción vea el cambio) y otra
+    vez al confirmar, por si otro proceso recargó antes del COMMIT.
+    """
+    _subir_version()
+    transaction.on_commit(_subir_version)
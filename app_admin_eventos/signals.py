@@ -0,0 +1,117 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from app_asistentes.models import AsistenteEvento
+from app_evaluadores.models import EvaluadorEvento
+from app_participantes.models import ParticipanteEvento
+from principal_eventos.cache_vistas import invalidar_catalogo, invalidar_eventos
+
+from .busqueda import indexar_eventos
+from .ingreso import TIPO_POR_MODELO
+from .inscripciones import retirar_inscripciones
+from .referencias import invalidar_referencias
+from .models import Area, Categoria, Evento, EventoCategoria
+
+
+CAMPOS_INDEXADOS = {'eve_nombre', 'eve_descripcion', 'eve_ciudad', 'eve_lugar'}
+
+
+@receiver(post_save, sender=Evento)
+def indexar_evento(sender, instance, update_fields=None, **kwargs):
+    if update_fields and not CAMPOS_INDEXADOS.intersection(update_fields):
+        return
+    indexar_eventos([instance.pk])
+
+
+@receiver(post_save, sender=EventoCategoria)
+@receiver(post_delete, sender=EventoCategoria)
+def indexar_categorias_evento(sender, instance, origin=None, **kwargs):
+    # Si se está eliminando el evento, sus términos caen en cascada con él
+    if isinstance(origin, Evento) or getattr(origin, 'model', None) is Evento:
+        return
+    indexar_eventos([instance.eve_cat_evento_fk_id])
+    invalidar_eventos([instance.eve_cat_evento_fk_id])
+
+
+@receiver(m2m_changed, sender=Evento.categorias.through)
+def indexar_categorias_m2m(sender, instance, action, reverse, pk_set, **kwargs):
+    # set()/add()/remove() sobre Evento.categorias no disparan post_save de EventoCategoria
+    if action in ('post_add', 'post_remove'):
+        ids = pk_set if reverse else [instance.pk]
+    elif action == 'post_clear' and not reverse:
+        ids = [instance.pk]
+    elif action == 'pre_clear' and reverse:
+        # Desde la categoría: después de limpiar ya no se sabe qué eventos tenía
+        instance._eventos_a_reindexar = list(
+            EventoCategoria.objects.filter(eve_cat_categoria_fk=instance).values_list('eve_cat_evento_fk', flat=True)
+        )
+        return
+    elif action == 'post_clear':
+        ids = getattr(instance, '_eventos_a_reindexar', [])
+    else:
+        return
+    indexar_eventos(ids)
+    invalidar_eventos(ids)
+
+
+@receiver(post_save, sender=Categoria)
+def indexar_eventos_categoria(sender, instance, created, **kwargs):
+    if not created:
+        ids = list(
+            EventoCategoria.objects.filter(eve_cat_categoria_fk=instance).values_list('eve_cat_evento_fk', flat=True)
+        )
+        indexar_eventos(ids)
+        invalidar_eventos(ids)
+
+
+@receiver(post_save, sender=Area)
+def indexar_eventos_area(sender, instance, created, **kwargs):
+    if not created:
+        ids = list(
+            EventoCategoria.objects.filter(eve_cat_categoria_fk__cat_area_fk=instance)
+            .values_list('eve_cat_evento_fk', flat=True).distinct()
+        )
+        indexar_eventos(ids)
+        invalidar_eventos(ids)
+
+
+########### CACHÉ DE PÁGINAS PÚBLICAS ###########
+# Las relaciones evento-categoría y los renombres ya invalidan arriba, junto
+# con el índice. Aquí va lo que solo afecta a la caché.
+
+@receiver(post_save, sender=Evento)
+@receiver(post_delete, sender=Evento)
+def invalidar_evento(sender, instance, **kwargs):
+    invalidar_eventos([instance.pk])
+
+
+@receiver(post_save, sender=Categoria)
+@receiver(post_delete, sender=Categoria)
+@receiver(post_save, sender=Area)
+@receiver(post_delete, sender=Area)
+def invalidar_filtros_catalogo(sender, **kwargs):
+    # Los selectores de área y categoría del catálogo cambian
+    invalidar_catalogo()
+
+
+########### DATOS DE REFERENCIA ###########
+@receiver(post_save, sender=Categoria)
+@receiver(post_delete, sender=Categoria)
+@receiver(post_save, sender=Area)
+@receiver(post_delete, sender=Area)
+def invalidar_areas_categorias(sender, **kwargs):
+    invalidar_referencias()
+
+
+########### ÍNDICE DE INSCRIPCIONES ###########
+# Las altas las indexa el save() de cada inscripción; aquí, las bajas
+# (también las que caen en cascada al borrar un perfil).
+
+@receiver(post_delete, sender=AsistenteEvento)
+@receiver(post_delete, sender=ParticipanteEvento)
+@receiver(post_delete, sender=EvaluadorEvento)
+def retirar_del_indice_inscripciones(sender, instance, origin=None, **kwargs):
+    # Si se está eliminando el evento, su índice cae en cascada con él
+    if isinstance(origin, Evento) or getattr(origin, 'model', None) is Evento:
+        return
+    retirar_inscripciones(TIPO_POR_MODELO[sender], [instance.pk])
@@ -0,0 +1,47 @@
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from app_admin_eventos.auditoria_indices import auditar, escaneos_completos
+
+
+class AuditoriaIndicesTestCase(TestCase):
+    """
+    EXPLAIN de las consultas frecuentes: los índices compuestos de las
+    migraciones deben convertir los recorridos completos en búsquedas.
+    """
+
+    def test_detecta_escaneos_en_cada_motor(self):
+        self.assertEqual(escaneos_completos("Seq Scan on app_admin_eventos_evento  (cost=0.00..1.05)", 'postgresql'), ['app_admin_eventos_evento'])
+        self.assertEqual(escaneos_completos("Index Scan using evento_estado_fin_idx on app_admin_eventos_evento", 'postgresql'), [])
+        self.assertEqual(escaneos_completos("1 SIMPLE app_usuarios_usuario None ALL None None None None 10 10.0 Using where", 'mysql'), ['app_usuarios_usuario'])
+        self.assertEqual(escaneos_completos("1 SIMPLE app_usuarios_usuario None ref usuario_email_idx usuario_email_idx 1022 const 1 100.0 None", 'mysql'), [])
+        self.assertEqual(escaneos_completos(
+            "1 PRIMARY app_admin_eventos_evento None ref evento_estado_fin_idx evento_estado_fin_idx 82 const 3 100.0 None\n"
+            "2 DEPENDENT SUBQUERY app_participantes_participanteevento None ALL None None None None 10 10.0 Using where",
+            'mysql',
+        ), ['app_participantes_participanteevento'])
+        self.assertEqual(escaneos_completos(json.dumps({'query_block': {
+            'table': {'table_name': 'app_admin_eventos_evento', 'access_type': 'ref'},
+            'select_list_subqueries': [{'dependent': True, 'query_block': {
+                'table': {'table_name': 'app_participantes_participanteevento', 'access_type': 'ALL'},
+            }}],
+        }}), 'mysql'), ['app_participantes_participanteevento'])
+        self.assertEqual(escaneos_completos("4 0 0 SCAN app_admin_eventos_evento\n28 0 0 USE TEMP B-TREE FOR ORDER BY", 'sqlite'), ['app_admin_eventos_evento'])
+        self.assertEqual(escaneos_completos("3 0 0 SEARCH app_usuarios_usuario USING INDEX usuario_email_idx (email=?)", 'sqlite'), [])
+
+    def test_consultas_indexadas_no_recorren_tablas(self):
+        resultado = {nombre: tablas for nombre, _, tablas in auditar()}
+        for nombre in (
+            'catalogo', 'ciclo_vida_finalizados', 'participantes_por_estado', 'miembros_proyecto',
+            'participantes_por_codigo', 'asistentes_por_estado', 'evaluadores_por_estado', 'usuario_por_email',
+        ):
+            self.assertEqual(resultado[nombre], [], nombre)
+
+    def test_comando_lista_cada_consulta(self):
+        salida = StringIO()
+        call_command('auditar_indices', '--planes', stdout=salida)
+        self.assertIn("participantes_por_codigo: usa índices", salida.getvalue())
+        self.assertIn("par_eve_codigo_proyecto_idx", salida.getvalue())
@@ -0,0 +1,175 @@
+import time
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from app_usuarios.models import Usuario, AdministradorEvento, Evaluador
+from app_admin_eventos.busqueda import buscar_eventos, normalizar, normalizar_ciudades, reindexar_todo, terminos
+from app_admin_eventos.filtros import condicion_filtros
+from app_admin_eventos.models import Area, Categoria, Evento, EventoCategoria, TerminoBusqueda
+from app_evaluadores.dashboard import eventos_evaluador
+from app_evaluadores.models import EvaluadorEvento
+from principal_eventos.catalogo import pagina_catalogo
+
+
+class BusquedaEventosTestCase(TestCase):
+    """
+    Búsqueda de eventos sobre el índice invertido TerminoBusqueda:
+    sin tildes, por prefijo, con todas las palabras y ordenada por relevancia.
+    """
+
+    def crear_evento(self, nombre, descripcion='Evento de prueba', ciudad='Manizales', lugar='Coliseo', estado='Publicado'):
+        return Evento.objects.create(
+            eve_nombre=nombre, eve_descripcion=descripcion, eve_ciudad=ciudad, eve_lugar=lugar,
+            eve_fecha_inicio=date.today(), eve_fecha_fin=date.today() + timedelta(days=1), eve_estado=estado,
+            eve_administrador_fk=self.admin_evento, eve_capacidad=10, eve_tienecosto='Es gratis',
+            eve_imagen='upload/eventos/imagen/img.jpg', eve_programacion='upload/eventos/programacion/prog.pdf',
+        )
+
+    def setUp(self):
+        usuario = Usuario.objects.create_user(
+            username="admin_busqueda", password="testpass123", email="admin_busqueda@test.com",
+            rol=Usuario.Roles.ADMIN_EVENTO, cedula="9920000001",
+        )
+        self.admin_evento, _ = AdministradorEvento.objects.get_or_create(usuario=usuario)
+
+    def test_normalizacion_en_espanol(self):
+        self.assertEqual(normalizar("Bogotá, CIÉNAGA y Peñalosa"), "bogota, cienaga y penalosa")
+        self.assertEqual(terminos("El Congreso de la Ingeniería en Bogotá"), ['congreso', 'ingenieria', 'bogota'])
+
+    def test_sin_tildes_y_por_prefijo(self):
+        evento = self.crear_evento("Feria de Ciencias", ciudad='Bogotá')
+
+        self.assertEqual(buscar_eventos("bogota"), [evento.id])
+        self.assertEqual(buscar_eventos("BOGOTÁ"), [evento.id])
+        self.assertEqual(buscar_eventos("cienc"), [evento.id])
+        self.assertEqual(buscar_eventos("de la"), [])
+
+    def test_todas_las_palabras_y_relevancia(self):
+        en_nombre = self.crear_evento("Robótica Educativa")
+        en_descripcion = self.crear_evento("Feria Escolar", descripcion="Talleres de robótica para colegios")
+        otra_ciudad = self.crear_evento("Robótica Avanzada", ciudad='Pereira')
+
+        # Nombre pesa más que descripción; los empates van del más reciente al más antiguo
+        self.assertEqual(buscar_eventos("robotica"), [otra_ciudad.id, en_nombre.id, en_descripcion.id])
+        self.assertEqual(buscar_eventos("robotica pereira"), [otra_ciudad.id])
+
+    def test_senales_mantienen_el_indice(self):
+        area = Area.objects.create(are_nombre="Tecnología", are_descripcion="Tecnología")
+        categoria = Categoria.objects.create(cat_nombre="Drones", cat_descripcion="Drones", cat_area_fk=area)
+        evento = self.crear_evento("Encuentro Anual")
+
+        EventoCategoria.objects.create(eve_cat_evento_fk=evento, eve_cat_categoria_fk=categoria)
+        self.assertEqual(buscar_eventos("drones"), [evento.id])
+        self.assertEqual(buscar_eventos("tecnologia"), [evento.id])
+
+        area.are_nombre = "Innovación"
+        area.save()
+        self.assertEqual(buscar_eventos("innovacion"), [evento.id])
+        self.assertEqual(buscar_eventos("tecnologia"), [])
+
+        evento.categorias.clear()
+        self.assertEqual(buscar_eventos("drones"), [])
+        evento.categorias.add(categoria)
+        self.assertEqual(buscar_eventos("drones"), [evento.id])
+
+        evento.eve_nombre = "Festival Nocturno"
+        evento.save()
+        self.assertEqual(buscar_eventos("festival"), [evento.id])
+        self.assertEqual(buscar_eventos("encuentro"), [])
+
+        evento.delete()
+        self.assertFalse(TerminoBusqueda.objects.exists())
+
+    def test_filtro_ciudad_sin_tildes_sobre_la_columna_normalizada(self):
+        bogota = self.crear_evento("Feria de Ciencias", ciudad='Bogotá D.C.')
+        self.crear_evento("Muestra de Arte", ciudad='Manizales', lugar='Plaza Bogotá')
+
+        for valor in ('bogota', 'BOGOTÁ', ' Bogo '):
+            with CaptureQueriesContext(connection) as consultas:
+                encontrados = list(Evento.objects.filter(condicion_filtros({'ciudad': valor})))
+            self.assertEqual(encontrados, [bogota])
+        self.assertIn("eve_ciudad_normalizada", consultas[0]['sql'])
+        self.assertNotIn("eve_ciudad\"", consultas[0]['sql'].split('WHERE')[1])
+
+        bogota.eve_ciudad = 'Medellín'
+        bogota.save(update_fields=['eve_ciudad'])
+        self.assertEqual(list(Evento.objects.filter(condicion_filtros({'ciudad': 'medellin'}))), [bogota])
+
+    def test_ciudades_de_cargas_masivas(self):
+        evento, = Evento.objects.bulk_create([Evento(
+            eve_nombre="Carga masiva", eve_descripcion="Evento", eve_ciudad='Cúcuta', eve_lugar='Coliseo',
+            eve_fecha_inicio=date.today(), eve_fecha_fin=date.today(), eve_estado='Publicado',
+            eve_administrador_fk=self.admin_evento, eve_capacidad=10, eve_tienecosto='Es gratis',
+            eve_imagen='img.jpg', eve_programacion='prog.pdf',
+        )])
+        self.assertFalse(Evento.objects.filter(condicion_filtros({'ciudad': 'cucuta'})).exists())
+
+        self.assertEqual(normalizar_ciudades(), 1)
+        self.assertEqual(normalizar_ciudades(), 0)
+        self.assertEqual(Evento.objects.get(condicion_filtros({'ciudad': 'cucuta'})).pk, evento.pk)
+
+    def test_catalogo_ordena_por_relevancia_y_pagina(self):
+        en_descripcion = self.crear_evento("Feria Escolar", descripcion="Muestra de teatro")
+        en_nombre = self.crear_evento("Teatro al Parque")
+        self.crear_evento("Teatro Cancelado", estado='Cancelado')
+
+        eventos, siguiente = pagina_catalogo({'nombre': 'teatro'}, tamano=1)
+        self.assertEqual(eventos, [en_nombre])
+        eventos, siguiente = pagina_catalogo({'nombre': 'teatro'}, siguiente, tamano=1)
+        self.assertEqual(eventos, [en_descripcion])
+        self.assertIsNone(siguiente)
+
+    @override_settings(BUSQUEDA_LIMITE=2)
+    def test_filtros_del_catalogo_van_antes_del_limite(self):
+        for numero in range(3):
+            self.crear_evento(f"Teatro Cancelado {numero}", estado='Cancelado')
+        self.crear_evento("Teatro en Cali", ciudad='Cali')
+        en_descripcion = self.crear_evento("Feria Escolar", descripcion="Muestra de teatro")
+
+        # Los cancelados y el de otra ciudad pesan más, pero no ocupan el límite
+        eventos, siguiente = pagina_catalogo({'nombre': 'teatro', 'ciudad': 'manizales'})
+        self.assertEqual((eventos, siguiente), ([en_descripcion], None))
+
+        with self.assertNumQueries(1):
+            ranking = buscar_eventos("teatro", eventos=Evento.objects.filter(eve_estado='Publicado'))
+        self.assertEqual(len(ranking), 2)
+
+    def test_dashboard_evaluador_usa_el_indice(self):
+        evaluador = Evaluador.objects.create(usuario=Usuario.objects.create_user(
+            username="eva_busqueda", password="testpass123", email="eva_busqueda@test.com",
+            rol=Usuario.Roles.EVALUADOR, cedula="9920000002",
+        ))
+        evento = self.crear_evento("Simposio de Química", ciudad='Medellín')
+        EvaluadorEvento.objects.create(eva_eve_evaluador_fk=evaluador, eva_eve_evento_fk=evento, eva_eve_estado='Aprobado')
+
+        self.assertEqual(eventos_evaluador(evaluador.id, {'nombre': 'quimica medellin'})[0], [evento])
+
+    def test_benchmark_una_consulta_sobre_miles_de_eventos(self):
+        palabras = ['ciencia', 'arte', 'musica', 'danza', 'robotica', 'teatro', 'cine', 'datos']
+        Evento.objects.bulk_create([
+            Evento(
+                eve_nombre=f"{palabras[i % 8].capitalize()} {palabras[(i * 3) % 8]} {i}",
+                eve_descripcion=f"Encuentro de {palabras[(i + 1) % 8]} y {palabras[(i + 2) % 8]} número {i}",
+                eve_ciudad=['Bogotá', 'Cali', 'Medellín'][i % 3], eve_lugar='Centro de Convenciones',
+                eve_fecha_inicio=date.today(), eve_fecha_fin=date.today(), eve_estado='Publicado',
+                eve_administrador_fk=self.admin_evento, eve_capacidad=10, eve_tienecosto='Es gratis',
+                eve_imagen='img.jpg', eve_programacion='prog.pdf',
+            )
+            for i in range(5000)
+        ])
+        self.assertEqual(reindexar_todo(), 5000)
+        call_command('reindexar_busqueda', stdout=StringIO())
+
+        with CaptureQueriesContext(connection) as consultas:
+            inicio = time.perf_counter()
+            resultados = buscar_eventos("robotica bogota")
+            duracion = time.perf_counter() - inicio
+
+        self.assertEqual(len(consultas), 1)
+        self.assertTrue(resultados)
+        self.assertLess(duracion, 0.5)
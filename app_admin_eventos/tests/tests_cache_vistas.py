@@ -0,0 +1,148 @@
+import re
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from app_usuarios.models import Usuario, AdministradorEvento
+from app_admin_eventos.ciclo_vida import avanzar_ciclo_vida
+from app_admin_eventos.models import Area, Categoria, Evento, EventoCategoria
+from principal_eventos.cache_vistas import estadisticas
+
+
+TOKEN_CSRF = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+
+class CacheVistasPublicasTestCase(TestCase):
+    """
+    Caché de páginas públicas para visitantes anónimos: aciertos, llaves por
+    evento y filtro, invalidación por señales y token CSRF por visitante.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        usuario = Usuario.objects.create_user(
+            username="admin_cache", password="testpass123", email="admin_cache@test.com",
+            rol=Usuario.Roles.ADMIN_EVENTO, cedula="9930000001",
+        )
+        self.admin_evento, _ = AdministradorEvento.objects.get_or_create(usuario=usuario)
+        self.area = Area.objects.create(are_nombre="Tecnología", are_descripcion="Área")
+        self.categoria = Categoria.objects.create(cat_nombre="Robótica", cat_descripcion="Cat", cat_area_fk=self.area)
+        self.evento = self.crear_evento("Feria de robots", ciudad="Manizales")
+        self.otro = self.crear_evento("Congreso de datos", ciudad="Pereira")
+        EventoCategoria.objects.create(eve_cat_evento_fk=self.evento, eve_cat_categoria_fk=self.categoria)
+
+    def crear_evento(self, nombre, ciudad, **campos):
+        return Evento.objects.create(
+            eve_nombre=nombre, eve_descripcion="Evento de prueba", eve_ciudad=ciudad, eve_lugar="Coliseo",
+            eve_fecha_inicio=date.today() + timedelta(days=10), eve_fecha_fin=date.today() + timedelta(days=12),
+            eve_estado=campos.pop('eve_estado', 'Publicado'), eve_imagen='upload/eventos/imagen/img.jpg',
+            eve_administrador_fk=self.admin_evento, eve_tienecosto='Es gratis', eve_capacidad=10,
+            eve_programacion='upload/eventos/programacion/prog.pdf', **campos,
+        )
+
+    def detalle(self, evento, client=None):
+        return (client or self.client).get(reverse('ver_info_evento', args=[evento.id]))
+
+    def test_segunda_visita_sale_de_cache_sin_consultas(self):
+        primera = self.detalle(self.evento)
+        self.assertEqual(primera.status_code, 200)
+        self.assertEqual(primera['X-Cache'], 'MISS')
+
+        with CaptureQueriesContext(connection) as consultas:
+            segunda = self.detalle(self.evento)
+        self.assertEqual(segunda['X-Cache'], 'HIT')
+        self.assertEqual(len(consultas), 0)
+        self.assertContains(segunda, "Feria de robots")
+
+    def test_editar_evento_invalida_solo_su_detalle(self):
+        self.detalle(self.evento)
+        self.detalle(self.otro)
+
+        self.evento.eve_nombre = "Feria de drones"
+        self.evento.save()
+
+        respuesta = self.detalle(self.evento)
+        self.assertEqual(respuesta['X-Cache'], 'MISS')
+        self.assertContains(respuesta, "Feria de drones")
+        self.assertEqual(self.detalle(self.otro)['X-Cache'], 'HIT')
+
+    def test_pagina_guardada_antes_del_commit_se_descarta(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.evento.eve_nombre = "Feria de drones"
+            self.evento.save()
+            # Una petición concurrente guarda la página antes del COMMIT del editor
+            self.assertEqual(self.detalle(self.evento)['X-Cache'], 'MISS')
+            self.assertEqual(self.detalle(self.evento)['X-Cache'], 'HIT')
+        self.assertEqual(self.detalle(self.evento)['X-Cache'], 'MISS')
+
+    def test_renombrar_categoria_invalida_sus_eventos(self):
+        self.detalle(self.evento)
+        self.detalle(self.otro)
+
+        self.categoria.cat_nombre = "Mecatrónica"
+        self.categoria.save()
+
+        self.assertEqual(self.detalle(self.evento)['X-Cache'], 'MISS')
+        self.assertEqual(self.detalle(self.otro)['X-Cache'], 'HIT')
+
+    def test_catalogo_guarda_una_pagina_por_combinacion_de_filtros(self):
+        url = reverse('pagina_principal')
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+        filtrada = self.client.get(url, {'ciudad': 'Pereira'})
+        self.assertEqual(filtrada['X-Cache'], 'MISS')
+        self.assertNotIn(self.evento, filtrada.context['eventos'])
+        self.assertEqual(self.client.get(url, {'ciudad': 'Pereira'})['X-Cache'], 'HIT')
+
+    def test_catalogo_se_invalida_con_eventos_y_areas(self):
+        url = reverse('catalogo_eventos')
+        self.client.get(url)
+        self.crear_evento("Hackatón", ciudad="Cali")
+        respuesta = self.client.get(url)
+        self.assertEqual(respuesta['X-Cache'], 'MISS')
+        self.assertIn("Hackatón", [evento['nombre'] for evento in respuesta.json()['eventos']])
+
+        Area.objects.create(are_nombre="Salud", are_descripcion="Área")
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+
+    def test_cambios_del_ciclo_de_vida_invalidan_aunque_no_haya_senales(self):
+        terminado = self.crear_evento("Evento pasado", ciudad="Manizales")
+        Evento.objects.filter(pk=terminado.pk).update(eve_fecha_fin=date.today() - timedelta(days=1))
+        self.assertContains(self.detalle(terminado), "Publicado")
+
+        avanzar_ciclo_vida()
+
+        respuesta = self.detalle(terminado)
+        self.assertEqual(respuesta['X-Cache'], 'MISS')
+        self.assertContains(respuesta, "Finalizado")
+
+    def test_cada_visitante_recibe_su_token_csrf(self):
+        primera = self.detalle(self.evento)
+        token_primero = TOKEN_CSRF.search(primera.content.decode()).group(1)
+
+        otro_visitante = Client()
+        segunda = self.detalle(self.evento, otro_visitante)
+        self.assertEqual(segunda['X-Cache'], 'HIT')
+        token_segundo = TOKEN_CSRF.search(segunda.content.decode()).group(1)
+        self.assertNotEqual(token_primero, token_segundo)
+        self.assertNotIn('__token_csrf__', token_segundo)
+        self.assertIn('csrftoken', segunda.cookies)
+
+    def test_contadores_y_comando(self):
+        self.detalle(self.evento)
+        self.detalle(self.evento)
+        self.detalle(self.evento)
+        self.assertEqual(estadisticas()['detalle_evento'], {'aciertos': 2, 'fallos': 1})
+
+        salida = StringIO()
+        call_command('estadisticas_cache', '--reiniciar', stdout=salida)
+        self.assertIn("detalle_evento: 2 aciertos, 1 fallos", salida.getvalue())
+        self.assertEqual(estadisticas()['detalle_evento'], {'aciertos': 0, 'fallos': 0})
@@ -0,0 +1,130 @@
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from app_usuarios.models import Usuario, AdministradorEvento
+from app_admin_eventos.busqueda import normalizar_ciudad
+from app_admin_eventos.models import Area, Categoria, Evento, EventoCategoria
+from principal_eventos.catalogo import TAMANO_PAGINA, leer_cursor, pagina_catalogo
+
+
+class CatalogoPublicoTestCase(TestCase):
+    """
+    Catálogo público paginado por llave (eve_fecha_inicio, id) y su
+    variante JSON para el scroll infinito.
+    """
+
+    def crear_eventos(self, cantidad, **campos):
+        """Eventos en bloque, un día de diferencia entre cada uno (sin subir archivos)."""
+        datos = {
+            'eve_descripcion': 'Evento de prueba', 'eve_ciudad': 'Manizales', 'eve_lugar': 'Coliseo',
+            'eve_fecha_fin': date.today() + timedelta(days=400), 'eve_estado': 'Publicado',
+            'eve_capacidad': 10, 'eve_tienecosto': 'Es gratis',
+            'eve_imagen': 'upload/eventos/imagen/img.jpg', 'eve_programacion': 'upload/eventos/programacion/prog.pdf',
+            **campos,
+        }
+        fecha = datos.pop('eve_fecha_inicio', None)
+        inicio = Evento.objects.count()
+        # bulk_create no pasa por Evento.save(): la ciudad normalizada se llena aquí
+        return Evento.objects.bulk_create([
+            Evento(
+                eve_nombre=f"Evento {inicio + i}", eve_administrador_fk=self.admin_evento,
+                eve_ciudad_normalizada=normalizar_ciudad(datos['eve_ciudad']),
+                eve_fecha_inicio=fecha or date.today() + timedelta(days=inicio + i), **datos,
+            )
+            for i in range(cantidad)
+        ])
+
+    def setUp(self):
+        # bulk_create no dispara señales: la caché de páginas no se entera de estos eventos
+        cache.clear()
+        self.client = Client()
+        usuario = Usuario.objects.create_user(
+            username="admin_catalogo", password="testpass123", email="admin_catalogo@test.com",
+            rol=Usuario.Roles.ADMIN_EVENTO, cedula="9900000001",
+        )
+        self.admin_evento, _ = AdministradorEvento.objects.get_or_create(usuario=usuario)
+
+    def recorrer(self, parametros=None, tamano=TAMANO_PAGINA):
+        vistos, cursor = [], None
+        while True:
+            eventos, cursor = pagina_catalogo(parametros, cursor, tamano)
+            vistos += eventos
+            if not cursor:
+                return vistos
+
+    def test_recorrido_completo_sin_repetidos_ni_faltantes(self):
+        self.crear_eventos(30)
+        # Varios eventos el mismo día: el id desempata
+        self.crear_eventos(7, eve_fecha_inicio=date.today() + timedelta(days=10))
+        self.crear_eventos(2, eve_estado='Cancelado')
+
+        vistos = self.recorrer(tamano=5)
+
+        esperados = list(
+            Evento.objects.exclude(eve_estado='Cancelado').order_by('-eve_fecha_inicio', '-id').values_list('id', flat=True)
+        )
+        self.assertEqual([evento.id for evento in vistos], esperados)
+
+    def test_filtros_y_categorias_sin_duplicados(self):
+        area = Area.objects.create(are_nombre="Arte", are_descripcion="Arte")
+        pintura = Categoria.objects.create(cat_nombre="Pintura", cat_descripcion="Pintura", cat_area_fk=area)
+        danza = Categoria.objects.create(cat_nombre="Danza", cat_descripcion="Danza", cat_area_fk=area)
+        evento, _ = self.crear_eventos(2)
+        pago, = self.crear_eventos(1, eve_tienecosto='De pago', eve_ciudad='Pereira')
+        EventoCategoria.objects.create(eve_cat_evento_fk=evento, eve_cat_categoria_fk=pintura)
+        EventoCategoria.objects.create(eve_cat_evento_fk=evento, eve_cat_categoria_fk=danza)
+
+        self.assertEqual(self.recorrer({'area': str(area.id)}), [evento])
+        self.assertEqual(self.recorrer({'categoria': str(danza.id)}), [evento])
+        self.assertEqual(self.recorrer({'costo': 'De pago'}), [pago])
+        self.assertEqual(self.recorrer({'ciudad': 'pere'}), [pago])
+        self.assertEqual(len(self.recorrer({'area': 'x'})), 3)
+
+    def test_cursor_invalido_empieza_desde_el_inicio(self):
+        self.crear_eventos(3)
+        self.assertIsNone(leer_cursor('no-es-un-cursor'))
+        self.assertEqual(len(pagina_catalogo({}, 'no-es-un-cursor')[0]), 3)
+
+    def test_paginas_profundas_cuestan_lo_mismo(self):
+        self.crear_eventos(TAMANO_PAGINA * 20)
+        categoria = Categoria.objects.create(
+            cat_nombre="Ciencia", cat_descripcion="Ciencia",
+            cat_area_fk=Area.objects.create(are_nombre="Ciencia", are_descripcion="Ciencia"),
+        )
+        EventoCategoria.objects.bulk_create([
+            EventoCategoria(eve_cat_evento_fk=evento, eve_cat_categoria_fk=categoria) for evento in Evento.objects.all()
+        ])
+
+        with CaptureQueriesContext(connection) as primera:
+            _, cursor = pagina_catalogo()
+        for _ in range(15):
+            _, cursor = pagina_catalogo(cursor=cursor)
+        with CaptureQueriesContext(connection) as profunda:
+            eventos, _ = pagina_catalogo(cursor=cursor)
+            [list(evento.categorias.all()) for evento in eventos]
+
+        # Eventos + categorías precargadas, sin OFFSET
+        self.assertEqual(len(primera), 2)
+        self.assertEqual(len(profunda), 2)
+        self.assertNotIn('OFFSET', profunda[0]['sql'].upper())
+
+    def test_pagina_principal_y_json_de_scroll(self):
+        self.crear_eventos(TAMANO_PAGINA + 3)
+
+        response = self.client.get(reverse('pagina_principal'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['eventos']), TAMANO_PAGINA)
+        self.assertContains(response, 'id="catalogo-siguiente"')
+
+        response = self.client.get(reverse('catalogo_eventos'), {'cursor': response.context['siguiente_cursor']})
+        datos = response.json()
+        self.assertEqual(len(datos['eventos']), 3)
+        self.assertIsNone(datos['siguiente'])
+        primero = datos['eventos'][0]
+        self.assertEqual(primero['url'], reverse('ver_info_evento', args=[primero['id']]))
+        self.assertEqual(set(primero), {'id', 'nombre', 'imagen', 'estado', 'fecha_inicio', 'ciudad', 'lugar', 'categorias', 'url'})
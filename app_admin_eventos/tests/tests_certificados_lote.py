@@ -0,0 +1,271 @@
+import shutil
+import tempfile
+from datetime import date, timedelta
+from io import BytesIO
+from unittest import mock
+
+from pypdf import PdfReader
+
+from django.core import mail
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from app_usuarios.models import Usuario, AdministradorEvento, Asistente
+from app_admin_eventos.models import Evento, LoteCertificados, CertificadoGenerado
+from app_admin_eventos.certificados import compilar_plantilla, procesar_lotes_pendientes
+from app_admin_eventos.pdf_worker import certificado_a_pdf
+from app_asistentes.models import AsistenteEvento
+
+
+MEDIA_TEMPORAL = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_TEMPORAL, CERTIFICADOS_PROCESOS=1)
+class CertificadosBaseTestCase(TestCase):
+    """
+    Evento finalizado con tres asistentes inscritos y sesión de administrador.
+    """
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_TEMPORAL, ignore_errors=True)
+
+    def setUp(self):
+        self.client = Client()
+        hoy = date.today()
+
+        user_admin = Usuario.objects.create_user(
+            username="admin_cert", password="testpass123", email="admin_cert@test.com",
+            rol=Usuario.Roles.ADMIN_EVENTO, cedula="1000000001",
+        )
+        self.admin_evento, _ = AdministradorEvento.objects.get_or_create(usuario=user_admin)
+
+        self.evento = Evento.objects.create(
+            eve_nombre='Congreso de Certificados',
+            eve_descripcion='Evento de prueba',
+            eve_ciudad='Manizales',
+            eve_lugar='Auditorio',
+            eve_fecha_inicio=hoy - timedelta(days=3),
+            eve_fecha_fin=hoy - timedelta(days=1),
+            eve_estado='Finalizado',
+            eve_administrador_fk=self.admin_evento,
+            eve_capacidad=100,
+            eve_tienecosto='No',
+            eve_imagen=SimpleUploadedFile("img.jpg", b"imgcontent", content_type="image/jpeg"),
+            eve_programacion=SimpleUploadedFile("prog.pdf", b"progcontent", content_type="application/pdf"),
+        )
+
+        self.asistentes = []
+        for i in range(3):
+            asistente = Asistente.objects.create(
+                usuario=Usuario.objects.create_user(
+                    username=f"asist_cert_{i}", password="testpass123", email=f"asist_cert_{i}@test.com",
+                    rol=Usuario.Roles.ASISTENTE, first_name="Asistente", last_name=f"N{i}",
+                    cedula=f"20000000{i}",
+                )
+            )
+            AsistenteEvento.objects.create(
+                asi_eve_asistente_fk=asistente,
+                asi_eve_evento_fk=self.evento,
+                asi_eve_fecha_hora=timezone.now(),
+                asi_eve_estado='Aprobado',
+                asi_eve_clave=f"CLAVE{i}",
+            )
+            self.asistentes.append(asistente)
+
+        session = self.client.session
+        session['admin_id'] = self.admin_evento.pk
+        session.save()
+
+    def crear_lote(self):
+        return LoteCertificados.objects.create(
+            lot_evento_fk=self.evento,
+            lot_tipo=LoteCertificados.Tipos.ASISTENTES,
+            lot_personas=[a.pk for a in self.asistentes],
+            lot_total=len(self.asistentes),
+        )
+
+
+class LoteCertificadosTestCase(CertificadosBaseTestCase):
+    """
+    Casos de prueba para la generación masiva de certificados por lotes.
+    """
+
+    def test_post_crea_lote_sin_renderizar(self):
+        """La vista solo registra el lote; no genera PDF dentro de la petición"""
+        url = reverse('certificados_admin', args=[self.evento.id])
+        with mock.patch('app_admin_eventos.certificados.certificado_a_pdf') as render:
+            response = self.client.post(url, {
+                'tipo_persona': 'asistentes',
+                'personas': [a.pk for a in self.asistentes],
+            })
+
+        self.assertRedirects(response, url, fetch_redirect_response=False)
+        render.assert_not_called()
+        lote = LoteCertificados.objects.get()
+        self.assertEqual(lote.lot_estado, LoteCertificados.Estados.PENDIENTE)
+        self.assertEqual(lote.lot_total, 3)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_post_tipo_invalido(self):
+        response = self.client.post(reverse('certificados_admin', args=[self.evento.id]), {
+            'tipo_persona': 'otros', 'personas': [1],
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(LoteCertificados.objects.exists())
+
+    def test_procesar_lote_guarda_y_envia(self):
+        lote = self.crear_lote()
+
+        procesar_lotes_pendientes()
+
+        lote.refresh_from_db()
+        self.assertEqual(lote.lot_estado, LoteCertificados.Estados.COMPLETADO)
+        self.assertEqual(lote.lot_generados, 3)
+        self.assertEqual(lote.porcentaje, 100)
+        self.assertEqual(CertificadoGenerado.objects.filter(cer_evento_fk=self.evento).count(), 3)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(mail.outbox[0].attachments[0][2], "application/pdf")
+        # El saludo usa el primer nombre; el nombre completo queda para el PDF y el archivo
+        self.assertTrue(mail.outbox[0].body.startswith("Hola Asistente,\n"))
+        self.assertIn(str(self.asistentes[0]).replace(' ', '_'), mail.outbox[0].attachments[0][0])
+
+        certificado = CertificadoGenerado.objects.first()
+        with certificado.cer_archivo.open('rb') as archivo:
+            self.assertTrue(archivo.read().startswith(b"%PDF"))
+
+    def test_error_individual_no_detiene_el_lote(self):
+        lote = self.crear_lote()
+        respuestas = [(b"%PDF-1.4 a", None), (None, "fallo"), (b"%PDF-1.4 c", None)]
+
+        with mock.patch('app_admin_eventos.certificados.certificado_a_pdf', side_effect=respuestas):
+            procesar_lotes_pendientes()
+
+        lote.refresh_from_db()
+        self.assertEqual(lote.lot_estado, LoteCertificados.Estados.COMPLETADO)
+        self.assertEqual(lote.lot_generados, 2)
+        self.assertEqual(lote.lot_errores, 1)
+
+    @override_settings(CERTIFICADOS_BLOQUEO=600)
+    def test_retoma_lote_abandonado_a_mitad(self):
+        abandonado = self.crear_lote()
+        en_curso = self.crear_lote()
+        LoteCertificados.objects.filter(pk=abandonado.pk).update(
+            lot_estado=LoteCertificados.Estados.PROCESANDO, lot_iniciado_en=timezone.now() - timedelta(minutes=11),
+        )
+        LoteCertificados.objects.filter(pk=en_curso.pk).update(
+            lot_estado=LoteCertificados.Estados.PROCESANDO, lot_iniciado_en=timezone.now() - timedelta(minutes=5),
+        )
+
+        procesados = procesar_lotes_pendientes()
+
+        self.assertEqual([lote.pk for lote in procesados], [abandonado.pk])
+        abandonado.refresh_from_db()
+        en_curso.refresh_from_db()
+        self.assertEqual(abandonado.lot_estado, LoteCertificados.Estados.COMPLETADO)
+        self.assertEqual(abandonado.lot_generados, 3)
+        self.assertEqual(en_curso.lot_estado, LoteCertificados.Estados.PROCESANDO)
+
+    def test_reenviar_usa_archivo_guardado(self):
+        self.crear_lote()
+        procesar_lotes_pendientes()
+        mail.outbox.clear()
+        certificado = CertificadoGenerado.objects.first()
+
+        with mock.patch('app_admin_eventos.certificados.certificado_a_pdf') as render:
+            response = self.client.post(
+                reverse('reenviar_certificado', args=[self.evento.id, certificado.id])
+            )
+
+        self.assertEqual(response.status_code, 302)
+        render.assert_not_called()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, [certificado.cer_correo])
+
+    def test_regenerar_reemplaza_certificado(self):
+        self.crear_lote()
+        procesar_lotes_pendientes()
+        self.crear_lote()
+        procesar_lotes_pendientes()
+
+        self.assertEqual(CertificadoGenerado.objects.count(), 3)
+
+    def test_progreso_json(self):
+        lote = self.crear_lote()
+        url = reverse('progreso_certificados', args=[self.evento.id, lote.id])
+
+        data = self.client.get(url).json()
+        self.assertEqual(data['estado'], 'Pendiente')
+        self.assertFalse(data['terminado'])
+
+        procesar_lotes_pendientes()
+        data = self.client.get(url).json()
+        self.assertEqual(data['generados'], 3)
+        self.assertEqual(data['porcentaje'], 100)
+        self.assertTrue(data['terminado'])
+
+    def test_get_muestra_lotes_y_certificados(self):
+        self.crear_lote()
+        procesar_lotes_pendientes()
+
+        response = self.client.get(reverse('certificados_admin', args=[self.evento.id]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['lotes']), 1)
+        self.assertContains(response, 'Reenviar')
+
+    def test_pool_de_procesos(self):
+        """Con varios procesos el resultado es el mismo que en serie"""
+        lote = self.crear_lote()
+
+        procesar_lotes_pendientes(procesos=2)
+
+        lote.refresh_from_db()
+        self.assertEqual(lote.lot_generados, 3)
+        self.assertEqual(lote.lot_errores, 0)
+
+
+class PlantillaCertificadoTestCase(CertificadosBaseTestCase):
+    """
+    Casos de prueba del motor reportlab con capa fija compilada por evento.
+    """
+
+    def texto_pdf(self, pdf):
+        return PdfReader(BytesIO(pdf)).pages[0].extract_text()
+
+    def test_pdf_contiene_textos_de_la_plantilla(self):
+        plantilla = compilar_plantilla(self.evento, LoteCertificados.Tipos.ASISTENTES)
+        pdf, error = certificado_a_pdf("Ana María Gómez", plantilla)
+
+        self.assertIsNone(error)
+        texto = self.texto_pdf(pdf)
+        self.assertIn("CERTIFICADO", texto)
+        self.assertIn("DE ASISTENCIA", texto)
+        self.assertIn("Ana María Gómez", texto)
+        self.assertIn("Congreso de Certificados", texto)
+        self.assertIn("Firma Director", texto)
+
+    def test_textos_por_tipo(self):
+        pdf, _ = certificado_a_pdf("X", compilar_plantilla(self.evento, LoteCertificados.Tipos.EVALUADORES))
+        self.assertIn("DE RECONOCIMIENTO", self.texto_pdf(pdf))
+
+        pdf, _ = certificado_a_pdf("X", compilar_plantilla(self.evento, LoteCertificados.Tipos.PARTICIPANTES))
+        self.assertIn("DE PARTICIPACIÓN", self.texto_pdf(pdf))
+
+    def test_plantilla_se_compila_una_vez_por_evento(self):
+        primera = compilar_plantilla(self.evento, LoteCertificados.Tipos.ASISTENTES)
+        self.assertIs(primera, compilar_plantilla(self.evento, LoteCertificados.Tipos.ASISTENTES))
+
+        # Si cambia un dato impreso del evento la plantilla se recompila
+        self.evento.eve_lugar = "Teatro Principal"
+        self.assertIsNot(primera, compilar_plantilla(self.evento, LoteCertificados.Tipos.ASISTENTES))
+
+    def test_nombre_largo_se_ajusta_al_ancho(self):
+        plantilla = compilar_plantilla(self.evento, LoteCertificados.Tipos.ASISTENTES)
+        pdf, error = certificado_a_pdf("Nombre " * 30, plantilla)
+
+        self.assertIsNone(error)
+        self.assertTrue(pdf.startswith(b"%PDF"))
@@ -0,0 +1,173 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from django.utils import timezone
+
+from app_usuarios.models import Usuario, AdministradorEvento, Asistente, Evaluador, Participante
+from app_admin_eventos.ciclo_vida import avanzar_ciclo_vida, eliminar_eventos
+from app_admin_eventos.models import Evento, InscripcionEvento
+from app_asistentes.models import AsistenteEvento
+from app_evaluadores.models import EvaluadorEvento, PosicionRanking
+from app_evaluadores.ranking import actualizar_ranking
+from app_participantes.models import ParticipanteEvento
+
+
+HOY = date(2025, 6, 15)
+
+
+@override_settings(EVENTOS_DIAS_CIERRE=7, EVENTOS_DIAS_ELIMINACION=30)
+class CicloVidaEventosTestCase(TestCase):
+    """
+    Transiciones Publicado -> Finalizado -> Cerrado -> eliminado aplicadas
+    en bloque por el comando programado, fuera de la página principal.
+    """
+
+    def crear_evento(self, nombre, estado, dias_desde_fin):
+        fin = HOY - timedelta(days=dias_desde_fin)
+        return Evento.objects.create(
+            eve_nombre=nombre, eve_descripcion='Evento de prueba', eve_ciudad='Manizales', eve_lugar='Coliseo',
+            eve_fecha_inicio=fin - timedelta(days=1), eve_fecha_fin=fin, eve_estado=estado,
+            eve_administrador_fk=self.admin_evento, eve_capacidad=10, eve_tienecosto='Es gratis',
+            eve_imagen='upload/eventos/imagen/img.jpg', eve_programacion='upload/eventos/programacion/prog.pdf',
+        )
+
+    def estado(self, evento):
+        return Evento.objects.filter(pk=evento.pk).values_list('eve_estado', flat=True).first()
+
+    def setUp(self):
+        usuario = Usuario.objects.create_user(
+            username="admin_ciclo", password="testpass123", email="admin_ciclo@test.com",
+            rol=Usuario.Roles.ADMIN_EVENTO, cedula="9910000001",
+        )
+        self.admin_evento, _ = AdministradorEvento.objects.get_or_create(usuario=usuario)
+
+    def test_transiciones_por_fecha(self):
+        en_curso = self.crear_evento("En curso", 'Publicado', -2)
+        termina_hoy = self.crear_evento("Termina hoy", 'Publicado', 0)
+        reciente = self.crear_evento("Reciente", 'Finalizado', 3)
+        para_cerrar = self.crear_evento("Para cerrar", 'Finalizado', 8)
+        cerrado = self.crear_evento("Cerrado reciente", 'Cerrado', 20)
+        para_eliminar = self.crear_evento("Para eliminar", 'Cerrado', 31)
+        cancelado = self.crear_evento("Cancelado", 'Cancelado', 90)
+
+        resultado = avanzar_ciclo_vida(hoy=HOY)
+
+        self.assertEqual(resultado, {'finalizados': 1, 'cerrados': 1, 'eliminados': 1})
+        self.assertEqual(self.estado(en_curso), 'Publicado')
+        self.assertEqual(self.estado(termina_hoy), 'Finalizado')
+        self.assertEqual(self.estado(reciente), 'Finalizado')
+        self.assertEqual(self.estado(para_cerrar), 'Cerrado')
+        self.assertEqual(self.estado(cerrado), 'Cerrado')
+        self.assertIsNone(self.estado(para_eliminar))
+        self.assertEqual(self.estado(cancelado), 'Cancelado')
+
+    def test_idempotente_y_en_bloque(self):
+        for i in range(20):
+            self.crear_evento(f"Viejo {i}", 'Publicado', 10)
+
+        with CaptureQueriesContext(connection) as consultas:
+            primero = avanzar_ciclo_vida(hoy=HOY)
+        segundo = avanzar_ciclo_vida(hoy=HOY)
+
+        # Un evento olvidado avanza varios pasos en la misma ejecución
+        self.assertEqual(primero, {'finalizados': 20, 'cerrados': 20, 'eliminados': 0})
+        self.assertEqual(segundo, {'finalizados': 0, 'cerrados': 0, 'eliminados': 0})
+        self.assertEqual(sum(1 for q in consultas.captured_queries if q['sql'].startswith('UPDATE')), 2)
+
+    def test_simular_no_modifica(self):
+        evento = self.crear_evento("Viejo", 'Publicado', 1)
+
+        resultado = avanzar_ciclo_vida(hoy=HOY, simular=True)
+
+        self.assertEqual(resultado['finalizados'], 1)
+        self.assertEqual(self.estado(evento), 'Publicado')
+
+    def test_comando(self):
+        self.crear_evento("Futuro", 'Publicado', -5000)
+        salida = StringIO()
+        call_command('ciclo_eventos', stdout=salida)
+        self.assertIn('0 finalizados', salida.getvalue())
+
+    def test_pagina_principal_solo_lee(self):
+        self.crear_evento("Viejo", 'Publicado', 1)
+
+        with CaptureQueriesContext(connection) as consultas:
+            response = Client().get(reverse('pagina_principal'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([q for q in consultas.captured_queries if q['sql'].startswith('UPDATE "app_admin_eventos')])
+
+    def test_acciones_admin_en_bloque(self):
+        superusuario = Usuario.objects.create_superuser(
+            username="root_ciclo", password="testpass123", email="root_ciclo@test.com", cedula="9910000002",
+        )
+        client = Client()
+        client.force_login(superusuario)
+        vencido = self.crear_evento("Vencido", 'Finalizado', 400)
+        futuro = self.crear_evento("Futuro", 'Publicado', -5000)
+        url = reverse('admin:app_admin_eventos_evento_changelist')
+
+        client.post(url, {'action': 'cerrar_eventos_vencidos', '_selected_action': [vencido.pk, futuro.pk]})
+        self.assertEqual(self.estado(vencido), 'Cerrado')
+        self.assertEqual(self.estado(futuro), 'Publicado')
+
+        client.post(url, {'action': 'eliminar_eventos_pasados', '_selected_action': [vencido.pk, futuro.pk]})
+        self.assertIsNone(self.estado(vencido))
+        self.assertEqual(self.estado(futuro), 'Publicado')
+
+    def inscribir(self, evento, asistentes):
+        """Un grupo (líder y miembro) con ranking, un evaluador y `asistentes` asistentes."""
+        for numero in range(asistentes):
+            usuario = Usuario.objects.create_user(
+                username=f"asi_{evento.pk}_{numero}", password="x", cedula=f"99505{evento.pk:02d}{numero:03d}",
+            )
+            AsistenteEvento.objects.create(
+                asi_eve_asistente_fk=Asistente.objects.create(usuario=usuario), asi_eve_evento_fk=evento,
+                asi_eve_fecha_hora=timezone.now(), asi_eve_estado='Aprobado', asi_eve_clave='',
+            )
+        lider, miembro = (
+            Participante.objects.create(usuario=Usuario.objects.create_user(
+                username=f"{rol}_{evento.pk}", password="x", cedula=f"99505{evento.pk:02d}9{sufijo}",
+            ))
+            for sufijo, rol in ((90, "lider"), (91, "miembro"))
+        )
+        principal = ParticipanteEvento.objects.create(
+            par_eve_participante_fk=lider, par_eve_evento_fk=evento, par_eve_estado='Aprobado', par_eve_es_grupo=True,
+        )
+        secundario = ParticipanteEvento.objects.create(
+            par_eve_participante_fk=miembro, par_eve_evento_fk=evento, par_eve_estado='Aprobado',
+            par_eve_proyecto_principal=principal,
+        )
+        actualizar_ranking(evento.pk, {principal.pk: 80, secundario.pk: 80})
+        EvaluadorEvento.objects.create(
+            eva_eve_evaluador_fk=Evaluador.objects.create(usuario=Usuario.objects.create_user(
+                username=f"eva_{evento.pk}", password="x", cedula=f"99505{evento.pk:02d}992",
+            )),
+            eva_eve_evento_fk=evento, eva_eve_estado='Aprobado',
+        )
+
+    def test_eliminar_no_carga_las_inscripciones(self):
+        pequeno = self.crear_evento("Pequeño", 'Cerrado', 31)
+        grande = self.crear_evento("Grande", 'Cerrado', 31)
+        conservado = self.crear_evento("Conservado", 'Cerrado', 20)
+        for evento, asistentes in ((pequeno, 1), (grande, 150), (conservado, 1)):
+            self.inscribir(evento, asistentes)
+
+        with CaptureQueriesContext(connection) as uno:
+            self.assertEqual(eliminar_eventos([pequeno.pk]), 1)
+        with CaptureQueriesContext(connection) as muchos:
+            self.assertEqual(eliminar_eventos([grande.pk]), 1)
+
+        # Un DELETE por tabla: el costo no crece con el tamaño del evento
+        self.assertEqual(len(uno), len(muchos))
+        self.assertEqual(set(AsistenteEvento.objects.values_list('asi_eve_evento_fk', flat=True)), {conservado.pk})
+        self.assertEqual(set(ParticipanteEvento.objects.values_list('par_eve_evento_fk', flat=True)), {conservado.pk})
+        self.assertEqual(set(EvaluadorEvento.objects.values_list('eva_eve_evento_fk', flat=True)), {conservado.pk})
+        self.assertEqual(set(PosicionRanking.objects.values_list('pos_evento_fk', flat=True)), {conservado.pk})
+        self.assertEqual(set(InscripcionEvento.objects.values_list('ins_evento_fk', flat=True)), {conservado.pk})
@@ -0,0 +1,143 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core import mail
+from django.core.mail import EmailMessage, EmailMultiAlternatives, send_mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from app_admin_eventos.correos import calcular_espera, procesar_cola
+from app_admin_eventos.models import AdjuntoCorreo, CorreoPendiente
+from app_usuarios.models import Usuario
+
+
+@override_settings(
+    EMAIL_BACKEND='app_admin_eventos.correos.ColaCorreosBackend',
+    COLA_CORREOS_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    COLA_CORREOS_MAX_INTENTOS=3,
+    COLA_CORREOS_ESPERA_BASE=60,
+    COLA_CORREOS_LOTE=50,
+)
+class ColaCorreosTestCase(TestCase):
+    """
+    Casos de prueba para la cola de correos asíncrona y su worker.
+    """
+
+    def test_send_mail_solo_encola(self):
+        """Las vistas no envían: el correo queda pendiente en la BD"""
+        send_mail("Asunto", "Cuerpo", "noreply@test.com", ["a@test.com"])
+
+        self.assertEqual(len(mail.outbox), 0)
+        correo = CorreoPendiente.objects.get()
+        self.assertEqual(correo.cor_estado, CorreoPendiente.Estados.PENDIENTE)
+        self.assertEqual(correo.cor_destinatarios, ["a@test.com"])
+
+    def test_worker_envia_html_y_adjuntos(self):
+        """El worker reconstruye el mensaje con alternativas y adjuntos"""
+        mensaje = EmailMultiAlternatives("Certificado", "texto", "noreply@test.com", ["b@test.com"])
+        mensaje.attach_alternative("<b>html</b>", "text/html")
+        mensaje.attach("certificado.pdf", b"%PDF-1.4", "application/pdf")
+        mensaje.send()
+
+        resultado = procesar_cola()
+
+        self.assertEqual(resultado['enviados'], 1)
+        self.assertEqual(len(mail.outbox), 1)
+        enviado = mail.outbox[0]
+        self.assertEqual(enviado.alternatives[0][1], "text/html")
+        self.assertEqual(enviado.attachments[0][0], "certificado.pdf")
+        self.assertEqual(enviado.attachments[0][1], b"%PDF-1.4")
+
+        correo = CorreoPendiente.objects.get()
+        self.assertEqual(correo.cor_estado, CorreoPendiente.Estados.ENVIADO)
+        self.assertIsNotNone(correo.cor_enviado_en)
+        # Lo enviado no guarda el contenido
+        self.assertEqual((correo.cor_cuerpo, correo.cor_alternativas), ('', []))
+        self.assertFalse(AdjuntoCorreo.objects.exists())
+
+    def test_admin_no_muestra_el_cuerpo(self):
+        send_mail("Acceso", "Tu contraseña es: abc123", "noreply@test.com", ["e@test.com"])
+        superusuario = Usuario.objects.create_superuser(
+            username="root_correos", password="testpass123", email="root_correos@test.com", cedula="9950500001",
+        )
+        self.client.force_login(superusuario)
+
+        respuesta = self.client.get(reverse('admin:app_admin_eventos_correopendiente_change', args=[CorreoPendiente.objects.get().pk]))
+
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertNotContains(respuesta, "abc123")
+
+    def test_html_content_subtype_se_conserva(self):
+        mensaje = EmailMessage("Aviso", "<p>Hola</p>", "noreply@test.com", ["c@test.com"])
+        mensaje.content_subtype = "html"
+        mensaje.send()
+
+        procesar_cola()
+
+        self.assertEqual(mail.outbox[0].content_subtype, "html")
+
+    def test_respeta_tamano_de_lote(self):
+        for i in range(5):
+            send_mail(f"Asunto {i}", "Cuerpo", "noreply@test.com", [f"d{i}@test.com"])
+
+        resultado = procesar_cola(tamano_lote=2)
+
+        self.assertEqual(resultado['enviados'], 2)
+        self.assertEqual(
+            CorreoPendiente.objects.filter(cor_estado=CorreoPendiente.Estados.PENDIENTE).count(), 3
+        )
+
+    def test_fallo_programa_reintento_con_backoff(self):
+        send_mail("Asunto", "Cuerpo", "noreply@test.com", ["e@test.com"])
+
+        with mock.patch.object(EmailMessage, 'send', side_effect=ConnectionError("SMTP caído")):
+            resultado = procesar_cola()
+
+        self.assertEqual(resultado['reintentos'], 1)
+        correo = CorreoPendiente.objects.get()
+        self.assertEqual(correo.cor_estado, CorreoPendiente.Estados.PENDIENTE)
+        self.assertEqual(correo.cor_intentos, 1)
+        self.assertIn("SMTP caído", correo.cor_ultimo_error)
+        self.assertEqual(correo.cor_cuerpo, "Cuerpo")
+        self.assertGreater(correo.cor_proximo_intento, timezone.now() + timedelta(seconds=50))
+
+        # No está listo todavía: el siguiente lote no lo toma
+        self.assertEqual(procesar_cola()['reintentos'], 0)
+
+    def test_marca_fallido_al_agotar_intentos(self):
+        send_mail("Asunto", "Cuerpo", "noreply@test.com", ["f@test.com"])
+        CorreoPendiente.objects.update(cor_intentos=2)
+
+        with mock.patch.object(EmailMessage, 'send', side_effect=ConnectionError("rechazado")):
+            resultado = procesar_cola()
+
+        self.assertEqual(resultado['fallidos'], 1)
+        self.assertEqual(CorreoPendiente.objects.get().cor_estado, CorreoPendiente.Estados.FALLIDO)
+
+    def test_correo_bloqueado_vencido_se_recupera(self):
+        """Un correo que quedó 'Enviando' por un worker caído vuelve a enviarse"""
+        send_mail("Asunto", "Cuerpo", "noreply@test.com", ["g@test.com"])
+        CorreoPendiente.objects.update(
+            cor_estado=CorreoPendiente.Estados.ENVIANDO,
+            cor_proximo_intento=timezone.now() - timedelta(seconds=1),
+        )
+
+        self.assertEqual(procesar_cola()['enviados'], 1)
+
+    def test_calcular_espera_exponencial(self):
+        self.assertEqual(calcular_espera(1), timedelta(seconds=60))
+        self.assertEqual(calcular_espera(3), timedelta(seconds=240))
+        self.assertEqual(calcular_espera(20), timedelta(seconds=3600))
+
+    def test_comando_procesa_la_cola(self):
+        for i in range(3):
+            send_mail(f"Asunto {i}", "Cuerpo", "noreply@test.com", [f"h{i}@test.com"])
+
+        salida = StringIO()
+        call_command('procesar_cola_correos', '--lote', '2', stdout=salida)
+
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertIn("3 enviados", salida.getvalue())
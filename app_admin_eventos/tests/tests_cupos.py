@@ -0,0 +1,277 @@
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from unittest import mock
+
+from django.db import OperationalError, connection
+from django.test import TestCase, TransactionTestCase, Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from app_usuarios.models import Usuario, AdministradorEvento, Asistente
+from app_admin_eventos.cupos import cambiar_estado_asistente, cambiar_estado_cupo, liberar_cupos, reservar_cupo
+from app_admin_eventos.estadisticas import estadisticas_evento
+from app_admin_eventos.forms import EventoForm
+from app_admin_eventos.models import Evento
+from app_asistentes.models import AsistenteEvento
+from principal_eventos.cache_vistas import _version
+
+
+MEDIA_TEMPORAL = tempfile.mkdtemp()
+
+
+def crear_evento(admin_evento, capacidad, **campos):
+    return Evento.objects.create(
+        eve_nombre='Feria de cupos', eve_descripcion='Evento de prueba', eve_ciudad='Manizales', eve_lugar='Coliseo',
+        eve_fecha_inicio=date.today() + timedelta(days=10), eve_fecha_fin=date.today() + timedelta(days=12),
+        eve_estado='Publicado', eve_administrador_fk=admin_evento, eve_capacidad=capacidad,
+        eve_tienecosto=campos.pop('eve_tienecosto', 'Es gratis'),
+        eve_imagen='upload/eventos/imagen/img.jpg', eve_programacion='upload/eventos/programacion/prog.pdf', **campos,
+    )
+
+
+@override_settings(MEDIA_ROOT=MEDIA_TEMPORAL)
+class ReservaCuposTestCase(TestCase):
+    """
+    Reserva de cupos con UPDATE condicional: la capacidad configurada no
+    cambia y las reservas se cuentan aparte; 0 filas actualizadas = lleno.
+    """
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_TEMPORAL, ignore_errors=True)
+
+    def setUp(self):
+        self.client = Client()
+        self.contador = 0
+        self.admin_evento, _ = AdministradorEvento.objects.get_or_create(
+            usuario=self.crear_usuario("admin_cupos", Usuario.Roles.ADMIN_EVENTO),
+        )
+        self.evento = crear_evento(self.admin_evento, capacidad=2)
+
+    def crear_usuario(self, nombre, rol):
+        self.contador += 1
+        return Usuario.objects.create_user(
+            username=nombre, password="testpass123", email=f"{nombre}@test.com",
+            rol=rol, cedula=f"99500{self.contador:05d}", first_name=nombre.capitalize(),
+        )
+
+    def crear_inscripcion(self, nombre, estado):
+        asistente = Asistente.objects.create(usuario=self.crear_usuario(nombre, Usuario.Roles.ASISTENTE))
+        return AsistenteEvento.objects.create(
+            asi_eve_asistente_fk=asistente, asi_eve_evento_fk=self.evento,
+            asi_eve_fecha_hora=timezone.now(), asi_eve_estado=estado, asi_eve_clave='',
+        )
+
+    def datos_registro(self, nombre):
+        self.contador += 1
+        return {
+            'cedula': f"99510{self.contador:05d}", 'username': nombre, 'email': f"{nombre}@test.com",
+            'telefono': '3001234567', 'first_name': nombre.capitalize(), 'last_name': 'Prueba',
+        }
+
+    def test_reserva_hasta_llenar_y_libera(self):
+        self.assertTrue(reservar_cupo(self.evento.pk))
+        self.assertTrue(reservar_cupo(self.evento.pk))
+        self.assertFalse(reservar_cupo(self.evento.pk))
+
+        self.evento.refresh_from_db()
+        self.assertEqual((self.evento.eve_capacidad, self.evento.eve_cupos_reservados), (2, 2))
+        self.assertEqual(self.evento.cupos_disponibles, 0)
+
+        liberar_cupos(self.evento.pk, 5)
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.eve_cupos_reservados, 0)
+
+    def test_reservas_solo_invalidan_el_catalogo_al_llenarse_o_reabrirse(self):
+        catalogo, detalle = _version('catalogo'), _version(f'evento:{self.evento.pk}')
+        reservar_cupo(self.evento.pk)
+        self.assertEqual(_version('catalogo'), catalogo)
+        self.assertGreater(_version(f'evento:{self.evento.pk}'), detalle)
+
+        reservar_cupo(self.evento.pk)  # Se llena
+        self.assertGreater(_version('catalogo'), catalogo)
+
+        catalogo = _version('catalogo')
+        liberar_cupos(self.evento.pk)  # Se vuelve a abrir
+        self.assertGreater(_version('catalogo'), catalogo)
+        catalogo = _version('catalogo')
+        liberar_cupos(self.evento.pk)
+        self.assertEqual(_version('catalogo'), catalogo)
+
+    def test_cambios_de_estado(self):
+        # Nueva y pendiente toma cupo; aprobarla no toma otro
+        self.assertTrue(cambiar_estado_cupo(self.evento.pk, None, 'Pendiente'))
+        self.assertTrue(cambiar_estado_cupo(self.evento.pk, 'Pendiente', 'Aprobado'))
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.eve_cupos_reservados, 1)
+
+        # Rechazarla lo devuelve; aprobar una rechazada lo vuelve a tomar
+        cambiar_estado_cupo(self.evento.pk, 'Aprobado', 'Rechazado')
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.eve_cupos_reservados, 0)
+        self.assertTrue(cambiar_estado_cupo(self.evento.pk, 'Rechazado', 'Aprobado'))
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.eve_cupos_reservados, 1)
+
+    def test_guardar_instancia_vieja_no_pisa_reservas(self):
+        evento_leido = Evento.objects.get(pk=self.evento.pk)
+        reservar_cupo(self.evento.pk)
+
+        evento_leido.eve_nombre = 'Feria editada'
+        evento_leido.save()
+
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.eve_nombre, 'Feria editada')
+        self.assertEqual(self.evento.eve_cupos_reservados, 1)
+
+    def test_registro_de_asistente_reserva_y_rechaza_sin_cupo(self):
+        url = reverse('crear_asistente', args=[self.evento.pk])
+        self.client.post(url, self.datos_registro("ana"))
+        self.client.post(url, self.datos_registro("beto"))
+        respuesta = self.client.post(url, self.datos_registro("carla"))
+
+        self.assertContains(respuesta, "No hay más cupos disponibles")
+        self.evento.refresh_from_db()
+        self.assertEqual((self.evento.eve_capacidad, self.evento.eve_cupos_reservados), (2, 2))
+        self.assertEqual(AsistenteEvento.objects.filter(asi_eve_evento_fk=self.evento).count(), 2)
+
+    def test_correo_del_registro_sale_fuera_de_la_transaccion(self):
+        # Con la fila del evento bloqueada durante el SMTP, los registros se harían en fila
+        nivel = len(connection.atomic_blocks)
+        niveles_al_enviar = []
+        with mock.patch('app_asistentes.views.EmailMessage.send', lambda *a, **k: niveles_al_enviar.append(len(connection.atomic_blocks))):
+            self.client.post(reverse('crear_asistente', args=[self.evento.pk]), self.datos_registro("dora"))
+        self.assertEqual(niveles_al_enviar, [nivel])
+
+    def test_inscripcion_fallida_devuelve_el_cupo(self):
+        with mock.patch.object(AsistenteEvento, 'save', side_effect=RuntimeError("falló")):
+            respuesta = self.client.post(reverse('crear_asistente', args=[self.evento.pk]), self.datos_registro("eva"))
+        self.assertContains(respuesta, "Ocurrió un error inesperado")
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.eve_cupos_reservados, 0)
+
+    def test_aprobar_pendiente_no_descuenta_dos_veces(self):
+        reservar_cupo(self.evento.pk)
+        pendiente = self.crear_inscripcion("dora", 'Pendiente')
+        session = self.client.session
+        session['admin_id'] = self.admin_evento.pk
+        session.save()
+
+        self.client.get(reverse('aprobar_asi', args=[self.evento.id, pendiente.id]))
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.eve_cupos_reservados, 1)
+
+        self.client.get(reverse('rechazar_asi', args=[self.evento.id, pendiente.id]))
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.eve_cupos_reservados, 0)
+
+    def test_cancelaciones_simultaneas_liberan_un_solo_cupo(self):
+        reservar_cupo(self.evento.pk)
+        reservar_cupo(self.evento.pk)
+        aprobada = self.crear_inscripcion("elsa", 'Aprobado')
+        # Dos peticiones leyeron la misma fila Aprobada antes de escribir
+        primera = AsistenteEvento.objects.get(pk=aprobada.pk)
+        segunda = AsistenteEvento.objects.get(pk=aprobada.pk)
+
+        self.assertTrue(cambiar_estado_asistente(primera, AsistenteEvento.Estados.CANCELADO))
+        self.assertIsNone(cambiar_estado_asistente(segunda, AsistenteEvento.Estados.CANCELADO))
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.eve_cupos_reservados, 1)
+
+    def test_aprobaciones_simultaneas_toman_un_solo_cupo(self):
+        rechazada = self.crear_inscripcion("fito", 'Rechazado')
+        primera = AsistenteEvento.objects.get(pk=rechazada.pk)
+        segunda = AsistenteEvento.objects.get(pk=rechazada.pk)
+
+        self.assertTrue(cambiar_estado_asistente(primera, AsistenteEvento.Estados.APROBADO))
+        self.assertIsNone(cambiar_estado_asistente(segunda, AsistenteEvento.Estados.APROBADO))
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.eve_cupos_reservados, 1)
+
+    def test_aprobar_y_rechazar_dos_veces_mueven_el_cupo_una_vez(self):
+        rechazada = self.crear_inscripcion("gina", 'Rechazado')
+        session = self.client.session
+        session['admin_id'] = self.admin_evento.pk
+        session.save()
+
+        for _ in range(2):
+            self.client.get(reverse('aprobar_asi', args=[self.evento.id, rechazada.id]))
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.eve_cupos_reservados, 1)
+
+        for _ in range(2):
+            self.client.get(reverse('rechazar_asi', args=[self.evento.id, rechazada.id]))
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.eve_cupos_reservados, 0)
+
+    def test_aprobar_con_otro_evento_en_la_url_no_cobra_su_cupo(self):
+        otro = crear_evento(self.admin_evento, capacidad=1)
+        rechazada = self.crear_inscripcion("hugo", 'Rechazado')
+        session = self.client.session
+        session['admin_id'] = self.admin_evento.pk
+        session.save()
+
+        respuesta = self.client.get(reverse('aprobar_asi', args=[otro.id, rechazada.id]))
+        self.assertEqual(respuesta.status_code, 404)
+        otro.refresh_from_db()
+        rechazada.refresh_from_db()
+        self.assertEqual(otro.eve_cupos_reservados, 0)
+        self.assertEqual(rechazada.asi_eve_estado, 'Rechazado')
+
+    def test_estadisticas_y_edicion_respetan_reservas(self):
+        reservar_cupo(self.evento.pk)
+        self.evento.refresh_from_db()
+        cupos = estadisticas_evento(self.evento)['cupos']
+        self.assertEqual((cupos['totales'], cupos['ocupados'], cupos['disponibles']), (2, 1, 1))
+
+        form = EventoForm(instance=self.evento, data={'eve_capacidad': 0})
+        form.is_valid()
+        self.assertIn('eve_capacidad', form.errors)
+
+
+class ConcurrenciaCuposTestCase(TransactionTestCase):
+    """
+    Arnés de concurrencia: cientos de reservas en paralelo sobre un mismo
+    evento, cada una con su propia conexión. Solo la capacidad configurada
+    puede tener éxito, sin importar el orden en que la base las atienda.
+    """
+
+    INTENTOS = 300
+    CAPACIDAD = 40
+    HILOS = 16
+
+    def setUp(self):
+        usuario = Usuario.objects.create_user(
+            username="admin_concurrencia", password="testpass123", email="admin_concurrencia@test.com",
+            rol=Usuario.Roles.ADMIN_EVENTO, cedula="9952000001",
+        )
+        admin_evento, _ = AdministradorEvento.objects.get_or_create(usuario=usuario)
+        self.evento = crear_evento(admin_evento, capacidad=self.CAPACIDAD)
+
+    def reservar(self, _):
+        try:
+            while True:
+                try:
+                    return reservar_cupo(self.evento.pk)
+                except OperationalError as error:
+                    # SQLite bloquea la tabla completa en memoria compartida: reintentar.
+                    # PostgreSQL/MySQL esperan el bloqueo de fila por sí solos.
+                    if 'locked' not in str(error):
+                        raise
+                    time.sleep(0.001)
+        finally:
+            connection.close()
+
+    def test_reservas_en_paralelo_no_sobrevenden(self):
+        with ThreadPoolExecutor(max_workers=self.HILOS) as hilos:
+            resultados = list(hilos.map(self.reservar, range(self.INTENTOS)))
+
+        self.assertEqual(resultados.count(True), self.CAPACIDAD)
+        self.assertEqual(resultados.count(False), self.INTENTOS - self.CAPACIDAD)
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.eve_cupos_reservados, self.CAPACIDAD)
+        self.assertEqual(self.evento.eve_capacidad, self.CAPACIDAD)
@@ -0,0 +1,145 @@
+from datetime import date, timedelta
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.utils import timezone
+
+from app_usuarios.models import Usuario, AdministradorEvento, Asistente, Participante, Evaluador
+from app_admin_eventos.models import Evento
+from app_admin_eventos.estadisticas import estadisticas_evento
+from app_asistentes.models import AsistenteEvento
+from app_participantes.models import ParticipanteEvento
+from app_participantes.utils import obtener_estadisticas_evento
+from app_evaluadores.models import EvaluadorEvento
+
+
+class EstadisticasEventoTestCase(TestCase):
+    """
+    Casos de prueba para el servicio de estadísticas con agregación condicional.
+    """
+
+    def crear_usuario(self, nombre, rol):
+        self.contador += 1
+        return Usuario.objects.create_user(
+            username=nombre, password="testpass123", email=f"{nombre}@test.com",
+            rol=rol, cedula=f"90000{self.contador:05d}",
+        )
+
+    def setUp(self):
+        self.client = Client()
+        self.contador = 0
+
+        user_admin = self.crear_usuario("admin_est", Usuario.Roles.ADMIN_EVENTO)
+        self.admin_evento, _ = AdministradorEvento.objects.get_or_create(usuario=user_admin)
+
+        self.evento = Evento.objects.create(
+            eve_nombre='Feria de Estadísticas',
+            eve_descripcion='Evento de prueba',
+            eve_ciudad='Manizales',
+            eve_lugar='Coliseo',
+            eve_fecha_inicio=date.today() + timedelta(days=10),
+            eve_fecha_fin=date.today() + timedelta(days=12),
+            eve_estado='Publicado',
+            eve_administrador_fk=self.admin_evento,
+            eve_capacidad=10,
+            eve_cupos_reservados=3,
+            eve_tienecosto='No',
+            eve_imagen=SimpleUploadedFile("img.jpg", b"imgcontent", content_type="image/jpeg"),
+            eve_programacion=SimpleUploadedFile("prog.pdf", b"progcontent", content_type="application/pdf"),
+        )
+
+        # Asistentes: 2 aprobados, 1 pendiente, 1 rechazado
+        for i, estado in enumerate(['Aprobado', 'Aprobado', 'Pendiente', 'Rechazado']):
+            asistente = Asistente.objects.create(usuario=self.crear_usuario(f"asi_est_{i}", Usuario.Roles.ASISTENTE))
+            AsistenteEvento.objects.create(
+                asi_eve_asistente_fk=asistente, asi_eve_evento_fk=self.evento,
+                asi_eve_fecha_hora=timezone.now(), asi_eve_estado=estado, asi_eve_clave=f"A{i}",
+            )
+
+        # Participantes: uno individual y un grupo de tres (líder + 2 miembros)
+        individual = Participante.objects.create(usuario=self.crear_usuario("par_ind", Usuario.Roles.PARTICIPANTE))
+        ParticipanteEvento.objects.create(
+            par_eve_participante_fk=individual, par_eve_evento_fk=self.evento,
+            par_eve_estado='Aprobado', par_eve_clave='P0',
+        )
+        lider = Participante.objects.create(usuario=self.crear_usuario("par_lider", Usuario.Roles.PARTICIPANTE))
+        proyecto = ParticipanteEvento.objects.create(
+            par_eve_participante_fk=lider, par_eve_evento_fk=self.evento,
+            par_eve_estado='Pendiente', par_eve_clave='P1', par_eve_es_grupo=True,
+        )
+        for i in range(2):
+            miembro = Participante.objects.create(usuario=self.crear_usuario(f"par_miembro_{i}", Usuario.Roles.PARTICIPANTE))
+            ParticipanteEvento.objects.create(
+                par_eve_participante_fk=miembro, par_eve_evento_fk=self.evento,
+                par_eve_estado='Rechazado', par_eve_clave=f"PM{i}", par_eve_es_grupo=True,
+                par_eve_proyecto_principal=proyecto,
+            )
+
+        # Evaluadores: 1 aprobado, 1 pendiente
+        for i, estado in enumerate(['Aprobado', 'Pendiente']):
+            evaluador = Evaluador.objects.create(usuario=self.crear_usuario(f"eva_est_{i}", Usuario.Roles.EVALUADOR))
+            EvaluadorEvento.objects.create(
+                eva_eve_evaluador_fk=evaluador, eva_eve_evento_fk=self.evento, eva_eve_estado=estado,
+            )
+
+        session = self.client.session
+        session['admin_id'] = self.admin_evento.pk
+        session.save()
+
+    def test_conteos_por_rol_y_estado(self):
+        datos = estadisticas_evento(self.evento)
+
+        self.assertEqual(datos['asistentes'], {'total': 4, 'aprobados': 2, 'rechazados': 1, 'pendientes': 1})
+        self.assertEqual(datos['evaluadores'], {'total': 2, 'aprobados': 1, 'rechazados': 0, 'pendientes': 1})
+
+        participantes = datos['participantes']
+        self.assertEqual(participantes['total'], 4)
+        self.assertEqual(participantes['aprobados'], 1)
+        self.assertEqual(participantes['rechazados'], 2)
+        self.assertEqual(participantes['pendientes'], 1)
+        self.assertEqual(participantes['proyectos_individuales'], 1)
+        self.assertEqual(participantes['proyectos_grupales'], 1)
+        self.assertEqual(participantes['total_proyectos'], 2)
+
+    def test_ocupacion(self):
+        cupos = estadisticas_evento(self.evento)['cupos']
+
+        # 10 de capacidad, 3 reservados por los asistentes no rechazados
+        self.assertEqual(cupos['disponibles'], 7)
+        self.assertEqual(cupos['ocupados'], 3)
+        self.assertEqual(cupos['totales'], 10)
+        self.assertEqual(cupos['porcentaje_ocupacion'], 30.0)
+
+    def test_una_consulta_por_tabla(self):
+        with self.assertNumQueries(3):
+            estadisticas_evento(self.evento)
+
+    def test_utils_participantes_una_consulta(self):
+        with self.assertNumQueries(1):
+            datos = obtener_estadisticas_evento(self.evento)
+
+        self.assertEqual(datos['total_proyectos'], 2)
+        self.assertEqual(datos['total_participantes'], 4)
+
+    def test_endpoint_json(self):
+        response = self.client.get(reverse('estadisticas_evento_json', args=[self.evento.id]))
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['evento'], self.evento.id)
+        self.assertEqual(data['evaluadores']['total'], 2)
+        self.assertEqual(data['cupos']['ocupados'], 3)
+
+    def test_vista_html_incluye_evaluadores(self):
+        response = self.client.get(reverse('estadisticas_evento', args=[self.evento.id]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_evaluadores'], 2)
+        self.assertEqual(response.context['proyectos_grupales'], 1)
+        self.assertEqual(response.context['cupos_ocupados'], 3)
+
+    def test_endpoint_json_requiere_admin(self):
+        self.client.logout()
+        response = self.client.get(reverse('estadisticas_evento_json', args=[self.evento.id]))
+        self.assertEqual(response.status_code, 302)
@@ -0,0 +1,54 @@
+from datetime import date, timedelta
+from importlib import import_module
+
+from django.apps import apps
+from django.test import TestCase
+
+from app_usuarios.models import Usuario, AdministradorEvento
+from app_admin_eventos.filtros import condicion_filtros, estado_canonico
+from app_admin_eventos.models import EstadoInscripcion, Evento
+
+
+normalizar_estados = import_module('app_admin_eventos.migrations.0008_estados_evento').normalizar_estados
+
+
+class EstadosNormalizadosTestCase(TestCase):
+    """
+    Estados con opciones fijas: la migración de datos deja cada fila con el
+    valor canónico y los filtros comparan con igualdad exacta.
+    """
+
+    def setUp(self):
+        usuario = Usuario.objects.create_user(
+            username="admin_estados", password="testpass123", email="admin_estados@test.com",
+            rol=Usuario.Roles.ADMIN_EVENTO, cedula="9940000001",
+        )
+        self.admin_evento, _ = AdministradorEvento.objects.get_or_create(usuario=usuario)
+
+    def crear_evento(self, estado):
+        return Evento.objects.create(
+            eve_nombre=f"Evento {estado}", eve_descripcion="Desc", eve_ciudad="Manizales", eve_lugar="Coliseo",
+            eve_fecha_inicio=date.today() + timedelta(days=5), eve_fecha_fin=date.today() + timedelta(days=6),
+            eve_estado=estado, eve_imagen='upload/eventos/imagen/img.jpg', eve_administrador_fk=self.admin_evento,
+            eve_tienecosto='Es gratis', eve_capacidad=10, eve_programacion='upload/eventos/programacion/prog.pdf',
+        )
+
+    def test_migracion_normaliza_mayusculas_espacios_y_sinonimos(self):
+        eventos = {estado: self.crear_evento(estado) for estado in ('PUBLICADO', ' finalizado ', 'activo', 'Cerrado', 'Otro')}
+
+        normalizar_estados(apps, None)
+
+        esperados = {'PUBLICADO': 'Publicado', ' finalizado ': 'Finalizado', 'activo': 'Publicado', 'Cerrado': 'Cerrado', 'Otro': 'Otro'}
+        for original, evento in eventos.items():
+            evento.refresh_from_db()
+            self.assertEqual(evento.eve_estado, esperados[original])
+
+    def test_filtro_de_estado_exacto_acepta_minusculas(self):
+        publicado = self.crear_evento(Evento.Estados.PUBLICADO)
+        self.crear_evento(Evento.Estados.FINALIZADO)
+
+        consulta = Evento.objects.filter(condicion_filtros({'estado': 'publicado'}))
+        self.assertEqual(list(consulta), [publicado])
+        self.assertNotIn('LIKE', str(consulta.query).upper())
+        self.assertEqual(estado_canonico(EstadoInscripcion, 'APROBADO'), EstadoInscripcion.APROBADO)
+        self.assertEqual(estado_canonico(EstadoInscripcion, 'desconocido'), 'desconocido')
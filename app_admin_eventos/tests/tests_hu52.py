@@ -103,7 +103,7 @@ class EventoEdicionTestCase(TestCase):
             'eve_fecha_fin': (self.futuro_lejano + timedelta(days=5)).strftime('%Y-%m-%d'),
             'eve_capacidad': 150,
             'eve_tienecosto': 'Si',
-            'eve_estado': 'Activo',
+            'eve_estado': 'Publicado',
             'area': self.area.pk,
             'categorias': [self.categoria.pk],
         }
@@ -0,0 +1,173 @@
+import shutil
+import tempfile
+from datetime import date, timedelta
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from app_usuarios.models import Usuario, AdministradorEvento, Asistente, Evaluador
+from app_admin_eventos.models import Evento, RegistroIngreso
+from app_admin_eventos.ingreso import leer_token, registrar_ingreso, token_ingreso
+from app_asistentes.models import AsistenteEvento
+from app_evaluadores.models import EvaluadorEvento
+
+
+MEDIA_TEMPORAL = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_TEMPORAL)
+class IngresoEventoTestCase(TestCase):
+    """
+    Casos de prueba para los tokens firmados de QR y el registro de ingreso.
+    """
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_TEMPORAL, ignore_errors=True)
+
+    def crear_usuario(self, nombre, rol):
+        self.contador += 1
+        return Usuario.objects.create_user(
+            username=nombre, password="testpass123", email=f"{nombre}@test.com",
+            rol=rol, cedula=f"95000{self.contador:05d}", first_name=nombre.capitalize(), last_name="Prueba",
+        )
+
+    def crear_evento(self, nombre):
+        return Evento.objects.create(
+            eve_nombre=nombre,
+            eve_descripcion='Evento de prueba',
+            eve_ciudad='Manizales',
+            eve_lugar='Coliseo',
+            eve_fecha_inicio=date.today(),
+            eve_fecha_fin=date.today() + timedelta(days=1),
+            eve_estado='Publicado',
+            eve_administrador_fk=self.admin_evento,
+            eve_capacidad=10,
+            eve_tienecosto='No',
+            eve_imagen=SimpleUploadedFile("img.jpg", b"imgcontent", content_type="image/jpeg"),
+            eve_programacion=SimpleUploadedFile("prog.pdf", b"progcontent", content_type="application/pdf"),
+        )
+
+    def crear_asistente_evento(self, nombre, estado='Aprobado', evento=None):
+        asistente = Asistente.objects.create(usuario=self.crear_usuario(nombre, Usuario.Roles.ASISTENTE))
+        return AsistenteEvento.objects.create(
+            asi_eve_asistente_fk=asistente, asi_eve_evento_fk=evento or self.evento,
+            asi_eve_fecha_hora=timezone.now(), asi_eve_estado=estado, asi_eve_clave='CLAVE',
+            asi_eve_qr=SimpleUploadedFile("qr.png", b"png", content_type="image/png"),
+        )
+
+    def setUp(self):
+        self.client = Client()
+        self.contador = 0
+
+        user_admin = self.crear_usuario("admin_ing", Usuario.Roles.ADMIN_EVENTO)
+        self.admin_evento, _ = AdministradorEvento.objects.get_or_create(usuario=user_admin)
+        self.evento = self.crear_evento('Feria de Ingreso')
+
+        session = self.client.session
+        session['admin_id'] = self.admin_evento.pk
+        session.save()
+
+    def test_token_compacto_y_verificable_sin_bd(self):
+        inscrito = self.crear_asistente_evento("ana")
+        token = token_ingreso(inscrito)
+
+        self.assertLessEqual(len(token), 32)
+        self.assertEqual(token, token_ingreso(inscrito))
+        with self.assertNumQueries(0):
+            self.assertEqual(leer_token(token), ('A', inscrito.pk, self.evento.pk))
+
+    def test_token_alterado_es_invalido(self):
+        token = token_ingreso(self.crear_asistente_evento("ana"))
+        cuerpo, firma = token.rsplit('.', 1)
+        otro_id = f"A{int(cuerpo.split('.')[0][1:], 36) + 1:x}"
+
+        self.assertIsNone(leer_token(f"{otro_id}.{cuerpo.split('.')[1]}.{firma}"))
+        self.assertIsNone(leer_token(token[:-1] + ('A' if token[-1] != 'A' else 'B')))
+        self.assertIsNone(leer_token("Participante: Ana, Evento: Feria, Clave: X"))
+        self.assertIsNone(leer_token(""))
+
+    def test_primer_escaneo_y_repetido(self):
+        inscrito = self.crear_asistente_evento("ana")
+        token = token_ingreso(inscrito)
+
+        primero = registrar_ingreso(self.evento.pk, token, dispositivo='Puerta 1')
+        segundo = registrar_ingreso(self.evento.pk, token, dispositivo='Puerta 2')
+
+        self.assertEqual(primero['resultado'], 'ingreso')
+        self.assertEqual(primero['nombre'], 'Ana Prueba')
+        self.assertEqual(segundo['resultado'], 'repetido')
+        self.assertEqual(segundo['hora'], primero['hora'])
+        registro = RegistroIngreso.objects.get()
+        self.assertEqual((registro.ing_tipo, registro.ing_inscripcion_id, registro.ing_dispositivo), ('A', inscrito.pk, 'Puerta 1'))
+
+    def test_otro_evento_y_no_aprobado(self):
+        otro_evento = self.crear_evento('Otro Evento')
+        ajeno = self.crear_asistente_evento("beto", evento=otro_evento)
+        pendiente = self.crear_asistente_evento("carla", estado='Pendiente')
+
+        self.assertEqual(registrar_ingreso(self.evento.pk, token_ingreso(ajeno))['resultado'], 'otro_evento')
+        self.assertEqual(registrar_ingreso(self.evento.pk, token_ingreso(pendiente))['resultado'], 'no_aprobado')
+        self.assertFalse(RegistroIngreso.objects.exists())
+
+    def test_escaneo_usa_consultas_constantes(self):
+        token = token_ingreso(self.crear_asistente_evento("ana"))
+
+        # Lectura de la inscripción + INSERT (dentro de su savepoint)
+        with self.assertNumQueries(4):
+            registrar_ingreso(self.evento.pk, token)
+        with self.assertNumQueries(0):
+            registrar_ingreso(self.evento.pk, token + 'x')
+
+    def test_endpoint_escanear(self):
+        token = token_ingreso(self.crear_asistente_evento("ana"))
+        url = reverse('escanear_ingreso', args=[self.evento.pk])
+
+        response = self.client.post(url, {'token': token, 'dispositivo': 'Puerta 1'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['resultado'], 'ingreso')
+
+        response = self.client.post(url, {'token': 'basura'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['resultado'], 'invalido')
+
+        response = self.client.get(reverse('control_ingreso', args=[self.evento.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_ingresos'], 1)
+
+    def test_endpoint_requiere_admin(self):
+        self.client.logout()
+        response = self.client.post(reverse('escanear_ingreso', args=[self.evento.pk]), {'token': 'x'})
+        self.assertEqual(response.status_code, 302)
+
+    def test_endpoints_rechazan_admin_de_otro_evento(self):
+        otro_admin, _ = AdministradorEvento.objects.get_or_create(
+            usuario=self.crear_usuario("admin_otro", Usuario.Roles.ADMIN_EVENTO),
+        )
+        token = token_ingreso(self.crear_asistente_evento("ana"))
+        session = self.client.session
+        session['admin_id'] = otro_admin.pk
+        session.save()
+
+        response = self.client.post(reverse('escanear_ingreso', args=[self.evento.pk]), {'token': token})
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json()['resultado'], 'prohibido')
+        self.assertFalse(RegistroIngreso.objects.exists())
+        self.assertEqual(self.client.get(reverse('control_ingreso', args=[self.evento.pk])).status_code, 403)
+
+    def test_aprobar_evaluador_genera_qr_con_token(self):
+        evaluador = Evaluador.objects.create(usuario=self.crear_usuario("eva", Usuario.Roles.EVALUADOR))
+        inscripcion = EvaluadorEvento.objects.create(
+            eva_eve_evaluador_fk=evaluador, eva_eve_evento_fk=self.evento, eva_eve_estado='Pendiente',
+        )
+
+        self.client.get(reverse('aprobar_eva', args=[self.evento.pk, inscripcion.pk]))
+
+        inscripcion.refresh_from_db()
+        self.assertEqual(inscripcion.eva_eve_estado, 'Aprobado')
+        self.assertTrue(inscripcion.eva_eve_qr.name)
+        resultado = registrar_ingreso(self.evento.pk, token_ingreso(inscripcion))
+        self.assertEqual((resultado['resultado'], resultado['tipo']), ('ingreso', 'Evaluador'))
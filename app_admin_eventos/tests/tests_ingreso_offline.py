@@ -0,0 +1,240 @@
+import hashlib
+import hmac
+import json
+import shutil
+import tempfile
+from datetime import date, timedelta
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from app_usuarios.models import Usuario, AdministradorEvento, Asistente
+from app_admin_eventos.models import Evento, RegistroIngreso
+from app_admin_eventos.ingreso import (
+    LOTE_MAXIMO, clave_estacion, huella_clave, registrar_ingreso, sincronizar_ingresos, snapshot_evento, token_ingreso,
+)
+from app_asistentes.models import AsistenteEvento
+
+
+MEDIA_TEMPORAL = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_TEMPORAL)
+class IngresoSinConexionTestCase(TestCase):
+    """
+    Casos de prueba para la foto firmada de llaves y la sincronización en lote.
+    """
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_TEMPORAL, ignore_errors=True)
+
+    def crear_usuario(self, nombre, rol):
+        self.contador += 1
+        return Usuario.objects.create_user(
+            username=nombre, password="testpass123", email=f"{nombre}@test.com",
+            rol=rol, cedula=f"96000{self.contador:05d}", first_name=nombre.capitalize(), last_name="Prueba",
+        )
+
+    def crear_evento(self, nombre):
+        return Evento.objects.create(
+            eve_nombre=nombre,
+            eve_descripcion='Evento de prueba',
+            eve_ciudad='Manizales',
+            eve_lugar='Coliseo',
+            eve_fecha_inicio=date.today(),
+            eve_fecha_fin=date.today() + timedelta(days=1),
+            eve_estado='Publicado',
+            eve_administrador_fk=self.admin_evento,
+            eve_capacidad=10,
+            eve_tienecosto='No',
+            eve_imagen=SimpleUploadedFile("img.jpg", b"imgcontent", content_type="image/jpeg"),
+            eve_programacion=SimpleUploadedFile("prog.pdf", b"progcontent", content_type="application/pdf"),
+        )
+
+    def crear_asistente_evento(self, nombre, estado='Aprobado', evento=None, clave='CLAVE'):
+        asistente = Asistente.objects.create(usuario=self.crear_usuario(nombre, Usuario.Roles.ASISTENTE))
+        return AsistenteEvento.objects.create(
+            asi_eve_asistente_fk=asistente, asi_eve_evento_fk=evento or self.evento,
+            asi_eve_fecha_hora=timezone.now(), asi_eve_estado=estado, asi_eve_clave=clave,
+        )
+
+    def crear_asistentes_en_bloque(self, cantidad, desde=0):
+        """Inscritos aprobados sin pasar por create_user, para lotes grandes."""
+        usuarios = Usuario.objects.bulk_create([
+            Usuario(username=f"masivo{i}", email=f"masivo{i}@test.com", password="!", rol=Usuario.Roles.ASISTENTE,
+                    cedula=f"96900{i:05d}", first_name=f"Masivo{i}")
+            for i in range(desde, desde + cantidad)
+        ])
+        asistentes = Asistente.objects.bulk_create([Asistente(usuario=usuario) for usuario in usuarios])
+        return AsistenteEvento.objects.bulk_create([
+            AsistenteEvento(asi_eve_asistente_fk=asistente, asi_eve_evento_fk=self.evento,
+                            asi_eve_fecha_hora=timezone.now(), asi_eve_estado='Aprobado', asi_eve_clave=f"K{i}")
+            for i, asistente in enumerate(asistentes)
+        ])
+
+    def setUp(self):
+        self.client = Client()
+        self.contador = 0
+
+        user_admin = self.crear_usuario("admin_off", Usuario.Roles.ADMIN_EVENTO)
+        self.admin_evento, _ = AdministradorEvento.objects.get_or_create(usuario=user_admin)
+        self.evento = self.crear_evento('Feria Sin Red')
+
+        session = self.client.session
+        session['admin_id'] = self.admin_evento.pk
+        session.save()
+
+    def test_snapshot_solo_aprobadas_y_sin_claves_en_claro(self):
+        ana = self.crear_asistente_evento("ana", clave='SECRETA1')
+        self.crear_asistente_evento("beto", estado='Pendiente')
+
+        snapshot = snapshot_evento(self.evento.pk)
+
+        self.assertEqual(snapshot['campos'], ['token', 'clave', 'nombre', 'tipo'])
+        self.assertEqual(snapshot['inscripciones'], [[token_ingreso(ana), huella_clave('SECRETA1'), 'Ana Prueba', 'A']])
+        self.assertNotIn('SECRETA1', json.dumps(snapshot))
+
+    def test_snapshot_firmado_con_clave_estacion(self):
+        self.crear_asistente_evento("ana")
+        snapshot = snapshot_evento(self.evento.pk)
+        firma = snapshot.pop('firma')
+
+        canonico = json.dumps(snapshot, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+        esperada = hmac.new(clave_estacion(self.evento.pk).encode(), canonico.encode('utf-8'), hashlib.sha256)
+        self.assertEqual(firma, esperada.hexdigest())
+        self.assertNotEqual(clave_estacion(self.evento.pk), clave_estacion(self.evento.pk + 1))
+
+    def test_version_cambia_solo_con_el_contenido(self):
+        self.crear_asistente_evento("ana")
+        version = snapshot_evento(self.evento.pk)['version']
+        self.assertEqual(version, snapshot_evento(self.evento.pk)['version'])
+
+        self.crear_asistente_evento("beto")
+        self.assertNotEqual(version, snapshot_evento(self.evento.pk)['version'])
+
+    def test_snapshot_usa_consultas_constantes(self):
+        self.crear_asistentes_en_bloque(5)
+        with CaptureQueriesContext(connection) as pocos:
+            snapshot_evento(self.evento.pk)
+
+        self.crear_asistentes_en_bloque(45, desde=5)
+        with CaptureQueriesContext(connection) as muchos:
+            snapshot = snapshot_evento(self.evento.pk)
+
+        self.assertEqual(len(pocos), 3)
+        self.assertEqual(len(muchos), len(pocos))
+        self.assertEqual(len(snapshot['inscripciones']), 50)
+
+    def test_endpoint_snapshot_y_304(self):
+        self.crear_asistente_evento("ana")
+        url = reverse('snapshot_ingreso', args=[self.evento.pk])
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        version = response.json()['version']
+
+        self.assertEqual(self.client.get(url, {'version': version}).status_code, 304)
+        self.assertEqual(self.client.get(url, {'version': 'vieja'}).status_code, 200)
+
+        response = self.client.get(reverse('control_ingreso', args=[self.evento.pk]))
+        self.assertEqual(response.context['clave_estacion'], clave_estacion(self.evento.pk))
+
+    def test_sincronizar_es_idempotente_y_conserva_la_hora_mas_temprana(self):
+        token = token_ingreso(self.crear_asistente_evento("ana"))
+        temprano = timezone.now() - timedelta(hours=2)
+        lote = [
+            {'token': token, 'hora': (temprano + timedelta(minutes=5)).isoformat()},
+            {'token': token, 'hora': temprano.isoformat()},
+        ]
+
+        primero = sincronizar_ingresos(self.evento.pk, lote, dispositivo='Puerta 1')
+        segundo = sincronizar_ingresos(self.evento.pk, lote, dispositivo='Puerta 1')
+
+        self.assertEqual((primero['registrados'], primero['repetidos']), (1, 0))
+        self.assertEqual((segundo['registrados'], segundo['repetidos']), (0, 1))
+        registro = RegistroIngreso.objects.get()
+        self.assertEqual(registro.ing_fecha_hora, temprano)
+        self.assertEqual(registrar_ingreso(self.evento.pk, token)['resultado'], 'repetido')
+
+    def test_sincronizar_rechaza_y_acota_hora_futura(self):
+        valido = token_ingreso(self.crear_asistente_evento("ana"))
+        pendiente = token_ingreso(self.crear_asistente_evento("beto", estado='Pendiente'))
+        ajeno = token_ingreso(self.crear_asistente_evento("carla", evento=self.crear_evento('Otro')))
+
+        resultado = sincronizar_ingresos(self.evento.pk, [
+            {'token': valido, 'hora': (timezone.now() + timedelta(days=1)).isoformat()},
+            {'token': pendiente},
+            {'token': ajeno},
+            {'token': 'basura'},
+            'no es un registro',
+        ])
+
+        self.assertEqual(resultado['recibidos'], 5)
+        self.assertEqual(resultado['registrados'], 1)
+        self.assertEqual(
+            sorted(r['motivo'] for r in resultado['rechazados']),
+            ['invalido', 'invalido', 'no_aprobado', 'otro_evento'],
+        )
+        self.assertLessEqual(RegistroIngreso.objects.get().ing_fecha_hora, timezone.now())
+
+    def test_lote_grande_con_consultas_constantes(self):
+        inscritos = self.crear_asistentes_en_bloque(500)
+        hora = timezone.now().isoformat()
+        lote = [{'token': token_ingreso(inscrito), 'hora': hora} for inscrito in inscritos]
+        # Un día completo: cada QR aparece varias veces hasta llenar el lote
+        lote = (lote * (LOTE_MAXIMO // len(lote)))[:LOTE_MAXIMO]
+
+        with CaptureQueriesContext(connection) as consultas:
+            resultado = sincronizar_ingresos(self.evento.pk, lote)
+
+        self.assertEqual(resultado['registrados'], 500)
+        self.assertEqual(RegistroIngreso.objects.count(), 500)
+        sentencias = [consulta['sql'].split()[0] for consulta in consultas.captured_queries]
+        # Aprobadas + existentes; los INSERT van en lotes (SQLite limita los parámetros por sentencia)
+        self.assertEqual(sentencias.count('SELECT'), 2)
+        self.assertLessEqual(sentencias.count('INSERT'), 5)
+
+    def test_endpoint_sincronizar(self):
+        token = token_ingreso(self.crear_asistente_evento("ana"))
+        url = reverse('sincronizar_ingresos', args=[self.evento.pk])
+
+        response = self.client.post(
+            url, json.dumps({'dispositivo': 'Puerta 2', 'registros': [{'token': token}]}), content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['registrados'], 1)
+        self.assertEqual(RegistroIngreso.objects.get().ing_dispositivo, 'Puerta 2')
+
+        self.assertEqual(self.client.post(url, 'no json', content_type='application/json').status_code, 400)
+        self.assertEqual(self.client.post(url, json.dumps({'registros': 'x'}), content_type='application/json').status_code, 400)
+        demasiados = json.dumps({'registros': [{'token': token}] * (LOTE_MAXIMO + 1)})
+        self.assertEqual(self.client.post(url, demasiados, content_type='application/json').status_code, 413)
+
+    def test_endpoints_requieren_admin(self):
+        self.client.logout()
+        self.assertEqual(self.client.get(reverse('snapshot_ingreso', args=[self.evento.pk])).status_code, 302)
+        response = self.client.post(reverse('sincronizar_ingresos', args=[self.evento.pk]), '{}', content_type='application/json')
+        self.assertEqual(response.status_code, 302)
+
+    def test_endpoints_rechazan_admin_de_otro_evento(self):
+        otro_admin, _ = AdministradorEvento.objects.get_or_create(
+            usuario=self.crear_usuario("admin_ajeno", Usuario.Roles.ADMIN_EVENTO),
+        )
+        token = token_ingreso(self.crear_asistente_evento("ana"))
+        session = self.client.session
+        session['admin_id'] = otro_admin.pk
+        session.save()
+
+        self.assertEqual(self.client.get(reverse('snapshot_ingreso', args=[self.evento.pk])).status_code, 403)
+        response = self.client.post(
+            reverse('sincronizar_ingresos', args=[self.evento.pk]),
+            json.dumps({'registros': [{'token': token}]}), content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(RegistroIngreso.objects.exists())
@@ -0,0 +1,147 @@
+import shutil
+import tempfile
+from datetime import date, timedelta
+
+from django.core import mail
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from app_usuarios.models import Usuario, AdministradorEvento, Asistente, Evaluador, Participante
+from app_admin_eventos.inscripciones import Tipos, roles_en_evento, roles_por_cedula
+from app_admin_eventos.models import Evento, InscripcionEvento
+from app_asistentes.models import AsistenteEvento
+from app_evaluadores.models import EvaluadorEvento
+from app_participantes.models import ParticipanteEvento
+
+
+MEDIA_TEMPORAL = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_TEMPORAL)
+class IndiceInscripcionesTestCase(TestCase):
+    """
+    Regla de roles cruzados sobre el índice InscripcionEvento: una fila por
+    usuario y evento con restricción única, mantenida por las inscripciones
+    de los tres roles y consultada una vez por usuario o por grupo.
+    """
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_TEMPORAL, ignore_errors=True)
+
+    def setUp(self):
+        self.client = Client()
+        self.contador = 0
+        admin_evento, _ = AdministradorEvento.objects.get_or_create(
+            usuario=self.crear_usuario("admin_inscripciones", Usuario.Roles.ADMIN_EVENTO),
+        )
+        self.evento = Evento.objects.create(
+            eve_nombre='Feria de inscripciones', eve_descripcion='Evento de prueba', eve_ciudad='Manizales', eve_lugar='Coliseo',
+            eve_fecha_inicio=date.today() + timedelta(days=10), eve_fecha_fin=date.today() + timedelta(days=12),
+            eve_estado='Publicado', eve_administrador_fk=admin_evento, eve_capacidad=50, eve_tienecosto='Es gratis',
+            eve_imagen='upload/eventos/imagen/img.jpg', eve_programacion='upload/eventos/programacion/prog.pdf',
+        )
+
+    def crear_usuario(self, nombre, rol):
+        self.contador += 1
+        return Usuario.objects.create_user(
+            username=nombre, password="testpass123", email=f"{nombre}@test.com",
+            rol=rol, cedula=f"99504{self.contador:05d}", first_name=nombre.capitalize(), last_name="Prueba",
+        )
+
+    def inscribir_asistente(self, usuario):
+        asistente, _ = Asistente.objects.get_or_create(usuario=usuario)
+        return AsistenteEvento.objects.create(
+            asi_eve_asistente_fk=asistente, asi_eve_evento_fk=self.evento,
+            asi_eve_fecha_hora=timezone.now(), asi_eve_estado='Aprobado', asi_eve_clave='',
+        )
+
+    def inscribir_evaluador(self, usuario):
+        evaluador, _ = Evaluador.objects.get_or_create(usuario=usuario)
+        return EvaluadorEvento.objects.create(
+            eva_eve_evaluador_fk=evaluador, eva_eve_evento_fk=self.evento, eva_eve_estado='Pendiente',
+        )
+
+    def test_el_indice_sigue_altas_y_bajas(self):
+        usuario = self.crear_usuario("ana", Usuario.Roles.ASISTENTE)
+        inscripcion = self.inscribir_asistente(usuario)
+        self.assertEqual(roles_en_evento(self.evento.pk, [usuario.pk]), {usuario.pk: Tipos.ASISTENTE})
+
+        inscripcion.asi_eve_estado = 'Cancelado'
+        inscripcion.save()
+        self.assertEqual(InscripcionEvento.objects.count(), 1)
+
+        # La baja en cascada desde el perfil también sale del índice
+        Asistente.objects.filter(usuario=usuario).delete()
+        self.assertFalse(InscripcionEvento.objects.exists())
+
+    def test_segundo_rol_en_el_evento_se_rechaza_sin_guardar(self):
+        usuario = self.crear_usuario("beto", Usuario.Roles.EVALUADOR)
+        self.inscribir_evaluador(usuario)
+
+        with self.assertRaisesMessage(ValidationError, "ya está inscrito como Evaluador"):
+            self.inscribir_asistente(usuario)
+        self.assertFalse(AsistenteEvento.objects.exists())
+
+        # full_clean conserva el mensaje por campo de antes
+        participante, _ = Participante.objects.get_or_create(usuario=usuario)
+        inscripcion = ParticipanteEvento(par_eve_participante_fk=participante, par_eve_evento_fk=self.evento, par_eve_estado='Pendiente')
+        with self.assertRaises(ValidationError) as error:
+            inscripcion.full_clean(exclude=['par_eve_clave'])
+        self.assertEqual(error.exception.message_dict['par_eve_participante_fk'], ["Este usuario ya está inscrito como Evaluador en este evento."])
+
+    def test_un_grupo_se_revisa_en_una_consulta(self):
+        cedulas = []
+        for nombre in ("caro", "dani", "eli"):
+            usuario = self.crear_usuario(nombre, Usuario.Roles.ASISTENTE)
+            cedulas.append(usuario.cedula)
+        self.inscribir_asistente(Usuario.objects.get(cedula=cedulas[0]))
+        self.inscribir_evaluador(Usuario.objects.get(cedula=cedulas[2]))
+
+        with self.assertNumQueries(1):
+            roles = roles_por_cedula(self.evento.pk, cedulas + ["0000000000"])
+        self.assertEqual(roles, {cedulas[0]: Tipos.ASISTENTE, cedulas[2]: Tipos.EVALUADOR})
+
+    def datos_grupo(self, *miembros):
+        self.contador += 1
+        datos = {
+            'cedula': f"99504{self.contador:05d}", 'username': 'lider_grupo', 'email': 'lider_grupo@test.com',
+            'telefono': '3001234567', 'first_name': 'Lider', 'last_name': 'Prueba', 'tipo_participacion': 'grupo',
+            'par_eve_documentos': SimpleUploadedFile('proyecto.pdf', b'%PDF-1.4', content_type='application/pdf'),
+        }
+        for numero, (cedula, nombre) in enumerate(miembros, start=1):
+            datos.update({
+                f'miembro_{numero}_cedula': cedula, f'miembro_{numero}_nombre': nombre,
+                f'miembro_{numero}_apellido': 'Prueba', f'miembro_{numero}_email': f"{nombre}@test.com",
+            })
+        return datos
+
+    def test_registro_grupal_rechaza_miembro_con_otro_rol_antes_de_crear(self):
+        asistente = self.crear_usuario("fabi", Usuario.Roles.ASISTENTE)
+        self.inscribir_asistente(asistente)
+        datos = self.datos_grupo(("9950499001", "gabi"), (asistente.cedula, "fabi"))
+
+        with CaptureQueriesContext(connection) as consultas:
+            respuesta = self.client.post(reverse('crear_participante', args=[self.evento.pk]), datos)
+
+        self.assertContains(respuesta, f"El miembro ({asistente.cedula}) ya está inscrito como ASISTENTE")
+        self.assertFalse(ParticipanteEvento.objects.exists())
+        self.assertFalse(Usuario.objects.filter(cedula="9950499001").exists())
+        revisiones = [c for c in consultas.captured_queries if 'FROM "app_admin_eventos_inscripcionevento"' in c['sql']]
+        self.assertEqual(len(revisiones), 2)  # La del formulario (líder) y la del grupo completo
+
+    def test_registro_grupal_indexa_a_todos(self):
+        datos = self.datos_grupo(("9950499002", "hugo"), ("9950499003", "ines"))
+        respuesta = self.client.post(reverse('crear_participante', args=[self.evento.pk]), datos)
+
+        self.assertRedirects(respuesta, reverse('pagina_principal'), fetch_redirect_response=False)
+        self.assertEqual(
+            InscripcionEvento.objects.filter(ins_evento_fk=self.evento, ins_tipo=Tipos.PARTICIPANTE).count(), 3,
+        )
+        self.assertEqual(len(mail.outbox), 3)
@@ -0,0 +1,156 @@
+import os
+import shutil
+import tempfile
+from datetime import date, timedelta
+from unittest import mock
+
+from django.core import mail
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from app_usuarios.models import Usuario, AdministradorEvento, Asistente, Participante
+from app_admin_eventos.models import Evento
+from app_admin_eventos import qr
+from app_admin_eventos.qr import asignar_qr, asignar_qrs, renderizar_qr
+from app_asistentes.models import AsistenteEvento
+from app_participantes.models import ParticipanteEvento
+
+
+MEDIA_TEMPORAL = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_TEMPORAL)
+class ServicioQrTestCase(TestCase):
+    """
+    Casos de prueba para el servicio de QR con caché por huella de contenido.
+    """
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_TEMPORAL, ignore_errors=True)
+
+    def crear_usuario(self, nombre, rol):
+        self.contador += 1
+        return Usuario.objects.create_user(
+            username=nombre, password="testpass123", email=f"{nombre}@test.com",
+            rol=rol, cedula=f"94000{self.contador:05d}", first_name=nombre.capitalize(),
+        )
+
+    def setUp(self):
+        qr._cache.clear()
+        self.client = Client()
+        self.contador = 0
+
+        user_admin = self.crear_usuario("admin_qr", Usuario.Roles.ADMIN_EVENTO)
+        self.admin_evento, _ = AdministradorEvento.objects.get_or_create(usuario=user_admin)
+
+        self.evento = Evento.objects.create(
+            eve_nombre='Feria QR',
+            eve_descripcion='Evento de prueba',
+            eve_ciudad='Manizales',
+            eve_lugar='Coliseo',
+            eve_fecha_inicio=date.today() + timedelta(days=10),
+            eve_fecha_fin=date.today() + timedelta(days=12),
+            eve_estado='Publicado',
+            eve_administrador_fk=self.admin_evento,
+            eve_capacidad=10,
+            eve_tienecosto='No',
+            eve_imagen=SimpleUploadedFile("img.jpg", b"imgcontent", content_type="image/jpeg"),
+            eve_programacion=SimpleUploadedFile("prog.pdf", b"progcontent", content_type="application/pdf"),
+        )
+
+        session = self.client.session
+        session['admin_id'] = self.admin_evento.pk
+        session.save()
+
+    def crear_asistente_evento(self, nombre, estado='Pendiente'):
+        asistente = Asistente.objects.create(usuario=self.crear_usuario(nombre, Usuario.Roles.ASISTENTE))
+        return AsistenteEvento.objects.create(
+            asi_eve_asistente_fk=asistente, asi_eve_evento_fk=self.evento,
+            asi_eve_fecha_hora=timezone.now(), asi_eve_estado=estado, asi_eve_clave='',
+            asi_eve_qr=SimpleUploadedFile("previo.png", b"png", content_type="image/png"),
+        )
+
+    def test_renderizado_png_en_cache(self):
+        contenido = renderizar_qr("Asistente: Ana, Evento: Feria QR, Clave: X")
+
+        self.assertTrue(contenido.startswith(b'\x89PNG'))
+        with mock.patch('app_admin_eventos.qr.qrcode.QRCode') as codificador:
+            self.assertEqual(renderizar_qr("Asistente: Ana, Evento: Feria QR, Clave: X"), contenido)
+        codificador.assert_not_called()
+
+    def test_mismo_payload_no_se_vuelve_a_subir(self):
+        primero = self.crear_asistente_evento("ana")
+        segundo = self.crear_asistente_evento("beto")
+        payload = 'A1.1.firma'
+
+        contenido = asignar_qr(primero, 'asi_eve_qr', payload)
+        primero.save()
+        qr._cache.clear()
+
+        with mock.patch('app_admin_eventos.qr.qrcode.QRCode') as codificador:
+            self.assertEqual(asignar_qr(segundo, 'asi_eve_qr', payload), contenido)
+        codificador.assert_not_called()
+        segundo.save()
+
+        self.assertEqual(primero.asi_eve_qr.name, segundo.asi_eve_qr.name)
+        # Sin copias con sufijo (qr_<huella>_abc123.png) en el directorio
+        directorio, archivo = os.path.split(primero.asi_eve_qr.path)
+        prefijo = os.path.splitext(archivo)[0]
+        self.assertEqual([f for f in os.listdir(directorio) if f.startswith(prefijo)], [archivo])
+
+    def test_lote_sube_una_vez_por_huella(self):
+        inscritos = [self.crear_asistente_evento(f"lote{i}") for i in range(3)]
+        payloads = [
+            'A1.1.uno',
+            'A2.1.dos',
+            'A1.1.uno',
+        ]
+
+        with mock.patch.object(AsistenteEvento._meta.get_field('asi_eve_qr').storage, 'save',
+                               wraps=AsistenteEvento._meta.get_field('asi_eve_qr').storage.save) as guardar:
+            contenidos = asignar_qrs(inscritos, 'asi_eve_qr', payloads)
+        AsistenteEvento.objects.bulk_update(inscritos, ['asi_eve_qr'])
+
+        self.assertEqual(guardar.call_count, 2)
+        self.assertEqual(contenidos[0], contenidos[2])
+        nombres = list(AsistenteEvento.objects.filter(pk__in=[i.pk for i in inscritos]).order_by('pk').values_list('asi_eve_qr', flat=True))
+        self.assertEqual(nombres[0], nombres[2])
+        self.assertNotEqual(nombres[0], nombres[1])
+
+    def test_aprobar_asistente_adjunta_qr(self):
+        inscrito = self.crear_asistente_evento("carla")
+
+        self.client.get(reverse('aprobar_asi', args=[self.evento.id, inscrito.id]))
+
+        inscrito.refresh_from_db()
+        self.assertEqual(inscrito.asi_eve_estado, 'Aprobado')
+        self.assertTrue(os.path.basename(inscrito.asi_eve_qr.name).startswith('qr_'))
+        self.assertEqual(len(mail.outbox), 1)
+        nombre, contenido, tipo = mail.outbox[0].attachments[0]
+        self.assertEqual(tipo, 'image/png')
+        with inscrito.asi_eve_qr.open('rb') as archivo:
+            self.assertEqual(archivo.read(), contenido)
+
+    def test_aprobar_grupo_en_lote(self):
+        lider = Participante.objects.create(usuario=self.crear_usuario("lider", Usuario.Roles.PARTICIPANTE))
+        proyecto = ParticipanteEvento.objects.create(
+            par_eve_participante_fk=lider, par_eve_evento_fk=self.evento, par_eve_estado='Pendiente',
+            par_eve_es_grupo=True, par_eve_codigo_proyecto='GRP1',
+        )
+        for i in range(3):
+            miembro = Participante.objects.create(usuario=self.crear_usuario(f"miembro{i}", Usuario.Roles.PARTICIPANTE))
+            ParticipanteEvento.objects.create(
+                par_eve_participante_fk=miembro, par_eve_evento_fk=self.evento, par_eve_estado='Pendiente',
+                par_eve_es_grupo=True, par_eve_proyecto_principal=proyecto,
+            )
+
+        self.client.get(reverse('aprobar_par', args=[self.evento.id, proyecto.id]))
+
+        grupo = ParticipanteEvento.objects.filter(par_eve_evento_fk=self.evento)
+        self.assertEqual(set(grupo.values_list('par_eve_estado', flat=True)), {'Aprobado'})
+        self.assertEqual(len(set(grupo.values_list('par_eve_qr', flat=True))), 4)
+        self.assertEqual(len(mail.outbox), 4)
@@ -0,0 +1,58 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from app_admin_eventos import referencias
+from app_admin_eventos.forms import EventoForm
+from app_admin_eventos.models import Area, Categoria
+
+
+class RegistroReferenciasTestCase(TestCase):
+    """
+    Registro de áreas y categorías: copia por proceso, validada contra una
+    versión en la caché compartida que suben las señales.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.area = Area.objects.create(are_nombre="Ciencias", are_descripcion="Área")
+        self.otra_area = Area.objects.create(are_nombre="Artes", are_descripcion="Área")
+        self.categoria = Categoria.objects.create(cat_nombre="Física", cat_descripcion="Cat", cat_area_fk=self.area)
+        Categoria.objects.create(cat_nombre="Pintura", cat_descripcion="Cat", cat_area_fk=self.otra_area)
+
+    def test_lecturas_repetidas_no_consultan_la_base(self):
+        referencias.areas()
+        with self.assertNumQueries(0):
+            self.assertEqual([area.are_nombre for area in referencias.areas()], ["Ciencias", "Artes"])
+            nombres = [(c.cat_nombre, c.cat_area_fk.are_nombre) for c in referencias.categorias()]
+            self.assertEqual(nombres, [("Física", "Ciencias"), ("Pintura", "Artes")])
+            self.assertEqual(referencias.categorias(self.area.id), (self.categoria,))
+            self.assertEqual(referencias.categoria(self.categoria.id).cat_nombre, "Física")
+
+    def test_cambios_suben_la_version(self):
+        referencias.areas()
+        self.area.are_nombre = "Ciencias básicas"
+        self.area.save()
+        Categoria.objects.create(cat_nombre="Química", cat_descripcion="Cat", cat_area_fk=self.area)
+        otra_area_id = self.otra_area.id
+        self.otra_area.delete()
+
+        self.assertEqual([area.are_nombre for area in referencias.areas()], ["Ciencias básicas"])
+        self.assertEqual([c.cat_nombre for c in referencias.categorias()], ["Física", "Química"])
+        self.assertIsNone(referencias.area(otra_area_id))
+
+    def test_otro_proceso_invalida_la_copia_local(self):
+        referencias.areas()
+        # Otro proceso edita por SQL y sube la versión compartida
+        Area.objects.filter(pk=self.area.pk).update(are_nombre="Editada")
+        cache.incr(referencias.LLAVE_VERSION)
+
+        with self.assertNumQueries(2):
+            self.assertEqual(referencias.area(self.area.id).are_nombre, "Editada")
+
+    def test_formulario_de_evento_usa_el_registro(self):
+        referencias.areas()
+        with self.assertNumQueries(0):
+            form = EventoForm()
+            html = str(form['area']) + str(form['categorias'])
+        self.assertIn("Ciencias", html)
+        self.assertIn(f'value="{self.categoria.id}"', html)
@@ -36,6 +36,12 @@ urlpatterns = [
     path('rechazar_par/<int:evento_id>/<int:participante_id>/', views.RechazarParticipanteView.as_view(), name='rechazar_par'),
 
     path('estadisticas/<int:evento_id>/', views.EstadisticasView.as_view(), name='estadisticas_evento'),
+    path('estadisticas/<int:evento_id>/json/', views.EstadisticasJsonView.as_view(), name='estadisticas_evento_json'),
+
+    path('evento/<int:evento_id>/ingreso/', views.ControlIngresoView.as_view(), name='control_ingreso'),
+    path('evento/<int:evento_id>/ingreso/escanear/', views.EscanearIngresoView.as_view(), name='escanear_ingreso'),
+    path('evento/<int:evento_id>/ingreso/snapshot/', views.SnapshotIngresoView.as_view(), name='snapshot_ingreso'),
+    path('evento/<int:evento_id>/ingreso/sincronizar/', views.SincronizarIngresosView.as_view(), name='sincronizar_ingresos'),
 
 
     path('ver_criterios/<int:evento_id>/', views.CriterioListView.as_view(), name='ver_criterios'),
@@ -59,6 +65,8 @@ urlpatterns = [
     
 
     path('evento/<int:evento_id>/certificados/',CertificadosView.as_view(),name='certificados_admin'),
+    path('evento/<int:evento_id>/certificados/lote/<int:lote_id>/progreso/', views.ProgresoCertificadosView.as_view(), name='progreso_certificados'),
+    path('evento/<int:evento_id>/certificados/<int:certificado_id>/reenviar/', views.ReenviarCertificadoView.as_view(), name='reenviar_certificado'),
 
     # AJAX para cargar personas (sin @admin_required, usa login y session cookies)
     path('evento/cargar_personas/',cargar_personas,name='cargar_personas'),
@@ -1,18 +1,25 @@
 from django.core.mail import EmailMessage
+import json
 import os
 import random
 import string
-from django.http import HttpResponse, JsonResponse
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse
 from django.views import View
 from django.views.generic import CreateView, ListView, UpdateView, DeleteView, DetailView
 from django.urls import reverse, reverse_lazy
-import qrcode
 from requests import request
-from .models import Criterio, Evento, EventoCategoria, Area, Categoria
+from .models import Criterio, EstadoInscripcion, Evento, EventoCategoria, Area, Categoria, RegistroIngreso
+from .filtros import estado_canonico
+from .cupos import cambiar_estado_asistente
+from .ingreso import LOTE_MAXIMO, clave_estacion, registrar_ingreso, sincronizar_ingresos, snapshot_evento, token_ingreso
+from .qr import asignar_qr, asignar_qrs
+from . import referencias
 from app_usuarios.models import AdministradorEvento , Usuario
 from app_participantes.models import ParticipanteEvento 
 from app_asistentes.models import  AsistenteEvento
-from app_evaluadores.models import EvaluadorEvento, Calificacion
+from app_evaluadores.models import EvaluadorEvento, Calificacion, PosicionRanking
+from app_evaluadores.puntajes import recalcular_evento
+from app_evaluadores.ranking import podio
 from app_admin_eventos.forms import EventoForm, EditarUsuarioAdministradorForm, CategoriaForm
 from django.views.generic.edit import FormView
 from django.views.decorators.http import require_POST
@@ -28,8 +35,6 @@ from django.utils import timezone
 from principal_eventos.settings import DEFAULT_FROM_EMAIL
 import time
 from django.db.models import Q
-from django.core.files.base import ContentFile
-from io import BytesIO
 from django.db.models import Exists, OuterRef
 from django.utils.decorators import method_decorator
 from django.contrib.auth.hashers import check_password, make_password
@@ -47,7 +52,9 @@ from app_evaluadores.models import Calificacion
 from django.views import View
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from .models import MemoriaEvento
+from .models import MemoriaEvento, LoteCertificados, CertificadoGenerado
+from .certificados import enviar_certificado, personas_del_evento
+from .estadisticas import estadisticas_evento
 from django.template.loader import render_to_string
 from xhtml2pdf import pisa
 from django.templatetags.static import static
@@ -115,7 +122,7 @@ class MenuPrincipalView(ListView):
 
     def get_queryset(self):
         # Obtener el administrador de evento logueado
-        admin_evento = get_object_or_404(AdministradorEvento, usuario=self.request.user)
+        admin_evento = self.request.perfiles.requerido('admin')
 
         # Filtrar eventos de este administrador
         return Evento.objects.filter(
@@ -124,7 +131,7 @@ class MenuPrincipalView(ListView):
 
     # Forzar que el admin cambie su contraseña en el primer login
     def dispatch(self, request, *args, **kwargs):
-        admin_evento = get_object_or_404(AdministradorEvento, usuario=request.user)
+        admin_evento = request.perfiles.requerido('admin')
 
         if not admin_evento.usuario.last_login:
             return redirect('cambio_password_admin')
@@ -168,8 +175,7 @@ class CambioPasswordAdminView(View):
             return render(request, self.template_name)
 
         # 🔍 Obtener el administrador actual
-        admin_id = request.session.get('admin_id')
-        admin = get_object_or_404(AdministradorEvento, pk=admin_id)
+        admin = request.perfiles.requerido('admin')
         usuario = admin.usuario
 
         # 🔐 Cambiar contraseña
@@ -194,7 +200,7 @@ class EditarAdministradorView(View):
     template_name = 'editar_administrador.html'
 
     def get(self, request, administrador_id):
-        administrador = get_object_or_404(AdministradorEvento, usuario=self.request.user)
+        administrador = self.request.perfiles.requerido('admin')
         usuario = administrador.usuario
         form = EditarUsuarioAdministradorForm(instance=usuario)
         relacion = Evento.objects.filter(eve_administrador_fk=administrador).first()
@@ -207,7 +213,7 @@ class EditarAdministradorView(View):
         })
 
     def post(self, request, administrador_id):
-        administrador = get_object_or_404(AdministradorEvento, usuario=self.request.user)
+        administrador = self.request.perfiles.requerido('admin')
         usuario = administrador.usuario
         relacion = Evento.objects.filter(eve_administrador_fk=administrador).first()
 
@@ -305,7 +311,7 @@ class EventoCreateView(CreateView):
         evento = form.save(commit=False)
 
         # ✅ Obtener administrador desde el usuario logueado
-        administrador = get_object_or_404(AdministradorEvento, usuario=self.request.user)
+        administrador = self.request.perfiles.requerido('admin')
         evento.eve_administrador_fk = administrador
         evento.save()
 
@@ -383,15 +389,15 @@ class ListaCategoriasView(ListView):
     context_object_name = "categorias"
 
     def get_queryset(self):
-        queryset = super().get_queryset()
-        area_id = self.request.GET.get("area")  # obtenemos el id del área desde el filtro
-        if area_id:
-            queryset = queryset.filter(cat_area_fk_id=area_id)
-        return queryset
+        # Desde el registro de referencia, con el área de cada categoría ya cargada
+        area_id = self.request.GET.get("area", "")  # obtenemos el id del área desde el filtro
+        if area_id.isdigit():
+            return referencias.categorias(area_id)
+        return referencias.categorias()
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["areas"] = Area.objects.all()
+        context["areas"] = referencias.areas()
         context["area_seleccionada"] = self.request.GET.get("area", "")
         return context
 
@@ -440,8 +446,8 @@ class EventoEditarView(UpdateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['areas'] = Area.objects.all()
-        context['categorias'] = Categoria.objects.all()
+        context['areas'] = referencias.areas()
+        context['categorias'] = referencias.categorias()
         context['selected_categorias'] = self.object.categorias.all()
         return context
 
@@ -572,7 +578,7 @@ class ValidacionParticipanteView(View):
             )
 
         if estado:
-            participantes_evento = participantes_evento.filter(par_eve_estado__iexact=estado)
+            participantes_evento = participantes_evento.filter(par_eve_estado=estado_canonico(EstadoInscripcion, estado))
 
         data = []
         for par in participantes_evento:
@@ -628,36 +634,29 @@ class AprobarParticipanteView(View):
             miembros_aprobados = []
             correos_enviados = []
             
+            payloads = []
             for miembro_pe in todos_miembros:
                 # Generar clave aleatoria para cada miembro
                 clave = ''.join(random.choices(string.ascii_letters + string.digits, k=10))
                 miembro_pe.par_eve_clave = clave
                 miembro_pe.par_eve_estado = 'Aprobado'
 
-                # Contenido del QR para cada miembro
-                miembro_participante = miembro_pe.par_eve_participante_fk
-                es_lider = miembro_pe.par_eve_proyecto_principal is None
-                rol_texto = "Líder" if es_lider else "Miembro"
-                
-                qr_data = f"Participante: {miembro_participante.usuario.first_name}, Rol: {rol_texto}, Grupo: {participante_evento.par_eve_codigo_proyecto}, Evento: {evento.eve_nombre}, Clave: {clave}"
-                qr_img = qrcode.make(qr_data)
+                # El QR lleva el token firmado de ingreso de cada miembro
+                payloads.append(token_ingreso(miembro_pe))
 
-                # Guardar QR en memoria como archivo
-                buffer = BytesIO()
-                qr_img.save(buffer, format='PNG')
-                file_name = f"qr_grupo_{participante_evento.par_eve_codigo_proyecto}_{miembro_participante.id}.png"
-                miembro_pe.par_eve_qr.save(file_name, ContentFile(buffer.getvalue()), save=False)
-
-                # Guardar en base de datos
-                miembro_pe.save()
+            # QR de todo el grupo en lote y una sola escritura en base de datos
+            contenidos_qr = asignar_qrs(todos_miembros, 'par_eve_qr', payloads)
+            ParticipanteEvento.objects.bulk_update(todos_miembros, ['par_eve_clave', 'par_eve_estado', 'par_eve_qr'])
 
+            for miembro_pe, contenido_qr in zip(todos_miembros, contenidos_qr):
+                miembro_participante = miembro_pe.par_eve_participante_fk
                 # Preparar información para el correo
                 miembros_aprobados.append({
                     'participante': miembro_participante,
-                    'clave': clave,
-                    'es_lider': es_lider,
-                    'qr_buffer': buffer.getvalue(),
-                    'file_name': file_name
+                    'clave': miembro_pe.par_eve_clave,
+                    'es_lider': miembro_pe.par_eve_proyecto_principal_id is None,
+                    'qr_buffer': contenido_qr,
+                    'file_name': f"qr_grupo_{participante_evento.par_eve_codigo_proyecto}_{miembro_participante.id}.png"
                 })
 
             # Enviar correos a todos los miembros del grupo
@@ -711,14 +710,9 @@ class AprobarParticipanteView(View):
             participante_evento.par_eve_estado = 'Aprobado'
 
             # Contenido del QR
-            qr_data = f"Participante: {participante.usuario.first_name}, Evento: {evento.eve_nombre}, Clave: {clave}"
-            qr_img = qrcode.make(qr_data)
-
-            # Guardar QR en memoria como archivo
-            buffer = BytesIO()
-            qr_img.save(buffer, format='PNG')
+            qr_data = token_ingreso(participante_evento)
+            contenido_qr = asignar_qr(participante_evento, 'par_eve_qr', qr_data)
             file_name = f"qr_participante_{participante.id}.png"
-            participante_evento.par_eve_qr.save(file_name, ContentFile(buffer.getvalue()), save=False)
 
             # Guardar en base de datos
             participante_evento.save()
@@ -742,7 +736,7 @@ class AprobarParticipanteView(View):
             )
 
             # Adjuntar el QR
-            email.attach(file_name, buffer.getvalue(), 'image/png')
+            email.attach(file_name, contenido_qr, 'image/png')
 
             try:
                 email.send(fail_silently=False)
@@ -892,7 +886,7 @@ class ValidacionAsistentesView(View):
 
         # Filtro por estado exacto
         if estado:
-            asistentes_evento = asistentes_evento.filter(asi_eve_estado__iexact=estado)
+            asistentes_evento = asistentes_evento.filter(asi_eve_estado=estado_canonico(EstadoInscripcion, estado))
 
         # Construcción del contexto
         data = []
@@ -923,32 +917,38 @@ class ValidacionAsistentesView(View):
 @method_decorator(admin_required, name='dispatch')
 class AprobarAsistenteView(View):
     def get(self, request, evento_id, asistente_id):
-        asistente_evento = get_object_or_404(AsistenteEvento, id=asistente_id)
+        asistente_evento = get_object_or_404(
+            AsistenteEvento.objects.select_related('asi_eve_evento_fk'), id=asistente_id, asi_eve_evento_fk_id=evento_id,
+        )
         asistente = asistente_evento.asi_eve_asistente_fk
-        evento = get_object_or_404(Evento, id=evento_id)
+        evento = asistente_evento.asi_eve_evento_fk
 
-        # Validar capacidad
-        if evento.eve_capacidad <= 0:
+        if asistente_evento.asi_eve_estado == EstadoInscripcion.APROBADO:
+            messages.info(request, f"El asistente {asistente} ya estaba aprobado.")
+            return redirect('validacion_asi', evento_id=evento_id)
+
+        # Validar capacidad: una inscripción Pendiente ya tiene su cupo; una
+        # Rechazada o Cancelada necesita tomar uno nuevo. El cambio de estado es
+        # condicional: si otra petición lo cambió antes, no se toca el cupo
+        cambiado = cambiar_estado_asistente(asistente_evento, EstadoInscripcion.APROBADO)
+        if cambiado is None:
+            messages.warning(request, "La inscripción cambió mientras se procesaba. Revisa su estado actual.")
+            return redirect('validacion_asi', evento_id=evento_id)
+        if not cambiado:
             messages.error(request, "No hay cupos disponibles para este evento.")
             return redirect('validacion_asi', evento_id=evento_id)
 
         # Generar clave aleatoria
         clave = ''.join(random.choices(string.ascii_letters + string.digits, k=10))
         asistente_evento.asi_eve_clave = clave
-        asistente_evento.asi_eve_estado = 'Aprobado'
 
         # Crear QR
-        qr_data = f"Asistente: {asistente.usuario.first_name}, Evento: {evento.eve_nombre}, Clave: {clave}"
-        qr_img = qrcode.make(qr_data)
-        buffer = BytesIO()
-        qr_img.save(buffer, format='PNG')
+        qr_data = token_ingreso(asistente_evento)
+        contenido_qr = asignar_qr(asistente_evento, 'asi_eve_qr', qr_data)
         file_name = f"qr_asistente_{asistente.id}.png"
-        asistente_evento.asi_eve_qr.save(file_name, ContentFile(buffer.getvalue()), save=False)
 
-        # Guardar evento y relación
-        evento.eve_capacidad -= 1
-        evento.save()
-        asistente_evento.save()
+        # Guardar relación (el estado ya quedó escrito arriba)
+        asistente_evento.save(update_fields=['asi_eve_clave', 'asi_eve_qr'])
 
         # Enviar correo
         subject = f"Confirmación de inscripción: {evento.eve_nombre}"
@@ -966,7 +966,7 @@ class AprobarAsistenteView(View):
             from_email=DEFAULT_FROM_EMAIL,
             to=[asistente.usuario.email],
         )
-        email.attach(file_name, buffer.getvalue(), 'image/png')
+        email.attach(file_name, contenido_qr, 'image/png')
         email.send(fail_silently=False)
 
         messages.success(request, f"Asistente {asistente} ha sido aprobado correctamente. Clave: {clave}")
@@ -976,12 +976,16 @@ class AprobarAsistenteView(View):
 @method_decorator(admin_required, name='dispatch')
 class RechazarAsistenteView(View):
     def get(self, request, evento_id, asistente_id):
-        asistente_evento = get_object_or_404(AsistenteEvento, id=asistente_id)
+        asistente_evento = get_object_or_404(AsistenteEvento, id=asistente_id, asi_eve_evento_fk_id=evento_id)
         asistente = asistente_evento.asi_eve_asistente_fk
         evento = asistente_evento.asi_eve_evento_fk
 
-        # Cambiar estado y limpiar datos
-        asistente_evento.asi_eve_estado = 'Rechazado'
+        # Cambiar estado (libera el cupo si lo ocupaba) solo si nadie lo cambió antes
+        if asistente_evento.asi_eve_estado == EstadoInscripcion.RECHAZADO or not cambiar_estado_asistente(
+            asistente_evento, EstadoInscripcion.RECHAZADO
+        ):
+            messages.warning(request, f"La inscripción de {asistente} ya fue rechazada o cambió de estado.")
+            return redirect('validacion_asi', evento_id=evento_id)
         asistente_evento.asi_eve_clave = ''
 
         # Eliminar archivo QR si existe
@@ -991,12 +995,8 @@ class RechazarAsistenteView(View):
             if os.path.exists(qr_path):
                 os.remove(qr_path)
 
-        # ✅ Aumentar el cupo del evento
-        evento.eve_capacidad += 1
-        evento.save()
-
-        # Guardar la relación actualizada
-        asistente_evento.save()
+        # Guardar la relación actualizada (el estado ya quedó escrito arriba)
+        asistente_evento.save(update_fields=['asi_eve_clave', 'asi_eve_qr'])
 
         # Enviar correo de rechazo
         subject = f"Rechazo de inscripción al evento: {evento.eve_nombre}"
@@ -1029,45 +1029,129 @@ class RechazarAsistenteView(View):
 class EstadisticasView(View):
     def get(self, request, evento_id):
         evento = get_object_or_404(Evento, id=evento_id)
-
-        # Calcular cupos del evento
-        cupos_disponibles = evento.eve_capacidad
-        cupos_ocupados = evento.eve_capacidad - cupos_disponibles
-        cupos_totales = evento.eve_capacidad
-        porcentaje_ocupacion = (cupos_ocupados / cupos_totales * 100) if cupos_totales > 0 else 0
-
-        # Participantes
-        total_participantes = ParticipanteEvento.objects.filter(par_eve_evento_fk=evento).count()
-        aprobados_participantes = ParticipanteEvento.objects.filter(par_eve_evento_fk=evento, par_eve_estado='Aprobado').count()
-        rechazados_participantes = ParticipanteEvento.objects.filter(par_eve_evento_fk=evento, par_eve_estado='Rechazado').count()
-        pendientes_participantes = total_participantes - (aprobados_participantes + rechazados_participantes)
-
-        # Asistentes
-        total_asistentes = AsistenteEvento.objects.filter(asi_eve_evento_fk=evento).count()
-        aprobados_asistentes = AsistenteEvento.objects.filter(asi_eve_evento_fk=evento, asi_eve_estado='Aprobado').count()
-        rechazados_asistentes = AsistenteEvento.objects.filter(asi_eve_evento_fk=evento, asi_eve_estado='Rechazado').count()
-        pendientes_asistentes = total_asistentes - (aprobados_asistentes + rechazados_asistentes)
+        datos = estadisticas_evento(evento)
+        cupos, participantes, asistentes, evaluadores = (
+            datos['cupos'], datos['participantes'], datos['asistentes'], datos['evaluadores']
+        )
 
         # Contexto para la plantilla
         context = {
             'evento': evento,
-            'cupos_disponibles': cupos_disponibles,
-            'cupos_ocupados': cupos_ocupados,
-            'cupos_totales': cupos_totales,
-            'porcentaje_ocupacion': porcentaje_ocupacion,
-            'total_participantes': total_participantes,
-            'aprobados_participantes': aprobados_participantes,
-            'rechazados_participantes': rechazados_participantes,
-            'pendientes_participantes': pendientes_participantes,
-            'total_asistentes': total_asistentes,
-            'aprobados_asistentes': aprobados_asistentes,
-            'rechazados_asistentes': rechazados_asistentes,
-            'pendientes_asistentes': pendientes_asistentes  
+            'cupos_disponibles': cupos['disponibles'],
+            'cupos_ocupados': cupos['ocupados'],
+            'cupos_totales': cupos['totales'],
+            'porcentaje_ocupacion': cupos['porcentaje_ocupacion'],
+            'total_participantes': participantes['total'],
+            'aprobados_participantes': participantes['aprobados'],
+            'rechazados_participantes': participantes['rechazados'],
+            'pendientes_participantes': participantes['pendientes'],
+            'proyectos_individuales': participantes['proyectos_individuales'],
+            'proyectos_grupales': participantes['proyectos_grupales'],
+            'total_asistentes': asistentes['total'],
+            'aprobados_asistentes': asistentes['aprobados'],
+            'rechazados_asistentes': asistentes['rechazados'],
+            'pendientes_asistentes': asistentes['pendientes'],
+            'total_evaluadores': evaluadores['total'],
+            'aprobados_evaluadores': evaluadores['aprobados'],
+            'rechazados_evaluadores': evaluadores['rechazados'],
+            'pendientes_evaluadores': evaluadores['pendientes'],
         }
 
         return render(request, 'estadisticas.html', context)
 
 
+@method_decorator(admin_required, name='dispatch')
+class EstadisticasJsonView(View):
+    def get(self, request, evento_id):
+        evento = get_object_or_404(Evento, id=evento_id)
+        return JsonResponse({'evento': evento.id, **estadisticas_evento(evento)})
+
+
+#############################--- Control de Ingreso ---##############################
+def evento_del_admin(request, evento_id):
+    """Evento `evento_id` (o 404) si lo administra el admin de la sesión; None si es de otro."""
+    administrador = request.perfiles.requerido('admin')
+    evento = get_object_or_404(Evento, id=evento_id)
+    return evento if evento.eve_administrador_fk_id == administrador.id else None
+
+
+SIN_PERMISO_EVENTO = "No administras este evento."
+
+
+@method_decorator(admin_required, name='dispatch')
+class ControlIngresoView(View):
+    def get(self, request, evento_id):
+        evento = evento_del_admin(request, evento_id)
+        if evento is None:
+            return HttpResponseForbidden(SIN_PERMISO_EVENTO)
+        ingresos = RegistroIngreso.objects.filter(ing_evento_fk=evento)
+        return render(request, 'control_ingreso.html', {
+            'evento': evento,
+            'clave_estacion': clave_estacion(evento.id),
+            'total_ingresos': ingresos.count(),
+            'ultimos_ingresos': ingresos.order_by('-ing_fecha_hora')[:20],
+        })
+
+
+@method_decorator(admin_required, name='dispatch')
+class EscanearIngresoView(View):
+    """
+    Endpoint de los lectores de la puerta: recibe el token del QR y responde
+    en JSON si la persona puede ingresar.
+    """
+    def post(self, request, evento_id):
+        if evento_del_admin(request, evento_id) is None:
+            return JsonResponse({'resultado': 'prohibido', 'error': SIN_PERMISO_EVENTO}, status=403)
+        resultado = registrar_ingreso(
+            evento_id,
+            request.POST.get('token', ''),
+            dispositivo=request.POST.get('dispositivo', ''),
+        )
+        if resultado.get('hora'):
+            resultado['hora'] = timezone.localtime(resultado['hora']).strftime('%H:%M:%S')
+        return JsonResponse(resultado, status=200 if resultado['resultado'] in ('ingreso', 'repetido') else 400)
+
+
+@method_decorator(admin_required, name='dispatch')
+class SnapshotIngresoView(View):
+    """
+    Foto firmada de las llaves de acceso para validar QR sin conexión.
+    Si la estación ya tiene la versión vigente responde 304 sin cuerpo.
+    """
+    def get(self, request, evento_id):
+        evento = evento_del_admin(request, evento_id)
+        if evento is None:
+            return JsonResponse({'error': SIN_PERMISO_EVENTO}, status=403)
+        snapshot = snapshot_evento(evento.id)
+        if request.GET.get('version') == snapshot['version']:
+            return HttpResponse(status=304)
+        return JsonResponse(snapshot)
+
+
+@method_decorator(admin_required, name='dispatch')
+class SincronizarIngresosView(View):
+    """
+    Recibe en JSON los ingresos acumulados por una estación sin conexión:
+    {"dispositivo": "...", "registros": [{"token": "...", "hora": "ISO 8601"}, ...]}
+    """
+    def post(self, request, evento_id):
+        if evento_del_admin(request, evento_id) is None:
+            return JsonResponse({'error': SIN_PERMISO_EVENTO}, status=403)
+        try:
+            datos = json.loads(request.body)
+            registros = datos['registros']
+            if not isinstance(registros, list):
+                raise ValueError
+        except (ValueError, KeyError, TypeError):
+            return JsonResponse({'error': 'Formato inválido'}, status=400)
+
+        if len(registros) > LOTE_MAXIMO:
+            return JsonResponse({'error': f'Máximo {LOTE_MAXIMO} registros por lote'}, status=413)
+
+        resultado = sincronizar_ingresos(evento_id, registros, dispositivo=str(datos.get('dispositivo', '')))
+        return JsonResponse(resultado)
+
+
 #############################--- Crear Criterio ---##############################
 @method_decorator(admin_required, name='dispatch')
 class CriterioListView(ListView):
@@ -1181,10 +1265,15 @@ class ActualizarCriterioView(View):
             return redirect('crear_criterio', evento_id=criterio.cri_evento_fk.id)
 
         # Guardar si pasa validación
+        cambia_peso = criterio.cri_peso != nuevo_peso
         criterio.cri_descripcion = descripcion
         criterio.cri_peso = nuevo_peso
         criterio.save()
 
+        # Un peso distinto cambia los puntajes ponderados de todo el evento
+        if cambia_peso:
+            recalcular_evento(criterio.cri_evento_fk_id)
+
         messages.success(request, 'Criterio actualizado exitosamente.')
         return redirect('crear_criterio', evento_id=criterio.cri_evento_fk.id)
 
@@ -1194,6 +1283,7 @@ class EliminarCriterioView(View):
         criterio = get_object_or_404(Criterio, pk=criterio_id)
         evento_id = criterio.cri_evento_fk.id
         criterio.delete()
+        recalcular_evento(evento_id)
 
         messages.success(request, 'Criterio eliminado exitosamente.')
         return redirect('crear_criterio', evento_id=evento_id)
@@ -1221,29 +1311,17 @@ class CriterioAgregadosListView(ListView):
 @method_decorator(admin_required, name='dispatch')
 class VerPodioParticipantesAdminView(View):
     def get(self, request, evento_id):
-        usuario = request.user
-        administrador = get_object_or_404(AdministradorEvento, usuario=usuario)
+        administrador = request.perfiles.requerido('admin')
 
         # ✅ Obtener evento
         evento = get_object_or_404(Evento, pk=evento_id)
 
         # ✅ Validar que el evento pertenezca al admin logueado
-        if evento.eve_administrador_fk != administrador:
+        if evento.eve_administrador_fk_id != administrador.id:
             return redirect('acceso_denegado')
 
-        # ✅ Obtener participantes con sus calificaciones
-        participantes_evento = ParticipanteEvento.objects.filter(
-            par_eve_evento_fk=evento
-        ).select_related('par_eve_participante_fk__usuario')
-
-        # ✅ Filtrar los que tienen calificación
-        participantes_calificados = [pe for pe in participantes_evento if pe.calificacion is not None]
-
-        # ✅ Ordenar de mayor a menor
-        participantes_calificados.sort(key=lambda x: x.calificacion, reverse=True)
-
-        # ✅ (Opcional) Mostrar solo el top 3
-        # participantes_calificados = participantes_calificados[:3]
+        # ✅ Ranking precalculado, ya ordenado de mayor a menor
+        participantes_calificados = podio(evento.id)
 
         context = {
             'evento': evento,
@@ -1271,10 +1349,9 @@ class DetalleCalificacionAdminView(DetailView):
         evento = get_object_or_404(Evento, id=evento_id)
 
         # Verificamos que el administrador logueado sea el encargado de este evento
-        id = self.request.session.get('id')
-        administrador = get_object_or_404(AdministradorEvento, pk=id)
+        administrador = self.request.perfiles.requerido('admin')
         
-        if evento.eve_administrador_fk != administrador:
+        if evento.eve_administrador_fk_id != administrador.id:
             return redirect('acceso_denegado')
 
         participante_evento = get_object_or_404(
@@ -1321,7 +1398,7 @@ class ValidacionEvaluadorView(View):
             )
 
         if estado:
-            evaluadores_evento = evaluadores_evento.filter(eva_eve_estado__iexact=estado)
+            evaluadores_evento = evaluadores_evento.filter(eva_eve_estado=estado_canonico(EstadoInscripcion, estado))
 
         
 
@@ -1361,13 +1438,9 @@ class AprobarEvaluadorView(View):
         evaluador_evento.eva_eve_estado = 'Aprobado'
 
         # Crear QR
-        qr_data = f"Evaluador: {evaluador.usuario.first_name}, Evento: {evento.eve_nombre}, Clave: {clave}"
-        qr_img = qrcode.make(qr_data)
-
-        buffer = BytesIO()
-        qr_img.save(buffer, format='PNG')
+        qr_data = token_ingreso(evaluador_evento)
+        contenido_qr = asignar_qr(evaluador_evento, 'eva_eve_qr', qr_data)
         file_name = f"qr_evaluador_{evaluador.id}.png"
-        evaluador_evento.eva_eve_qr.save(file_name, ContentFile(buffer.getvalue()), save=False)
 
         evaluador_evento.save()
 
@@ -1388,7 +1461,7 @@ class AprobarEvaluadorView(View):
             from_email=DEFAULT_FROM_EMAIL,
             to=[evaluador.usuario.email],
         )
-        email.attach(file_name, buffer.getvalue(), 'image/png')
+        email.attach(file_name, contenido_qr, 'image/png')
 
         try:
             email.send(fail_silently=False)
@@ -1487,87 +1560,64 @@ class InformacionTecnicaEventoView(View):
 class CertificadosView(View):
     def get(self, request, evento_id):
         evento = get_object_or_404(Evento, id=evento_id)
-        return render(request, 'enviar_certificados.html', {'evento': evento})
+        lotes = LoteCertificados.objects.filter(lot_evento_fk=evento)[:10]
+        certificados = CertificadoGenerado.objects.filter(cer_evento_fk=evento).order_by('cer_tipo', 'cer_nombre')
+        return render(request, 'enviar_certificados.html', {
+            'evento': evento,
+            'lotes': lotes,
+            'certificados': certificados,
+        })
 
     def post(self, request, evento_id):
         tipo = request.POST.get("tipo_persona")
         personas_ids = request.POST.getlist("personas")
 
-        if not (personas_ids and tipo):
+        if not (personas_ids and tipo in LoteCertificados.Tipos.values):
             messages.error(request, "❌ Debes seleccionar un tipo de persona y al menos una persona.")
             return redirect('certificados_admin', evento_id=evento_id)
 
-        # Obtener personas según tipo
-        personas = []
-        template_name = None
-
-        if tipo == "participantes":
-            qs = ParticipanteEvento.objects.filter(
-                par_eve_evento_fk_id=evento_id,
-                par_eve_participante_fk__in=personas_ids
-            )
-            personas = [rel.par_eve_participante_fk for rel in qs]
-            template_name = "certificado_participante.html"
-
-        elif tipo == "evaluadores":
-            qs = EvaluadorEvento.objects.filter(
-                eva_eve_evento_fk_id=evento_id,
-                eva_eve_evaluador_fk__in=personas_ids
-            )
-            personas = [rel.eva_eve_evaluador_fk for rel in qs]
-            template_name = "certificado_evaluador.html"
-
-        elif tipo == "asistentes":
-            qs = AsistenteEvento.objects.filter(
-                asi_eve_evento_fk_id=evento_id,
-                asi_eve_asistente_fk__in=personas_ids
-            )
-            personas = [rel.asi_eve_asistente_fk for rel in qs]
-            template_name = "certificado_asistente.html"
+        evento = get_object_or_404(Evento, id=evento_id)
+        personas = personas_del_evento(evento.id, tipo, personas_ids)
 
         if not personas:
             messages.warning(request, "⚠️ No se encontró ninguna persona seleccionada.")
             return redirect('certificados_admin', evento_id=evento_id)
 
-        evento = get_object_or_404(Evento, id=evento_id)
-
-        # Generar y enviar certificado para cada persona
-        for persona in personas:
-            # Renderizar plantilla HTML con datos y el template correspondiente
-            html_content = render_to_string(template_name, {
-                "persona": persona,
-                "evento": evento
-            })
+        # La generación corre fuera de la petición (comando procesar_certificados)
+        LoteCertificados.objects.create(
+            lot_evento_fk=evento,
+            lot_tipo=tipo,
+            lot_personas=[persona.pk for persona in personas],
+            lot_total=len(personas),
+        )
 
-            # Convertir HTML a PDF
-            pdf_buffer = BytesIO()
-            pisa_status = pisa.CreatePDF(html_content, dest=pdf_buffer)
-            if pisa_status.err:
-                print(f"Error generando PDF para {persona}")
-                continue
+        messages.success(request, f"⏳ Se están generando {len(personas)} certificado(s). Puedes seguir el progreso aquí.")
+        return redirect('certificados_admin', evento_id=evento_id)
 
-            # Enviar por correo
-            correo = persona.usuario.email
-            nombre_pdf = f"certificado_{tipo}_{str(persona).replace(' ', '_')}.pdf"
 
-            email = EmailMessage(
-                subject="🎓 Tu Certificado",
-                body=(
-                    f"Hola {persona.usuario.first_name},\n\n"
-                    f"Adjunto encontrarás tu certificado correspondiente al evento '{evento.eve_nombre}'.\n\n"
-                    "¡Gracias por participar!"
-                ),
-                from_email=DEFAULT_FROM_EMAIL,
-                to=[correo],
-            )
-            email.attach(nombre_pdf, pdf_buffer.getvalue(), "application/pdf")
+@method_decorator(admin_required, name='dispatch')
+class ProgresoCertificadosView(View):
+    def get(self, request, evento_id, lote_id):
+        lote = get_object_or_404(LoteCertificados, id=lote_id, lot_evento_fk_id=evento_id)
+        return JsonResponse({
+            'estado': lote.lot_estado,
+            'total': lote.lot_total,
+            'generados': lote.lot_generados,
+            'errores': lote.lot_errores,
+            'porcentaje': lote.porcentaje,
+            'terminado': lote.lot_estado in (LoteCertificados.Estados.COMPLETADO, LoteCertificados.Estados.FALLIDO),
+        })
 
-            try:
-                email.send(fail_silently=False)
-            except Exception as e:
-                print(f"Error al enviar correo a {correo}: {e}")
 
-        messages.success(request, "✅ Certificados enviados correctamente.")
+@method_decorator(admin_required, name='dispatch')
+class ReenviarCertificadoView(View):
+    def post(self, request, evento_id, certificado_id):
+        certificado = get_object_or_404(CertificadoGenerado, id=certificado_id, cer_evento_fk_id=evento_id)
+        try:
+            enviar_certificado(certificado)
+            messages.success(request, f"✅ Certificado reenviado a {certificado.cer_correo}.")
+        except Exception as e:
+            messages.error(request, f"❌ No se pudo reenviar el certificado: {e}")
         return redirect('certificados_admin', evento_id=evento_id)
 
 
@@ -1665,30 +1715,17 @@ class PremiacionView(View):
     def get(self, request, evento_id):
         evento = get_object_or_404(Evento, id=evento_id)
 
-        # Sumamos calificaciones por participante en este evento
-        resultados = (
-            Calificacion.objects
-            .filter(cal_criterio_fk__cri_evento_fk=evento)
-            .values('cal_participante_fk')
-            .annotate(total=Sum('cal_valor'))
-            .order_by('-total')
-        )
-
-        # Top 3
-        ganadores = []
-        for idx, r in enumerate(resultados[:3], start=1):
-            participante = Participante.objects.get(pk=r['cal_participante_fk'])
-            if ParticipanteEvento.objects.filter(
-                par_eve_evento_fk=evento,
-                par_eve_participante_fk=participante
-            ).exists():
-                ganadores.append({
-                    'id': participante.pk,
-                    'nombre': str(participante),
-                    'correo': participante.usuario.email,
-                    'puntaje': r['total'],
-                    'puesto': idx,
-                })
+        # Top 3 del ranking precalculado
+        ganadores = [
+            {
+                'id': pe.par_eve_participante_fk.pk,
+                'nombre': str(pe.par_eve_participante_fk),
+                'correo': pe.par_eve_participante_fk.usuario.email,
+                'puntaje': pe.puntaje,
+                'puesto': pe.puesto,
+            }
+            for pe in podio(evento.id, limite=3)
+        ]
 
         return render(request, 'premiacion.html', {
             'evento': evento,
@@ -1704,27 +1741,28 @@ class PremiacionView(View):
             messages.error(request, "❌ Debes seleccionar ganadores y subir un certificado.")
             return redirect('premiacion_admin', evento_id=evento_id)
 
-        # Volvemos a calcular posiciones para tener el puesto de cada id
-        resultados = (
-            Calificacion.objects
-            .filter(cal_criterio_fk__cri_evento_fk=evento)
-            .values('cal_participante_fk')
-            .annotate(total=Sum('cal_valor'))
-            .order_by('-total')
-        )
-        posicion_map = { r['cal_participante_fk']: idx
-                         for idx, r in enumerate(resultados[:3], start=1) }
+        # Puesto y puntaje de cada seleccionado desde el ranking
+        posiciones = {
+            pos.pos_participante_fk_id: pos
+            for pos in PosicionRanking.objects.filter(
+                pos_evento_fk=evento, pos_participante_fk__in=seleccionados
+            ).select_related('pos_participante_fk__usuario')
+        }
 
+        contenido_archivo = archivo.read()
         enviados = 0
         for pid in seleccionados:
-            participante = Participante.objects.get(pk=pid)
-            puesto = posicion_map.get(participante.pk, '?')
-            puntaje = next((r['total'] for r in resultados if r['cal_participante_fk']==participante.pk), None)
+            posicion = posiciones.get(int(pid))
+            if posicion is None:
+                continue
+            participante = posicion.pos_participante_fk
+            puesto = posicion.pos_puesto
+            puntaje = posicion.pos_puntaje
 
             subject = f"🏆 Certificado de Premiación — {evento.eve_nombre}"
             body = (
                 f"Hola {participante.usuario.first_name},\n\n"
-                f"¡Felicidades! Has obtenido el *puesto {puesto}* con un total de *{puntaje} puntos* "
+                f"¡Felicidades! Has obtenido el *puesto {puesto}* con un total de *{puntaje:g} puntos* "
                 f"en el evento \"{evento.eve_nombre}\".\n\n"
                 "Adjunto encontrarás tu certificado de premiación.\n\n"
                 "¡Gracias por tu participación y éxitos en futuras competencias!\n"
@@ -1737,7 +1775,7 @@ class PremiacionView(View):
                 to=[participante.usuario.email],
             )
             nombre_pdf = f"premiacion_puesto{puesto}_{participante.usuario.username}.pdf"
-            email.attach(nombre_pdf, archivo.read(), archivo.content_type)
+            email.attach(nombre_pdf, contenido_archivo, archivo.content_type)
             try:
                 email.send(fail_silently=False)
                 enviados += 1
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.3 on 2026-10-17 23:50
+
+from django.db import migrations, models
+from django.db.models import Q
+from django.db.models.functions import Trim
+
+
+ESTADOS = ['Preinscrito', 'Pendiente', 'Aprobado', 'Rechazado', 'Cancelado']
+
+# Valores libres que se usaron antes de tener opciones fijas
+SINONIMOS = {'aceptado': 'Aprobado', 'confirmado': 'Aprobado'}
+
+
+def normalizar_estados(apps, schema_editor):
+    AsistenteEvento = apps.get_model('app_asistentes', 'AsistenteEvento')
+    # Sentencias en bloque: espacios sobrantes, mayúsculas distintas y sinónimos
+    AsistenteEvento.objects.filter(Q(asi_eve_estado__startswith=' ') | Q(asi_eve_estado__endswith=' ')).update(asi_eve_estado=Trim('asi_eve_estado'))
+    for valor in ESTADOS:
+        AsistenteEvento.objects.filter(asi_eve_estado__iexact=valor).exclude(asi_eve_estado=valor).update(asi_eve_estado=valor)
+    for sinonimo, valor in SINONIMOS.items():
+        AsistenteEvento.objects.filter(asi_eve_estado__iexact=sinonimo).update(asi_eve_estado=valor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_asistentes", "0003_indices_asistenteevento"),
+    ]
+
+    operations = [
+        migrations.RunPython(normalizar_estados, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="asistenteevento",
+            name="asi_eve_estado",
+            field=models.CharField(
+                choices=[
+                    ("Preinscrito", "Preinscrito"),
+                    ("Pendiente", "Pendiente"),
+                    ("Aprobado", "Aprobado"),
+                    ("Rechazado", "Rechazado"),
+                    ("Cancelado", "Cancelado"),
+                ],
+                max_length=45,
+            ),
+        ),
+    ]
@@ -1,58 +1,52 @@
-from django.db import models
-from app_admin_eventos.models import Evento
-from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from app_admin_eventos.models import EstadoInscripcion, Evento
 
 
 
 class AsistenteEvento(models.Model):
+    Estados = EstadoInscripcion
+
     asi_eve_asistente_fk = models.ForeignKey('app_usuarios.Asistente', on_delete=models.CASCADE)
     asi_eve_evento_fk = models.ForeignKey(Evento, on_delete=models.CASCADE)
     asi_eve_fecha_hora = models.DateTimeField()
-    asi_eve_estado = models.CharField(max_length=45)
+    asi_eve_estado = models.CharField(max_length=45, choices=EstadoInscripcion.choices)
     asi_eve_soporte = models.FileField(upload_to='upload/asistentes/soportes', verbose_name="Archivo de Soporte")
     asi_eve_qr = models.ImageField(upload_to='upload/asistentes/qr', verbose_name="Código QR")
     asi_eve_clave = models.CharField(max_length=45)
 
     def clean(self):
-        
-        from app_evaluadores.models import EvaluadorEvento
-        from app_participantes.models import ParticipanteEvento
         """
-        Realiza validaciones para asegurar que el usuario no esté ya inscrito 
-        en el mismo evento con otro rol (Participante o Evaluador).
-        La unicidad como Asistente se maneja en la clase Meta.
+        El usuario no puede estar inscrito en el mismo evento con otro rol
+        (Participante o Evaluador). La unicidad como Asistente se maneja en Meta.
         """
-        # Obtenemos el objeto Usuario base a través del perfil Asistente
-        usuario = self.asi_eve_asistente_fk.usuario
-        evento = self.asi_eve_evento_fk
-
-        # 1. Validación Cruzada: El Usuario no puede ser Participante en este Evento
-        if ParticipanteEvento.objects.filter(par_eve_participante_fk__usuario=usuario, par_eve_evento_fk=evento).exists():
-            raise ValidationError(
-                {'asi_eve_asistente_fk': "Este usuario ya está inscrito como Participante en este evento."}
-            )
-        
-        # 2. Validación Cruzada: El Usuario no puede ser Evaluador en este Evento
-        if EvaluadorEvento.objects.filter(eva_eve_evaluador_fk__usuario=usuario, eva_eve_evento_fk=evento).exists():
-            raise ValidationError(
-                {'asi_eve_asistente_fk': "Este usuario ya está inscrito como Evaluador en este evento."}
-            )
-            
-        # Nota: La validación de unicidad propia (que no se inscriba dos veces como Asistente)
-        # se manejará principalmente por unique_together en Meta, lo cual es más eficiente.
-        # Eliminamos la línea explícita de unicidad propia del clean() para simplificar,
-        # confiando en la restricción de base de datos.
+        from app_admin_eventos.inscripciones import Tipos, validar_inscripcion
+
+        validar_inscripcion(
+            self.asi_eve_evento_fk_id, self.asi_eve_asistente_fk.usuario_id, Tipos.ASISTENTE,
+            campo='asi_eve_asistente_fk', nueva=False,
+        )
 
     def save(self, *args, **kwargs):
         """
-        Remueve la llamada explícita a self.clean() para seguir el flujo estándar de Django.
+        Una inscripción nueva se indexa en InscripcionEvento en la misma
+        transacción: si el usuario ya tiene otro rol en el evento, la
+        restricción única la rechaza (ValidationError) y no queda guardada.
         """
-        super().save(*args, **kwargs)
+        from app_admin_eventos.inscripciones import Tipos, registrar_inscripcion
+
+        if not self._state.adding:
+            return super().save(*args, **kwargs)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            registrar_inscripcion(self.asi_eve_evento_fk_id, self.asi_eve_asistente_fk.usuario_id, Tipos.ASISTENTE, self.pk)
 
     class Meta:
         # **Clave de la Unicidad:** Esta restricción garantiza que un mismo
         # perfil de Asistente no pueda tener dos entradas para el mismo Evento
         unique_together = ('asi_eve_asistente_fk', 'asi_eve_evento_fk')
+        indexes = [
+            models.Index(fields=['asi_eve_evento_fk', 'asi_eve_estado'], name='asi_eve_evento_estado_idx'),
+        ]
         verbose_name = "Inscripción de Asistente"
         verbose_name_plural = "Inscripciones de Asistentes"
 
@@ -12,13 +12,14 @@ from app_usuarios.models import Asistente, Usuario
 from django.utils.timezone import now, localtime
 from django.contrib.auth.hashers import make_password
 from app_admin_eventos.models import Evento
+from app_admin_eventos.cupos import cambiar_estado_asistente, liberar_cupos, liberar_cupos_inscripciones, reservar_cupo
+from app_admin_eventos.ingreso import token_ingreso
+from app_admin_eventos.inscripciones import Tipos, roles_en_evento
+from app_admin_eventos.qr import asignar_qr
 from .forms import AsistenteForm, EditarUsuarioAsistenteForm
-import qrcode
 import string
 import random
 import os
-from django.core.files.base import ContentFile
-from io import BytesIO
 from django.utils.decorators import method_decorator
 from principal_eventos.decorador import asistente_required, visitor_required
 from django.views.generic import DetailView
@@ -28,8 +29,6 @@ from django.utils.decorators import method_decorator
 from app_admin_eventos.models import Evento, MemoriaEvento
 from app_admin_eventos.models import Evento, MemoriaEvento
 from app_asistentes.models import AsistenteEvento
-from app_participantes.models import ParticipanteEvento
-from app_evaluadores.models import EvaluadorEvento
 from django.db.models import Q
 from django.db import models
 from django.contrib.auth import logout
@@ -63,14 +62,8 @@ class DashboardAsistenteView(View):
     template_name = 'dashboard_principal_asistente.html'
 
     def get(self, request):
-        asistente_id = request.session.get('asistente_id')
-        if not asistente_id:
-            messages.error(request, "Debe iniciar sesión como asistente.")
-            return redirect('login_view')
-
-        try:
-            asistente = Asistente.objects.get(id=asistente_id)
-        except Asistente.DoesNotExist:
+        asistente = request.perfiles.asistente
+        if asistente is None:
             messages.error(request, "Asistente no encontrado.")
             return redirect('login_view')
 
@@ -135,22 +128,18 @@ class AsistenteCreateView(View):
                     ).first()
 
                     creado = False
+                    rol_en_evento = None
 
                     if usuario:
-                        # 🔸 Evitar registro duplicado en otros roles del mismo evento
-                        if ParticipanteEvento.objects.filter(
-                            par_eve_evento_fk=evento,
-                            par_eve_participante_fk__usuario=usuario
-                        ).exists():
+                        # 🔸 Evitar registro duplicado en otros roles del mismo evento (una consulta al índice)
+                        rol_en_evento = roles_en_evento(evento.pk, [usuario.pk]).get(usuario.pk)
+                        if rol_en_evento == Tipos.PARTICIPANTE:
                             messages.error(request, f"Ya estás inscrito como PARTICIPANTE en el evento \"{evento.eve_nombre}\". No puedes registrarte también como Asistente.")
                             return render(request, 'crear_asistente.html', {
                                 'form': form, 'evento': evento, 'es_de_pago': es_de_pago
                             })
 
-                        if EvaluadorEvento.objects.filter(
-                            eva_eve_evento_fk=evento,
-                            eva_eve_evaluador_fk__usuario=usuario
-                        ).exists():
+                        if rol_en_evento == Tipos.EVALUADOR:
                             messages.error(request, f"Ya estás inscrito como EVALUADOR en el evento \"{evento.eve_nombre}\". No puedes registrarte también como Asistente.")
                             return render(request, 'crear_asistente.html', {
                                 'form': form, 'evento': evento, 'es_de_pago': es_de_pago
@@ -191,96 +180,93 @@ class AsistenteCreateView(View):
                         )
                         asistente = Asistente.objects.create(usuario=usuario)
 
-                    # 🔹 Validar capacidad disponible
-                    if evento.eve_capacidad <= 0:
-                        messages.error(request, "No hay más cupos disponibles para este evento.")
-                        return render(request, 'crear_asistente.html', {
-                            'form': form, 'evento': evento, 'es_de_pago': es_de_pago
-                        })
-
                     # 🔹 Evitar duplicados
-                    if AsistenteEvento.objects.filter(
-                        asi_eve_evento_fk=evento,
-                        asi_eve_asistente_fk=asistente
-                    ).exists():
+                    if rol_en_evento == Tipos.ASISTENTE:
                         messages.warning(request, "Ya estás inscrito como asistente en este evento.")
                         return render(request, 'crear_asistente.html', {
                             'form': form, 'evento': evento, 'es_de_pago': es_de_pago
                         })
 
-                    # 🔹 Crear registro de asistencia
-                    documento_pago = request.FILES.get('asi_eve_soporte') if es_de_pago else None
-                    estado = "Pendiente" if es_de_pago else "Aprobado"
-
-                    clave = ""
-                    qr_img_file = None
-                    qr_bytes = None
-                    qr_filename = None
-
-                    # Solo generar QR si es gratis
-                    if not es_de_pago:
-                        clave = ''.join(random.choices(string.ascii_letters + string.digits, k=10))
-                        qr_data = f"Asistente: {first_name} {last_name}\nEvento: {evento.eve_nombre}\nClave: {clave}"
-                        qr = qrcode.make(qr_data)
-                        buffer = BytesIO()
-                        qr.save(buffer, format='PNG')
-                        qr_bytes = buffer.getvalue()
-                        qr_filename = f"qr_{cedula}_{evento.pk}.png"
-                        qr_img_file = ContentFile(qr_bytes, name=qr_filename)
-
-                    AsistenteEvento.objects.create(
-                        asi_eve_evento_fk=evento,
-                        asi_eve_asistente_fk=asistente,
-                        asi_eve_estado=estado,
-                        asi_eve_clave=clave,
-                        asi_eve_qr=qr_img_file if qr_img_file else None,
-                        asi_eve_soporte=documento_pago,
-                        asi_eve_fecha_hora=timezone.now(),
+                # 🔹 Reservar cupo: UPDATE condicional, 0 filas = evento lleno. Va fuera de
+                # la transacción de arriba para que el bloqueo de la fila del evento dure
+                # solo esa sentencia, no el QR, el almacenamiento ni el envío del correo.
+                if not reservar_cupo(evento.pk):
+                    messages.error(request, "No hay más cupos disponibles para este evento.")
+                    return render(request, 'crear_asistente.html', {
+                        'form': form, 'evento': evento, 'es_de_pago': es_de_pago
+                    })
+
+                # 🔹 Crear registro de asistencia
+                documento_pago = request.FILES.get('asi_eve_soporte') if es_de_pago else None
+                estado = AsistenteEvento.Estados.PENDIENTE if es_de_pago else AsistenteEvento.Estados.APROBADO
+
+                asistente_evento = AsistenteEvento(
+                    asi_eve_evento_fk=evento,
+                    asi_eve_asistente_fk=asistente,
+                    asi_eve_estado=estado,
+                    asi_eve_clave="",
+                    asi_eve_soporte=documento_pago,
+                    asi_eve_fecha_hora=timezone.now(),
+                )
+                qr_bytes = None
+                qr_filename = None
+
+                # Solo generar QR si es gratis (el token firmado necesita el ID de la inscripción)
+                if not es_de_pago:
+                    clave = ''.join(random.choices(string.ascii_letters + string.digits, k=10))
+                    asistente_evento.asi_eve_clave = clave
+                try:
+                    asistente_evento.save()
+                except Exception:
+                    # La reserva ya quedó confirmada: se devuelve el cupo
+                    liberar_cupos(evento.pk)
+                    raise
+
+                # 🔹 Ya confirmada la inscripción: QR y correo
+                if not es_de_pago:
+                    qr_bytes = asignar_qr(asistente_evento, 'asi_eve_qr', token_ingreso(asistente_evento))
+                    qr_filename = f"qr_{cedula}_{evento.pk}.png"
+                    asistente_evento.save(update_fields=['asi_eve_qr'])
+
+                # 🔹 Enviar correo
+                subject = f"🎟️ Registro exitoso - Evento \"{evento.eve_nombre}\""
+
+                if creado:
+                    body = (
+                        f"Hola Asistente {first_name} {last_name},\n\n"
+                        f"Tu registro al evento \"{evento.eve_nombre}\" fue exitoso.\n\n"
+                        f"Tu cuenta fue creada. Credenciales de acceso:\n"
+                        f"- Correo: {email}\n"
+                        f"- Contraseña generada: {password_plana}\n\n"
+                    )
+                else:
+                    body = (
+                        f"Hola Asistente {first_name} {last_name},\n\n"
+                        f"Tu registro al evento \"{evento.eve_nombre}\" fue exitoso.\n\n"
+                        f"Ya tenías una cuenta. Credenciales de acceso:\n"
+                        f"- Correo: {email}\n"
+                        f"- Contraseña: La que usas actualmente.\n\n"
                     )
 
-                    # 🔹 Reducir capacidad
-                    evento.eve_capacidad -= 1
-                    evento.save(update_fields=['eve_capacidad'])
-
-                    # 🔹 Enviar correo
-                    subject = f"🎟️ Registro exitoso - Evento \"{evento.eve_nombre}\""
-
-                    if creado:
-                        body = (
-                            f"Hola Asistente {first_name} {last_name},\n\n"
-                            f"Tu registro al evento \"{evento.eve_nombre}\" fue exitoso.\n\n"
-                            f"Tu cuenta fue creada. Credenciales de acceso:\n"
-                            f"- Correo: {email}\n"
-                            f"- Contraseña generada: {password_plana}\n\n"
-                        )
-                    else:
-                        body = (
-                            f"Hola Asistente {first_name} {last_name},\n\n"
-                            f"Tu registro al evento \"{evento.eve_nombre}\" fue exitoso.\n\n"
-                            f"Ya tenías una cuenta. Credenciales de acceso:\n"
-                            f"- Correo: {email}\n"
-                            f"- Contraseña: La que usas actualmente.\n\n"
-                        )
-
-                    if not es_de_pago:
-                        body += (
-                            f"Tu clave de acceso al evento es: {clave}\n"
-                            f"Adjunto encontrarás tu código QR para el ingreso.\n\n"
-                        )
+                if not es_de_pago:
+                    body += (
+                        f"Tu clave de acceso al evento es: {clave}\n"
+                        f"Adjunto encontrarás tu código QR para el ingreso.\n\n"
+                    )
 
-                    body += "¡Gracias por registrarte!\nEquipo de Event-Soft."
+                body += "¡Gracias por registrarte!\nEquipo de Event-Soft."
 
-                    email_msg = EmailMessage(subject, body, DEFAULT_FROM_EMAIL, [email])
-                    if not es_de_pago and qr_bytes and qr_filename:
-                        email_msg.attach(qr_filename, qr_bytes, 'image/png')
-                    try:
-                        email_msg.send(fail_silently=False)
-                    except Exception as e:
-                        messages.warning(request, f"Asistente registrado, pero no se pudo enviar el correo: {e}")
+                email_msg = EmailMessage(subject, body, DEFAULT_FROM_EMAIL, [email])
+                if not es_de_pago and qr_bytes and qr_filename:
+                    email_msg.attach(qr_filename, qr_bytes, 'image/png')
+                try:
+                    email_msg.send(fail_silently=False)
+                except Exception as e:
+                    messages.warning(request, f"Asistente registrado, pero no se pudo enviar el correo: {e}")
 
-                    # ✅ Mensaje de éxito garantizado ANTES del redirect
-                    messages.success(request, f"Te has inscrito correctamente al evento \"{evento.eve_nombre}\".")
-                    return redirect('pagina_principal')
+                # ✅ Mensaje de éxito garantizado ANTES del redirect
+                messages.success(request, f"Te has inscrito correctamente al evento \"{evento.eve_nombre}\".")
+                return redirect('pagina_principal')
 
             except Exception as e:
                 messages.error(request, f"Ocurrió un error inesperado al registrarte: {str(e)}")
@@ -318,8 +304,7 @@ class CambioPasswordAsistenteView(View):
             messages.error(request, "La contraseña debe tener al menos 6 caracteres.")
             return render(request, self.template_name)
 
-        asistente_id = request.session.get('asistente_id')
-        asistente = get_object_or_404(Asistente, pk=asistente_id)
+        asistente = request.perfiles.requerido('asistente')
         usuario = asistente.usuario
 
         usuario.set_password(password1)
@@ -350,12 +335,8 @@ class EliminarAsistenteView(View):
             )
             return redirect('pagina_principal')
 
-        # 🔹 Liberar cupos solo de eventos pendientes (Mantenemos esta lógica)
-        for inscripcion in inscripciones:
-            if inscripcion.asi_eve_estado == "Pendiente":
-                evento = inscripcion.asi_eve_evento_fk
-                evento.eve_capacidad += 1
-                evento.save(update_fields=["eve_capacidad"])
+        # 🔹 Liberar los cupos de las inscripciones que se borran en cascada
+        liberar_cupos_inscripciones(inscripciones)
 
         # 🔹 Obtener el último evento inscrito (para referencia en el correo)
         ultimo_evento = inscripciones.first()
@@ -402,10 +383,10 @@ class EliminarAsistenteView(View):
 class AsistenteCancelacionView(View):
     """
     Permite a un asistente cancelar una preinscripción activa a un evento.
-    El cupo se libera explícitamente al aumentar la capacidad del evento.
+    El cupo se libera explícitamente descontándolo de los reservados del evento.
     """
     def post(self, request, evento_id):
-        asistente = get_object_or_404(Asistente, usuario=request.user)
+        asistente = request.perfiles.requerido('asistente')
         evento = get_object_or_404(Evento, id=evento_id)
 
         # CA-10.1: Prohibir la cancelación si el evento ya terminó
@@ -417,23 +398,17 @@ class AsistenteCancelacionView(View):
         inscripcion = AsistenteEvento.objects.filter(
             asi_eve_asistente_fk=asistente,
             asi_eve_evento_fk=evento,
-            asi_eve_estado='Aprobado'
+            asi_eve_estado=AsistenteEvento.Estados.APROBADO,
         ).first()
 
+        # 2. Cambiar el estado a 'Cancelado' y liberar el cupo, solo si sigue Aprobada:
+        # una cancelación repetida o simultánea no libera un cupo ajeno
         # CA-10.5: No inscrito o no tiene estado 'Aprobado'
-        if not inscripcion:
+        if not inscripcion or not cambiar_estado_asistente(inscripcion, AsistenteEvento.Estados.CANCELADO):
             messages.error(request, "No tienes una inscripción activa para este evento.")
             return redirect('dashboard_asistente')
 
-        # 2. Cambiar el estado a 'Cancelado'
-        inscripcion.asi_eve_estado = 'Cancelado'
-        inscripcion.save(update_fields=['asi_eve_estado'])
-
-        # 3. 🔹 Liberar cupo explícitamente
-        evento.eve_capacidad += 1
-        evento.save(update_fields=['eve_capacidad'])
-
-        # 4. Mensaje de éxito
+        # 3. Mensaje de éxito
         messages.success(
             request,
             f"Has cancelado exitosamente tu inscripción al evento '{evento.eve_nombre}'. "
@@ -547,7 +522,7 @@ class EventoDetailView(DetailView):
         
         # Lógica de bloqueo/redirección (CORRECTA)
         if asistente_id:
-            asistente = get_object_or_404(Asistente, id=asistente_id)
+            asistente = request.perfiles.requerido('asistente')
             if not AsistenteEvento.objects.filter(asi_eve_asistente_fk=asistente, asi_eve_evento_fk=evento).exists():
                 messages.error(request, "No tienes permiso para ver este evento.")
                 # Asumo que 'pagina_principal' es el alias de 'dashboard_asistente'
@@ -573,7 +548,7 @@ class EventoDetailView(DetailView):
         context['url_para_compartir'] = public_absolute_url 
 
         # Datos adicionales
-        context['asistente'] = get_object_or_404(Asistente, id=self.request.session.get('asistente_id'))
+        context['asistente'] = self.request.perfiles.requerido('asistente')
         
         return context
 
@@ -587,7 +562,7 @@ class IngresoEventoAsistenteView(View):
 
     def get(self, request, pk):
         evento = get_object_or_404(Evento, pk=pk)
-        asistente = get_object_or_404(Asistente, usuario=request.user)
+        asistente = request.perfiles.requerido('asistente')
         asistente_evento = get_object_or_404(AsistenteEvento, asi_eve_evento_fk=evento, asi_eve_asistente_fk=asistente)
 
         context = {
@@ -0,0 +1,34 @@
+from django.db.models import F, FloatField, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from app_admin_eventos.filtros import condicion_filtros
+from app_admin_eventos.models import Criterio, EstadoInscripcion, Evento
+
+
+def eventos_evaluador(evaluador_id, parametros=None):
+    """
+    Eventos del evaluador en una sola consulta, retornados como
+    (aprobados, pendientes). Cada evento lleva anotados `estado_evaluador` y
+    `criterios_suma` (suma de pesos de sus criterios, 0 si no tiene).
+    Los filtros solo se aplican a los eventos aprobados.
+    """
+    pesos = Criterio.objects.filter(
+        cri_evento_fk=OuterRef('pk')
+    ).values('cri_evento_fk').annotate(total=Sum('cri_peso')).values('total')
+
+    aprobados = Q(evaluadorevento__eva_eve_estado=EstadoInscripcion.APROBADO) & condicion_filtros(parametros or {})
+    pendientes = Q(evaluadorevento__eva_eve_estado=EstadoInscripcion.PENDIENTE)
+
+    eventos = (
+        Evento.objects.filter(aprobados | pendientes, evaluadorevento__eva_eve_evaluador_fk_id=evaluador_id)
+        .annotate(
+            estado_evaluador=F('evaluadorevento__eva_eve_estado'),
+            criterios_suma=Coalesce(Subquery(pesos), 0.0, output_field=FloatField()),
+        )
+        .order_by('pk')
+    )
+
+    resultado = {EstadoInscripcion.APROBADO: [], EstadoInscripcion.PENDIENTE: []}
+    for evento in eventos:
+        resultado[evento.estado_evaluador].append(evento)
+    return resultado[EstadoInscripcion.APROBADO], resultado[EstadoInscripcion.PENDIENTE]
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from app_admin_eventos.models import Evento
+from app_evaluadores.puntajes import AGREGADOS, recalcular_evento
+
+
+class Command(BaseCommand):
+    help = "Recalcula las calificaciones ponderadas y el ranking de uno o todos los eventos."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--evento', type=int, help="ID del evento (por defecto, todos).")
+        parser.add_argument('--agregado', choices=AGREGADOS, help="Agregado entre evaluadores (por defecto, PUNTAJES_AGREGADO).")
+        parser.add_argument('--recorte', type=int, help="Porcentaje descartado por extremo en la media recortada.")
+
+    def handle(self, *args, **options):
+        if options['recorte'] is not None and not 0 <= options['recorte'] < 50:
+            raise CommandError("El recorte debe estar entre 0 y 49.")
+
+        eventos = Evento.objects.all()
+        if options['evento']:
+            eventos = eventos.filter(pk=options['evento'])
+
+        for evento_id, nombre in eventos.values_list('pk', 'eve_nombre'):
+            cambiados = recalcular_evento(evento_id, agregado=options['agregado'], recorte=options['recorte'])
+            self.stdout.write(f"📊 {nombre}: {cambiados} calificación(es) actualizada(s)")
+
+        self.stdout.write(self.style.SUCCESS("✅ Puntajes recalculados."))
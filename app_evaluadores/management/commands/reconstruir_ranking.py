@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from app_admin_eventos.models import Evento
+from app_evaluadores.ranking import reconstruir_ranking
+
+
+class Command(BaseCommand):
+    help = "Recalcula desde cero la tabla de ranking de uno o todos los eventos."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--evento', type=int, help="ID del evento (por defecto, todos).")
+
+    def handle(self, *args, **options):
+        eventos = Evento.objects.all()
+        if options['evento']:
+            eventos = eventos.filter(pk=options['evento'])
+
+        for evento_id, nombre in eventos.values_list('pk', 'eve_nombre'):
+            total = reconstruir_ranking(evento_id)
+            self.stdout.write(f"🏆 {nombre}: {total} participante(s) en el ranking")
+
+        self.stdout.write(self.style.SUCCESS("✅ Ranking reconstruido."))
@@ -0,0 +1,109 @@
+# Generated by Django 5.2.3 on 2026-10-17 23:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def cargar_ranking(apps, schema_editor):
+    ParticipanteEvento = apps.get_model("app_participantes", "ParticipanteEvento")
+    PosicionRanking = apps.get_model("app_evaluadores", "PosicionRanking")
+
+    posiciones = []
+    evento_actual, puesto, anterior, indice = None, 0, None, 0
+    filas = (
+        ParticipanteEvento.objects.filter(calificacion__isnull=False)
+        .order_by("par_eve_evento_fk_id", "-calificacion", "pk")
+        .values_list(
+            "pk", "par_eve_evento_fk_id", "par_eve_participante_fk_id", "calificacion"
+        )
+    )
+    for participante_evento_id, evento_id, participante_id, puntaje in filas:
+        if evento_id != evento_actual:
+            evento_actual, indice, anterior = evento_id, 0, None
+        indice += 1
+        if puntaje != anterior:
+            puesto, anterior = indice, puntaje
+        posiciones.append(
+            PosicionRanking(
+                pos_evento_fk_id=evento_id,
+                pos_participante_evento_fk_id=participante_evento_id,
+                pos_participante_fk_id=participante_id,
+                pos_puntaje=puntaje,
+                pos_puesto=puesto,
+            )
+        )
+    PosicionRanking.objects.bulk_create(posiciones, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_admin_eventos", "0004_lotecertificados_certificadogenerado"),
+        ("app_evaluadores", "0002_initial"),
+        ("app_participantes", "0002_initial"),
+        ("app_usuarios", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PosicionRanking",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("pos_puntaje", models.FloatField()),
+                ("pos_puesto", models.PositiveIntegerField()),
+                ("pos_actualizado_en", models.DateTimeField(auto_now=True)),
+                (
+                    "pos_evento_fk",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ranking",
+                        to="app_admin_eventos.evento",
+                    ),
+                ),
+                (
+                    "pos_participante_evento_fk",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="posicion_ranking",
+                        to="app_participantes.participanteevento",
+                    ),
+                ),
+                (
+                    "pos_participante_fk",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="app_usuarios.participante",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Posición en el ranking",
+                "verbose_name_plural": "Ranking de participantes",
+                "indexes": [
+                    models.Index(
+                        fields=["pos_evento_fk", "pos_puesto"],
+                        name="ranking_evento_puesto_idx",
+                    ),
+                    models.Index(
+                        fields=["pos_evento_fk", "pos_puntaje"],
+                        name="ranking_evento_puntaje_idx",
+                    ),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("pos_evento_fk", "pos_participante_fk"),
+                        name="ranking_participante_unico",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(cargar_ranking, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.3 on 2026-10-17 23:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_admin_eventos", "0007_indices_evento"),
+        ("app_evaluadores", "0003_posicionranking"),
+        ("app_usuarios", "0002_indice_email_usuario"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="evaluadorevento",
+            index=models.Index(
+                fields=["eva_eve_evento_fk", "eva_eve_estado"],
+                name="eva_eve_evento_estado_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.3 on 2026-10-17 23:50
+
+from django.db import migrations, models
+from django.db.models import Q
+from django.db.models.functions import Trim
+
+
+ESTADOS = ['Preinscrito', 'Pendiente', 'Aprobado', 'Rechazado', 'Cancelado']
+
+# Valores libres que se usaron antes de tener opciones fijas
+SINONIMOS = {'aceptado': 'Aprobado', 'confirmado': 'Aprobado'}
+
+
+def normalizar_estados(apps, schema_editor):
+    EvaluadorEvento = apps.get_model('app_evaluadores', 'EvaluadorEvento')
+    # Sentencias en bloque: espacios sobrantes, mayúsculas distintas y sinónimos
+    EvaluadorEvento.objects.filter(Q(eva_eve_estado__startswith=' ') | Q(eva_eve_estado__endswith=' ')).update(eva_eve_estado=Trim('eva_eve_estado'))
+    for valor in ESTADOS:
+        EvaluadorEvento.objects.filter(eva_eve_estado__iexact=valor).exclude(eva_eve_estado=valor).update(eva_eve_estado=valor)
+    for sinonimo, valor in SINONIMOS.items():
+        EvaluadorEvento.objects.filter(eva_eve_estado__iexact=sinonimo).update(eva_eve_estado=valor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_evaluadores", "0004_indices_evaluadorevento"),
+    ]
+
+    operations = [
+        migrations.RunPython(normalizar_estados, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="evaluadorevento",
+            name="eva_eve_estado",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("Preinscrito", "Preinscrito"),
+                    ("Pendiente", "Pendiente"),
+                    ("Aprobado", "Aprobado"),
+                    ("Rechazado", "Rechazado"),
+                    ("Cancelado", "Cancelado"),
+                ],
+                max_length=45,
+                null=True,
+            ),
+        ),
+    ]
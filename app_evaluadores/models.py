@@ -1,7 +1,6 @@
-from django.db import models
-from app_admin_eventos.models import Evento, Criterio
+from django.db import models, transaction
+from app_admin_eventos.models import EstadoInscripcion, Evento, Criterio
 from app_usuarios.models import Participante
-from django.core.exceptions import ValidationError
 
 
 
@@ -18,54 +17,81 @@ class Calificacion(models.Model):
 
 
 class EvaluadorEvento(models.Model):
+    Estados = EstadoInscripcion
+
     eva_eve_evaluador_fk = models.ForeignKey('app_usuarios.Evaluador', on_delete=models.CASCADE)
     eva_eve_evento_fk = models.ForeignKey(Evento, on_delete=models.CASCADE)
     eva_eve_fecha_hora = models.DateTimeField(auto_now_add=True, null=True, blank=True)
-    eva_eve_estado = models.CharField(max_length=45, null=True, blank=True)
+    eva_eve_estado = models.CharField(max_length=45, choices=EstadoInscripcion.choices, null=True, blank=True)
     eva_eve_qr = models.ImageField(upload_to='upload/evaluadores/qr', null=True, blank=True, verbose_name="Código QR")
     eva_eve_clave = models.CharField(max_length=45, null=True, blank=True)
     eva_eve_documento = models.FileField(upload_to='upload/evaluadores/documentos', null=True, blank=True , verbose_name="Documento de Evaluador")
 
     def clean(self):
-        
-        from app_asistentes.models import AsistenteEvento
-        from app_participantes.models import ParticipanteEvento
         """
-        Realiza validaciones para asegurar que el usuario no esté ya inscrito 
-        en el mismo evento con otro rol (Asistente o Participante).
+        El usuario no puede estar inscrito en el mismo evento con otro rol
+        (Asistente o Participante). La unicidad propia la da unique_together.
         """
-        usuario = self.eva_eve_evaluador_fk.usuario
-        evento = self.eva_eve_evento_fk
-
-        # 1. Validación Cruzada: El Usuario no puede ser Participante en este Evento
-        if ParticipanteEvento.objects.filter(par_eve_participante_fk__usuario=usuario, par_eve_evento_fk=evento).exists():
-            raise ValidationError(
-                {'eva_eve_evaluador_fk': "Este usuario ya está inscrito como Participante en este evento."}
-            )
-            
-        # 2. Validación Cruzada: El Usuario no puede ser Asistente en este Evento
-        if AsistenteEvento.objects.filter(asi_eve_asistente_fk__usuario=usuario, asi_eve_evento_fk=evento).exists():
-            raise ValidationError(
-                {'eva_eve_evaluador_fk': "Este usuario ya está inscrito como Asistente en este evento."}
-            )
-            
-        # Nota: La validación de unicidad propia ya no es necesaria en clean() porque 
-        # se utiliza `unique_together` en Meta, lo cual es más eficiente y obligatorio
-        # a nivel de base de datos.
+        from app_admin_eventos.inscripciones import Tipos, validar_inscripcion
+
+        validar_inscripcion(
+            self.eva_eve_evento_fk_id, self.eva_eve_evaluador_fk.usuario_id, Tipos.EVALUADOR,
+            campo='eva_eve_evaluador_fk', nueva=False,
+        )
 
     def save(self, *args, **kwargs):
         """
-        Se elimina la llamada a self.clean().
-        Se asume que full_clean() se llama antes de save() en el flujo normal de Django.
+        Una inscripción nueva se indexa en InscripcionEvento en la misma
+        transacción: si el usuario ya tiene otro rol en el evento, la
+        restricción única la rechaza (ValidationError) y no queda guardada.
         """
-        super().save(*args, **kwargs)
+        from app_admin_eventos.inscripciones import Tipos, registrar_inscripcion
+
+        if not self._state.adding:
+            return super().save(*args, **kwargs)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            registrar_inscripcion(self.eva_eve_evento_fk_id, self.eva_eve_evaluador_fk.usuario_id, Tipos.EVALUADOR, self.pk)
 
     class Meta:
         # **Clave de la Unicidad:** Garantiza que un mismo evaluador 
         # no pueda tener dos entradas para el mismo evento.
         unique_together = ('eva_eve_evaluador_fk', 'eva_eve_evento_fk')
+        indexes = [
+            models.Index(fields=['eva_eve_evento_fk', 'eva_eve_estado'], name='eva_eve_evento_estado_idx'),
+        ]
         verbose_name = "Inscripción de Evaluador"
         verbose_name_plural = "Inscripciones de Evaluadores"
 
 
 
+
+
+class PosicionRanking(models.Model):
+    """
+    Tabla desnormalizada del ranking de cada evento. Se mantiene al día
+    desde app_evaluadores.ranking cada vez que cambia una calificación,
+    así el podio y el puesto de un participante se leen sin recalcular.
+    """
+    pos_evento_fk = models.ForeignKey(Evento, on_delete=models.CASCADE, related_name='ranking')
+    pos_participante_evento_fk = models.OneToOneField(
+        'app_participantes.ParticipanteEvento', on_delete=models.CASCADE, related_name='posicion_ranking'
+    )
+    pos_participante_fk = models.ForeignKey(Participante, on_delete=models.CASCADE)
+    pos_puntaje = models.FloatField()
+    pos_puesto = models.PositiveIntegerField()
+    pos_actualizado_en = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['pos_evento_fk', 'pos_participante_fk'], name='ranking_participante_unico'),
+        ]
+        indexes = [
+            models.Index(fields=['pos_evento_fk', 'pos_puesto'], name='ranking_evento_puesto_idx'),
+            models.Index(fields=['pos_evento_fk', 'pos_puntaje'], name='ranking_evento_puntaje_idx'),
+        ]
+        verbose_name = "Posición en el ranking"
+        verbose_name_plural = "Ranking de participantes"
+
+    def __str__(self):
+        return f"#{self.pos_puesto} {self.pos_participante_fk} ({self.pos_puntaje})"
@@ -0,0 +1,176 @@
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from app_admin_eventos.models import Criterio
+from app_participantes.models import ParticipanteEvento
+
+from .models import Calificacion
+from .ranking import reconstruir_ranking
+
+
+AGREGADOS = ('media', 'mediana', 'media_recortada')
+
+Puntaje = namedtuple('Puntaje', ['evaluadores', 'media', 'mediana', 'media_recortada'])
+
+
+# Una sola consulta agrupada por evento:
+#  1. por_evaluador: puntaje ponderado de cada evaluador sobre cada participante,
+#     SUM(valor * peso) / SUM(peso) sobre los criterios que calificó.
+#  2. ordenados: numera los puntajes de cada participante de menor a mayor.
+#  3. Agregado final: media, mediana (filas centrales) y media recortada
+#     (descarta floor(total * recorte / 100) filas en cada extremo).
+# La mediana y los límites del recorte se comparan solo con sumas y
+# productos de enteros: en MySQL `/` devuelve DECIMAL y no trunca, así que
+# `(total + 1) / 2` o `(total * recorte) / 100` darían límites fraccionarios.
+#   - filas centrales: total <= 2 * fila <= total + 2
+#   - fila > floor(x)          <=>  100 * fila > total * recorte
+#   - fila <= total - floor(x)  <=>  100 * (total - fila + 1) > total * recorte
+_SQL_PUNTAJES = """
+WITH por_evaluador AS (
+    SELECT cal.{participante} AS participante_id,
+           SUM(cal.{valor} * cri.{peso}) / SUM(cri.{peso}) AS puntaje
+    FROM {calificacion} cal
+    INNER JOIN {criterio} cri ON cri.{criterio_pk} = cal.{criterio_fk}
+    WHERE cri.{evento} = %s {filtro_participantes}
+    GROUP BY cal.{participante}, cal.{evaluador}
+    HAVING SUM(cri.{peso}) > 0
+),
+ordenados AS (
+    SELECT participante_id, puntaje,
+           ROW_NUMBER() OVER (PARTITION BY participante_id ORDER BY puntaje) AS fila,
+           COUNT(*) OVER (PARTITION BY participante_id) AS total
+    FROM por_evaluador
+)
+SELECT participante_id,
+       COUNT(*),
+       AVG(puntaje),
+       AVG(CASE WHEN 2 * fila BETWEEN total AND total + 2 THEN puntaje END),
+       AVG(CASE WHEN 100 * fila > total * %s AND 100 * (total - fila + 1) > total * %s THEN puntaje END)
+FROM ordenados
+GROUP BY participante_id
+"""
+
+
+def _columnas():
+    calificacion = Calificacion._meta
+    criterio = Criterio._meta
+    return {
+        'calificacion': connection.ops.quote_name(calificacion.db_table),
+        'criterio': connection.ops.quote_name(criterio.db_table),
+        'participante': calificacion.get_field('cal_participante_fk').column,
+        'evaluador': calificacion.get_field('cal_evaluador_fk').column,
+        'criterio_fk': calificacion.get_field('cal_criterio_fk').column,
+        'valor': calificacion.get_field('cal_valor').column,
+        'criterio_pk': criterio.pk.column,
+        'peso': criterio.get_field('cri_peso').column,
+        'evento': criterio.get_field('cri_evento_fk').column,
+    }
+
+
+def puntajes_evento(evento_id, participantes=None, recorte=None):
+    """
+    Puntajes ponderados de un evento agregados entre evaluadores.
+    Retorna {participante_id: Puntaje}. `participantes` limita el cálculo a
+    una lista de IDs de Participante y `recorte` es el porcentaje de
+    puntajes que descarta la media recortada en cada extremo.
+    """
+    if recorte is None:
+        recorte = settings.PUNTAJES_RECORTE
+    recorte = int(recorte)
+
+    parametros = [evento_id]
+    filtro = ''
+    if participantes is not None:
+        participantes = list(participantes)
+        if not participantes:
+            return {}
+        filtro = 'AND cal.{participante} IN ({marcas})'.format(
+            participante=Calificacion._meta.get_field('cal_participante_fk').column,
+            marcas=', '.join(['%s'] * len(participantes)),
+        )
+        parametros += participantes
+
+    sql = _SQL_PUNTAJES.format(filtro_participantes=filtro, **_columnas())
+    with connection.cursor() as cursor:
+        cursor.execute(sql, parametros + [recorte, recorte])
+        return {fila[0]: Puntaje(*fila[1:]) for fila in cursor.fetchall()}
+
+
+def puntaje_final(puntaje, agregado=None):
+    """
+    Valor entero que se guarda en ParticipanteEvento.calificacion según el
+    agregado configurado en PUNTAJES_AGREGADO.
+    """
+    agregado = agregado or settings.PUNTAJES_AGREGADO
+    valor = getattr(puntaje, agregado)
+    # La media recortada queda vacía si el recorte descarta todas las filas
+    if valor is None:
+        valor = puntaje.media
+    return round(valor)
+
+
+def guardar_calificaciones(evaluador_id, valores, participantes):
+    """
+    Guarda en bloque las calificaciones de un evaluador. `valores` es
+    {criterio_id: valor} y se aplica a cada ID de `participantes` (todos los
+    miembros de un grupo reciben las mismas notas). Lee las filas existentes
+    con una consulta y luego hace un bulk_update y un bulk_create, la misma
+    secuencia en cualquier motor de base de datos.
+    """
+    existentes = {
+        (calificacion.cal_criterio_fk_id, calificacion.cal_participante_fk_id): calificacion
+        for calificacion in Calificacion.objects.filter(
+            cal_evaluador_fk_id=evaluador_id,
+            cal_criterio_fk_id__in=valores,
+            cal_participante_fk_id__in=participantes,
+        ).only('pk', 'cal_criterio_fk_id', 'cal_participante_fk_id', 'cal_valor')
+    }
+
+    nuevas, cambiadas = [], []
+    for participante_id in participantes:
+        for criterio_id, valor in valores.items():
+            calificacion = existentes.get((criterio_id, participante_id))
+            if calificacion is None:
+                nuevas.append(Calificacion(
+                    cal_evaluador_fk_id=evaluador_id,
+                    cal_criterio_fk_id=criterio_id,
+                    cal_participante_fk_id=participante_id,
+                    cal_valor=valor,
+                ))
+            elif calificacion.cal_valor != valor:
+                calificacion.cal_valor = valor
+                cambiadas.append(calificacion)
+
+    with transaction.atomic():
+        if cambiadas:
+            Calificacion.objects.bulk_update(cambiadas, ['cal_valor'], batch_size=500)
+        if nuevas:
+            Calificacion.objects.bulk_create(nuevas, batch_size=500)
+    return len(nuevas), len(cambiadas)
+
+
+def recalcular_evento(evento_id, agregado=None, recorte=None):
+    """
+    Recalcula la calificación de todos los participantes de un evento (por
+    ejemplo, después de cambiar el peso de un criterio) y reconstruye su ranking.
+    Retorna la cantidad de inscripciones cuya calificación cambió.
+    """
+    puntajes = puntajes_evento(evento_id, recorte=recorte)
+
+    cambiados = []
+    inscripciones = ParticipanteEvento.objects.filter(par_eve_evento_fk_id=evento_id).only(
+        'pk', 'par_eve_participante_fk_id', 'calificacion'
+    )
+    for participante_evento in inscripciones:
+        puntaje = puntajes.get(participante_evento.par_eve_participante_fk_id)
+        nueva = puntaje_final(puntaje, agregado) if puntaje else None
+        if nueva != participante_evento.calificacion:
+            participante_evento.calificacion = nueva
+            cambiados.append(participante_evento)
+
+    with transaction.atomic():
+        ParticipanteEvento.objects.bulk_update(cambiados, ['calificacion'], batch_size=500)
+        reconstruir_ranking(evento_id)
+    return len(cambiados)
@@ -0,0 +1,179 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F
+
+from app_admin_eventos.models import Evento
+from app_participantes.models import ParticipanteEvento
+
+from .models import PosicionRanking
+
+
+# El puesto es de tipo "competencia": 1 + cantidad de puntajes estrictamente
+# mayores. Los empates comparten puesto (1, 2, 2, 4...). Con esa definición un
+# cambio de puntaje solo mueve a las filas que quedan entre el valor viejo y el
+# nuevo, y eso se hace con un UPDATE condicional sin leer el ranking completo.
+
+def _desplazar(evento_id, excluidos, viejo, nuevo, cantidad):
+    """
+    Ajusta el puesto de las demás filas del evento cuando `cantidad` puntajes
+    pasan de `viejo` a `nuevo` (None significa que la fila entra o sale).
+    """
+    filas = PosicionRanking.objects.filter(pos_evento_fk_id=evento_id).exclude(
+        pos_participante_evento_fk_id__in=excluidos
+    )
+    if viejo is None:
+        filas.filter(pos_puntaje__lt=nuevo).update(pos_puesto=F('pos_puesto') + cantidad)
+    elif nuevo is None:
+        filas.filter(pos_puntaje__lt=viejo).update(pos_puesto=F('pos_puesto') - cantidad)
+    elif nuevo > viejo:
+        filas.filter(pos_puntaje__gte=viejo, pos_puntaje__lt=nuevo).update(pos_puesto=F('pos_puesto') + cantidad)
+    elif nuevo < viejo:
+        filas.filter(pos_puntaje__gte=nuevo, pos_puntaje__lt=viejo).update(pos_puesto=F('pos_puesto') - cantidad)
+
+
+def actualizar_ranking(evento_id, puntajes):
+    """
+    Registra los puntajes nuevos de un evento y corrige los puestos afectados.
+    `puntajes` es un diccionario {id de ParticipanteEvento: puntaje}; los
+    miembros de un grupo con el mismo puntaje se mueven en bloque.
+    """
+    if not puntajes:
+        return
+
+    with transaction.atomic():
+        # Serializa las actualizaciones del ranking de un mismo evento
+        list(Evento.objects.select_for_update().filter(pk=evento_id).values_list('pk', flat=True))
+
+        actuales = dict(
+            PosicionRanking.objects.filter(pos_participante_evento_fk_id__in=puntajes)
+            .values_list('pos_participante_evento_fk_id', 'pos_puntaje')
+        )
+
+        movimientos = defaultdict(list)
+        for participante_evento_id, nuevo in puntajes.items():
+            viejo = actuales.get(participante_evento_id)
+            if participante_evento_id in actuales and viejo == nuevo:
+                continue
+            movimientos[(viejo, nuevo)].append(participante_evento_id)
+
+        if not movimientos:
+            return
+
+        participantes = dict(
+            ParticipanteEvento.objects.filter(pk__in=puntajes).values_list('pk', 'par_eve_participante_fk_id')
+        )
+
+        for (viejo, nuevo), ids in movimientos.items():
+            _desplazar(evento_id, ids, viejo, nuevo, len(ids))
+
+            puesto = 1 + PosicionRanking.objects.filter(
+                pos_evento_fk_id=evento_id, pos_puntaje__gt=nuevo
+            ).exclude(pos_participante_evento_fk_id__in=ids).count()
+
+            existentes = [i for i in ids if i in actuales]
+            if existentes:
+                PosicionRanking.objects.filter(pos_participante_evento_fk_id__in=existentes).update(
+                    pos_puntaje=nuevo, pos_puesto=puesto
+                )
+            PosicionRanking.objects.bulk_create([
+                PosicionRanking(
+                    pos_evento_fk_id=evento_id,
+                    pos_participante_evento_fk_id=i,
+                    pos_participante_fk_id=participantes[i],
+                    pos_puntaje=nuevo,
+                    pos_puesto=puesto,
+                )
+                for i in ids if i not in actuales
+            ])
+
+
+def retirar_del_ranking(participante_evento_id):
+    """
+    Cierra el hueco que deja la inscripción `participante_evento_id` antes de
+    que su fila salga del ranking. No hace nada si aún no tenía puntaje.
+    """
+    posicion = (
+        PosicionRanking.objects.filter(pos_participante_evento_fk_id=participante_evento_id)
+        .values_list('pos_evento_fk_id', 'pos_puntaje')
+        .first()
+    )
+    if posicion:
+        evento_id, puntaje = posicion
+        _desplazar(evento_id, [participante_evento_id], puntaje, None, 1)
+
+
+def reconstruir_ranking(evento_id):
+    """
+    Recalcula desde cero el ranking de un evento a partir de
+    ParticipanteEvento.calificacion. Útil para cargar datos existentes.
+    """
+    filas = list(
+        ParticipanteEvento.objects.filter(par_eve_evento_fk_id=evento_id, calificacion__isnull=False)
+        .order_by('-calificacion', 'pk')
+        .values_list('pk', 'par_eve_participante_fk_id', 'calificacion')
+    )
+
+    calculadas = {}
+    puesto, anterior = 0, None
+    for indice, (participante_evento_id, participante_id, puntaje) in enumerate(filas, start=1):
+        if puntaje != anterior:
+            puesto, anterior = indice, puntaje
+        calculadas[participante_evento_id] = (participante_id, puntaje, puesto)
+
+    with transaction.atomic():
+        PosicionRanking.objects.filter(pos_evento_fk_id=evento_id).exclude(
+            pos_participante_evento_fk_id__in=calculadas
+        ).delete()
+
+        existentes = list(PosicionRanking.objects.filter(pos_evento_fk_id=evento_id))
+        for posicion in existentes:
+            _, posicion.pos_puntaje, posicion.pos_puesto = calculadas.pop(posicion.pos_participante_evento_fk_id)
+        PosicionRanking.objects.bulk_update(existentes, ['pos_puntaje', 'pos_puesto'])
+
+        PosicionRanking.objects.bulk_create([
+            PosicionRanking(
+                pos_evento_fk_id=evento_id,
+                pos_participante_evento_fk_id=participante_evento_id,
+                pos_participante_fk_id=participante_id,
+                pos_puntaje=puntaje,
+                pos_puesto=puesto,
+            )
+            for participante_evento_id, (participante_id, puntaje, puesto) in calculadas.items()
+        ])
+    return len(filas)
+
+
+############ LECTURAS ############
+
+def podio(evento_id, limite=None):
+    """
+    Ranking ordenado por puesto (top-N si se da `limite`). Retorna objetos
+    ParticipanteEvento con los atributos `puesto` y `puntaje` ya cargados.
+    """
+    posiciones = (
+        PosicionRanking.objects.filter(pos_evento_fk_id=evento_id)
+        .select_related('pos_participante_evento_fk__par_eve_participante_fk__usuario')
+        .order_by('pos_puesto', 'pos_participante_evento_fk_id')
+    )
+    if limite:
+        posiciones = posiciones[:limite]
+
+    resultado = []
+    for posicion in posiciones:
+        participante_evento = posicion.pos_participante_evento_fk
+        participante_evento.puesto = posicion.pos_puesto
+        participante_evento.puntaje = posicion.pos_puntaje
+        resultado.append(participante_evento)
+    return resultado
+
+
+def puesto_de(evento_id, participante_id):
+    """
+    Puesto actual de un participante en el evento, o None si aún no tiene puntaje.
+    """
+    return (
+        PosicionRanking.objects.filter(pos_evento_fk_id=evento_id, pos_participante_fk_id=participante_id)
+        .values_list('pos_puesto', flat=True)
+        .first()
+    )
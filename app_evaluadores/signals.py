@@ -0,0 +1,23 @@
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from app_admin_eventos.models import Evento
+from app_participantes.models import ParticipanteEvento
+
+from .ranking import retirar_del_ranking
+
+
+# El receptor va sobre ParticipanteEvento (que ya tiene receptores de baja)
+# y no sobre PosicionRanking: así las filas del ranking se siguen borrando en
+# cascada con un solo DELETE, sin cargarlas una por una.
+
+@receiver(pre_delete, sender=ParticipanteEvento)
+def cerrar_hueco_ranking(sender, instance, origin=None, **kwargs):
+    """
+    Cuando sale alguien del ranking (se elimina su inscripción, su perfil o
+    su usuario), los que estaban por debajo suben un puesto.
+    """
+    # Si se está eliminando el evento, su ranking cae completo con él
+    if isinstance(origin, Evento) or getattr(origin, 'model', None) is Evento:
+        return
+    retirar_del_ranking(instance.pk)
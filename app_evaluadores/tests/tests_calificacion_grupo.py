@@ -0,0 +1,151 @@
+from datetime import date, timedelta
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from app_usuarios.models import Usuario, AdministradorEvento, Participante, Evaluador
+from app_admin_eventos.models import Criterio, Evento
+from app_participantes.models import ParticipanteEvento
+from app_evaluadores.models import Calificacion, EvaluadorEvento, PosicionRanking
+from app_evaluadores.puntajes import guardar_calificaciones
+
+
+class CalificacionGrupoTestCase(TestCase):
+    """
+    Casos de prueba para la escritura en bloque de calificaciones de grupos.
+    Las mediciones de consultas sirven de benchmark: el número de viajes a la
+    base de datos no debe crecer con el tamaño del grupo ni con la rúbrica.
+    """
+
+    def crear_usuario(self, nombre, rol):
+        self.contador += 1
+        return Usuario.objects.create_user(
+            username=nombre, password="testpass123", email=f"{nombre}@test.com",
+            rol=rol, cedula=f"93000{self.contador:05d}",
+        )
+
+    def crear_grupo(self, prefijo, tamano):
+        lider = Participante.objects.create(usuario=self.crear_usuario(f"{prefijo}_lider", Usuario.Roles.PARTICIPANTE))
+        proyecto = ParticipanteEvento.objects.create(
+            par_eve_participante_fk=lider, par_eve_evento_fk=self.evento,
+            par_eve_estado='Aprobado', par_eve_clave=f"{prefijo}L", par_eve_es_grupo=True,
+        )
+        for i in range(tamano - 1):
+            miembro = Participante.objects.create(usuario=self.crear_usuario(f"{prefijo}_m{i}", Usuario.Roles.PARTICIPANTE))
+            ParticipanteEvento.objects.create(
+                par_eve_participante_fk=miembro, par_eve_evento_fk=self.evento,
+                par_eve_estado='Aprobado', par_eve_clave=f"{prefijo}{i}", par_eve_es_grupo=True,
+                par_eve_proyecto_principal=proyecto,
+            )
+        return proyecto
+
+    def datos_formulario(self, valor):
+        return {f'calificacion_{criterio.id}': str(valor) for criterio in self.criterios}
+
+    def calificar(self, proyecto, valor):
+        url = reverse('calificando_participante', args=[proyecto.par_eve_participante_fk_id, self.evento.id])
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.post(url, self.datos_formulario(valor))
+        self.assertEqual(response.status_code, 302)
+        return len(consultas)
+
+    def setUp(self):
+        self.client = Client()
+        self.contador = 0
+
+        user_admin = self.crear_usuario("admin_grp", Usuario.Roles.ADMIN_EVENTO)
+        self.admin_evento, _ = AdministradorEvento.objects.get_or_create(usuario=user_admin)
+
+        self.evento = Evento.objects.create(
+            eve_nombre='Feria de Grupos',
+            eve_descripcion='Evento de prueba',
+            eve_ciudad='Manizales',
+            eve_lugar='Coliseo',
+            eve_fecha_inicio=date.today() + timedelta(days=10),
+            eve_fecha_fin=date.today() + timedelta(days=12),
+            eve_estado='Publicado',
+            eve_administrador_fk=self.admin_evento,
+            eve_capacidad=50,
+            eve_tienecosto='No',
+            eve_imagen=SimpleUploadedFile("img.jpg", b"imgcontent", content_type="image/jpeg"),
+            eve_programacion=SimpleUploadedFile("prog.pdf", b"progcontent", content_type="application/pdf"),
+        )
+        self.criterios = [
+            Criterio.objects.create(cri_descripcion=f'Criterio {i}', cri_peso=10, cri_evento_fk=self.evento)
+            for i in range(10)
+        ]
+
+        self.evaluador = Evaluador.objects.create(usuario=self.crear_usuario("eva_grp", Usuario.Roles.EVALUADOR))
+        EvaluadorEvento.objects.create(
+            eva_eve_evaluador_fk=self.evaluador, eva_eve_evento_fk=self.evento, eva_eve_estado='Aprobado',
+        )
+
+        session = self.client.session
+        session['evaluador_id'] = self.evaluador.pk
+        session.save()
+
+    def test_calificar_grupo_guarda_todos_los_miembros(self):
+        proyecto = self.crear_grupo("g6", 6)
+
+        self.calificar(proyecto, 80)
+
+        miembros = ParticipanteEvento.objects.filter(par_eve_evento_fk=self.evento)
+        self.assertEqual(Calificacion.objects.filter(cal_evaluador_fk=self.evaluador).count(), 60)
+        self.assertEqual(set(miembros.values_list('calificacion', flat=True)), {80})
+        self.assertEqual(set(PosicionRanking.objects.values_list('pos_puesto', flat=True)), {1})
+
+    def test_recalificar_actualiza_sin_duplicar(self):
+        proyecto = self.crear_grupo("g6", 6)
+        self.calificar(proyecto, 80)
+
+        self.calificar(proyecto, 55)
+
+        valores = Calificacion.objects.filter(cal_evaluador_fk=self.evaluador).values_list('cal_valor', flat=True)
+        self.assertEqual(len(valores), 60)
+        self.assertEqual(set(valores), {55})
+        self.assertEqual(
+            set(ParticipanteEvento.objects.filter(par_eve_evento_fk=self.evento).values_list('calificacion', flat=True)),
+            {55},
+        )
+
+    def test_consultas_no_crecen_con_el_grupo(self):
+        pequeno = self.crear_grupo("g2", 2)
+        grande = self.crear_grupo("g6", 6)
+
+        consultas_pequeno = self.calificar(pequeno, 70)
+        consultas_grande = self.calificar(grande, 70)
+
+        self.assertEqual(consultas_pequeno, consultas_grande)
+
+    def test_benchmark_contra_escritura_por_fila(self):
+        proyecto = self.crear_grupo("g6", 6)
+        miembros = proyecto.get_todos_miembros_proyecto()
+
+        # Escritura anterior: update_or_create por criterio y miembro + save() por miembro
+        with CaptureQueriesContext(connection) as por_fila:
+            for miembro_pe in miembros:
+                for criterio in self.criterios:
+                    Calificacion.objects.update_or_create(
+                        cal_evaluador_fk=self.evaluador, cal_criterio_fk=criterio,
+                        cal_participante_fk_id=miembro_pe.par_eve_participante_fk_id,
+                        defaults={'cal_valor': 60},
+                    )
+                miembro_pe.calificacion = 60
+                miembro_pe.save()
+
+        valores = {criterio.id: 90 for criterio in self.criterios}
+        participantes = [miembro_pe.par_eve_participante_fk_id for miembro_pe in miembros]
+        with CaptureQueriesContext(connection) as en_bloque:
+            guardar_calificaciones(self.evaluador.id, valores, participantes)
+            ParticipanteEvento.objects.filter(pk__in=[m.pk for m in miembros]).update(calificacion=90)
+
+        # 6 miembros x 10 criterios: más de 60 viajes contra un puñado constante
+        self.assertGreater(len(por_fila), 60)
+        self.assertLessEqual(len(en_bloque), 6)
+        self.assertEqual(
+            set(Calificacion.objects.filter(cal_evaluador_fk=self.evaluador).values_list('cal_valor', flat=True)),
+            {90},
+        )
@@ -0,0 +1,135 @@
+from datetime import date, timedelta
+
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from app_usuarios.models import Usuario, AdministradorEvento, Evaluador
+from app_admin_eventos.busqueda import indexar_eventos, normalizar_ciudades
+from app_admin_eventos.models import Area, Categoria, Criterio, Evento, EventoCategoria
+from app_evaluadores.dashboard import eventos_evaluador
+from app_evaluadores.models import EvaluadorEvento
+
+
+class DashboardEvaluadorConsultasTestCase(TestCase):
+    """
+    Capa de consultas del dashboard del evaluador: eventos anotados con la
+    suma de pesos de criterios y filtros sobre los campos reales de Evento.
+    """
+
+    def crear_usuario(self, nombre, rol):
+        self.contador += 1
+        return Usuario.objects.create_user(
+            username=nombre, password="testpass123", email=f"{nombre}@test.com",
+            rol=rol, cedula=f"98000{self.contador:05d}", first_name=nombre.capitalize(), last_name="Prueba",
+        )
+
+    def crear_eventos(self, cantidad, estado_evaluador='Aprobado', **campos):
+        """
+        Fixture de benchmark: crea eventos en bloque (sin subir archivos),
+        cada uno con dos criterios que suman 100, y los asigna al evaluador.
+        """
+        datos = {
+            'eve_descripcion': 'Evento de prueba', 'eve_ciudad': 'Manizales', 'eve_lugar': 'Coliseo',
+            'eve_fecha_inicio': date.today(), 'eve_fecha_fin': date.today() + timedelta(days=1),
+            'eve_estado': 'Publicado', 'eve_capacidad': 10, 'eve_tienecosto': 'No',
+            'eve_imagen': 'upload/eventos/img.jpg', 'eve_programacion': 'upload/eventos/prog.pdf',
+            **campos,
+        }
+        inicio = Evento.objects.count()
+        eventos = Evento.objects.bulk_create([
+            Evento(eve_nombre=f"Evento {inicio + i}", eve_administrador_fk=self.admin_evento, **datos)
+            for i in range(cantidad)
+        ])
+        Criterio.objects.bulk_create([
+            Criterio(cri_descripcion=descripcion, cri_peso=peso, cri_evento_fk=evento)
+            for evento in eventos for descripcion, peso in (("Uno", 70), ("Dos", 30))
+        ])
+        EvaluadorEvento.objects.bulk_create([
+            EvaluadorEvento(eva_eve_evaluador_fk=self.evaluador, eva_eve_evento_fk=evento, eva_eve_estado=estado_evaluador)
+            for evento in eventos
+        ])
+        # bulk_create no pasa por Evento.save() ni dispara las señales del índice de búsqueda
+        normalizar_ciudades()
+        indexar_eventos([evento.id for evento in eventos])
+        return eventos
+
+    def setUp(self):
+        self.client = Client()
+        self.contador = 0
+
+        user_admin = self.crear_usuario("admin_dash_eva", Usuario.Roles.ADMIN_EVENTO)
+        self.admin_evento, _ = AdministradorEvento.objects.get_or_create(usuario=user_admin)
+        usuario = self.crear_usuario("evaluador_dash", Usuario.Roles.EVALUADOR)
+        usuario.last_login = timezone.now()
+        usuario.save()
+        self.evaluador = Evaluador.objects.create(usuario=usuario)
+
+        session = self.client.session
+        session['evaluador_id'] = self.evaluador.pk
+        session.save()
+
+    def test_aprobados_pendientes_y_suma_de_criterios(self):
+        completo, = self.crear_eventos(1)
+        incompleto, = self.crear_eventos(1)
+        Criterio.objects.filter(cri_evento_fk=incompleto, cri_descripcion="Dos").delete()
+        sin_criterios, = self.crear_eventos(1)
+        Criterio.objects.filter(cri_evento_fk=sin_criterios).delete()
+        pendiente, = self.crear_eventos(1, estado_evaluador='Pendiente')
+
+        aprobados, pendientes = eventos_evaluador(self.evaluador.id)
+
+        self.assertEqual([(e.id, e.criterios_suma) for e in aprobados], [(completo.id, 100), (incompleto.id, 70), (sin_criterios.id, 0)])
+        self.assertEqual(pendientes, [pendiente])
+
+    def test_filtros_usan_ciudad_y_tiene_costo(self):
+        bogota, = self.crear_eventos(1, eve_ciudad='Bogotá', eve_lugar='Manizales Plaza')
+        pago, = self.crear_eventos(1, eve_tienecosto='Si')
+        pendiente, = self.crear_eventos(1, estado_evaluador='Pendiente', eve_ciudad='Pereira')
+
+        aprobados, pendientes = eventos_evaluador(self.evaluador.id, {'ciudad': 'bogot'})
+        self.assertEqual(aprobados, [bogota])
+        # Los pendientes no se filtran
+        self.assertEqual(pendientes, [pendiente])
+
+        self.assertEqual(eventos_evaluador(self.evaluador.id, {'ciudad': 'Manizales'})[0], [pago])
+        self.assertEqual(eventos_evaluador(self.evaluador.id, {'costo': 'si'})[0], [pago])
+        self.assertEqual(eventos_evaluador(self.evaluador.id, {'costo': 'No', 'nombre': bogota.eve_nombre})[0], [bogota])
+
+    def test_filtro_por_area_y_categoria_sin_duplicados(self):
+        area = Area.objects.create(are_nombre="Ciencia", are_descripcion="Ciencia")
+        fisica = Categoria.objects.create(cat_nombre="Física", cat_descripcion="Física", cat_area_fk=area)
+        quimica = Categoria.objects.create(cat_nombre="Química", cat_descripcion="Química", cat_area_fk=area)
+        evento, otro = self.crear_eventos(2)
+        EventoCategoria.objects.create(eve_cat_evento_fk=evento, eve_cat_categoria_fk=fisica)
+        EventoCategoria.objects.create(eve_cat_evento_fk=evento, eve_cat_categoria_fk=quimica)
+
+        self.assertEqual(eventos_evaluador(self.evaluador.id, {'area': area.id})[0], [evento])
+        self.assertEqual(eventos_evaluador(self.evaluador.id, {'categoria': quimica.id})[0], [evento])
+
+    def test_otro_evaluador_no_ve_los_eventos(self):
+        self.crear_eventos(2)
+        otro = Evaluador.objects.create(usuario=self.crear_usuario("otro_eva", Usuario.Roles.EVALUADOR))
+        self.assertEqual(eventos_evaluador(otro.id), ([], []))
+
+    def test_benchmark_cientos_de_eventos_con_consultas_constantes(self):
+        self.crear_eventos(3)
+        # La primera visita carga las áreas y categorías del registro de referencia
+        self.client.get(reverse('dashboard_evaluador'))
+        with CaptureQueriesContext(connection) as pocos:
+            self.client.get(reverse('dashboard_evaluador'))
+
+        self.crear_eventos(300)
+        self.crear_eventos(100, estado_evaluador='Pendiente')
+        with CaptureQueriesContext(connection) as muchos:
+            response = self.client.get(reverse('dashboard_evaluador'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['eventos']), 303)
+        self.assertEqual(len(response.context['eventos_pendientes']), 100)
+        self.assertTrue(all(response.context['criterios_completos'].values()))
+        self.assertEqual(len(muchos), len(pocos))
+        with self.assertNumQueries(1):
+            eventos_evaluador(self.evaluador.id, {'ciudad': 'Manizales', 'costo': 'No', 'area': 1})
@@ -0,0 +1,203 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+
+from app_usuarios.models import Usuario, AdministradorEvento, Participante, Evaluador
+from app_admin_eventos.models import Criterio, Evento
+from app_participantes.models import ParticipanteEvento
+from app_evaluadores.models import Calificacion, EvaluadorEvento, PosicionRanking
+from app_evaluadores.puntajes import puntajes_evento, puntaje_final, recalcular_evento
+
+
+class PuntajesPonderadosTestCase(TestCase):
+    """
+    Casos de prueba para el motor de puntajes ponderados por cri_peso.
+    """
+
+    def crear_usuario(self, nombre, rol):
+        self.contador += 1
+        return Usuario.objects.create_user(
+            username=nombre, password="testpass123", email=f"{nombre}@test.com",
+            rol=rol, cedula=f"92000{self.contador:05d}",
+        )
+
+    def calificar(self, evaluador, participante_evento, valores):
+        for criterio, valor in zip(self.criterios, valores):
+            Calificacion.objects.create(
+                cal_evaluador_fk=evaluador, cal_criterio_fk=criterio,
+                cal_participante_fk=participante_evento.par_eve_participante_fk, cal_valor=valor,
+            )
+
+    def setUp(self):
+        self.client = Client()
+        self.contador = 0
+
+        user_admin = self.crear_usuario("admin_pun", Usuario.Roles.ADMIN_EVENTO)
+        self.admin_evento, _ = AdministradorEvento.objects.get_or_create(usuario=user_admin)
+
+        self.evento = Evento.objects.create(
+            eve_nombre='Feria de Puntajes',
+            eve_descripcion='Evento de prueba',
+            eve_ciudad='Manizales',
+            eve_lugar='Coliseo',
+            eve_fecha_inicio=date.today() + timedelta(days=10),
+            eve_fecha_fin=date.today() + timedelta(days=12),
+            eve_estado='Publicado',
+            eve_administrador_fk=self.admin_evento,
+            eve_capacidad=50,
+            eve_tienecosto='No',
+            eve_imagen=SimpleUploadedFile("img.jpg", b"imgcontent", content_type="image/jpeg"),
+            eve_programacion=SimpleUploadedFile("prog.pdf", b"progcontent", content_type="application/pdf"),
+        )
+
+        # Pesos 75/25: un 100 en el primer criterio vale tres veces más que en el segundo
+        self.criterios = [
+            Criterio.objects.create(cri_descripcion='Innovación', cri_peso=75, cri_evento_fk=self.evento),
+            Criterio.objects.create(cri_descripcion='Presentación', cri_peso=25, cri_evento_fk=self.evento),
+        ]
+
+        self.evaluadores = []
+        for i in range(5):
+            evaluador = Evaluador.objects.create(usuario=self.crear_usuario(f"eva_pun_{i}", Usuario.Roles.EVALUADOR))
+            EvaluadorEvento.objects.create(
+                eva_eve_evaluador_fk=evaluador, eva_eve_evento_fk=self.evento, eva_eve_estado='Aprobado',
+            )
+            self.evaluadores.append(evaluador)
+
+        self.inscripciones = []
+        for i in range(2):
+            participante = Participante.objects.create(usuario=self.crear_usuario(f"par_pun_{i}", Usuario.Roles.PARTICIPANTE))
+            self.inscripciones.append(ParticipanteEvento.objects.create(
+                par_eve_participante_fk=participante, par_eve_evento_fk=self.evento,
+                par_eve_estado='Aprobado', par_eve_clave=f"PP{i}",
+            ))
+
+    def test_puntaje_ponderado_de_un_evaluador(self):
+        uno = self.inscripciones[0]
+        self.calificar(self.evaluadores[0], uno, [100, 0])
+
+        puntaje = puntajes_evento(self.evento.id)[uno.par_eve_participante_fk_id]
+
+        self.assertEqual(puntaje.evaluadores, 1)
+        self.assertAlmostEqual(puntaje.media, 75)
+
+    def test_media_mediana_y_recortada(self):
+        uno = self.inscripciones[0]
+        # Puntajes ponderados por evaluador: 10, 20, 30, 40, 100
+        for evaluador, nota in zip(self.evaluadores, [10, 20, 30, 40, 100]):
+            self.calificar(evaluador, uno, [nota, nota])
+
+        puntaje = puntajes_evento(self.evento.id, recorte=20)[uno.par_eve_participante_fk_id]
+
+        self.assertEqual(puntaje.evaluadores, 5)
+        self.assertAlmostEqual(puntaje.media, 40)
+        self.assertAlmostEqual(puntaje.mediana, 30)
+        # Se descarta el 20% de cada extremo (10 y 100)
+        self.assertAlmostEqual(puntaje.media_recortada, 30)
+
+    def test_mediana_con_cantidad_par(self):
+        uno = self.inscripciones[0]
+        for evaluador, nota in zip(self.evaluadores, [10, 20, 60, 90]):
+            self.calificar(evaluador, uno, [nota, nota])
+
+        puntaje = puntajes_evento(self.evento.id)[uno.par_eve_participante_fk_id]
+
+        self.assertAlmostEqual(puntaje.mediana, 40)
+
+    def test_recorte_fraccionario_es_simetrico(self):
+        uno = self.inscripciones[0]
+        for evaluador, nota in zip(self.evaluadores, [10, 20, 60, 90]):
+            self.calificar(evaluador, uno, [nota, nota])
+
+        # 30% de 4 filas = 1.2: se descarta una fila en cada extremo (20 y 60 quedan)
+        puntaje = puntajes_evento(self.evento.id, recorte=30)[uno.par_eve_participante_fk_id]
+
+        self.assertAlmostEqual(puntaje.mediana, 40)
+        self.assertAlmostEqual(puntaje.media_recortada, 40)
+
+    def test_recortada_sin_filas_usa_media(self):
+        uno = self.inscripciones[0]
+        self.calificar(self.evaluadores[0], uno, [80, 80])
+
+        puntaje = puntajes_evento(self.evento.id, recorte=49)[uno.par_eve_participante_fk_id]
+
+        self.assertEqual(puntaje_final(puntaje, 'media_recortada'), 80)
+
+    def test_una_consulta_por_evento(self):
+        for inscripcion in self.inscripciones:
+            for evaluador in self.evaluadores:
+                self.calificar(evaluador, inscripcion, [70, 90])
+
+        with self.assertNumQueries(1):
+            puntajes = puntajes_evento(self.evento.id)
+        self.assertEqual(len(puntajes), 2)
+
+    def test_filtro_por_participantes(self):
+        for inscripcion in self.inscripciones:
+            self.calificar(self.evaluadores[0], inscripcion, [70, 90])
+
+        participante_id = self.inscripciones[1].par_eve_participante_fk_id
+        self.assertEqual(list(puntajes_evento(self.evento.id, participantes=[participante_id])), [participante_id])
+        self.assertEqual(puntajes_evento(self.evento.id, participantes=[]), {})
+
+    def test_cambio_de_peso_recalcula_evento(self):
+        uno, dos = self.inscripciones
+        self.calificar(self.evaluadores[0], uno, [100, 0])
+        self.calificar(self.evaluadores[0], dos, [0, 100])
+        recalcular_evento(self.evento.id)
+
+        uno.refresh_from_db()
+        self.assertEqual(uno.calificacion, 75)
+        self.assertEqual(PosicionRanking.objects.get(pos_participante_evento_fk=uno).pos_puesto, 1)
+
+        # Invertir los pesos invierte el podio
+        Criterio.objects.filter(pk=self.criterios[0].pk).update(cri_peso=25)
+        Criterio.objects.filter(pk=self.criterios[1].pk).update(cri_peso=75)
+        call_command('recalcular_puntajes', evento=self.evento.id, stdout=StringIO())
+
+        uno.refresh_from_db()
+        dos.refresh_from_db()
+        self.assertEqual((uno.calificacion, dos.calificacion), (25, 75))
+        self.assertEqual(PosicionRanking.objects.get(pos_participante_evento_fk=dos).pos_puesto, 1)
+
+    @override_settings(PUNTAJES_AGREGADO='mediana')
+    def test_calificar_usa_todos_los_evaluadores(self):
+        uno = self.inscripciones[0]
+        self.calificar(self.evaluadores[0], uno, [20, 20])
+        self.calificar(self.evaluadores[1], uno, [90, 90])
+
+        session = self.client.session
+        session['evaluador_id'] = self.evaluadores[2].pk
+        session.save()
+
+        url = reverse('calificando_participante', args=[uno.par_eve_participante_fk_id, self.evento.id])
+        self.client.post(url, {
+            f'calificacion_{self.criterios[0].id}': '60',
+            f'calificacion_{self.criterios[1].id}': '0',
+        })
+
+        # Ponderados: 20, 90 y 45 -> mediana 45
+        uno.refresh_from_db()
+        self.assertEqual(uno.calificacion, 45)
+        self.assertEqual(PosicionRanking.objects.get(pos_participante_evento_fk=uno).pos_puntaje, 45)
+
+    def test_actualizar_peso_desde_vista_admin(self):
+        uno = self.inscripciones[0]
+        self.calificar(self.evaluadores[0], uno, [100, 0])
+        recalcular_evento(self.evento.id)
+
+        session = self.client.session
+        session['admin_id'] = self.admin_evento.pk
+        session.save()
+
+        self.client.post(reverse('actualizar_criterio', args=[self.criterios[0].pk]), {
+            'cri_descripcion': 'Innovación', 'cri_peso': '50',
+        })
+
+        # 100 * 50 / (50 + 25)
+        uno.refresh_from_db()
+        self.assertEqual(uno.calificacion, 67)
@@ -0,0 +1,187 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from app_usuarios.models import Usuario, AdministradorEvento, Participante, Evaluador
+from app_admin_eventos.models import Criterio, Evento
+from app_participantes.models import ParticipanteEvento
+from app_evaluadores.models import EvaluadorEvento, PosicionRanking
+from app_evaluadores.ranking import actualizar_ranking, reconstruir_ranking, podio, puesto_de
+
+
+class RankingTestCase(TestCase):
+    """
+    Casos de prueba para el ranking materializado por evento.
+    """
+
+    def crear_usuario(self, nombre, rol):
+        self.contador += 1
+        return Usuario.objects.create_user(
+            username=nombre, password="testpass123", email=f"{nombre}@test.com",
+            rol=rol, cedula=f"91000{self.contador:05d}",
+        )
+
+    def crear_participante(self, nombre, **extras):
+        participante = Participante.objects.create(usuario=self.crear_usuario(nombre, Usuario.Roles.PARTICIPANTE))
+        return ParticipanteEvento.objects.create(
+            par_eve_participante_fk=participante, par_eve_evento_fk=self.evento,
+            par_eve_estado='Aprobado', par_eve_clave=nombre[:10], **extras,
+        )
+
+    def setUp(self):
+        self.client = Client()
+        self.contador = 0
+
+        user_admin = self.crear_usuario("admin_rank", Usuario.Roles.ADMIN_EVENTO)
+        self.admin_evento, _ = AdministradorEvento.objects.get_or_create(usuario=user_admin)
+
+        self.evento = Evento.objects.create(
+            eve_nombre='Feria de Ranking',
+            eve_descripcion='Evento de prueba',
+            eve_ciudad='Manizales',
+            eve_lugar='Coliseo',
+            eve_fecha_inicio=date.today() + timedelta(days=10),
+            eve_fecha_fin=date.today() + timedelta(days=12),
+            eve_estado='Publicado',
+            eve_administrador_fk=self.admin_evento,
+            eve_capacidad=50,
+            eve_tienecosto='No',
+            eve_imagen=SimpleUploadedFile("img.jpg", b"imgcontent", content_type="image/jpeg"),
+            eve_programacion=SimpleUploadedFile("prog.pdf", b"progcontent", content_type="application/pdf"),
+        )
+
+        self.a = self.crear_participante("par_a")
+        self.b = self.crear_participante("par_b")
+        self.c = self.crear_participante("par_c")
+        self.d = self.crear_participante("par_d")
+
+    def puestos(self):
+        return dict(
+            PosicionRanking.objects.filter(pos_evento_fk=self.evento)
+            .values_list('pos_participante_evento_fk_id', 'pos_puesto')
+        )
+
+    def assertRankingConsistente(self):
+        """El ranking incremental debe coincidir con uno recalculado desde cero."""
+        for pe in ParticipanteEvento.objects.filter(pk__in=self.puestos()):
+            pe.calificacion = PosicionRanking.objects.get(pos_participante_evento_fk=pe).pos_puntaje
+            pe.save()
+        incremental = self.puestos()
+        reconstruir_ranking(self.evento.id)
+        self.assertEqual(incremental, self.puestos())
+
+    def test_inserciones_y_empates(self):
+        actualizar_ranking(self.evento.id, {self.a.pk: 80})
+        actualizar_ranking(self.evento.id, {self.b.pk: 90})
+        actualizar_ranking(self.evento.id, {self.c.pk: 80})
+        actualizar_ranking(self.evento.id, {self.d.pk: 70})
+
+        self.assertEqual(self.puestos(), {self.b.pk: 1, self.a.pk: 2, self.c.pk: 2, self.d.pk: 4})
+        self.assertRankingConsistente()
+
+    def test_subir_y_bajar_puntaje(self):
+        actualizar_ranking(self.evento.id, {self.a.pk: 80, self.b.pk: 70, self.c.pk: 60})
+
+        actualizar_ranking(self.evento.id, {self.c.pk: 95})
+        self.assertEqual(self.puestos(), {self.c.pk: 1, self.a.pk: 2, self.b.pk: 3})
+
+        actualizar_ranking(self.evento.id, {self.c.pk: 70})
+        self.assertEqual(self.puestos(), {self.a.pk: 1, self.b.pk: 2, self.c.pk: 2})
+
+        actualizar_ranking(self.evento.id, {self.a.pk: 10})
+        self.assertEqual(self.puestos(), {self.b.pk: 1, self.c.pk: 1, self.a.pk: 3})
+        self.assertRankingConsistente()
+
+    def test_grupo_se_mueve_en_bloque(self):
+        actualizar_ranking(self.evento.id, {self.a.pk: 85})
+        actualizar_ranking(self.evento.id, {self.b.pk: 90, self.c.pk: 90, self.d.pk: 90})
+
+        self.assertEqual(self.puestos(), {self.b.pk: 1, self.c.pk: 1, self.d.pk: 1, self.a.pk: 4})
+
+        actualizar_ranking(self.evento.id, {self.b.pk: 50, self.c.pk: 50, self.d.pk: 50})
+        self.assertEqual(self.puestos(), {self.a.pk: 1, self.b.pk: 2, self.c.pk: 2, self.d.pk: 2})
+        self.assertRankingConsistente()
+
+    def test_puntaje_sin_cambios_no_escribe(self):
+        actualizar_ranking(self.evento.id, {self.a.pk: 80})
+        with CaptureQueriesContext(connection) as consultas:
+            actualizar_ranking(self.evento.id, {self.a.pk: 80})
+
+        escrituras = [q['sql'] for q in consultas if q['sql'].startswith(('UPDATE', 'INSERT', 'DELETE'))]
+        self.assertEqual(escrituras, [])
+
+    def test_eliminar_cierra_hueco(self):
+        actualizar_ranking(self.evento.id, {self.a.pk: 90, self.b.pk: 80, self.c.pk: 70})
+
+        self.b.delete()
+
+        self.assertEqual(self.puestos(), {self.a.pk: 1, self.c.pk: 2})
+
+        # También cuando la inscripción cae en cascada con el perfil
+        self.a.par_eve_participante_fk.delete()
+        self.assertEqual(self.puestos(), {self.c.pk: 1})
+
+    def test_eliminar_evento_borra_el_ranking_en_bloque(self):
+        actualizar_ranking(self.evento.id, {self.a.pk: 90, self.b.pk: 80, self.c.pk: 70, self.d.pk: 60})
+
+        with CaptureQueriesContext(connection) as consultas:
+            self.evento.delete()
+
+        # Borrado rápido: DELETE directos (por evento y por inscripción), sin leer ni desplazar filas
+        ranking = [q['sql'] for q in consultas if 'app_evaluadores_posicionranking' in q['sql']]
+        self.assertTrue(ranking)
+        self.assertTrue(all(sql.startswith('DELETE') for sql in ranking))
+        self.assertFalse(PosicionRanking.objects.exists())
+
+    def test_reconstruir_desde_calificaciones(self):
+        for pe, nota in [(self.a, 60), (self.b, 90), (self.c, 60)]:
+            pe.calificacion = nota
+            pe.save()
+        PosicionRanking.objects.create(
+            pos_evento_fk=self.evento, pos_participante_evento_fk=self.d,
+            pos_participante_fk=self.d.par_eve_participante_fk, pos_puntaje=99, pos_puesto=1,
+        )
+
+        call_command('reconstruir_ranking', evento=self.evento.id, stdout=StringIO())
+
+        self.assertEqual(self.puestos(), {self.b.pk: 1, self.a.pk: 2, self.c.pk: 2})
+
+    def test_lecturas_en_una_consulta(self):
+        actualizar_ranking(self.evento.id, {self.a.pk: 90, self.b.pk: 80, self.c.pk: 70, self.d.pk: 60})
+
+        with self.assertNumQueries(1):
+            top = podio(self.evento.id, limite=3)
+            nombres = [pe.par_eve_participante_fk.usuario.username for pe in top]
+        self.assertEqual(nombres, ['par_a', 'par_b', 'par_c'])
+        self.assertEqual([pe.puesto for pe in top], [1, 2, 3])
+
+        with self.assertNumQueries(1):
+            self.assertEqual(puesto_de(self.evento.id, self.c.par_eve_participante_fk_id), 3)
+
+    def test_calificar_actualiza_ranking(self):
+        criterio = Criterio.objects.create(cri_descripcion='Innovación', cri_peso=100, cri_evento_fk=self.evento)
+        evaluador = Evaluador.objects.create(usuario=self.crear_usuario("eva_rank", Usuario.Roles.EVALUADOR))
+        EvaluadorEvento.objects.create(
+            eva_eve_evaluador_fk=evaluador, eva_eve_evento_fk=self.evento, eva_eve_estado='Aprobado',
+        )
+        actualizar_ranking(self.evento.id, {self.a.pk: 50})
+
+        session = self.client.session
+        session['evaluador_id'] = evaluador.pk
+        session.save()
+
+        url = reverse('calificando_participante', args=[self.b.par_eve_participante_fk_id, self.evento.id])
+        response = self.client.post(url, {f'calificacion_{criterio.id}': '75'})
+        self.assertEqual(response.status_code, 302)
+
+        self.assertEqual(self.puestos(), {self.b.pk: 1, self.a.pk: 2})
+
+        response = self.client.get(reverse('ver_calificaciones', args=[self.evento.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([pe.puesto for pe in response.context['participantes']], [1, 2])
@@ -11,8 +11,12 @@ from app_participantes.models import ParticipanteEvento
 from app_usuarios.models import Evaluador, Participante, Usuario
 from principal_eventos.settings import DEFAULT_FROM_EMAIL
 from .models import Calificacion, EvaluadorEvento
+from .dashboard import eventos_evaluador
+from .puntajes import guardar_calificaciones, puntaje_final, puntajes_evento, recalcular_evento
+from .ranking import actualizar_ranking, podio
 from app_admin_eventos.models import Area, Categoria, Criterio, Evento
-from app_asistentes.models import AsistenteEvento
+from app_admin_eventos import referencias
+from app_admin_eventos.inscripciones import Tipos, roles_en_evento
 from .forms import EvaluadorForm, EditarUsuarioEvaluadorForm
 from django.views.generic import DetailView, ListView
 from django.db.models import Q
@@ -38,67 +42,31 @@ from django.db import transaction
 @method_decorator(evaluador_required, name='dispatch')
 class DashboardEvaluadorView(View):
     def get(self, request):
-        evaluador_id = request.session.get('evaluador_id')
-        if not evaluador_id:
-            messages.error(request, "Debe iniciar sesión como evaluador.")
-            return redirect('login_view')
-
-        try:
-            evaluador = Evaluador.objects.get(id=evaluador_id)
-        except Evaluador.DoesNotExist:
+        # Ya resuelto en dispatch: no se vuelve a consultar
+        evaluador = request.perfiles.evaluador
+        if evaluador is None:
             messages.error(request, "Evaluador no encontrado.")
             return redirect('login_view')
 
-        # Relación completa con estado
-        relaciones = EvaluadorEvento.objects.filter(eva_eve_evaluador_fk=evaluador).select_related('eva_eve_evento_fk')
-
-        # Separar eventos según estado
-        eventos_aprobados = [rel.eva_eve_evento_fk for rel in relaciones if rel.eva_eve_estado == 'Aprobado']
-        eventos_pendientes = [rel.eva_eve_evento_fk for rel in relaciones if rel.eva_eve_estado == 'Pendiente']
-
-        # Aplicar filtros sobre eventos_aprobados
-        nombre = request.GET.get('nombre')
-        ciudad = request.GET.get('ciudad')
-        area_id = request.GET.get('area')
-        categoria_id = request.GET.get('categoria')
-        costo = request.GET.get('costo')
-        estado = request.GET.get('estado')
-
-        eventos = Evento.objects.filter(id__in=[e.id for e in eventos_aprobados])
-
-        if nombre:
-            eventos = eventos.filter(eve_nombre__icontains=nombre)
-        if ciudad:
-            eventos = eventos.filter(eve_lugar__icontains=ciudad)
-        if area_id:
-            eventos = eventos.filter(categorias__cat_area_fk__id=area_id).distinct()
-        if categoria_id:
-            eventos = eventos.filter(categorias__id=categoria_id).distinct()
-        if costo:
-            eventos = eventos.filter(eve_costo=costo)
-        if estado:
-            eventos = eventos.filter(eve_estado=estado)
+        # Eventos aprobados (filtrados) y pendientes con la suma de pesos de criterios en una consulta
+        eventos, eventos_pendientes = eventos_evaluador(evaluador.id, request.GET)
 
         # Verificar si los criterios suman 100 para habilitar botón
-        criterios_completos = {}
-        for evento in eventos:
-            suma_pesos = Criterio.objects.filter(cri_evento_fk=evento).aggregate(total=models.Sum('cri_peso'))['total'] or 0
-            criterios_completos[evento.id] = (suma_pesos == 100)
+        criterios_completos = {evento.id: evento.criterios_suma == 100 for evento in eventos}
 
         context = {
             'evaluador': evaluador,
             'eventos': eventos,
             'eventos_pendientes': eventos_pendientes,
-            'areas': Area.objects.all(),
-            'categorias': Categoria.objects.all(),
+            'areas': referencias.areas(),
+            'categorias': referencias.categorias(),
             'criterios_completos': criterios_completos,
         }
         return render(request, 'dashboard_principal_evaluador.html', context)
 
     #Iniciar sesion una vez y cambiar contraseña
     def dispatch(self, request, *args, **kwargs):
-        evaluador_id = request.session.get('evaluador_id')
-        evaluador = get_object_or_404(Evaluador, pk=evaluador_id)
+        evaluador = request.perfiles.requerido('evaluador')
 
         # Si nunca ha iniciado sesión, forzar cambio de contraseña
         if not evaluador.usuario.last_login:
@@ -128,8 +96,7 @@ class CambioPasswordEvaluadorView(View):
             messages.error(request, "❌ La contraseña debe tener al menos 6 caracteres.")
             return render(request, self.template_name)
 
-        evaluador_id = request.session.get('evaluador_id')
-        evaluador = get_object_or_404(Evaluador, pk=evaluador_id)
+        evaluador = request.perfiles.requerido('evaluador')
         usuario = evaluador.usuario
 
         usuario.set_password(password1)
@@ -177,6 +144,7 @@ class EvaluadorCreateView(View):
                     
                     # --- 🔑 INICIO DEL BLOQUE DE REUTILIZACIÓN DE DATOS (Modificado) 🔑 ---
                     
+                    rol_en_evento = None
                     if usuario_existente:
                         usuario = usuario_existente
                         creado = False
@@ -184,19 +152,16 @@ class EvaluadorCreateView(View):
 
                         # 🛑 APLICACIÓN DE VERIFICACIÓN DE ROLES CRUZADA (CLAVE) 🛑
                         
+                        # Rol que ya tiene en este evento: una consulta al índice de inscripciones
+                        rol_en_evento = roles_en_evento(evento.pk, [usuario.pk]).get(usuario.pk)
+
                         # 1. Verificar si ya es Asistente en este evento
-                        if AsistenteEvento.objects.filter(
-                            asi_eve_evento_fk=evento,
-                            asi_eve_asistente_fk__usuario=usuario # Seguimiento al usuario
-                        ).exists():
+                        if rol_en_evento == Tipos.ASISTENTE:
                             messages.error(request, f"🚫 El usuario ya está inscrito como ASISTENTE en el evento \"{evento.eve_nombre}\".")
                             return render(request, 'crear_evaluador.html', {'form': form, 'evento': evento})
 
                         # 2. Verificar si ya es Participante en este evento
-                        if ParticipanteEvento.objects.filter(
-                            par_eve_evento_fk=evento,
-                            par_eve_participante_fk__usuario=usuario # Seguimiento al usuario
-                        ).exists():
+                        if rol_en_evento == Tipos.PARTICIPANTE:
                             messages.error(request, f"🚫 El usuario ya está inscrito como PARTICIPANTE en el evento \"{evento.eve_nombre}\".")
                             return render(request, 'crear_evaluador.html', {'form': form, 'evento': evento})
 
@@ -242,10 +207,7 @@ class EvaluadorCreateView(View):
                     evaluador, evaluador_creado = Evaluador.objects.get_or_create(usuario=usuario) 
 
                     # 🔹 Verificar si ya está inscrito en este evento como EVALUADOR (Revisión de duplicados)
-                    if EvaluadorEvento.objects.filter(
-                        eva_eve_evaluador_fk=evaluador,
-                        eva_eve_evento_fk=evento
-                    ).exists():
+                    if rol_en_evento == Tipos.EVALUADOR:
                         messages.warning(request, f"⚠️ El usuario {usuario.username} ya está registrado como evaluador en este evento.")
                         return redirect('pagina_principal')
 
@@ -409,7 +371,7 @@ class EventoDetailView(DetailView):
         
         # Verificar si el evaluador está asignado a este evento
         if evaluador_id:
-            evaluador = get_object_or_404(Evaluador, id=evaluador_id)
+            evaluador = self.request.perfiles.requerido('evaluador')
             if not EvaluadorEvento.objects.filter(eva_eve_evaluador_fk=evaluador, eva_eve_evento_fk=evento).exists():
                 messages.error(self.request, "No tienes permiso para ver este evento.")
                 return redirect('pagina_principal')
@@ -531,10 +493,15 @@ class ActualizarEvaCriterioView(View):
             return redirect('crear_criterio_eva', evento_id=criterio.cri_evento_fk.id)
 
         # Guardar si pasa validación
+        cambia_peso = criterio.cri_peso != nuevo_peso
         criterio.cri_descripcion = descripcion
         criterio.cri_peso = nuevo_peso
         criterio.save()
 
+        # Un peso distinto cambia los puntajes ponderados de todo el evento
+        if cambia_peso:
+            recalcular_evento(criterio.cri_evento_fk_id)
+
         messages.success(request, 'Criterio actualizado exitosamente.')
         return redirect('crear_criterio_eva', evento_id=criterio.cri_evento_fk.id)
     
@@ -545,6 +512,7 @@ class EliminarEvaCriterioView(View):
         criterio = get_object_or_404(Criterio, pk=criterio_id)
         evento_id = criterio.cri_evento_fk.id
         criterio.delete()
+        recalcular_evento(evento_id)
 
         messages.success(request, 'Criterio eliminado exitosamente.')
         return redirect('crear_criterio_eva', evento_id=evento_id)
@@ -573,7 +541,7 @@ class CalificarParticipantesView(View):
     template_name = 'ver_lista_participantes.html'
 
     def get(self, request, evento_id):
-        evaluador = get_object_or_404(Evaluador, id=request.session['evaluador_id'])
+        evaluador = request.perfiles.requerido('evaluador')
         evento = get_object_or_404(Evento, pk=evento_id)
 
         # Obtener los criterios del evento (para luego filtrar calificaciones)
@@ -658,8 +626,7 @@ class CalificandoParticipanteView(View):
         participante = get_object_or_404(Participante, pk=participante_id)
         evento = get_object_or_404(Evento, pk=evento_id)
         criterios = Criterio.objects.filter(cri_evento_fk=evento)
-        evaluador_id = request.session.get('evaluador_id')
-        evaluador = get_object_or_404(Evaluador, pk=evaluador_id)
+        evaluador = request.perfiles.requerido('evaluador')
 
         # Obtener la relación ParticipanteEvento del líder
         participante_evento_lider = get_object_or_404(ParticipanteEvento, 
@@ -667,57 +634,42 @@ class CalificandoParticipanteView(View):
                                                      par_eve_evento_fk=evento,
                                                      par_eve_proyecto_principal__isnull=True)
 
-        # Lista para almacenar las calificaciones obtenidas
-        calificaciones = []
-
-        # Guardar las calificaciones de cada criterio para el líder
+        # Notas enviadas por criterio
+        valores = {}
         for criterio in criterios:
-            campo = f'calificacion_{criterio.id}'
-            valor = request.POST.get(campo)
+            valor = request.POST.get(f'calificacion_{criterio.id}')
             if valor:
-                calificaciones.append(int(valor))
-                
-                # Guardamos la calificación solo para el líder
-                Calificacion.objects.update_or_create(
-                    cal_evaluador_fk=evaluador,
-                    cal_criterio_fk=criterio,
-                    cal_participante_fk=participante,
-                    defaults={'cal_valor': int(valor)}
-                )
+                valores[criterio.id] = int(valor)
 
-        # Calcular promedio de las calificaciones actuales
-        if calificaciones:
-            promedio = sum(calificaciones) / len(calificaciones)
-            calificacion_final = round(promedio)
-            
-            # Aplicar la calificación a todo el grupo
+        if valores:
+            # Un grupo recibe las mismas notas en todos sus miembros (incluido el líder)
             if participante_evento_lider.par_eve_es_grupo:
-                # Obtener todos los miembros del proyecto (incluido el líder)
                 todos_miembros = participante_evento_lider.get_todos_miembros_proyecto()
-                
-                for miembro_pe in todos_miembros:
-                    miembro_pe.calificacion = calificacion_final
-                    miembro_pe.save()
-                
-                # Crear registro de calificación para todos los miembros (para tracking)
-                for miembro_pe in todos_miembros:
-                    if miembro_pe.par_eve_participante_fk != participante:  # Evitar duplicar para el líder
-                        for criterio in criterios:
-                            campo = f'calificacion_{criterio.id}'
-                            valor = request.POST.get(campo)
-                            if valor:
-                                Calificacion.objects.update_or_create(
-                                    cal_evaluador_fk=evaluador,
-                                    cal_criterio_fk=criterio,
-                                    cal_participante_fk=miembro_pe.par_eve_participante_fk,
-                                    defaults={'cal_valor': int(valor)}
-                                )
-                
+            else:
+                todos_miembros = [participante_evento_lider]
+
+            with transaction.atomic():
+                guardar_calificaciones(
+                    evaluador.id, valores, [miembro_pe.par_eve_participante_fk_id for miembro_pe in todos_miembros]
+                )
+
+                # Calificación final: puntaje ponderado por cri_peso y agregado entre
+                # todos los evaluadores del participante (no solo el actual)
+                puntaje = puntajes_evento(evento.id, participantes=[participante.id]).get(participante.id)
+                if puntaje:
+                    calificacion_final = puntaje_final(puntaje)
+                else:
+                    # Criterios sin peso: se conserva el promedio simple
+                    calificacion_final = round(sum(valores.values()) / len(valores))
+
+                ParticipanteEvento.objects.filter(
+                    pk__in=[miembro_pe.pk for miembro_pe in todos_miembros]
+                ).update(calificacion=calificacion_final)
+                actualizar_ranking(evento.id, {miembro_pe.pk: calificacion_final for miembro_pe in todos_miembros})
+
+            if participante_evento_lider.par_eve_es_grupo:
                 mensaje_exito = f"Calificaciones para el grupo de {participante.usuario.first_name} {participante.usuario.last_name} guardadas correctamente. La calificación se aplicó a todos los {len(todos_miembros)} miembros del grupo."
             else:
-                # Participante individual
-                participante_evento_lider.calificacion = calificacion_final
-                participante_evento_lider.save()
                 mensaje_exito = f"Calificaciones para {participante.usuario.first_name} {participante.usuario.last_name} guardadas correctamente."
 
             messages.success(request, mensaje_exito)
@@ -776,31 +728,17 @@ def obtener_info_grupo_participante(participante, evento):
 class VerPodioParticipantesView(View):
     def get(self, request, evento_id):
         evento = get_object_or_404(Evento, pk=evento_id)
-        evaluador = get_object_or_404(Evaluador, id=request.session['evaluador_id'])
+        evaluador = request.perfiles.requerido('evaluador')
 
-        participantes_evento = ParticipanteEvento.objects.filter(
-            par_eve_evento_fk=evento_id,
-            calificacion__isnull=False
-        ).select_related('par_eve_participante_fk')
-
-        participantes_calificados = []
-        for pe in participantes_evento:
+        # Ranking ya ordenado y con puesto precalculado
+        participantes_calificados = podio(evento.id)
+        for pe in participantes_calificados:
             participante = pe.par_eve_participante_fk
-            if participante and participante.id:
-                pe.participante = participante
-
-                # Extraer primer nombre y apellido
-                first_name = participante.usuario.first_name.split()[0].upper()
-                last_name = participante.usuario.last_name.split()[0].upper()
-
-                # Guardar como atributos personalizados
-                pe.nombre_limpio = first_name
-                pe.apellido_limpio = last_name
+            pe.participante = participante
 
-                participantes_calificados.append(pe)
-
-
-        participantes_calificados.sort(key=lambda x: x.calificacion, reverse=True)
+            # Extraer primer nombre y apellido
+            pe.nombre_limpio = (participante.usuario.first_name.split() or [''])[0].upper()
+            pe.apellido_limpio = (participante.usuario.last_name.split() or [''])[0].upper()
 
         return render(request, 'ver_notas_participantes.html', {
             'participantes': participantes_calificados,
@@ -995,7 +933,7 @@ class IngresoEventoEvaluadorView(View):
 
     def get(self, request, pk):
         evento = get_object_or_404(Evento, pk=pk)
-        evaluador = get_object_or_404(Evaluador, usuario=request.user)
+        evaluador = request.perfiles.requerido('evaluador')
         evaluador_evento = get_object_or_404(EvaluadorEvento, eva_eve_evento_fk=evento, eva_eve_evaluador_fk=evaluador)
 
         context = {
@@ -1012,7 +950,7 @@ class VerCriteriosEvaluadorView(View):
     def get(self, request, evento_id):
         evento = get_object_or_404(Evento, pk=evento_id)
         criterios = Criterio.objects.filter(cri_evento_fk=evento).order_by('cri_descripcion')
-        evaluador = get_object_or_404(Evaluador, id=request.session['evaluador_id'])
+        evaluador = request.perfiles.requerido('evaluador')
 
         return render(request, self.template_name, {
             'evento': evento,
@@ -1,6 +1,6 @@
 from django import forms
 from app_usuarios.models import Usuario, Participante
-from .models import ParticipanteEvento
+from app_admin_eventos.inscripciones import Tipos, roles_por_cedula
 from django.core.exceptions import ValidationError
 from django.contrib.auth import get_user_model
 
@@ -106,22 +106,12 @@ class ParticipanteForm(forms.ModelForm):
         cedula = cleaned_data.get('cedula')
         evento = self.evento
         
-        # Validar si el usuario ya está inscrito en el evento
+        # Validar si el usuario ya está inscrito en el evento (una consulta al índice de inscripciones)
         if cedula and evento:
-            try:
-                usuario_existente = UserModel.objects.get(cedula=cedula)
-                if Participante.objects.filter(usuario=usuario_existente).exists():
-                    participante_existente = Participante.objects.get(usuario=usuario_existente)
-                    if ParticipanteEvento.objects.filter(
-                        par_eve_participante_fk=participante_existente, 
-                        par_eve_evento_fk=evento
-                    ).exists():
-                        raise forms.ValidationError(
-                            {'cedula': f"Ya existe un participante con la cédula {cedula} registrado para el evento '{evento.eve_nombre}'."}
-                        )
-                
-            except UserModel.DoesNotExist:
-                pass # Es un usuario nuevo, no hay conflicto de inscripción previa.
+            if roles_por_cedula(evento.pk, [cedula]).get(str(cedula).strip()) == Tipos.PARTICIPANTE:
+                raise forms.ValidationError(
+                    {'cedula': f"Ya existe un participante con la cédula {cedula} registrado para el evento '{evento.eve_nombre}'."}
+                )
 
         return cleaned_data
 
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.3 on 2026-10-17 23:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_admin_eventos", "0007_indices_evento"),
+        ("app_participantes", "0002_initial"),
+        ("app_usuarios", "0002_indice_email_usuario"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="participanteevento",
+            index=models.Index(
+                fields=["par_eve_evento_fk", "par_eve_estado"],
+                name="par_eve_evento_estado_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="participanteevento",
+            index=models.Index(
+                fields=["par_eve_evento_fk", "par_eve_proyecto_principal"],
+                name="par_eve_evento_proyecto_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="participanteevento",
+            index=models.Index(
+                fields=["par_eve_codigo_proyecto", "par_eve_evento_fk"],
+                name="par_eve_codigo_proyecto_idx",
+            ),
+        ),
+    ]
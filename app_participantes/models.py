@@ -1,16 +1,17 @@
-from django.db import models
-from app_admin_eventos.models import Evento
-from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from app_admin_eventos.models import EstadoInscripcion, Evento
 import random
 import string
 
 
 
 class ParticipanteEvento(models.Model):
+    Estados = EstadoInscripcion
+
     par_eve_evento_fk = models.ForeignKey(Evento, on_delete=models.CASCADE)
     par_eve_participante_fk = models.ForeignKey('app_usuarios.Participante', on_delete=models.CASCADE)
     par_eve_fecha = models.DateTimeField(auto_now_add=True)
-    par_eve_estado = models.CharField(max_length=45)
+    par_eve_estado = models.CharField(max_length=45, choices=EstadoInscripcion.choices)
     par_eve_documentos = models.FileField(upload_to='upload/participantes/documentos', null=True, blank=True, verbose_name="Documentos del Participante")
     par_eve_qr = models.ImageField(upload_to='upload/participantes/qr', null=True, blank=True, verbose_name="Código QR")
     par_eve_clave = models.CharField(max_length=45)
@@ -31,49 +32,34 @@ class ParticipanteEvento(models.Model):
         return f"{self.par_eve_participante_fk} - {self.par_eve_evento_fk}"
 
     def clean(self):
-
-        from app_asistentes.models import AsistenteEvento
-        from app_evaluadores.models import EvaluadorEvento
         """ 
-        Validación: no permitir que el mismo usuario esté en el evento con otro rol.
+        Validación: no permitir que el mismo usuario esté en el evento con otro
+        rol, ni dos veces como Participante (capa defensiva junto a unique_together).
         """
-        usuario = self.par_eve_participante_fk.usuario
-        evento = self.par_eve_evento_fk
+        from app_admin_eventos.inscripciones import Tipos, validar_inscripcion
 
-        # 1. Validación Cruzada: No puede ser Asistente
-        if AsistenteEvento.objects.filter(asi_eve_asistente_fk__usuario=usuario, asi_eve_evento_fk=evento).exists():
-            raise ValidationError(
-                {'par_eve_participante_fk': "Este usuario ya está inscrito como Asistente en este evento."}
-            )
-            
-        # 2. Validación Cruzada: No puede ser Evaluador
-        if EvaluadorEvento.objects.filter(eva_eve_evaluador_fk__usuario=usuario, eva_eve_evento_fk=evento).exists():
-            raise ValidationError(
-                {'par_eve_participante_fk': "Este usuario ya está inscrito como Evaluador en este evento."}
-            )
-            
-        # 3. Validación de Unicidad Propia (Para evitar doble inscripción del mismo Participante)
-        # Se mantiene en clean() como capa defensiva, pero confiamos en `unique_together` de Meta.
-        if ParticipanteEvento.objects.filter(
-            par_eve_participante_fk__usuario=usuario,
-            par_eve_evento_fk=evento
-        ).exclude(pk=self.pk).exists():
-            raise ValidationError(
-                {'par_eve_participante_fk': "Este usuario ya está inscrito como Participante en este evento."}
-            )
+        validar_inscripcion(
+            self.par_eve_evento_fk_id, self.par_eve_participante_fk.usuario_id, Tipos.PARTICIPANTE,
+            campo='par_eve_participante_fk', nueva=self._state.adding,
+        )
 
     def save(self, *args, **kwargs):
+        from app_admin_eventos.inscripciones import Tipos, registrar_inscripcion
+
         # 1. Lógica para generar código único de proyecto (NO TOCADA)
         # Solo se genera si no tiene un código y NO es miembro de otro proyecto
         if not self.par_eve_codigo_proyecto and not self.par_eve_proyecto_principal:
             # Usamos random y string importados en el ámbito del módulo
             self.par_eve_codigo_proyecto = ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
         
-        # 2. Ejecutar validaciones ANTES de guardar (CORRECCIÓN CLAVE)
-        # Se elimina la llamada a self.clean() que había aquí. 
-        # Si llamas a .save() directamente, debes llamar a .full_clean() antes.
-        
-        super().save(*args, **kwargs)
+        # 2. Si llamas a .save() directamente, debes llamar a .full_clean() antes.
+        # Aun así, una inscripción nueva se indexa en InscripcionEvento en la misma
+        # transacción y la restricción única rechaza un segundo rol en el evento.
+        if not self._state.adding:
+            return super().save(*args, **kwargs)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            registrar_inscripcion(self.par_eve_evento_fk_id, self.par_eve_participante_fk.usuario_id, Tipos.PARTICIPANTE, self.pk)
 
     # NO SE TOCAN los métodos @property y get_todos_miembros_proyecto ya que manejan la lógica de grupos.
     @property
@@ -101,6 +87,13 @@ class ParticipanteEvento(models.Model):
         # **Clave de la Unicidad:** Garantiza que un mismo participante 
         # no pueda tener dos entradas para el mismo evento.
         unique_together = ('par_eve_participante_fk', 'par_eve_evento_fk')
+        indexes = [
+            # Listados del evento por estado y miembros de un proyecto grupal
+            models.Index(fields=['par_eve_evento_fk', 'par_eve_estado'], name='par_eve_evento_estado_idx'),
+            models.Index(fields=['par_eve_evento_fk', 'par_eve_proyecto_principal'], name='par_eve_evento_proyecto_idx'),
+            # obtener_participantes_por_codigo_proyecto
+            models.Index(fields=['par_eve_codigo_proyecto', 'par_eve_evento_fk'], name='par_eve_codigo_proyecto_idx'),
+        ]
         verbose_name = "Inscripción de Participante"
         verbose_name_plural = "Inscripciones de Participantes"
 
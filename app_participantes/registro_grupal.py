@@ -0,0 +1,190 @@
+import random
+import string
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.db.models import Q
+from django.utils.timezone import localtime, now
+
+from app_admin_eventos.inscripciones import Tipos, registrar_inscripciones
+from app_usuarios.models import Participante, Usuario, normalizar_identificador
+
+from .models import ParticipanteEvento
+
+
+# Registro de los miembros adicionales de un proyecto grupal por conjuntos:
+# una consulta trae a todos los miembros ya registrados (por cédula), otra
+# los usernames ocupados y el resto son bulk_update/bulk_create, así que el
+# número de consultas no crece con el tamaño del grupo. Las contraseñas
+# generadas se derivan en hilos aparte mientras tanto: PBKDF2 suelta el GIL,
+# de modo que corren en paralelo y no bloquean el hilo de la petición.
+#
+# bulk_create solo devuelve las llaves primarias donde la base de datos lo
+# permite (PostgreSQL, SQLite, MariaDB; no MySQL). Sin ellas, las filas
+# recién creadas se vuelven a leer con una consulta por tabla.
+
+HILOS_CONTRASENAS = 4
+
+CAMPOS_MIEMBRO = ('cedula', 'nombre', 'apellido', 'email')
+
+
+def miembros_del_formulario(datos):
+    """
+    Miembros completos enviados como miembro_1_*, miembro_2_*, ... en orden.
+    Los que no traen cédula, nombre, apellido y correo se ignoran, como antes.
+    """
+    miembros = []
+    i = 1
+    while f'miembro_{i}_cedula' in datos:
+        if all(datos.get(f'miembro_{i}_{campo}') for campo in CAMPOS_MIEMBRO):
+            miembros.append({
+                'cedula': str(datos.get(f'miembro_{i}_cedula')).strip(),
+                'nombre': datos.get(f'miembro_{i}_nombre').strip(),
+                'apellido': datos.get(f'miembro_{i}_apellido').strip(),
+                'email': datos.get(f'miembro_{i}_email'),
+                'telefono': datos.get(f'miembro_{i}_telefono', ''),
+            })
+        i += 1
+    return miembros
+
+
+def usernames_disponibles(bases):
+    """
+    Un username libre por cada base: la base, o base1, base2, ... como el
+    `while ... exists()` de antes, pero con una sola consulta por prefijo
+    para todo el grupo. Tampoco repite uno ya asignado dentro del grupo.
+    Se compara en minúsculas sobre username_normalizado: en MySQL el índice
+    único de username no distingue mayúsculas y `Ana1234` ocupa `ana1234`.
+    """
+    if not bases:
+        return []
+    bases = [normalizar_identificador(base) for base in bases]
+    prefijos = Q()
+    for base in set(bases):
+        prefijos |= Q(username_normalizado__startswith=base)
+    ocupados = set(Usuario.objects.filter(prefijos).values_list('username_normalizado', flat=True))
+
+    libres = []
+    for base in bases:
+        candidato, contador = base, 1
+        while candidato in ocupados:
+            candidato = f"{base}{contador}"
+            contador += 1
+        ocupados.add(candidato)
+        libres.append(candidato)
+    return libres
+
+
+def _perfil_participante(usuario):
+    try:
+        return usuario.participante
+    except Participante.DoesNotExist:
+        return None
+
+
+def registrar_miembros(evento, inscripcion_lider, miembros, grupo=None):
+    """
+    Registra los `miembros` (ver miembros_del_formulario) en el proyecto de
+    `inscripcion_lider`: actualiza a los usuarios que ya existen, crea los
+    nuevos con contraseña generada, sus perfiles de Participante, los agrega
+    al grupo de Django y crea sus ParticipanteEvento indexados. Los roles
+    cruzados se validan antes, en la vista. Debe llamarse dentro de una
+    transacción. Retorna los datos para los correos, en el mismo orden:
+    [{'nombre', 'nombre_completo', 'email', 'password'}], con password None
+    para quien ya tenía cuenta.
+    """
+    if not miembros:
+        return []
+    devuelve_pks = connection.features.can_return_rows_from_bulk_insert
+
+    existentes = {
+        usuario.cedula: usuario
+        for usuario in Usuario.objects.filter(cedula__in=[m['cedula'] for m in miembros]).select_related('participante')
+    }
+    nuevos = [m for m in miembros if m['cedula'] not in existentes]
+    contrasenas = [''.join(random.choices(string.ascii_letters + string.digits, k=20)) for _ in nuevos]
+
+    with ThreadPoolExecutor(max_workers=HILOS_CONTRASENAS) as hilos:
+        hashes = hilos.map(make_password, contrasenas)
+
+        # Usuarios existentes: se actualizan sus datos en un solo UPDATE
+        actualizados = []
+        for miembro in miembros:
+            usuario = existentes.get(miembro['cedula'])
+            if usuario:
+                usuario.first_name = miembro['nombre']
+                usuario.last_name = miembro['apellido']
+                usuario.telefono = miembro['telefono']
+                usuario.rol = Usuario.Roles.PARTICIPANTE
+                actualizados.append(usuario)
+        if actualizados:
+            Usuario.objects.bulk_update(actualizados, ['first_name', 'last_name', 'telefono', 'rol'])
+
+        usernames = usernames_disponibles([f"{m['nombre'].lower()}{m['cedula'][-4:]}" for m in nuevos])
+
+        # bulk_create no pasa por Usuario.save(): las columnas normalizadas se llenan aquí
+        creados = Usuario.objects.bulk_create([
+            Usuario(
+                username=username,
+                first_name=miembro['nombre'],
+                last_name=miembro['apellido'],
+                email=miembro['email'],
+                telefono=miembro['telefono'],
+                is_active=True,
+                date_joined=localtime(now()),
+                rol=Usuario.Roles.PARTICIPANTE,
+                cedula=miembro['cedula'],
+                password=password,
+                email_normalizado=normalizar_identificador(miembro['email']),
+                username_normalizado=normalizar_identificador(username),
+            )
+            for miembro, username, password in zip(nuevos, usernames, hashes)
+        ])
+    if creados and not devuelve_pks:
+        creados = list(Usuario.objects.filter(cedula__in=[m['cedula'] for m in nuevos]))
+
+    usuarios = {**existentes, **{usuario.cedula: usuario for usuario in creados}}
+    cedula_por_usuario = {usuario.pk: cedula for cedula, usuario in usuarios.items()}
+    perfiles = {cedula: _perfil_participante(usuario) for cedula, usuario in existentes.items()}
+    sin_perfil = [Participante(usuario=usuario) for cedula, usuario in usuarios.items() if not perfiles.get(cedula)]
+    perfiles_creados = Participante.objects.bulk_create(sin_perfil)
+    if perfiles_creados and not devuelve_pks:
+        perfiles_creados = Participante.objects.filter(usuario__in=[perfil.usuario_id for perfil in sin_perfil])
+    for perfil in perfiles_creados:
+        perfiles[cedula_por_usuario[perfil.usuario_id]] = perfil
+
+    if grupo:
+        grupo.user_set.add(*usuarios.values())
+
+    inscripciones = ParticipanteEvento.objects.bulk_create([
+        ParticipanteEvento(
+            par_eve_evento_fk=evento,
+            par_eve_participante_fk=perfiles[miembro['cedula']],
+            par_eve_estado="Pendiente",
+            par_eve_es_grupo=True,
+            par_eve_proyecto_principal=inscripcion_lider,
+            par_eve_codigo_proyecto=inscripcion_lider.par_eve_codigo_proyecto,
+        )
+        for miembro in miembros
+    ])
+    if not devuelve_pks:
+        inscripciones = ParticipanteEvento.objects.filter(
+            par_eve_evento_fk=evento, par_eve_participante_fk__in=[perfiles[m['cedula']] for m in miembros],
+        )
+    # bulk_create tampoco pasa por ParticipanteEvento.save(): se indexan aquí
+    usuario_por_perfil = {perfil.pk: perfil.usuario_id for perfil in perfiles.values()}
+    registrar_inscripciones(evento.pk, Tipos.PARTICIPANTE, [
+        (usuario_por_perfil[inscripcion.par_eve_participante_fk_id], inscripcion.pk) for inscripcion in inscripciones
+    ])
+
+    contrasenas_por_cedula = dict(zip([m['cedula'] for m in nuevos], contrasenas))
+    return [
+        {
+            'nombre': miembro['nombre'],
+            'nombre_completo': f"{miembro['nombre']} {miembro['apellido']}",
+            'email': miembro['email'],
+            'password': contrasenas_por_cedula.get(miembro['cedula']),
+        }
+        for miembro in miembros
+    ]
@@ -0,0 +1,123 @@
+import shutil
+import tempfile
+from datetime import date, timedelta
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from app_usuarios.models import Usuario, AdministradorEvento, Participante
+from app_admin_eventos.models import Evento, Criterio
+from app_participantes.models import ParticipanteEvento
+
+
+MEDIA_TEMPORAL = tempfile.mkdtemp()
+
+
+# Sesiones en caché (como en producción con Redis): la lectura de la sesión no consulta la base
+@override_settings(MEDIA_ROOT=MEDIA_TEMPORAL, SESSION_ENGINE='django.contrib.sessions.backends.cached_db')
+class DashboardParticipanteConsultasTestCase(TestCase):
+    """
+    El dashboard del participante se arma con una consulta anotada,
+    sin importar en cuántos eventos esté inscrito.
+    """
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_TEMPORAL, ignore_errors=True)
+
+    def crear_usuario(self, nombre, rol):
+        self.contador += 1
+        return Usuario.objects.create_user(
+            username=nombre, password="testpass123", email=f"{nombre}@test.com",
+            rol=rol, cedula=f"97000{self.contador:05d}", first_name=nombre.capitalize(), last_name="Prueba",
+        )
+
+    def crear_evento(self, nombre):
+        return Evento.objects.create(
+            eve_nombre=nombre,
+            eve_descripcion='Evento de prueba',
+            eve_ciudad='Manizales',
+            eve_lugar='Coliseo',
+            eve_fecha_inicio=date.today(),
+            eve_fecha_fin=date.today() + timedelta(days=1),
+            eve_estado='Publicado',
+            eve_administrador_fk=self.admin_evento,
+            eve_capacidad=10,
+            eve_tienecosto='No',
+            eve_imagen=SimpleUploadedFile("img.jpg", b"imgcontent", content_type="image/jpeg"),
+            eve_programacion=SimpleUploadedFile("prog.pdf", b"progcontent", content_type="application/pdf"),
+        )
+
+    def inscribir(self, participante, evento, estado='Aprobado', **extra):
+        return ParticipanteEvento.objects.create(
+            par_eve_participante_fk=participante, par_eve_evento_fk=evento,
+            par_eve_estado=estado, par_eve_clave="CLAVE", **extra,
+        )
+
+    def agregar_eventos(self, cantidad):
+        """Eventos aprobados con criterios completos, un grupo y calificación."""
+        for _ in range(cantidad):
+            evento = self.crear_evento(f"Evento {ParticipanteEvento.objects.count()}")
+            Criterio.objects.create(cri_descripcion="Uno", cri_peso=60, cri_evento_fk=evento)
+            Criterio.objects.create(cri_descripcion="Dos", cri_peso=40, cri_evento_fk=evento)
+            lider = self.inscribir(self.participante, evento, calificacion=80, par_eve_es_grupo=True)
+            self.inscribir(self.companero, evento, par_eve_proyecto_principal=lider)
+
+    def setUp(self):
+        self.client = Client()
+        self.contador = 0
+
+        user_admin = self.crear_usuario("admin_dash", Usuario.Roles.ADMIN_EVENTO)
+        self.admin_evento, _ = AdministradorEvento.objects.get_or_create(usuario=user_admin)
+        self.participante = Participante.objects.create(usuario=self.crear_usuario("lider", Usuario.Roles.PARTICIPANTE))
+        self.companero = Participante.objects.create(usuario=self.crear_usuario("companero", Usuario.Roles.PARTICIPANTE))
+
+        session = self.client.session
+        session['participante_id'] = self.participante.pk
+        session.save()
+
+    def test_flags_del_dashboard(self):
+        completo = self.crear_evento("Completo")
+        Criterio.objects.create(cri_descripcion="Uno", cri_peso=100, cri_evento_fk=completo)
+        lider = self.inscribir(self.participante, completo, calificacion=90, par_eve_es_grupo=True)
+        self.inscribir(self.companero, completo, par_eve_proyecto_principal=lider)
+
+        incompleto = self.crear_evento("Incompleto")
+        Criterio.objects.create(cri_descripcion="Uno", cri_peso=50, cri_evento_fk=incompleto)
+        self.inscribir(self.participante, incompleto)
+
+        lider_ajeno = self.inscribir(self.companero, self.crear_evento("Ajeno"))
+        self.inscribir(self.participante, lider_ajeno.par_eve_evento_fk, par_eve_proyecto_principal=lider_ajeno)
+
+        pendiente = self.crear_evento("Pendiente")
+        self.inscribir(self.participante, pendiente, estado='Pendiente')
+
+        response = self.client.get(reverse('dashboard_participante'))
+
+        self.assertEqual(response.status_code, 200)
+        ajeno = lider_ajeno.par_eve_evento_fk_id
+        self.assertEqual(response.context['criterios_completos'], {completo.id: True, incompleto.id: False, ajeno: False})
+        self.assertEqual(response.context['calificaciones_registradas'], {completo.id: True, incompleto.id: False, ajeno: False})
+        self.assertEqual(
+            response.context['es_miembro_de_proyecto_grupal'], {completo.id: True, incompleto.id: False, ajeno: True}
+        )
+        self.assertEqual([evento.id for evento in response.context['eventos_pendientes']], [pendiente.id])
+        self.assertEqual(response.context['relacion'], lider)
+
+    def test_consultas_constantes_sin_importar_eventos(self):
+        self.agregar_eventos(1)
+        with CaptureQueriesContext(connection) as uno:
+            self.client.get(reverse('dashboard_participante'))
+
+        self.agregar_eventos(19)
+        with CaptureQueriesContext(connection) as veinte:
+            response = self.client.get(reverse('dashboard_participante'))
+
+        self.assertEqual(len(response.context['eventos']), 20)
+        self.assertEqual(len(veinte), len(uno))
+        # Participante + relaciones anotadas (la sesión se lee de la caché)
+        self.assertEqual(len(veinte), 2)
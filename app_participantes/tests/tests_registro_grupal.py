@@ -0,0 +1,138 @@
+import shutil
+import tempfile
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth.models import Group
+from django.core import mail
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from app_usuarios.models import Usuario, AdministradorEvento, Participante
+from app_admin_eventos.models import Evento, InscripcionEvento
+from app_participantes.models import ParticipanteEvento
+from app_participantes.registro_grupal import registrar_miembros, usernames_disponibles
+
+
+MEDIA_TEMPORAL = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_TEMPORAL)
+class RegistroGrupalTestCase(TestCase):
+    """
+    Registro de los miembros de un proyecto grupal por conjuntos: el número
+    de consultas no depende del tamaño del grupo.
+    """
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_TEMPORAL, ignore_errors=True)
+
+    def setUp(self):
+        self.client = Client()
+        admin_evento, _ = AdministradorEvento.objects.get_or_create(
+            usuario=Usuario.objects.create_user(
+                username="admin_grupal", password="testpass123", email="admin_grupal@test.com",
+                rol=Usuario.Roles.ADMIN_EVENTO, cedula="9950400001",
+            ),
+        )
+        self.evento = Evento.objects.create(
+            eve_nombre='Feria grupal', eve_descripcion='Evento de prueba', eve_ciudad='Manizales', eve_lugar='Coliseo',
+            eve_fecha_inicio=date.today() + timedelta(days=10), eve_fecha_fin=date.today() + timedelta(days=12),
+            eve_estado='Publicado', eve_administrador_fk=admin_evento, eve_capacidad=50, eve_tienecosto='Es gratis',
+            eve_imagen='upload/eventos/imagen/img.jpg', eve_programacion='upload/eventos/programacion/prog.pdf',
+        )
+
+    def crear_lider(self, cedula):
+        usuario = Usuario.objects.create_user(
+            username=f"lider{cedula}", password="testpass123", email=f"lider{cedula}@test.com",
+            rol=Usuario.Roles.PARTICIPANTE, cedula=cedula,
+        )
+        participante, _ = Participante.objects.get_or_create(usuario=usuario)
+        return ParticipanteEvento.objects.create(
+            par_eve_evento_fk=self.evento, par_eve_participante_fk=participante,
+            par_eve_estado="Pendiente", par_eve_es_grupo=True,
+        )
+
+    def miembros(self, desde, cantidad):
+        return [
+            {'cedula': f"99504{numero:05d}", 'nombre': "Miembro", 'apellido': "Prueba",
+             'email': f"miembro{numero}@test.com", 'telefono': ''}
+            for numero in range(desde, desde + cantidad)
+        ]
+
+    def registrar(self, lider_cedula, miembros):
+        lider = self.crear_lider(lider_cedula)
+        grupo = Group.objects.create(name=f"grupo-{lider_cedula}")
+        with CaptureQueriesContext(connection) as consultas:
+            correos = registrar_miembros(self.evento, lider, miembros, grupo)
+        return lider, grupo, correos, len(consultas.captured_queries)
+
+    def test_consultas_no_crecen_con_el_grupo(self):
+        _, _, _, pequeno = self.registrar("9950400100", self.miembros(101, 2))
+        _, _, _, grande = self.registrar("9950400200", self.miembros(201, 12))
+        self.assertEqual(pequeno, grande)
+
+    def test_crea_nuevos_y_reutiliza_existentes(self):
+        existente = Usuario.objects.create_user(
+            username="ya_registrado", password="suya", email="miembro301@test.com",
+            rol=Usuario.Roles.ASISTENTE, cedula="9950400301",
+        )
+        lider, grupo, correos, _ = self.registrar("9950400300", self.miembros(301, 3))
+
+        self.assertIsNone(correos[0]['password'])
+        existente.refresh_from_db()
+        self.assertEqual((existente.rol, existente.first_name), (Usuario.Roles.PARTICIPANTE, "Miembro"))
+        self.assertTrue(existente.check_password("suya"))
+
+        nuevo = Usuario.objects.get(cedula="9950400302")
+        self.assertTrue(nuevo.check_password(correos[1]['password']))
+        self.assertEqual((nuevo.username, nuevo.email_normalizado), ("miembro0302", "miembro302@test.com"))
+
+        inscripciones = ParticipanteEvento.objects.filter(par_eve_proyecto_principal=lider)
+        self.assertEqual(inscripciones.count(), 3)
+        self.assertEqual(set(inscripciones.values_list('par_eve_codigo_proyecto', flat=True)), {lider.par_eve_codigo_proyecto})
+        self.assertEqual(grupo.user_set.count(), 3)
+        self.assertEqual(InscripcionEvento.objects.filter(ins_evento_fk=self.evento).count(), 4)
+
+    def test_sin_pks_de_bulk_create_relee_las_filas(self):
+        # MySQL (no MariaDB) no devuelve las llaves de un INSERT en lote
+        with mock.patch.object(type(connection.features), 'can_return_rows_from_bulk_insert', False):
+            lider, grupo, correos, _ = self.registrar("9950400500", self.miembros(501, 3))
+
+        self.assertEqual(grupo.user_set.count(), 3)
+        self.assertEqual(ParticipanteEvento.objects.filter(par_eve_proyecto_principal=lider).count(), 3)
+        indexadas = InscripcionEvento.objects.filter(ins_evento_fk=self.evento, ins_usuario_fk__cedula__in=["9950400501", "9950400502", "9950400503"])
+        self.assertEqual(
+            set(indexadas.values_list('ins_inscripcion_id', flat=True)),
+            set(ParticipanteEvento.objects.filter(par_eve_proyecto_principal=lider).values_list('pk', flat=True)),
+        )
+        self.assertTrue(Usuario.objects.get(cedula="9950400502").check_password(correos[1]['password']))
+
+    def test_usernames_libres_con_una_consulta(self):
+        for numero, username in enumerate(("Ana0001", "ana00011", "luis0002")):
+            Usuario.objects.create_user(username=username, password="x", email=f"{username}@test.com", cedula=f"995040050{numero}")
+        # En MySQL `Ana0001` ocupa `ana0001`: el índice único no distingue mayúsculas
+        with self.assertNumQueries(1):
+            libres = usernames_disponibles(["ana0001", "ANA0001", "eva0003"])
+        self.assertEqual(libres, ["ana00012", "ana00013", "eva0003"])
+
+    def test_vista_registra_el_grupo(self):
+        datos = {
+            'cedula': "9950400400", 'username': 'lider_vista', 'email': 'lider_vista@test.com',
+            'telefono': '3001234567', 'first_name': 'Lider', 'last_name': 'Prueba', 'tipo_participacion': 'grupo',
+            'par_eve_documentos': SimpleUploadedFile('proyecto.pdf', b'%PDF-1.4', content_type='application/pdf'),
+        }
+        for numero, miembro in enumerate(self.miembros(401, 3), start=1):
+            datos.update({f'miembro_{numero}_{campo}': valor for campo, valor in miembro.items()})
+
+        respuesta = self.client.post(reverse('crear_participante', args=[self.evento.pk]), datos)
+
+        self.assertRedirects(respuesta, reverse('pagina_principal'), fetch_redirect_response=False)
+        self.assertEqual(ParticipanteEvento.objects.filter(par_eve_evento_fk=self.evento).count(), 4)
+        self.assertEqual(len(mail.outbox), 4)
+        self.assertIn("Tu contraseña es: ", mail.outbox[1].body)
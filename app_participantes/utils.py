@@ -57,26 +57,14 @@ def obtener_estadisticas_evento(evento):
     """
     Obtiene estadísticas de participación de un evento
     """
-    proyectos_individuales = ParticipanteEvento.objects.filter(
-        par_eve_evento_fk=evento,
-        par_eve_es_grupo=False
-    ).count()
-    
-    proyectos_grupales = ParticipanteEvento.objects.filter(
-        par_eve_evento_fk=evento,
-        par_eve_es_grupo=True,
-        par_eve_proyecto_principal__isnull=True  # Solo líderes
-    ).count()
-    
-    total_participantes = ParticipanteEvento.objects.filter(
-        par_eve_evento_fk=evento
-    ).count()
-    
+    from app_admin_eventos.estadisticas import estadisticas_participantes
+
+    participantes = estadisticas_participantes(evento)
     return {
-        'proyectos_individuales': proyectos_individuales,
-        'proyectos_grupales': proyectos_grupales,
-        'total_proyectos': proyectos_individuales + proyectos_grupales,
-        'total_participantes': total_participantes
+        'proyectos_individuales': participantes['proyectos_individuales'],
+        'proyectos_grupales': participantes['proyectos_grupales'],
+        'total_proyectos': participantes['total_proyectos'],
+        'total_participantes': participantes['total']
     }
 
 
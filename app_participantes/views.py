@@ -1,16 +1,19 @@
-from io import BytesIO
 from django.utils import timezone
 from django.http import HttpResponse, HttpResponseForbidden
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views import View
 from django.urls import reverse
-import qrcode
-from django.db.models import Q
+from django.db.models import BooleanField, Count, ExpressionWrapper, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 
 from app_participantes.utils import send_mail_participante_grupo
 from .models import ParticipanteEvento
 from app_usuarios.models import Evaluador, Participante, Usuario
 from app_admin_eventos.models import Evento, Criterio
+from app_admin_eventos.ingreso import token_ingreso
+from app_admin_eventos.inscripciones import Tipos, roles_por_cedula
+from .registro_grupal import miembros_del_formulario, registrar_miembros
+from app_admin_eventos.qr import asignar_qr
 from .forms import EditarUsuarioParticipanteForm, ParticipanteForm, MiembroParticipanteForm
 from django.contrib import messages
 from principal_eventos.settings import DEFAULT_FROM_EMAIL
@@ -24,16 +27,14 @@ from django.contrib.auth import update_session_auth_hash
 from django.views.generic import DetailView
 from django.db.models import Sum
 from app_evaluadores.models import Calificacion
+from app_evaluadores.ranking import puesto_de
 from django.contrib.auth.decorators import login_required
 from app_admin_eventos.models import Evento, MemoriaEvento
 from django.db import transaction
 from django.contrib.auth.models import Group
 from django.contrib.auth import logout
-from app_asistentes.models import AsistenteEvento
-from app_evaluadores.models import EvaluadorEvento
 from django.contrib.auth.hashers import make_password 
 from django.utils.crypto import get_random_string
-from django.core.files.base import ContentFile
 
 
 def crear_o_obtener_grupo_proyecto(codigo_proyecto, evento_nombre):
@@ -108,19 +109,34 @@ class ParticipanteCreateView(View):
                     # ----------------------------------------------------------------
                     # A. Lógica para el Participante Líder / Individual
                     # ----------------------------------------------------------------
+                    # 1. 🛑 Validación de Roles Cruzados: líder y miembros en una sola consulta 🛑
+                    miembros = miembros_del_formulario(request.POST) if es_grupo else []
+                    cedulas_miembros = [miembro['cedula'] for miembro in miembros]
+                    roles = roles_por_cedula(evento.pk, [cedula_lider, *cedulas_miembros])
+
+                    rol_lider = roles.get(cedula_lider)
+                    if rol_lider == Tipos.PARTICIPANTE:
+                        messages.error(request, f"Ya existe un participante con la cédula {cedula_lider} registrado para el evento '{evento.eve_nombre}'.")
+                    elif rol_lider:
+                        messages.error(request, f"🚫 El líder ({cedula_lider}) ya está inscrito como {Tipos(rol_lider).label.upper()} en este evento.")
+                    for cedula_miembro in cedulas_miembros:
+                        rol_miembro = roles.get(cedula_miembro)
+                        if rol_miembro == Tipos.PARTICIPANTE:
+                            messages.error(request, f"El miembro ({cedula_miembro}) ya está registrado para el evento '{evento.eve_nombre}'.")
+                        elif rol_miembro:
+                            messages.error(request, f"🚫 El miembro ({cedula_miembro}) ya está inscrito como {Tipos(rol_miembro).label.upper()} en este evento.")
+                    # La misma cédula dos veces en el formulario
+                    repetidas = {c for c in cedulas_miembros if c == cedula_lider or cedulas_miembros.count(c) > 1}
+                    for cedula_miembro in sorted(repetidas):
+                        messages.error(request, f"El miembro ({cedula_miembro}) ya está registrado para el evento '{evento.eve_nombre}'.")
+                    if roles or repetidas:
+                        return render(request, 'crear_participante.html', {'form': form, 'evento': evento})
+
                     usuario_existente = Usuario.objects.filter(cedula=cedula_lider).first()
                     participante_lider = None
                     usuario = None
                     
                     if usuario_existente:
-                        # 1. 🛑 Validación de Roles Cruzados (Líder) 🛑
-                        if AsistenteEvento.objects.filter(asi_eve_evento_fk=evento, asi_eve_asistente_fk__usuario=usuario_existente).exists():
-                            messages.error(request, f"🚫 El líder ({cedula_lider}) ya está inscrito como ASISTENTE en este evento.")
-                            return render(request, 'crear_participante.html', {'form': form, 'evento': evento})
-                        if EvaluadorEvento.objects.filter(eva_eve_evento_fk=evento, eva_eve_evaluador_fk__usuario=usuario_existente).exists():
-                            messages.error(request, f"🚫 El líder ({cedula_lider}) ya está inscrito como EVALUADOR en este evento.")
-                            return render(request, 'crear_participante.html', {'form': form, 'evento': evento})
-                        
                         # Intentar obtener perfil Participante
                         try:
                             participante_existente = usuario_existente.participante 
@@ -128,11 +144,6 @@ class ParticipanteCreateView(View):
                             participante_existente = None
 
                         if participante_existente:
-                            # Validar que no esté ya inscrito en este evento
-                            if ParticipanteEvento.objects.filter(par_eve_participante_fk=participante_existente, par_eve_evento_fk=evento).exists():
-                                messages.error(request, f"Ya existe un participante con la cédula {cedula_lider} registrado para el evento '{evento.eve_nombre}'.")
-                                return render(request, 'crear_participante.html', {'form': form, 'evento': evento})
-                            
                             # Usuario y Perfil Participante existen (Solo actualizar datos de usuario)
                             participante_lider = participante_existente
                             usuario = usuario_existente
@@ -201,124 +212,12 @@ class ParticipanteCreateView(View):
                     # ----------------------------------------------------------------
                     # C. Lógica para Miembros Adicionales (Si es Grupal)
                     # ----------------------------------------------------------------
+                    # Todo el grupo por conjuntos: un número fijo de consultas sin importar
+                    # cuántos miembros sean (ver registro_grupal.registrar_miembros)
                     miembros_creados = []
                     if es_grupo:
-                        i = 1
-                        # Iterar sobre los posibles campos de miembros (miembro_1, miembro_2, etc.)
-                        while f'miembro_{i}_cedula' in request.POST:
-                            cedula_miembro = request.POST.get(f'miembro_{i}_cedula')
-                            nombre_miembro = request.POST.get(f'miembro_{i}_nombre')     # <--- Campo de Nombre
-                            apellido_miembro = request.POST.get(f'miembro_{i}_apellido') # <--- Campo de Apellido
-                            email_miembro = request.POST.get(f'miembro_{i}_email')
-                            telefono_miembro = request.POST.get(f'miembro_{i}_telefono', '')
-
-                            # Usamos nombre_miembro y apellido_miembro por separado
-                            if cedula_miembro and nombre_miembro and apellido_miembro and email_miembro:
-                                cedula_miembro = str(cedula_miembro).strip()
-                                
-                                # A diferencia de antes, YA NO NECESITAS la lógica de separación de nombre/apellido 
-                                # porque los estás recibiendo separados del formulario.
-                                nombre = nombre_miembro.strip()
-                                apellido = apellido_miembro.strip()
-
-                                usuario_miembro_existente = Usuario.objects.filter(cedula=cedula_miembro).first()
-                                contrasena_miembro = None 
-                                
-                                if usuario_miembro_existente:
-                                    # 🛑 Validación de Roles Cruzados (Miembro) 🛑
-                                    if AsistenteEvento.objects.filter(asi_eve_evento_fk=evento, asi_eve_asistente_fk__usuario=usuario_miembro_existente).exists():
-                                        messages.error(request, f"🚫 El miembro ({cedula_miembro}) ya está inscrito como ASISTENTE en este evento.")
-                                        raise Exception("Error de rol cruzado.")
-                                    if EvaluadorEvento.objects.filter(eva_eve_evento_fk=evento, eva_eve_evaluador_fk__usuario=usuario_miembro_existente).exists():
-                                        messages.error(request, f"🚫 El miembro ({cedula_miembro}) ya está inscrito como EVALUADOR en este evento.")
-                                        raise Exception("Error de rol cruzado.")
-
-                                    # Obtener/Crear Perfil Participante para el miembro
-                                    try:
-                                        participante_miembro_existente = usuario_miembro_existente.participante
-                                    except Participante.DoesNotExist:
-                                        participante_miembro_existente = None
-                                    
-                                    if participante_miembro_existente:
-                                        # Validar que no esté ya inscrito en este evento
-                                        if ParticipanteEvento.objects.filter(par_eve_participante_fk=participante_miembro_existente, par_eve_evento_fk=evento).exists():
-                                            messages.error(request, f"El miembro ({cedula_miembro}) ya está registrado para el evento '{evento.eve_nombre}'.")
-                                            raise Exception("Participante ya inscrito.")
-
-                                        participante_miembro = participante_miembro_existente
-                                        usuario_miembro = participante_miembro.usuario
-                                        
-                                        # Actualizar datos de Usuario Existente
-                                        usuario_miembro.first_name = nombre 
-                                        usuario_miembro.last_name = apellido
-                                        usuario_miembro.telefono = telefono_miembro
-                                        usuario_miembro.rol = Usuario.Roles.PARTICIPANTE
-                                        usuario_miembro.save(update_fields=['first_name', 'last_name', 'telefono', 'rol'])
-                                    else:
-                                        # Usuario Existe, Crear Perfil Participante
-                                        usuario_miembro = usuario_miembro_existente
-                                        
-                                        # Actualizar datos de Usuario Existente
-                                        usuario_miembro.first_name = nombre 
-                                        usuario_miembro.last_name = apellido
-                                        usuario_miembro.telefono = telefono_miembro
-                                        usuario_miembro.rol = Usuario.Roles.PARTICIPANTE
-                                        usuario_miembro.save(update_fields=['first_name', 'last_name', 'telefono', 'rol'])
-                                        
-                                        participante_miembro = Participante.objects.create(usuario=usuario_miembro)
-                                        
-                                else:
-                                    # Usuario y Participante son COMPLETAMENTE nuevos (Creación total y generación de contraseña)
-                                    username_miembro = f"{nombre.lower()}{cedula_miembro[-4:]}"
-                                    contador = 1
-                                    username_original = username_miembro
-                                    # Asegurar que el username es único
-                                    while Usuario.objects.filter(username=username_miembro).exists():
-                                        username_miembro = f"{username_original}{contador}"
-                                        contador += 1
-                                    
-                                    contrasena_miembro = ''.join(random.choices(string.ascii_letters + string.digits, k=20))
-                                    
-                                    usuario_miembro = Usuario.objects.create(
-                                        username=username_miembro,
-                                        first_name=nombre, 
-                                        last_name=apellido, 
-                                        email=email_miembro,
-                                        telefono=telefono_miembro,
-                                        is_active=True,
-                                        date_joined=localtime(now()),
-                                        rol=Usuario.Roles.PARTICIPANTE,
-                                        cedula=cedula_miembro
-                                    )
-                                    usuario_miembro.password = make_password(contrasena_miembro)
-                                    usuario_miembro.save(update_fields=['password'])
-
-                                    participante_miembro = Participante.objects.create(usuario=usuario_miembro)
-
-                                # Añadir a grupo de Django y ParticipanteEvento
-                                if grupo_django:
-                                    usuario_miembro.groups.add(grupo_django)
-
-                                # Crear la relación ParticipanteEvento (miembro)
-                                ParticipanteEvento.objects.create(
-                                    par_eve_evento_fk=evento,
-                                    par_eve_participante_fk=participante_miembro,
-                                    par_eve_estado="Pendiente",
-                                    par_eve_es_grupo=True,
-                                    par_eve_proyecto_principal=participante_evento_lider,
-                                    par_eve_codigo_proyecto=codigo_proyecto,
-                                )
-
-                                # Registrar datos del miembro para el correo de notificación
-                                miembros_creados.append({
-                                    'nombre': nombre, # Usamos solo el nombre para el saludo
-                                    'nombre_completo': f"{nombre} {apellido}", # Para el saludo completo si se requiere
-                                    'email': email_miembro,
-                                    'password': contrasena_miembro
-                                })
-                                correos_enviados.append(email_miembro)
-
-                            i += 1
+                        miembros_creados = registrar_miembros(evento, participante_evento_lider, miembros, grupo_django)
+                        correos_enviados.extend(miembro['email'] for miembro in miembros_creados)
                     
                     # ----------------------------------------------------------------
                     # D. Envío de Correos y Mensajes de Éxito
@@ -473,7 +372,7 @@ class EventoDetailView(DetailView):
         
         # Verificar si el participante está asignado a este evento
         if participante_id:
-            participante = get_object_or_404(Participante, id=participante_id)
+            participante = self.request.perfiles.requerido('participante')
             if not ParticipanteEvento.objects.filter(par_eve_participante_fk=participante, par_eve_evento_fk=evento).exists():
                 messages.error(self.request, "No tienes permiso para ver este evento.")
                 return redirect('pagina_principal')
@@ -490,22 +389,32 @@ class DashboardParticipanteView(View):
     template_name = 'dashboard_principal_participante.html'
 
     def get(self, request):
-        participante_id = request.session.get('participante_id')
-        if not participante_id:
-            messages.error(request, "Debe iniciar sesión como participante.")
-            return redirect('login_view')
-
-        try:
-            # Seleccionamos el usuario para posibles validaciones futuras
-            participante = Participante.objects.select_related('usuario').get(id=participante_id)
-        except Participante.DoesNotExist:
+        # Perfil de la sesión (ya trae su usuario)
+        participante = request.perfiles.participante
+        if participante is None:
             messages.error(request, "Participante no encontrado.")
             return redirect('login_view')
 
-        # Relación participante-evento
-        relaciones = ParticipanteEvento.objects.filter(
-            par_eve_participante_fk=participante
-        ).select_related('par_eve_evento_fk')
+        # Relación participante-evento con todo lo que necesita el dashboard en
+        # una sola consulta: miembros del proyecto, suma de pesos de los criterios
+        # del evento y si ya tiene calificación.
+        miembros = ParticipanteEvento.objects.filter(
+            par_eve_proyecto_principal=OuterRef('pk')
+        ).values('par_eve_proyecto_principal').annotate(total=Count('pk')).values('total')
+        pesos = Criterio.objects.filter(
+            cri_evento_fk=OuterRef('par_eve_evento_fk')
+        ).values('cri_evento_fk').annotate(total=Sum('cri_peso')).values('total')
+
+        relaciones = list(
+            ParticipanteEvento.objects.filter(par_eve_participante_fk=participante)
+            .select_related('par_eve_evento_fk')
+            .annotate(
+                total_miembros=Coalesce(Subquery(miembros), 0),
+                suma_criterios=Coalesce(Subquery(pesos), 0.0),
+                calificado=ExpressionWrapper(Q(calificacion__isnull=False), output_field=BooleanField()),
+            )
+            .order_by('pk')
+        )
 
         # Separar eventos aprobados y pendientes
         eventos_aprobados = [
@@ -518,48 +427,22 @@ class DashboardParticipanteView(View):
         # Diccionarios de datos
         criterios_completos = {}
         calificaciones_registradas = {}
-        # 🔥 NUEVA VARIABLE: Indica si el proyecto es grupal (> 1 persona)
-        es_miembro_de_proyecto_grupal = {} 
-
-        for evento in eventos_aprobados:
-            rel = ParticipanteEvento.objects.filter(
-                par_eve_evento_fk=evento,
-                par_eve_participante_fk=participante
-            ).first()
-
-            if rel:
-                # ---------------------------------------------------------------------------------
-                # LÓGICA CLAVE: Se muestra el botón si el proyecto tiene 2 o más integrantes
-                
-                if rel.par_eve_proyecto_principal is not None:
-                    # Caso 1: Es un MIEMBRO (par_eve_proyecto_principal NO es NULL) -> Es GRUPO.
-                    es_miembro_de_proyecto_grupal[evento.id] = True
-                    
-                else:
-                    # Caso 2: Es el LÍDER (par_eve_proyecto_principal es NULL).
-                    # Verificamos si tiene al menos UN miembro que apunte a él como principal.
-                    
-                    conteo_miembros_asociados = ParticipanteEvento.objects.filter(
-                        par_eve_proyecto_principal=rel
-                    ).count()
-                    
-                    # Si el líder tiene miembros asociados (> 0), es un proyecto grupal.
-                    es_miembro_de_proyecto_grupal[evento.id] = (conteo_miembros_asociados > 0)
-                
-                # ---------------------------------------------------------------------------------
-                
-                # Lógica de Criterios y Calificaciones (se mantiene)
-                suma = Criterio.objects.filter(cri_evento_fk=evento).aggregate(total=Sum('cri_peso'))['total'] or 0
-                criterios_completos[evento.id] = (suma == 100)
-                calificaciones_registradas[evento.id] = rel.calificacion is not None
-            else:
-                es_miembro_de_proyecto_grupal[evento.id] = False
-                criterios_completos[evento.id] = False
-                calificaciones_registradas[evento.id] = False
-
+        # 🔥 Indica si el proyecto es grupal (> 1 persona)
+        es_miembro_de_proyecto_grupal = {}
+
+        for rel in relaciones:
+            if rel.par_eve_estado != 'Aprobado':
+                continue
+            evento_id = rel.par_eve_evento_fk_id
+            # Un MIEMBRO siempre pertenece a un grupo; el LÍDER solo si tiene miembros asociados
+            es_miembro_de_proyecto_grupal[evento_id] = (
+                rel.par_eve_proyecto_principal_id is not None or rel.total_miembros > 0
+            )
+            criterios_completos[evento_id] = (rel.suma_criterios == 100)
+            calificaciones_registradas[evento_id] = rel.calificado
 
         # Obtener una relación para usar en la vista (si es necesario)
-        relacion = relaciones.first() 
+        relacion = relaciones[0] if relaciones else None
 
         context = {
             'participante': participante,
@@ -596,8 +479,7 @@ class CambioPasswordParticipanteView(View):
             messages.error(request, "❌ La contraseña debe tener al menos 6 caracteres.")
             return render(request, self.template_name)
 
-        participante_id = request.session.get('participante_id')
-        participante = get_object_or_404(Participante, pk=participante_id)
+        participante = request.perfiles.requerido('participante')
         usuario = participante.usuario
 
         usuario.set_password(password1)
@@ -745,7 +627,7 @@ class IngresoEventoParticipanteView(View):
 
     def get(self, request, pk):
         evento = get_object_or_404(Evento, pk=pk)
-        participante = get_object_or_404(Participante, usuario=request.user)
+        participante = request.perfiles.requerido('participante')
         participante_evento = get_object_or_404(ParticipanteEvento, par_eve_evento_fk=evento, par_eve_participante_fk=participante)
 
         context = {
@@ -764,7 +646,7 @@ class VerCriteriosParticipanteView(View):
     def get(self, request, evento_id):
         evento = get_object_or_404(Evento, pk=evento_id)
         criterios = Criterio.objects.filter(cri_evento_fk=evento).order_by('cri_descripcion')
-        participante = get_object_or_404(Participante, id=request.session['participante_id'])
+        participante = request.perfiles.requerido('participante')
 
         return render(request, self.template_name, {
             'evento': evento,
@@ -780,8 +662,7 @@ class VerCalificacionView(View):
     template_name = 'ver_notas.html'
 
     def get(self, request, evento_id):
-        participante_id = request.session.get('participante_id')
-        participante = get_object_or_404(Participante, pk=participante_id)
+        participante = request.perfiles.requerido('participante')
         evento = get_object_or_404(Evento, pk=evento_id)
 
         # Obtener relación del participante con el evento
@@ -794,17 +675,8 @@ class VerCalificacionView(View):
         # Calificación del participante actual
         calificacion = relacion.calificacion
 
-        # Obtener todos los participantes con calificación para este evento (para ranking)
-        relaciones = ParticipanteEvento.objects.filter(
-            par_eve_evento_fk=evento,
-            calificacion__isnull=False
-        ).select_related('par_eve_participante_fk__usuario').order_by('-calificacion')
-
-        puesto_actual = None
-        for index, rel in enumerate(relaciones, start=1):
-            if rel.par_eve_participante_fk.pk == participante.pk:
-                puesto_actual = index
-                break
+        # Puesto precalculado en la tabla de ranking
+        puesto_actual = puesto_de(evento.id, participante.pk)
 
         context = {
             'evento': evento,
@@ -822,8 +694,7 @@ class DetalleCalificacionView(View):
     template_name = 'ver_detalle_calificacion.html'
 
     def get(self, request, evento_id):
-        participante_id = request.session.get('participante_id')
-        participante = get_object_or_404(Participante, pk=participante_id)
+        participante = request.perfiles.requerido('participante')
         evento = get_object_or_404(Evento, id=evento_id)
 
         participante_evento = get_object_or_404(
@@ -943,7 +814,7 @@ class AgregarMiembrosView(View):
             messages.error(request, "Error de sesión. No se encontró el ID del líder.")
             return redirect('login_view')
 
-        lider = get_object_or_404(Participante, id=participante_lider_id)
+        lider = request.perfiles.requerido('participante')
         evento = get_object_or_404(Evento, id=evento_id)
         
         # Obtener el registro principal del LÍDER (es_grupo=1 y principal=NULL)
@@ -976,8 +847,7 @@ class AgregarMiembrosView(View):
 
     def post(self, request, evento_id):
         evento = get_object_or_404(Evento, id=evento_id)
-        participante_lider_id = request.session.get('participante_id')
-        lider = get_object_or_404(Participante, id=participante_lider_id)
+        lider = request.perfiles.requerido('participante')
         
         # Obtener el registro principal del LÍDER
         relacion_lider = get_object_or_404(
@@ -1064,13 +934,9 @@ class AgregarMiembrosView(View):
                     # Lógica de generación de CLAVE y QR
                     clave_acceso = ''.join(random.choices(string.ascii_letters + string.digits, k=10))
                     nueva_relacion.par_eve_clave = clave_acceso
-                    qr_data = f"Participante: {nuevo_usuario.username}, Evento: {evento.eve_nombre}, Clave: {clave_acceso}"
-                    qr_img = qrcode.make(qr_data)
-                    buffer = BytesIO()
-                    qr_img.save(buffer, format='PNG')
-                    file_name = f"qr_participante_{nuevo_participante.id}.png"
-                    nueva_relacion.par_eve_qr.save(file_name, ContentFile(buffer.getvalue()), save=False)
                     nueva_relacion.save()
+                    asignar_qr(nueva_relacion, 'par_eve_qr', token_ingreso(nueva_relacion))
+                    nueva_relacion.save(update_fields=['par_eve_qr'])
 
                 # 5. Envío de correo electrónico
                 try:
@@ -1122,7 +988,7 @@ class ListaMiembrosView(View):
         if not participante_logueado_id:
             return None, None, None, None, "Error de sesión. No se encontró el ID del participante logueado."
 
-        participante = get_object_or_404(Participante, id=participante_logueado_id)
+        participante = request.perfiles.requerido('participante')
         evento = get_object_or_404(Evento, id=evento_id)
 
         try:
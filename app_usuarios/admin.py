@@ -1,17 +1,19 @@
-from datetime import timezone
 from django.contrib import admin
 from django.core.mail import send_mail
 from django.conf import settings
 from django.utils.html import format_html
 from django.urls import reverse
+from django.utils import timezone
 import random
 import string
 from django.contrib import admin, messages
 
 from app_asistentes.models import AsistenteEvento
-from app_evaluadores.models import EvaluadorEvento
+from app_evaluadores.models import EvaluadorEvento, PosicionRanking
 from app_participantes.models import ParticipanteEvento
-from app_admin_eventos.models import Area, Categoria, Criterio, Evento, EventoCategoria, MemoriaEvento
+from app_admin_eventos.models import Area, Categoria, Criterio, Evento, EventoCategoria, MemoriaEvento, CorreoPendiente, LoteCertificados, CertificadoGenerado, RegistroIngreso, InscripcionEvento
+from app_admin_eventos.ciclo_vida import eliminar_eventos
+from principal_eventos.cache_vistas import invalidar_eventos
 
 from .models import Asistente, Evaluador, Participante, Usuario, AdministradorEvento, InvitacionAdministrador
 
@@ -157,35 +159,32 @@ class EventoAdmin(admin.ModelAdmin):
     list_display = ['eve_nombre', 'eve_ciudad', 'eve_lugar', 'eve_fecha_inicio', 'eve_fecha_fin', 'eve_estado']
     list_filter = ['eve_estado', 'eve_fecha_inicio', 'eve_fecha_fin']
     search_fields = ['eve_nombre', 'eve_ciudad', 'eve_lugar']
+    # Lo mueven las inscripciones (app_admin_eventos.cupos), no se edita a mano
+    readonly_fields = ['eve_cupos_reservados']
 
     # HU93: Publicar evento en sitio web
     def publicar_evento(self, request, queryset):
-        updated = queryset.update(eve_estado="Publicado")
+        ids = list(queryset.values_list('id', flat=True))
+        updated = Evento.objects.filter(id__in=ids).update(eve_estado=Evento.Estados.PUBLICADO)
+        invalidar_eventos(ids)
         self.message_user(request, f"{updated} evento(s) publicados en el sitio web.", level=messages.SUCCESS)
 
     publicar_evento.short_description = "HU93 - Publicar evento en el sitio Web"
 
     # HU95: Cerrar eventos después de un tiempo
     def cerrar_eventos_vencidos(self, request, queryset):
-        hoy = timezone.now().date()
-        cerrados = 0
-        for evento in queryset:
-            if evento.eve_fecha_fin < hoy and evento.eve_estado != "Cerrado":
-                evento.eve_estado = "Cerrado"
-                evento.save()
-                cerrados += 1
+        hoy = timezone.localdate()
+        ids = list(queryset.filter(eve_fecha_fin__lt=hoy).exclude(eve_estado=Evento.Estados.CERRADO).values_list('id', flat=True))
+        cerrados = Evento.objects.filter(id__in=ids).update(eve_estado=Evento.Estados.CERRADO)
+        invalidar_eventos(ids)
         self.message_user(request, f"{cerrados} evento(s) cerrados automáticamente.", level=messages.WARNING)
 
     cerrar_eventos_vencidos.short_description = "HU95 - Cerrar eventos vencidos"
 
     # HU96: Eliminar eventos pasados
     def eliminar_eventos_pasados(self, request, queryset):
-        hoy = timezone.now().date()
-        eliminados = 0
-        for evento in queryset:
-            if evento.eve_fecha_fin < hoy:
-                evento.delete()
-                eliminados += 1
+        hoy = timezone.localdate()
+        eliminados = eliminar_eventos(queryset.filter(eve_fecha_fin__lt=hoy).values_list('id', flat=True))
         self.message_user(request, f"{eliminados} evento(s) eliminados del sitio.", level=messages.ERROR)
 
     eliminar_eventos_pasados.short_description = "HU96 - Eliminar eventos pasados"
@@ -223,6 +222,65 @@ class MemoriaEventoAdmin(admin.ModelAdmin):
     search_fields = ['nombre']
 
 
+# --------------------------
+# Cola de Correos
+# --------------------------
+class CorreoPendienteAdmin(admin.ModelAdmin):
+    list_display = ['cor_asunto', 'cor_estado', 'cor_intentos', 'cor_proximo_intento', 'cor_creado_en', 'cor_enviado_en']
+    list_filter = ['cor_estado']
+    search_fields = ['cor_asunto', 'cor_ultimo_error']
+    readonly_fields = ['cor_creado_en', 'cor_enviado_en', 'cor_ultimo_error']
+    # El contenido puede llevar contraseñas generadas: no se muestra ni se edita
+    exclude = ['cor_cuerpo', 'cor_alternativas']
+
+    def reintentar_correos(self, request, queryset):
+        from django.utils import timezone as dj_timezone
+        reintentados = queryset.exclude(cor_estado=CorreoPendiente.Estados.ENVIADO).update(
+            cor_estado=CorreoPendiente.Estados.PENDIENTE,
+            cor_intentos=0,
+            cor_proximo_intento=dj_timezone.now(),
+        )
+        self.message_user(request, f"{reintentados} correo(s) devueltos a la cola.", level=messages.SUCCESS)
+
+    reintentar_correos.short_description = "Reintentar envío de los correos seleccionados"
+
+    actions = [reintentar_correos]
+
+
+# --------------------------
+# Certificados
+# --------------------------
+class LoteCertificadosAdmin(admin.ModelAdmin):
+    list_display = ['lot_evento_fk', 'lot_tipo', 'lot_estado', 'lot_total', 'lot_generados', 'lot_errores', 'lot_creado_en']
+    list_filter = ['lot_estado', 'lot_tipo']
+
+
+class CertificadoGeneradoAdmin(admin.ModelAdmin):
+    list_display = ['cer_nombre', 'cer_correo', 'cer_tipo', 'cer_evento_fk', 'cer_generado_en', 'cer_enviado_en']
+    list_filter = ['cer_tipo', 'cer_evento_fk']
+    search_fields = ['cer_nombre', 'cer_correo']
+
+
+class RegistroIngresoAdmin(admin.ModelAdmin):
+    list_display = ['ing_nombre', 'ing_tipo', 'ing_evento_fk', 'ing_fecha_hora', 'ing_dispositivo']
+    list_filter = ['ing_tipo', 'ing_evento_fk']
+    search_fields = ['ing_nombre']
+
+
+class InscripcionEventoAdmin(admin.ModelAdmin):
+    # Índice mantenido por las inscripciones de cada rol: solo consulta
+    list_display = ['ins_evento_fk', 'ins_usuario_fk', 'ins_tipo', 'ins_inscripcion_id']
+    list_filter = ['ins_tipo', 'ins_evento_fk']
+    search_fields = ['ins_usuario_fk__cedula', 'ins_usuario_fk__username']
+    readonly_fields = ['ins_evento_fk', 'ins_usuario_fk', 'ins_tipo', 'ins_inscripcion_id']
+
+
+class PosicionRankingAdmin(admin.ModelAdmin):
+    list_display = ['pos_evento_fk', 'pos_puesto', 'pos_participante_fk', 'pos_puntaje', 'pos_actualizado_en']
+    list_filter = ['pos_evento_fk']
+    ordering = ['pos_evento_fk', 'pos_puesto']
+
+
 
 
 
@@ -235,7 +293,13 @@ admin.site.register(Categoria, CategoriaAdmin)
 admin.site.register(Area, AreaAdmin)
 admin.site.register(Criterio, CriterioAdmin)
 admin.site.register(MemoriaEvento, MemoriaEventoAdmin)
+admin.site.register(CorreoPendiente, CorreoPendienteAdmin)
+admin.site.register(LoteCertificados, LoteCertificadosAdmin)
+admin.site.register(CertificadoGenerado, CertificadoGeneradoAdmin)
+admin.site.register(RegistroIngreso, RegistroIngresoAdmin)
+admin.site.register(InscripcionEvento, InscripcionEventoAdmin)
 admin.site.register(EventoCategoria)
 admin.site.register(AsistenteEvento)
 admin.site.register(EvaluadorEvento)
-admin.site.register(ParticipanteEvento)
\ No newline at end of file
+admin.site.register(ParticipanteEvento)
+admin.site.register(PosicionRanking, PosicionRankingAdmin)
\ No newline at end of file
@@ -0,0 +1,53 @@
+from django.contrib.auth.backends import ModelBackend
+from django.db.models import Q
+
+from .models import Usuario, normalizar_identificador
+
+
+# Perfil de cada rol, para traerlo en la misma consulta que el usuario
+PERFIL_POR_ROL = {
+    Usuario.Roles.ADMIN_EVENTO: 'administrador_evento',
+    Usuario.Roles.EVALUADOR: 'evaluador',
+    Usuario.Roles.PARTICIPANTE: 'participante',
+    Usuario.Roles.ASISTENTE: 'asistente',
+}
+
+
+def buscar_usuario(identificador, rol=None):
+    """
+    Usuario cuyo correo o username coincide con `identificador` sin importar
+    mayúsculas, en una consulta sobre las columnas normalizadas (indexadas).
+    Con `rol` trae también su perfil (select_related). Si el identificador
+    es el username de uno y el correo de otro, gana el username.
+    """
+    identificador = normalizar_identificador(identificador)
+    if not identificador:
+        return None
+    consulta = Usuario.objects.filter(Q(username_normalizado=identificador) | Q(email_normalizado=identificador))
+    if rol in PERFIL_POR_ROL:
+        consulta = consulta.select_related(PERFIL_POR_ROL[rol])
+    candidatos = list(consulta[:2])
+    for usuario in candidatos:
+        if usuario.username_normalizado == identificador:
+            return usuario
+    return candidatos[0] if candidatos else None
+
+
+class IdentificadorBackend(ModelBackend):
+    """
+    Autenticación por correo o username sin distinguir mayúsculas. Si la
+    vista ya buscó al usuario lo pasa en `usuario` y no se consulta otra vez.
+    """
+
+    def authenticate(self, request, username=None, password=None, usuario=None, **kwargs):
+        if password is None:
+            return None
+        if usuario is None:
+            usuario = buscar_usuario(username or kwargs.get(Usuario.USERNAME_FIELD))
+        if usuario is None:
+            # Mismo costo que una contraseña equivocada: no revela qué cuentas existen
+            Usuario().set_password(password)
+            return None
+        if usuario.check_password(password) and self.user_can_authenticate(usuario):
+            return usuario
+        return None
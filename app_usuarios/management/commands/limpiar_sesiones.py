@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from app_usuarios.sesiones import limpiar_sesiones
+
+
+class Command(BaseCommand):
+    help = "Borra por lotes las sesiones vencidas de django_session (para programarlo en cron)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=5000, help="Filas por DELETE.")
+        parser.add_argument('--simular', action='store_true', help="Solo cuenta las sesiones vencidas.")
+
+    def handle(self, *args, **options):
+        if options['lote'] < 1:
+            raise CommandError("--lote debe ser mayor que cero.")
+
+        borradas = limpiar_sesiones(lote=options['lote'], simular=options['simular'])
+        if options['simular']:
+            self.stdout.write(f"{borradas} sesiones vencidas por borrar.")
+        else:
+            self.stdout.write(self.style.SUCCESS(f"✅ {borradas} sesiones vencidas borradas."))
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from app_usuarios.medicion_login import medir_login
+
+
+class Command(BaseCommand):
+    help = "Mide latencia y consultas por intento de una ráfaga de inicios de sesión concurrentes."
+
+    def add_arguments(self, parser):
+        parser.add_argument('identificador', help="Correo o username de una cuenta de prueba.")
+        parser.add_argument('password')
+        parser.add_argument('--intentos', type=int, default=1000)
+        parser.add_argument('--hilos', type=int, default=50)
+        parser.add_argument('--rol', default=None, help="Rol elegido en el formulario (trae su perfil en la misma consulta).")
+
+    def handle(self, *args, **options):
+        if options['intentos'] < 1 or options['hilos'] < 1:
+            raise CommandError("--intentos y --hilos deben ser mayores que cero.")
+
+        resultado = medir_login(
+            options['identificador'], options['password'],
+            intentos=options['intentos'], hilos=options['hilos'], rol=options['rol'],
+        )
+        latencia, consultas = resultado['latencia_ms'], resultado['consultas']
+        self.stdout.write(
+            f"{resultado['intentos']} intentos ({resultado['exitosos']} exitosos) en {resultado['segundos']} s "
+            f"= {resultado['por_segundo']} inicios/s"
+        )
+        self.stdout.write(
+            f"Latencia: p50 {latencia['p50']} ms, p95 {latencia['p95']} ms, p99 {latencia['p99']} ms, máx {latencia['max']} ms"
+        )
+        self.stdout.write(
+            f"Consultas por intento: {consultas['promedio']} (mín {consultas['min']}, máx {consultas['max']})"
+        )
+        if resultado['exitosos'] < resultado['intentos']:
+            self.stdout.write(self.style.WARNING("⚠️ Hubo intentos fallidos: revisa el identificador y la contraseña."))
@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from app_usuarios.sesiones import medir_motores
+
+
+class Command(BaseCommand):
+    help = "Compara consultas y tiempo por petición de cada motor de sesión (SESIONES_MOTOR)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--peticiones', type=int, default=1000)
+        parser.add_argument('--motor', action='append', choices=list(settings.MOTORES_SESION),
+                            help="Motor a medir (se puede repetir). Por defecto todos.")
+
+    def handle(self, *args, **options):
+        if options['peticiones'] < 1:
+            raise CommandError("--peticiones debe ser mayor que cero.")
+
+        motores = {nombre: settings.MOTORES_SESION[nombre] for nombre in options['motor'] or settings.MOTORES_SESION}
+        for nombre, medicion in medir_motores(options['peticiones'], motores).items():
+            actual = " (actual)" if nombre == settings.SESIONES_MOTOR else ""
+            self.stdout.write(f"{nombre}{actual}:")
+            for tipo in ('lectura', 'escritura'):
+                datos = medicion[tipo]
+                self.stdout.write(
+                    f"  {tipo}: {datos['consultas']} consultas, {datos['microsegundos']} µs por petición, "
+                    f"cookie de {datos['cookie_bytes']} bytes"
+                )
@@ -0,0 +1,72 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth import authenticate, login
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from .backends import buscar_usuario
+
+
+def _intento(identificador, password, rol):
+    """Un inicio de sesión como el de login_view: buscar, autenticar, login y guardar la sesión."""
+    request = RequestFactory().post('/login/')
+    request.session = import_module(settings.SESSION_ENGINE).SessionStore()
+    with CaptureQueriesContext(connection) as consultas:
+        inicio = time.perf_counter()
+        usuario = buscar_usuario(identificador, rol)
+        user = authenticate(request, usuario=usuario, password=password) if usuario else None
+        if user:
+            login(request, user)
+            request.session.save()
+        duracion = time.perf_counter() - inicio
+    return user is not None, duracion, len(consultas)
+
+
+def _intento_en_hilo(identificador, password, rol):
+    try:
+        return _intento(identificador, password, rol)
+    finally:
+        # Cada hilo abre su conexión: se cierra fuera de la medición
+        connection.close()
+
+
+def medir_login(identificador, password, intentos=1000, hilos=50, rol=None):
+    """
+    Lanza `intentos` inicios de sesión repartidos en `hilos` concurrentes y
+    retorna latencias (ms) y consultas por intento. Cada intento crea una
+    sesión real: conviene correrlo contra una base de pruebas.
+    """
+    inicio = time.perf_counter()
+    if hilos == 1:
+        # Secuencial en la conexión actual (sirve dentro de una transacción)
+        resultados = [_intento(identificador, password, rol) for _ in range(intentos)]
+    else:
+        with ThreadPoolExecutor(max_workers=hilos) as ejecutor:
+            resultados = list(ejecutor.map(lambda _: _intento_en_hilo(identificador, password, rol), range(intentos)))
+    total = time.perf_counter() - inicio
+
+    latencias = sorted(duracion * 1000 for _, duracion, _ in resultados)
+    consultas = [cantidad for _, _, cantidad in resultados]
+    percentiles = statistics.quantiles(latencias, n=100, method='inclusive') if len(latencias) > 1 else latencias * 99
+    return {
+        'intentos': intentos,
+        'exitosos': sum(1 for exito, _, _ in resultados if exito),
+        'segundos': round(total, 3),
+        'por_segundo': round(intentos / total, 1) if total else 0,
+        'latencia_ms': {
+            'p50': round(percentiles[49], 2),
+            'p95': round(percentiles[94], 2),
+            'p99': round(percentiles[98], 2),
+            'max': round(latencias[-1], 2),
+        },
+        'consultas': {
+            'min': min(consultas),
+            'max': max(consultas),
+            'promedio': round(sum(consultas) / len(consultas), 2),
+        },
+    }
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.3 on 2026-10-18 00:00
+
+from django.db import migrations, models
+from django.db.models.functions import Lower, Trim
+
+
+def normalizar_identificadores(apps, schema_editor):
+    Usuario = apps.get_model('app_usuarios', 'Usuario')
+    # Una sola sentencia para toda la tabla
+    Usuario.objects.update(
+        email_normalizado=Lower(Trim('email')),
+        username_normalizado=Lower(Trim('username')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_usuarios", "0002_indice_email_usuario"),
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="usuario",
+            name="email_normalizado",
+            field=models.CharField(default="", editable=False, max_length=254),
+        ),
+        migrations.AddField(
+            model_name="usuario",
+            name="username_normalizado",
+            field=models.CharField(default="", editable=False, max_length=150),
+        ),
+        migrations.RunPython(normalizar_identificadores, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="usuario",
+            index=models.Index(
+                fields=["email_normalizado"], name="usuario_email_norm_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="usuario",
+            index=models.Index(
+                fields=["username_normalizado"], name="usuario_username_norm_idx"
+            ),
+        ),
+    ]
@@ -18,11 +18,40 @@ class Usuario(AbstractUser):
     telefono = models.CharField(max_length=15, blank=True, null=True)
     rol = models.CharField(max_length=30, choices=Roles.choices, default=Roles.ASISTENTE)
     cedula = models.CharField(max_length=20, unique=True)
-
+    # Copias en minúsculas de email y username: el inicio de sesión compara
+    # por igualdad sobre ellas (índice) en lugar de iexact (recorrido completo)
+    email_normalizado = models.CharField(max_length=254, default='', editable=False)
+    username_normalizado = models.CharField(max_length=150, default='', editable=False)
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Registro y restablecimiento de contraseña buscan por correo
+            models.Index(fields=['email'], name='usuario_email_idx'),
+            models.Index(fields=['email_normalizado'], name='usuario_email_norm_idx'),
+            models.Index(fields=['username_normalizado'], name='usuario_username_norm_idx'),
+        ]
 
     def __str__(self):
         return f"{self.username} ({self.rol})"
 
+    def save(self, *args, **kwargs):
+        self.email_normalizado = normalizar_identificador(self.email)
+        self.username_normalizado = normalizar_identificador(self.username)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            campos = set(update_fields)
+            if 'email' in campos:
+                campos.add('email_normalizado')
+            if 'username' in campos:
+                campos.add('username_normalizado')
+            kwargs['update_fields'] = campos
+        super().save(*args, **kwargs)
+
+
+def normalizar_identificador(valor):
+    """Forma con la que se guardan y se buscan correo y username al iniciar sesión."""
+    return (valor or '').strip().lower()
+
 
 class Asistente(models.Model):
     usuario = models.OneToOneField(Usuario, on_delete=models.CASCADE, related_name='asistente')
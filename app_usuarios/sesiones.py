@@ -0,0 +1,88 @@
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.sessions.models import Session
+from django.db import connection
+from django.utils import timezone
+
+
+def limpiar_sesiones(lote=5000, simular=False):
+    """
+    Borra las filas vencidas de django_session por lotes de `lote` llaves.
+    Un solo DELETE sobre la tabla más consultada la bloquearía mientras
+    dura; por lotes, las peticiones que inician sesión no esperan.
+    Sirve con cualquier motor: con sesiones firmadas quedan las filas de
+    antes del cambio. Retorna cuántas filas se borraron (o se borrarían).
+    """
+    vencidas = Session.objects.filter(expire_date__lt=timezone.now())
+    if simular:
+        return vencidas.count()
+
+    borradas = 0
+    while True:
+        llaves = list(vencidas.values_list('session_key', flat=True)[:lote])
+        if not llaves:
+            return borradas
+        borradas += Session.objects.filter(session_key__in=llaves).delete()[0]
+
+
+def _datos_de_rol():
+    # Lo mismo que guarda login_view para un administrador
+    return {
+        SESSION_KEY: '1', BACKEND_SESSION_KEY: settings.AUTHENTICATION_BACKENDS[0], HASH_SESSION_KEY: 'x' * 64,
+        'admin_id': 1, 'admin_nombre': 'administrador', 'rol': 'ADMIN_EVENTO',
+    }
+
+
+def _medir(motor, peticiones, escribir):
+    """Consultas y microsegundos por petición: cargar la sesión de la cookie, leer el rol y, si `escribir`, guardarla."""
+    tienda = import_module(motor).SessionStore
+    sesion = tienda()
+    sesion.update(_datos_de_rol())
+    sesion.save()
+    llave = sesion.session_key
+
+    # Contador propio: CaptureQueriesContext solo guarda las últimas 9000
+    consultas = 0
+
+    def contar(ejecutar, sql, params, many, context):
+        nonlocal consultas
+        consultas += 1
+        return ejecutar(sql, params, many, context)
+
+    with connection.execute_wrapper(contar):
+        inicio = time.perf_counter()
+        for numero in range(peticiones):
+            sesion = tienda(session_key=llave)
+            sesion.get('rol'), sesion.get('admin_id'), sesion.get(SESSION_KEY)
+            if escribir:
+                sesion['ultima_vista'] = numero
+                sesion.save()
+                llave = sesion.session_key
+        duracion = time.perf_counter() - inicio
+
+    # La cookie de sesión: la llave, o todos los datos firmados
+    tamano_cookie = len(llave)
+    tienda(session_key=llave).delete()
+    return {
+        'consultas': round(consultas / peticiones, 2),
+        'microsegundos': round(duracion / peticiones * 1_000_000, 1),
+        'cookie_bytes': tamano_cookie,
+    }
+
+
+def medir_motores(peticiones=1000, motores=None):
+    """
+    Costo por petición de cada motor de sesión con la carga de una sesión
+    de rol, solo lectura y con escritura.
+    {nombre: {'lectura': {...}, 'escritura': {...}}}
+    """
+    resultado = {}
+    for nombre, motor in (motores or settings.MOTORES_SESION).items():
+        resultado[nombre] = {
+            'lectura': _medir(motor, peticiones, escribir=False),
+            'escritura': _medir(motor, peticiones, escribir=True),
+        }
+    return resultado
@@ -0,0 +1,77 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from app_usuarios.backends import buscar_usuario
+from app_usuarios.models import Usuario, Asistente
+
+
+class InicioSesionTestCase(TestCase):
+    """
+    Inicio de sesión por correo o username sin distinguir mayúsculas, sobre
+    columnas normalizadas: una consulta para el usuario y su perfil, sin
+    volver a buscarlo en authenticate ni escribir is_active.
+    """
+
+    def setUp(self):
+        self.client = Client()
+        self.usuario = Usuario.objects.create_user(
+            username="Ana.Gomez", password="testpass123", email="Ana.Gomez@Test.com",
+            rol=Usuario.Roles.ASISTENTE, cedula="9950100001",
+        )
+        Asistente.objects.create(usuario=self.usuario)
+
+    def iniciar(self, identificador, password="testpass123"):
+        return self.client.post(reverse('login_view'), {
+            'email_username': identificador, 'password': password, 'role': Usuario.Roles.ASISTENTE,
+        })
+
+    def test_columnas_normalizadas_se_mantienen_al_guardar(self):
+        self.assertEqual((self.usuario.email_normalizado, self.usuario.username_normalizado), ("ana.gomez@test.com", "ana.gomez"))
+
+        self.usuario.email = " Nuevo@Test.com "
+        self.usuario.save(update_fields=['email'])
+        self.usuario.refresh_from_db()
+        self.assertEqual(self.usuario.email_normalizado, "nuevo@test.com")
+
+    def test_busca_por_correo_o_username_en_una_consulta(self):
+        with self.assertNumQueries(1):
+            usuario = buscar_usuario("ANA.GOMEZ@test.com", Usuario.Roles.ASISTENTE)
+            self.assertIsNotNone(usuario.asistente)
+        self.assertEqual(buscar_usuario(" ana.gomez "), self.usuario)
+        self.assertIsNone(buscar_usuario("nadie"))
+
+    def test_username_gana_sobre_correo_de_otra_cuenta(self):
+        otro = Usuario.objects.create_user(
+            username="ana.gomez@test.com", password="x", email="otra@test.com",
+            rol=Usuario.Roles.ASISTENTE, cedula="9950100002",
+        )
+        self.assertEqual(buscar_usuario("Ana.Gomez@Test.com"), otro)
+
+    def test_login_consulta_el_usuario_una_vez_y_no_escribe_is_active(self):
+        with CaptureQueriesContext(connection) as consultas:
+            respuesta = self.iniciar("ANA.GOMEZ")
+        # Primer acceso: redirige a cambiar la contraseña
+        self.assertRedirects(respuesta, reverse('cambio_password_asistente'), fetch_redirect_response=False)
+
+        sql = [consulta['sql'] for consulta in consultas.captured_queries]
+        lecturas = [s for s in sql if s.startswith('SELECT') and 'FROM "app_usuarios_usuario"' in s]
+        self.assertEqual(len(lecturas), 1)
+        escrituras = [s for s in sql if s.startswith('UPDATE "app_usuarios_usuario"')]
+        self.assertEqual(len(escrituras), 1)
+        self.assertIn('"last_login"', escrituras[0])
+        self.assertNotIn('"is_active"', escrituras[0])
+
+    def test_mensajes_de_error(self):
+        self.assertContains(self.iniciar("ana.gomez", "otra"), "Contraseña incorrecta.")
+        self.assertContains(self.iniciar("nadie"), "Correo o nombre de usuario no encontrado.")
+
+    def test_comando_de_medicion(self):
+        salida = StringIO()
+        call_command('medir_login', 'ana.gomez@test.com', 'testpass123', '--intentos', '5', '--hilos', '1', stdout=salida)
+        self.assertIn("5 intentos (5 exitosos)", salida.getvalue())
+        self.assertIn("Consultas por intento:", salida.getvalue())
@@ -0,0 +1,77 @@
+from django.db import connection
+from django.http import Http404
+from django.test import TestCase, Client, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from app_usuarios.models import Usuario, AdministradorEvento, Evaluador
+from principal_eventos.perfiles import PerfilesRol
+
+
+class PerfilesRolTestCase(TestCase):
+    """
+    Perfiles de rol por petición: se consultan solo si una vista los pide,
+    una vez, y se comparten entre decorador, dispatch y get_queryset.
+    """
+
+    def setUp(self):
+        self.client = Client()
+        self.usuario_admin = Usuario.objects.create_user(
+            username="admin_perfiles", password="testpass123", email="admin_perfiles@test.com",
+            rol=Usuario.Roles.ADMIN_EVENTO, cedula="9950200001", last_login=timezone.now(),
+        )
+        self.admin, _ = AdministradorEvento.objects.get_or_create(usuario=self.usuario_admin)
+        self.usuario_evaluador = Usuario.objects.create_user(
+            username="eva_perfiles", password="testpass123", email="eva_perfiles@test.com",
+            rol=Usuario.Roles.EVALUADOR, cedula="9950200002", last_login=timezone.now(),
+        )
+        self.evaluador, _ = Evaluador.objects.get_or_create(usuario=self.usuario_evaluador)
+
+    def iniciar_sesion(self, usuario, **llaves):
+        self.client.force_login(usuario)
+        session = self.client.session
+        session.update(llaves)
+        session.save()
+
+    def consultas_a(self, tabla, consultas):
+        return [c['sql'] for c in consultas.captured_queries if c['sql'].startswith('SELECT') and f'FROM "{tabla}"' in c['sql']]
+
+    def perfiles(self, **sesion):
+        request = RequestFactory().get('/')
+        request.session = sesion
+        return PerfilesRol(request)
+
+    def test_resuelve_una_vez_y_solo_si_se_pide(self):
+        perfiles = self.perfiles(admin_id=self.admin.pk)
+        self.assertTrue(perfiles.tiene('admin'))
+        self.assertFalse(perfiles.tiene('evaluador'))
+
+        with self.assertNumQueries(1):
+            self.assertEqual(perfiles.admin, self.admin)
+            self.assertEqual(perfiles.requerido('admin').usuario, self.usuario_admin)
+        with self.assertNumQueries(0):
+            self.assertIsNone(perfiles.evaluador)
+            with self.assertRaises(Http404):
+                perfiles.requerido('participante')
+
+    def test_perfil_de_otro_usuario_no_se_acepta(self):
+        perfiles = self.perfiles(admin_id=self.admin.pk, _auth_user_id=str(self.usuario_evaluador.pk))
+        self.assertIsNone(perfiles.admin)
+
+    def test_dashboard_admin_consulta_el_perfil_una_vez(self):
+        self.iniciar_sesion(self.usuario_admin, admin_id=self.admin.pk)
+
+        with CaptureQueriesContext(connection) as consultas:
+            respuesta = self.client.get(reverse('dashboard_admin'))
+        self.assertEqual(respuesta.status_code, 200)
+        # Antes: dispatch y get_queryset buscaban cada uno al administrador
+        self.assertEqual(len(self.consultas_a('app_usuarios_administradorevento', consultas)), 1)
+
+    def test_dashboard_evaluador_consulta_el_perfil_una_vez(self):
+        self.iniciar_sesion(self.usuario_evaluador, evaluador_id=self.evaluador.pk)
+
+        with CaptureQueriesContext(connection) as consultas:
+            respuesta = self.client.get(reverse('dashboard_evaluador'))
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(len(self.consultas_a('app_usuarios_evaluador', consultas)), 1)
@@ -0,0 +1,101 @@
+import os
+import runpy
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from app_usuarios.models import Usuario, AdministradorEvento
+from app_usuarios.sesiones import limpiar_sesiones, medir_motores
+
+
+class SesionesTestCase(TestCase):
+    """
+    Motores de sesión intercambiables para las sesiones de rol, limpieza por
+    lotes de filas vencidas y medición del costo por petición.
+    """
+
+    def crear_sesiones(self, cantidad, vencidas):
+        desfase = timedelta(days=-1 if vencidas else 1)
+        prefijo = 'v' if vencidas else 'a'
+        Session.objects.bulk_create(
+            Session(session_key=f"{prefijo}{numero:031d}", session_data='', expire_date=timezone.now() + desfase)
+            for numero in range(cantidad)
+        )
+
+    def test_limpieza_por_lotes_solo_borra_vencidas(self):
+        self.crear_sesiones(7, vencidas=True)
+        self.crear_sesiones(2, vencidas=False)
+
+        self.assertEqual(limpiar_sesiones(simular=True), 7)
+        with CaptureQueriesContext(connection) as consultas:
+            self.assertEqual(limpiar_sesiones(lote=3), 7)
+        borrados = [c for c in consultas.captured_queries if c['sql'].startswith('DELETE')]
+        self.assertEqual(len(borrados), 3)
+        self.assertEqual(Session.objects.count(), 2)
+
+    def test_comando_de_limpieza(self):
+        self.crear_sesiones(2, vencidas=True)
+        salida = StringIO()
+        call_command('limpiar_sesiones', stdout=salida)
+        self.assertIn("2 sesiones vencidas borradas", salida.getvalue())
+
+    def cargar_settings(self, **variables):
+        """Variables de settings.py con este entorno: sin caché compartida ni motor, salvo los dados."""
+        with mock.patch.dict(os.environ, {'REDIS_URL': '', 'CACHE_DIRECTORIO': '', 'DEBUG': 'False', **variables}):
+            if 'SESIONES_MOTOR' not in variables:
+                os.environ.pop('SESIONES_MOTOR', None)
+            return runpy.run_path(str(Path(settings.BASE_DIR) / 'principal_eventos' / 'settings.py'))
+
+    def test_motor_por_defecto_segun_la_cache(self):
+        self.assertEqual(self.cargar_settings()['SESSION_ENGINE'], 'django.contrib.sessions.backends.db')
+        compartida = self.cargar_settings(REDIS_URL='redis://localhost:6379/0')
+        self.assertEqual(compartida['SESSION_ENGINE'], 'django.contrib.sessions.backends.cached_db')
+
+        # Memoria local por worker: una sesión revocada seguiría viva en los demás
+        with self.assertRaisesMessage(ImproperlyConfigured, "caché compartida"):
+            self.cargar_settings(SESIONES_MOTOR='cached_db')
+        en_desarrollo = self.cargar_settings(SESIONES_MOTOR='cached_db', DEBUG='True')
+        self.assertEqual(en_desarrollo['SESSION_ENGINE'], 'django.contrib.sessions.backends.cached_db')
+
+    def test_cached_db_lee_sin_consultar_la_tabla(self):
+        medicion = medir_motores(peticiones=5)
+        self.assertEqual(medicion['db']['lectura']['consultas'], 1)
+        self.assertEqual(medicion['cached_db']['lectura']['consultas'], 0)
+        self.assertEqual(medicion['firmadas']['escritura']['consultas'], 0)
+        self.assertGreater(medicion['firmadas']['lectura']['cookie_bytes'], medicion['db']['lectura']['cookie_bytes'])
+
+    def test_comando_de_medicion(self):
+        salida = StringIO()
+        call_command('medir_sesiones', '--peticiones', '3', '--motor', 'firmadas', stdout=salida)
+        self.assertIn("firmadas:", salida.getvalue())
+        self.assertNotIn("cached_db", salida.getvalue())
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies')
+    def test_login_con_sesiones_firmadas_no_usa_la_tabla(self):
+        usuario = Usuario.objects.create_user(
+            username="admin_firmada", password="testpass123", email="admin_firmada@test.com",
+            rol=Usuario.Roles.ADMIN_EVENTO, cedula="9950300001", last_login=timezone.now(),
+        )
+        AdministradorEvento.objects.get_or_create(usuario=usuario)
+        client = Client()
+
+        with CaptureQueriesContext(connection) as consultas:
+            respuesta = client.post(reverse('login_view'), {
+                'email_username': 'admin_firmada', 'password': 'testpass123', 'role': Usuario.Roles.ADMIN_EVENTO,
+            })
+            self.assertRedirects(respuesta, reverse('dashboard_admin'), fetch_redirect_response=False)
+            self.assertEqual(client.get(reverse('dashboard_admin')).status_code, 200)
+
+        self.assertFalse([c for c in consultas.captured_queries if 'django_session' in c['sql']])
+        self.assertEqual(Session.objects.count(), 0)
@@ -0,0 +1,168 @@
+import hashlib
+import re
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+
+
+# Caché de respuestas completas para las páginas públicas de eventos, que
+# son idénticas para todos los visitantes anónimos. Las llaves del catálogo
+# llevan una versión del catálogo y las del detalle una versión por evento;
+# las señales de app_admin_eventos suben esas versiones, así una edición
+# invalida solo las páginas afectadas sin tener que buscar ni borrar llaves.
+
+PREFIJO = 'vista'
+
+# Vistas con caché, para los contadores de aciertos y fallos
+VISTAS = ('catalogo', 'catalogo_json', 'detalle_evento', 'preinscripcion_evento')
+
+# Los formularios del modal de soporte llevan token CSRF, que es distinto
+# por visitante: se guarda una marca en su lugar y se reemplaza al servir.
+_TOKEN_CSRF = re.compile(rb'(name="csrfmiddlewaretoken" value=")[^"]+(")')
+_MARCA_CSRF = b'__token_csrf__'
+
+# Llaves de sesión que identifican a un usuario con rol (ver decorador.py)
+_LLAVES_ROL = ('admin_id', 'evaluador_id', 'participante_id', 'asistente_id')
+
+
+def _version_inicial():
+    # Si la caché descarta una versión, la nueva arranca desde el reloj y no
+    # puede coincidir con una anterior que aún tenga páginas guardadas
+    return time.time_ns() // 1000
+
+
+def _version(nombre):
+    llave = f'{PREFIJO}:version:{nombre}'
+    version = cache.get(llave)
+    if version is None:
+        # add() no pisa la versión si otro proceso la creó primero
+        cache.add(llave, _version_inicial(), None)
+        version = cache.get(llave)
+    return version
+
+
+def _subir_version(nombre):
+    llave = f'{PREFIJO}:version:{nombre}'
+    try:
+        cache.incr(llave)
+    except ValueError:
+        cache.set(llave, _version_inicial(), None)
+
+
+def _invalidar(nombres):
+    """
+    Sube las versiones ya (la misma transacción ve el cambio) y otra vez al
+    confirmar: una petición anónima que renderizó datos previos al COMMIT
+    con la versión nueva no deja esa página guardada.
+    """
+    nombres = list(nombres)
+    for nombre in nombres:
+        _subir_version(nombre)
+    transaction.on_commit(lambda: [_subir_version(nombre) for nombre in nombres])
+
+
+def invalidar_catalogo():
+    """Descarta todas las páginas del catálogo (listado, filtros y scroll)."""
+    _invalidar(['catalogo'])
+
+
+def invalidar_detalle_eventos(ids):
+    """Descarta solo las páginas de detalle de los eventos, sin tocar el catálogo."""
+    _invalidar([f'evento:{evento_id}' for evento_id in set(ids)])
+
+
+def invalidar_eventos(ids):
+    """Descarta las páginas de detalle de los eventos indicados y el catálogo, donde aparecen."""
+    _invalidar([*(f'evento:{evento_id}' for evento_id in set(ids)), 'catalogo'])
+
+
+def _contar(nombre, resultado):
+    llave = f'{PREFIJO}:contador:{nombre}:{resultado}'
+    cache.add(llave, 0, None)
+    try:
+        cache.incr(llave)
+    except ValueError:
+        pass
+
+
+def estadisticas():
+    """{vista: {'aciertos': n, 'fallos': n}} de las vistas con caché registradas."""
+    return {
+        nombre: {
+            'aciertos': cache.get(f'{PREFIJO}:contador:{nombre}:acierto', 0),
+            'fallos': cache.get(f'{PREFIJO}:contador:{nombre}:fallo', 0),
+        }
+        for nombre in VISTAS
+    }
+
+
+def reiniciar_estadisticas():
+    cache.delete_many([
+        f'{PREFIJO}:contador:{nombre}:{resultado}' for nombre in VISTAS for resultado in ('acierto', 'fallo')
+    ])
+
+
+def _es_anonimo(request):
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    if any(request.session.get(llave) for llave in _LLAVES_ROL):
+        return False
+    if getattr(request, 'user', None) is not None and request.user.is_authenticated:
+        return False
+    # Una página con mensajes pendientes es única para ese visitante
+    return not len(get_messages(request))
+
+
+def _llave(nombre, request, evento_id):
+    # La página de detalle pinta su URL absoluta: el esquema y el host son parte de la llave
+    parametros = sorted((clave, tuple(request.GET.getlist(clave))) for clave in request.GET)
+    huella = hashlib.sha256(
+        repr((request.scheme, request.get_host(), request.path, parametros)).encode()
+    ).hexdigest()[:32]
+    if evento_id is None:
+        return f"{PREFIJO}:{nombre}:c{_version('catalogo')}:{huella}"
+    return f"{PREFIJO}:{nombre}:{evento_id}:e{_version(f'evento:{evento_id}')}:{huella}"
+
+
+def cache_anonimo(nombre, argumento_evento=None):
+    """
+    Decorador para vistas públicas: guarda la respuesta 200 para visitantes
+    anónimos por vista, evento (`argumento_evento` es el kwarg de la URL con
+    su id) y combinación de filtros GET. Agrega la cabecera X-Cache con
+    HIT/MISS y lleva contadores de aciertos y fallos.
+    """
+
+    def decorador(vista):
+        @wraps(vista)
+        def envoltura(request, *args, **kwargs):
+            if not _es_anonimo(request):
+                return vista(request, *args, **kwargs)
+
+            llave = _llave(nombre, request, kwargs.get(argumento_evento) if argumento_evento else None)
+            guardado = cache.get(llave)
+            if guardado is not None:
+                _contar(nombre, 'acierto')
+                contenido, tipo = guardado
+                response = HttpResponse(
+                    contenido.replace(_MARCA_CSRF, get_token(request).encode()), content_type=tipo
+                )
+                response['X-Cache'] = 'HIT'
+                return response
+
+            _contar(nombre, 'fallo')
+            response = vista(request, *args, **kwargs)
+            if hasattr(response, 'render') and callable(response.render):
+                response = response.render()
+            if response.status_code == 200 and not response.streaming and not response.cookies:
+                contenido = _TOKEN_CSRF.sub(rb'\1' + _MARCA_CSRF + rb'\2', response.content)
+                cache.set(llave, (contenido, response['Content-Type']), settings.CACHE_VISTAS_SEGUNDOS)
+            response['X-Cache'] = 'MISS'
+            return response
+        return envoltura
+    return decorador
@@ -0,0 +1,99 @@
+import base64
+from datetime import date
+
+from django.db.models import Q
+
+from app_admin_eventos.busqueda import buscar_eventos
+from app_admin_eventos.filtros import condicion_filtros
+from app_admin_eventos.models import Evento
+
+
+# Eventos por página del catálogo público
+TAMANO_PAGINA = 12
+
+ESTADOS_VISIBLES = (Evento.Estados.PUBLICADO, Evento.Estados.FINALIZADO)
+
+# Solo lo que pintan las tarjetas del catálogo
+CAMPOS_TARJETA = (
+    'id', 'eve_nombre', 'eve_imagen', 'eve_estado', 'eve_fecha_inicio', 'eve_fecha_fin', 'eve_ciudad', 'eve_lugar',
+)
+
+
+def codificar_cursor(evento):
+    """Cursor opaco con la posición (fecha de inicio, id) del último evento entregado."""
+    crudo = f"{evento.eve_fecha_inicio.isoformat()}.{evento.pk}"
+    return base64.urlsafe_b64encode(crudo.encode()).decode().rstrip('=')
+
+
+def leer_cursor(cursor):
+    """Retorna (fecha, id) o None si el cursor está vacío o mal formado."""
+    if not cursor:
+        return None
+    try:
+        crudo = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        fecha, pk = crudo.split('.')
+        return date.fromisoformat(fecha), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def eventos_catalogo(parametros=None):
+    """Eventos visibles para el visitante con los filtros del buscador, del más reciente al más antiguo."""
+    return (
+        Evento.objects.filter(eve_estado__in=ESTADOS_VISIBLES)
+        .filter(condicion_filtros(parametros or {}))
+        .only(*CAMPOS_TARJETA)
+        .prefetch_related('categorias')
+        .order_by('-eve_fecha_inicio', '-id')
+    )
+
+
+def pagina_catalogo(parametros=None, cursor=None, tamano=TAMANO_PAGINA):
+    """
+    Una página del catálogo con paginación por llave (keyset): en lugar de
+    OFFSET, continúa después del (eve_fecha_inicio, id) del cursor, así
+    cada página cuesta lo mismo sin importar qué tan adentro esté.
+    Con texto de búsqueda (`nombre`) el orden es por relevancia.
+    Retorna (eventos, cursor de la siguiente página o None).
+    """
+    parametros = parametros or {}
+    texto = str(parametros.get('nombre') or '').strip()
+    if texto:
+        return _pagina_busqueda(parametros, texto, cursor, tamano)
+
+    eventos = eventos_catalogo(parametros)
+    posicion = leer_cursor(cursor)
+    if posicion:
+        fecha, pk = posicion
+        eventos = eventos.filter(Q(eve_fecha_inicio__lt=fecha) | Q(eve_fecha_inicio=fecha, id__lt=pk))
+
+    # Se pide uno de más para saber si hay otra página sin hacer un COUNT
+    eventos = list(eventos[:tamano + 1])
+    if len(eventos) > tamano:
+        eventos = eventos[:tamano]
+        return eventos, codificar_cursor(eventos[-1])
+    return eventos, None
+
+
+def _pagina_busqueda(parametros, texto, cursor, tamano):
+    """
+    Página de resultados ordenados por relevancia. La búsqueda entrega a lo
+    sumo BUSQUEDA_LIMITE IDs visibles y ya ordenados (estado y filtros van
+    dentro de la consulta de ranking), así el cursor es simplemente la
+    posición dentro de esa lista.
+    """
+    try:
+        inicio = max(int(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode().lstrip('#')), 0)
+    except (TypeError, ValueError, UnicodeDecodeError):
+        inicio = 0
+
+    otros_filtros = {clave: parametros.get(clave) for clave in parametros if clave != 'nombre'}
+    ordenados = buscar_eventos(texto, eventos=eventos_catalogo(otros_filtros))
+
+    pagina = ordenados[inicio:inicio + tamano]
+    por_id = eventos_catalogo(otros_filtros).in_bulk(pagina)
+    eventos = [por_id[evento_id] for evento_id in pagina if evento_id in por_id]
+
+    fin = inicio + tamano
+    siguiente = base64.urlsafe_b64encode(f"#{fin}".encode()).decode().rstrip('=') if fin < len(ordenados) else None
+    return eventos, siguiente
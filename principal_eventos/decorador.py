@@ -15,7 +15,7 @@ def redirigir_por_rol_sesion(session):
 def admin_required(view_func):
     @wraps(view_func)
     def wrapper(request, *args, **kwargs):
-        if not request.session.get('admin_id'):
+        if not request.perfiles.tiene('admin'):
             return redirigir_por_rol_sesion(request.session)
         return view_func(request, *args, **kwargs)
     return wrapper
@@ -23,7 +23,7 @@ def admin_required(view_func):
 def evaluador_required(view_func):
     @wraps(view_func)
     def wrapper(request, *args, **kwargs):
-        if not request.session.get('evaluador_id'):
+        if not request.perfiles.tiene('evaluador'):
             return redirigir_por_rol_sesion(request.session)
         return view_func(request, *args, **kwargs)
     return wrapper
@@ -31,7 +31,7 @@ def evaluador_required(view_func):
 def participante_required(view_func):
     @wraps(view_func)
     def wrapper(request, *args, **kwargs):
-        if not request.session.get('participante_id'):
+        if not request.perfiles.tiene('participante'):
             return redirigir_por_rol_sesion(request.session)
         return view_func(request, *args, **kwargs)
     return wrapper
@@ -39,7 +39,7 @@ def participante_required(view_func):
 def asistente_required(view_func):
     @wraps(view_func)
     def wrapper(request, *args, **kwargs):
-        if not request.session.get('asistente_id'):
+        if not request.perfiles.tiene('asistente'):
             return redirigir_por_rol_sesion(request.session)
         return view_func(request, *args, **kwargs)
     return wrapper
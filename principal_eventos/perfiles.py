@@ -0,0 +1,77 @@
+from functools import cached_property
+
+from django.contrib.auth import SESSION_KEY
+from django.http import Http404
+
+from app_usuarios.models import AdministradorEvento, Asistente, Evaluador, Participante
+
+
+# Llave de sesión que escribe login_view para cada rol -> modelo del perfil
+PERFILES = {
+    'admin': ('admin_id', AdministradorEvento),
+    'evaluador': ('evaluador_id', Evaluador),
+    'participante': ('participante_id', Participante),
+    'asistente': ('asistente_id', Asistente),
+}
+
+
+class PerfilesRol:
+    """
+    Perfiles de rol del usuario de la sesión. Cada uno se consulta la primera
+    vez que se pide (con su usuario en la misma consulta) y se reutiliza el
+    resto de la petición: decoradores, dispatch y get_queryset comparten la
+    misma instancia. Es None si la sesión no tiene ese rol.
+    """
+
+    def __init__(self, request):
+        self._request = request
+
+    def tiene(self, nombre):
+        """Si la sesión tiene el rol, sin consultar la base (lo que revisan los decoradores)."""
+        return bool(self._request.session.get(PERFILES[nombre][0]))
+
+    def _resolver(self, nombre):
+        llave, modelo = PERFILES[nombre]
+        perfil_id = self._request.session.get(llave)
+        if not perfil_id:
+            return None
+        perfil = modelo.objects.select_related('usuario').filter(pk=perfil_id).first()
+        # El perfil debe ser del usuario autenticado en la sesión, si lo hay
+        usuario_id = self._request.session.get(SESSION_KEY)
+        if perfil is None or (usuario_id is not None and str(perfil.usuario_id) != str(usuario_id)):
+            return None
+        return perfil
+
+    @cached_property
+    def admin(self):
+        return self._resolver('admin')
+
+    @cached_property
+    def evaluador(self):
+        return self._resolver('evaluador')
+
+    @cached_property
+    def participante(self):
+        return self._resolver('participante')
+
+    @cached_property
+    def asistente(self):
+        return self._resolver('asistente')
+
+    def requerido(self, nombre):
+        """Perfil del rol o Http404, como el get_object_or_404 que reemplaza."""
+        perfil = getattr(self, nombre)
+        if perfil is None:
+            raise Http404(f"La sesión no tiene perfil de {nombre}.")
+        return perfil
+
+
+class PerfilesRolMiddleware:
+    """Adjunta `request.perfiles` (sin consultas hasta que una vista lo use)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.perfiles = PerfilesRol(request)
+        return self.get_response(request)
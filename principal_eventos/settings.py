@@ -4,6 +4,7 @@
 
 from pathlib import Path
 import os
+from django.core.exceptions import ImproperlyConfigured
 from django.core.management.utils import get_random_secret_key
 from dotenv import load_dotenv
 import dj_database_url
@@ -67,6 +68,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'principal_eventos.perfiles.PerfilesRolMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -127,6 +129,8 @@ else:
 # AUTH
 # --------------------------------------------
 AUTH_USER_MODEL = 'app_usuarios.Usuario'
+# Correo o username sin distinguir mayúsculas, sobre columnas normalizadas e indexadas
+AUTHENTICATION_BACKENDS = ['app_usuarios.backends.IdentificadorBackend']
 LOGIN_URL = 'login_view'
 
 # --------------------------------------------
@@ -221,6 +225,124 @@ except Exception as e:
     DEFAULT_FROM_EMAIL = "noreply@ejemplo.com"
     logger.warning("⚠️ Email configurado para mostrar en consola")
 
+# ---------------------------------------------------
+# COLA DE CORREOS (envío asíncrono)
+# ---------------------------------------------------
+# Con COLA_CORREOS_ACTIVA las vistas encolan los correos en la BD y el
+# comando `python manage.py procesar_cola_correos --continuo` los envía con
+# el backend real. Solo se activa donde ese worker está desplegado (ver
+# README): sin él no saldría ningún correo, ni credenciales ni restablecimientos.
+COLA_CORREOS_ACTIVA = config('COLA_CORREOS_ACTIVA', default=False, cast=bool)
+COLA_CORREOS_BACKEND = EMAIL_BACKEND
+COLA_CORREOS_LOTE = config('COLA_CORREOS_LOTE', default=50, cast=int)
+COLA_CORREOS_MAX_INTENTOS = config('COLA_CORREOS_MAX_INTENTOS', default=5, cast=int)
+COLA_CORREOS_ESPERA_BASE = config('COLA_CORREOS_ESPERA_BASE', default=60, cast=int)
+COLA_CORREOS_ESPERA_MAXIMA = config('COLA_CORREOS_ESPERA_MAXIMA', default=3600, cast=int)
+COLA_CORREOS_BLOQUEO = config('COLA_CORREOS_BLOQUEO', default=600, cast=int)
+
+if COLA_CORREOS_ACTIVA:
+    EMAIL_BACKEND = 'app_admin_eventos.correos.ColaCorreosBackend'
+
+# ---------------------------------------------------
+# CERTIFICADOS (generación masiva)
+# ---------------------------------------------------
+# Procesos usados por `python manage.py procesar_certificados` (0 = núcleos disponibles)
+CERTIFICADOS_PROCESOS = config('CERTIFICADOS_PROCESOS', default=0, cast=int)
+# Segundos tras los que un lote 'Procesando' se da por abandonado y otro worker lo retoma
+CERTIFICADOS_BLOQUEO = config('CERTIFICADOS_BLOQUEO', default=3600, cast=int)
+
+# ---------------------------------------------------
+# PUNTAJES DE EVALUACIÓN
+# ---------------------------------------------------
+# Agregado entre evaluadores que define la calificación final:
+# 'media', 'mediana' o 'media_recortada'
+PUNTAJES_AGREGADO = config('PUNTAJES_AGREGADO', default='media')
+# Porcentaje de puntajes descartados en cada extremo por la media recortada
+PUNTAJES_RECORTE = config('PUNTAJES_RECORTE', default=20, cast=int)
+
+# ---------------------------------------------------
+# CICLO DE VIDA DE EVENTOS
+# ---------------------------------------------------
+# Usados por `python manage.py ciclo_eventos` (días contados desde eve_fecha_fin)
+EVENTOS_DIAS_CIERRE = config('EVENTOS_DIAS_CIERRE', default=7, cast=int)
+EVENTOS_DIAS_ELIMINACION = config('EVENTOS_DIAS_ELIMINACION', default=30, cast=int)
+
+# ---------------------------------------------------
+# BÚSQUEDA DE EVENTOS
+# ---------------------------------------------------
+# Máximo de resultados ordenados por relevancia que entrega una búsqueda
+BUSQUEDA_LIMITE = config('BUSQUEDA_LIMITE', default=500, cast=int)
+
+# ---------------------------------------------------
+# CACHÉ
+# ---------------------------------------------------
+# Producción: REDIS_URL (Redis o compatible). Desarrollo: CACHE_DIRECTORIO
+# para una caché en archivos compartida entre procesos, o memoria local.
+REDIS_URL = config('REDIS_URL', default='')
+CACHE_DIRECTORIO = config('CACHE_DIRECTORIO', default='')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+elif CACHE_DIRECTORIO:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': CACHE_DIRECTORIO,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'edufest',
+        }
+    }
+
+# Segundos que se guardan las páginas públicas de eventos para visitantes
+# anónimos (las señales las invalidan antes si el evento cambia)
+CACHE_VISTAS_SEGUNDOS = config('CACHE_VISTAS_SEGUNDOS', default=300, cast=int)
+
+# Máximo que un proceso usa su copia de áreas y categorías sin recargarla
+# (los cambios la invalidan antes; este límite solo acota casos raros)
+REFERENCIAS_SEGUNDOS = config('REFERENCIAS_SEGUNDOS', default=3600, cast=int)
+
+# ---------------------------------------------------
+# SESIONES
+# ---------------------------------------------------
+# La sesión solo guarda el usuario autenticado, el rol y el id de su perfil
+# (login_view). SESIONES_MOTOR elige dónde vive:
+#   - cached_db (por defecto con REDIS_URL o CACHE_DIRECTORIO): se lee de la
+#     caché y solo se escribe en la tabla al cambiar; la tabla se consulta si
+#     la caché perdió la llave
+#   - firmadas: todo en una cookie firmada con SECRET_KEY, sin tabla ni caché.
+#     Cerrar sesión borra la cookie, pero una copia sigue valiendo hasta expirar
+#   - db (por defecto sin caché compartida): la tabla django_session en cada
+#     petición (motor por defecto de Django)
+# cached_db necesita una caché que vean todos los procesos: con la memoria
+# local de cada worker, una sesión cerrada o revocada en uno sigue viva en la
+# copia de los demás. Por eso fuera de DEBUG no se acepta sin caché compartida.
+# `python manage.py medir_sesiones` compara el costo por petición de cada uno.
+MOTORES_SESION = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'firmadas': 'django.contrib.sessions.backends.signed_cookies',
+}
+CACHE_COMPARTIDA = bool(REDIS_URL or CACHE_DIRECTORIO)
+SESIONES_MOTOR = config('SESIONES_MOTOR', default='cached_db' if CACHE_COMPARTIDA else 'db')
+if SESIONES_MOTOR not in MOTORES_SESION:
+    raise ImproperlyConfigured(f"SESIONES_MOTOR debe ser uno de: {', '.join(MOTORES_SESION)}")
+if SESIONES_MOTOR == 'cached_db' and not CACHE_COMPARTIDA and not DEBUG:
+    raise ImproperlyConfigured(
+        "SESIONES_MOTOR=cached_db necesita una caché compartida entre procesos (REDIS_URL o CACHE_DIRECTORIO)."
+    )
+SESSION_ENGINE = MOTORES_SESION[SESIONES_MOTOR]
+SESSION_COOKIE_AGE = config('SESIONES_SEGUNDOS', default=60 * 60 * 24 * 14, cast=int)
+
 # ---------------------------------------------------
 # SECURITY (PRODUCCIÓN)
 # ---------------------------------------------------
@@ -26,6 +26,7 @@ urlpatterns = [
 
     #VisitanteWeb URLs
     path('', views.MenuPrincipalVisitanteView.as_view(), name='pagina_principal'),
+    path('catalogo/', views.CatalogoEventosJsonView.as_view(), name='catalogo_eventos'),
     path('ver_info/<int:pk>/', views.EventoDetailView.as_view(), name='ver_info_evento'),
     path('ver_info/eva/par<int:pk>/', views.EventoPreinscripcionesView.as_view(), name='preinscripcion_avanzada'),
 
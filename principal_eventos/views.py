@@ -1,5 +1,8 @@
 from app_admin_eventos.models import  Evento, Categoria, Area
+from app_admin_eventos import referencias
 from django.shortcuts import get_object_or_404, render, redirect
+from django.http import JsonResponse
+from django.urls import reverse
 from django.views.generic import DetailView, ListView
 from django.utils import timezone
 from django.db.models import Q
@@ -7,7 +10,10 @@ from datetime import timedelta
 from django.utils.timezone import now
 from django.contrib.auth.hashers import check_password
 from app_usuarios.models import Usuario, Evaluador, Participante, AdministradorEvento, Asistente
+from app_usuarios.backends import buscar_usuario
 from django.contrib.auth import authenticate, login, logout
+from .cache_vistas import cache_anonimo
+from .catalogo import ESTADOS_VISIBLES, pagina_catalogo
 from .decorador import visitor_required
 from django.utils.decorators import method_decorator
 from django.views import View
@@ -49,24 +55,20 @@ def login_view(request):
         # 🔑 CORRECCIÓN: Inicializar la variable 'user' antes del bloque 'try'
         user = None 
 
-        try:
-            # Buscar usuario por email o username
-            usuario_obj = Usuario.objects.get(Q(email__iexact=identificador) | Q(username__iexact=identificador))
-        except Usuario.DoesNotExist:
-            usuario_obj = None
+        # Buscar usuario por email o username (una consulta indexada, con el perfil del rol elegido)
+        usuario_obj = buscar_usuario(identificador, rol_seleccionado)
 
         if usuario_obj:
             
             # 2. Revisar si es primer acceso
             primer_acceso = usuario_obj.last_login is None
 
-            # 3. Autenticar el usuario
-            user = authenticate(request, username=usuario_obj.username, password=contrasena)
+            # 3. Autenticar el usuario ya cargado (el backend no lo vuelve a buscar).
+            # Un usuario inactivo no pasa authenticate: no hace falta escribir is_active.
+            user = authenticate(request, usuario=usuario_obj, password=contrasena)
             
             if user:
                 login(request, user)
-                user.is_active = True
-                user.save(update_fields=["is_active"])
                 
                 # Nueva Lógica de Redirección: Valida la existencia del perfil de rol (la relación)
                 
@@ -249,61 +251,62 @@ class ResetPasswordConfirmView(View):
 
 ########### VISTAS PRINCIPALES VISITANTES ###########
 @method_decorator(visitor_required, name='dispatch')
+@method_decorator(cache_anonimo('catalogo'), name='dispatch')
 class MenuPrincipalVisitanteView(ListView):
     model = Evento
     template_name = 'base.html'
     context_object_name = 'eventos'
 
     def get_queryset(self):
-        today = now().date()
-
-        # Actualizar eventos cuyo eve_fecha_fin es hoy y están en estado 'Publicado'
-        Evento.objects.filter(
-            eve_estado__iexact='Publicado',
-            eve_fecha_fin=today
-        ).update(eve_estado='Finalizado')
-
-        # Filtrar eventos que están publicados o finalizados
-        eventos = Evento.objects.filter(
-            Q(eve_estado__iexact='Publicado') | Q(eve_estado__iexact='Finalizado')
-        ).order_by('-eve_fecha_inicio')
-
-        # Filtros personalizados
-        nombre = self.request.GET.get('nombre')
-        ciudad = self.request.GET.get('ciudad')
-        categoria_id = self.request.GET.get('categoria')
-        area_id = self.request.GET.get('area')
-        costo = self.request.GET.get('costo')
-        estado = self.request.GET.get('estado')
-
-        if nombre:
-            eventos = eventos.filter(eve_nombre__icontains=nombre)
-        if ciudad:
-            eventos = eventos.filter(eve_ciudad__icontains=ciudad)
-        if categoria_id:
-            eventos = eventos.filter(categorias__id=categoria_id)
-        if area_id:
-            eventos = eventos.filter(categorias__cat_area_fk__id=area_id)
-        if costo:
-            eventos = eventos.filter(eve_tienecosto__iexact=costo)
-        if estado:
-            eventos = eventos.filter(eve_estado__iexact=estado)
-
-        return eventos.distinct()
+        # Solo lectura: los cambios de estado los aplica `manage.py ciclo_eventos`
+        # Primera página del catálogo; las siguientes llegan por scroll desde CatalogoEventosJsonView
+        eventos, self.siguiente_cursor = pagina_catalogo(self.request.GET)
+        return eventos
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['areas'] = Area.objects.all()
-        context['categorias'] = Categoria.objects.all()
+        context['areas'] = referencias.areas()
+        context['categorias'] = referencias.categorias()
+        context['siguiente_cursor'] = self.siguiente_cursor
         current_time = now().date()
         for evento in context['eventos']:
-            if evento.eve_estado.lower() == 'Finalizado':
+            if evento.eve_estado == Evento.Estados.FINALIZADO:
                 evento.deletion_date = evento.eve_fecha_fin + timedelta(days=30)
         return context
 
 
+@method_decorator(visitor_required, name='dispatch')
+@method_decorator(cache_anonimo('catalogo_json'), name='dispatch')
+class CatalogoEventosJsonView(View):
+    """
+    Páginas siguientes del catálogo para el scroll infinito. Recibe los mismos
+    filtros que la página principal más `cursor`, y responde las tarjetas y
+    el cursor de la página que sigue (null al llegar al final).
+    """
+    def get(self, request):
+        eventos, siguiente = pagina_catalogo(request.GET, request.GET.get('cursor'))
+        return JsonResponse({
+            'eventos': [
+                {
+                    'id': evento.id,
+                    'nombre': evento.eve_nombre,
+                    'imagen': evento.eve_imagen.url if evento.eve_imagen else '',
+                    'estado': evento.eve_estado,
+                    'fecha_inicio': evento.eve_fecha_inicio.isoformat(),
+                    'ciudad': evento.eve_ciudad,
+                    'lugar': evento.eve_lugar,
+                    'categorias': [categoria.cat_nombre for categoria in evento.categorias.all()],
+                    'url': reverse('ver_info_evento', args=[evento.id]),
+                }
+                for evento in eventos
+            ],
+            'siguiente': siguiente,
+        })
+
+
 ########### VISTA DETALLE DE EVENTO ###########
 @method_decorator(visitor_required, name='dispatch')
+@method_decorator(cache_anonimo('detalle_evento', argumento_evento='pk'), name='dispatch')
 class EventoDetailView(DetailView):
     model = Evento
     template_name = 'info_evento.html'
@@ -311,11 +314,10 @@ class EventoDetailView(DetailView):
 
     def get_queryset(self):
         # Corrección: Solo permitir la visualización de eventos Publicados o Finalizados
-        return self.model.objects.filter(
-            Q(eve_estado__iexact='Publicado') | Q(eve_estado__iexact='Finalizado')
-        )
+        return self.model.objects.filter(eve_estado__in=ESTADOS_VISIBLES)
 
 @method_decorator(visitor_required, name='dispatch')
+@method_decorator(cache_anonimo('preinscripcion_evento', argumento_evento='pk'), name='dispatch')
 class EventoPreinscripcionesView(DetailView):
     model = Evento
     template_name = 'preinscripcion_eva_par.html'
@@ -0,0 +1,84 @@
+document.addEventListener('DOMContentLoaded', function () {
+    const centinela = document.getElementById('catalogo-siguiente');
+    const contenedor = document.querySelector('.contenedor-principal');
+    if (!centinela || !contenedor) return;
+
+    let cargando = false;
+
+    function crear(etiqueta, clase, texto) {
+        const elemento = document.createElement(etiqueta);
+        if (clase) elemento.className = clase;
+        if (texto !== undefined) elemento.textContent = texto;
+        return elemento;
+    }
+
+    // Misma estructura que las tarjetas que pinta base.html
+    function tarjeta(evento) {
+        const fecha = new Date(evento.fecha_inicio + 'T00:00:00');
+        const card = crear('div', 'card cursor-pointer');
+        card.dataset.url = evento.url;
+        card.addEventListener('click', () => { location.href = evento.url; });
+
+        const imagen = crear('img');
+        imagen.src = evento.imagen;
+        imagen.alt = evento.nombre;
+        card.appendChild(imagen);
+
+        const cuerpo = crear('div', 'card-body');
+        cuerpo.appendChild(crear('h5', '', evento.nombre));
+        card.appendChild(cuerpo);
+
+        if (evento.estado === 'Finalizado') {
+            const aviso = crear('div');
+            aviso.appendChild(crear('h4', 'text-danger alert-danger text-center m-2   rounded', 'Finalizado'));
+            card.appendChild(aviso);
+        }
+
+        const pie = crear('div', 'card-footer align-items-center');
+        const bloqueFecha = crear('div', 'fecha');
+        bloqueFecha.appendChild(crear('div', 'dia', fecha.toLocaleDateString('es-CO', { weekday: 'short' })));
+        bloqueFecha.appendChild(crear('div', 'numero', String(fecha.getDate()).padStart(2, '0')));
+        bloqueFecha.appendChild(crear('div', 'mes', fecha.toLocaleDateString('es-CO', { month: 'short', year: 'numeric' })));
+        pie.appendChild(bloqueFecha);
+
+        const info = crear('div', 'info d-flex flex-column mb-2');
+        [evento.ciudad, evento.lugar].forEach((texto) => {
+            const parrafo = crear('p');
+            parrafo.appendChild(crear('strong', '', texto));
+            info.appendChild(parrafo);
+        });
+        pie.appendChild(info);
+        card.appendChild(pie);
+        return card;
+    }
+
+    async function cargarSiguiente() {
+        if (cargando || !centinela.dataset.cursor) return;
+        cargando = true;
+
+        // Conserva los filtros del buscador de la página actual
+        const parametros = new URLSearchParams(location.search);
+        parametros.set('cursor', centinela.dataset.cursor);
+
+        try {
+            const respuesta = await fetch(`${centinela.dataset.url}?${parametros}`, { credentials: 'same-origin' });
+            if (!respuesta.ok) return;
+            const datos = await respuesta.json();
+            datos.eventos.forEach((evento) => contenedor.appendChild(tarjeta(evento)));
+
+            if (datos.siguiente) {
+                centinela.dataset.cursor = datos.siguiente;
+            } else {
+                observador.disconnect();
+                centinela.remove();
+            }
+        } finally {
+            cargando = false;
+        }
+    }
+
+    const observador = new IntersectionObserver((entradas) => {
+        if (entradas.some((entrada) => entrada.isIntersecting)) cargarSiguiente();
+    }, { rootMargin: '400px' });
+    observador.observe(centinela);
+});